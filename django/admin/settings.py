@@ -193,6 +193,24 @@ STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', '600'))
 # api/pagination.py CachedCountMixin. Override via COUNT_CACHE_TTL env var.
 COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL', '60'))
 
+# Longest time (seconds) a conditional GET on the articles, trials and
+# categories lists/details may keep answering 304 for data that changed
+# without bumping last_updated (M2M links, ML scores, org content): their
+# ETags include the current window. See api/conditional.py. Override via
+# CONDITIONAL_GET_WINDOW env var.
+CONDITIONAL_GET_WINDOW = int(os.environ.get('CONDITIONAL_GET_WINDOW', '600'))
+
+# Offline Unpaywall index built by `import_unpaywall_snapshot`; getDataByDOI
+# answers from it before calling the live API (gregory/unpaywall/snapshot.py).
+# Nothing is consulted until the file exists. Override via
+# UNPAYWALL_SNAPSHOT_INDEX; an empty value disables the index.
+UNPAYWALL_SNAPSHOT_INDEX = os.environ.get(
+	'UNPAYWALL_SNAPSHOT_INDEX', str(BASE_DIR / 'unpaywall_snapshot.sqlite3')
+)
+# Entries from a snapshot older than this many days are re-checked against the
+# live API (0 disables the check). Override via UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS.
+UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS = int(os.environ.get('UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS', '180'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
 	{'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -2,7 +2,7 @@
 
 Inherits everything from admin.settings (Postgres DATABASES, USE_TZ, secrets
 from env, ...) and only swaps the two knobs that make tests slow without
-changing test-observable behavior.
+changing test-observable behavior, plus the machine-local Unpaywall index.
 """
 
 from admin.settings import *
@@ -12,3 +12,7 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
 # In-memory cache — no Postgres round-trips, no createcachetable needed.
 CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# No offline Unpaywall index — a snapshot imported on a dev machine must not
+# answer lookups the tests expect to reach the (mocked) API.
+UNPAYWALL_SNAPSHOT_INDEX = ""
@@ -0,0 +1,222 @@
+"""
+Conditional GET (ETag / Last-Modified) for the read API.
+
+MCP tools, frontend polls and crawler revisits re-read the same pages over
+and over, and each read ran the page query plus the full serialization even
+when nothing had changed. The views mixing in ConditionalGetMixin answer
+``If-None-Match`` / ``If-Modified-Since`` with a 304 *before* serializing,
+from validators that cost one aggregate over the filtered scope:
+
+- ``Max(last_updated)`` and ``Count(pk)`` of the same filtered queryset the
+  list would page through (or of the single row, for a detail request), so
+  an edit, an addition or a deletion changes the validator;
+- the caller's visible organisation ids and the organisation whose per-org
+  fields are serialized (both change what the caller sees), the normalised
+  query string and the negotiated format;
+- the current CONDITIONAL_GET_WINDOW bucket. Some of what the serializers
+  return changes without bumping ``last_updated`` — M2M links, ML scores and
+  relevance flags written with ``update()`` by the pipeline, org content —
+  so a validator is never reused across windows. That bounds how stale a
+  revalidated response can be, the same trade the stats and paginator count
+  caches already make with their TTLs.
+
+A request without either header can't be answered with a 304, so it is
+served first and its validators are worked out afterwards, taking the count
+from the paginator the list just used (cached by CachedCountMixin, see
+api/pagination.py) instead of counting the scope a second time. That count
+may be up to COUNT_CACHE_TTL old; the worst it can do is make a later
+revalidation miss and come back as a 200. A conditional request still counts
+the scope itself, so a deletion can never be answered with a stale 304.
+
+The /stats/ endpoints already cache their payload server-side, so their
+ETag is simply the hash of the payload they are about to send
+(``conditional_payload_response``).
+
+SECURITY: like the stats and count cache keys, the validators must include
+the visible org ids and the query params; without them one tenant's ETag
+would validate another tenant's cached copy in a shared cache.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, DateTimeField, F, Max, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from api.serializers.mixins import _resolve_per_org_fields_org
+
+
+def _window_start():
+	window = max(1, settings.CONDITIONAL_GET_WINDOW)
+	return int(time.time()) // window * window
+
+
+def _make_etag(parts):
+	digest = hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()
+	# Weak: GZipMiddleware rewrites strong ETags anyway, and the guarantee
+	# here is "same data", not byte-identical bodies.
+	return f'W/"{digest[:40]}"'
+
+
+def _request_parts(request, per_org_fields=True):
+	"""What, besides the data, decides the representation a caller gets.
+	*per_org_fields* is False for responses with no per-org fields, which
+	saves the team lookup that resolving that organisation can cost."""
+	visible_org_ids = getattr(request, "visible_org_ids", None)
+	per_org = _resolve_per_org_fields_org(request) if per_org_fields else None
+	renderer = getattr(request, "accepted_renderer", None)
+	return {
+		"path": request.path,
+		"orgs": None if visible_org_ids is None else sorted(visible_org_ids),
+		"per_org": per_org.pk if per_org is not None else None,
+		"params": sorted(
+			(key, value)
+			for key in request.query_params.keys()
+			for value in request.query_params.getlist(key)
+		),
+		"format": getattr(renderer, "format", None),
+	}
+
+
+def _is_conditional(request):
+	"""True when the request carries a validator a 304 could answer."""
+	return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+
+
+def _not_modified(request, etag, last_modified=None):
+	"""The 304 to send, or None when the request's validators don't match."""
+	response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+	if response is not None:
+		response["ETag"] = etag
+		if last_modified is not None:
+			response["Last-Modified"] = http_date(last_modified)
+	return response
+
+
+def _stamp(response, etag, last_modified=None):
+	response["ETag"] = etag
+	if last_modified is not None:
+		response["Last-Modified"] = http_date(last_modified)
+	return response
+
+
+def conditional_payload_response(request, payload):
+	"""Response for an already-built (usually cached) *payload*: 304 when
+	the caller's ``If-None-Match`` matches its hash, else the payload with
+	its ETag."""
+	# The payload itself is hashed, so whatever per-org content it carries is
+	# already in the ETag.
+	etag = _make_etag(
+		{"request": _request_parts(request, per_org_fields=False), "payload": payload}
+	)
+	return _not_modified(request, etag) or _stamp(Response(payload), etag)
+
+
+class ConditionalGetMixin:
+	"""
+	Conditional ``list`` and ``retrieve`` for a viewset.
+
+	``conditional_timestamp_field`` names the model's modification timestamp
+	(``last_updated`` on Articles and Trials); its maximum over the scope
+	becomes the Last-Modified header. Viewsets whose model has none (e.g.
+	categories, whose counts move with the articles and trials assigned to
+	them) set it to None and list ``conditional_dependencies`` instead:
+	``(model, timestamp field)`` pairs whose table-wide maximum stands in for
+	it, read in the same validator query.
+	"""
+
+	conditional_timestamp_field = "last_updated"
+	conditional_dependencies = ()
+	# False when the serializer has no per-org fields (see _request_parts).
+	conditional_per_org_fields = True
+
+	def _conditional_validators(self, request, queryset, count=None):
+		"""``(etag, last_modified)`` for *queryset*, or None when it is empty
+		(a detail request then 404s the normal way). *count* is the size of
+		*queryset* when the caller already knows it."""
+		aggregates = {} if count is not None else {"count": Count("pk")}
+		if self.conditional_timestamp_field:
+			aggregates["latest"] = Max(self.conditional_timestamp_field)
+		# The dependencies ride along in the same SELECT as uncorrelated
+		# subqueries (one index probe each), so validating costs one query
+		# however many tables the response depends on.
+		for index, (model, field) in enumerate(self.conditional_dependencies):
+			newest = (
+				model.objects.exclude(**{f"{field}__isnull": True})
+				.order_by(F(field).desc())
+				.values(field)[:1]
+			)
+			aggregates[f"dependency_{index}"] = Max(
+				Subquery(newest), output_field=DateTimeField()
+			)
+		state = queryset.order_by().aggregate(**aggregates) if aggregates else {}
+		if count is not None:
+			state["count"] = count
+		if not state["count"]:
+			return None
+		dependencies = [
+			state.pop(f"dependency_{index}")
+			for index in range(len(self.conditional_dependencies))
+		]
+		timestamps = [state.get("latest")] + dependencies
+		state["dependencies"] = dependencies
+		window_start = _window_start()
+		state["window"] = window_start
+
+		latest = max((ts for ts in timestamps if ts is not None), default=None)
+		# Changes that don't move the timestamp surface at the next window,
+		# so Last-Modified must not predate the current one.
+		last_modified = max(int(latest.timestamp()), window_start) if latest else window_start
+		parts = _request_parts(request, per_org_fields=self.conditional_per_org_fields)
+		etag = _make_etag({"request": parts, "state": state})
+		return etag, last_modified
+
+	def _paginated_count(self):
+		"""The row count the list's paginator read (from its count cache
+		where it has one), or None when the response wasn't paginated."""
+		page = getattr(self.paginator, "page", None)
+		return page.paginator.count if page is not None else None
+
+	def _conditional(self, request, queryset, handler, *args, **kwargs):
+		if request.method not in ("GET", "HEAD"):
+			return handler(request, *args, **kwargs)
+		if not _is_conditional(request):
+			response = handler(request, *args, **kwargs)
+			if response.status_code == 200:
+				validators = self._conditional_validators(
+					request, queryset, count=self._paginated_count()
+				)
+				if validators is not None:
+					_stamp(response, *validators)
+			return response
+		validators = self._conditional_validators(request, queryset)
+		if validators is None:
+			return handler(request, *args, **kwargs)
+		etag, last_modified = validators
+		not_modified = _not_modified(request, etag, last_modified)
+		if not_modified is not None:
+			return not_modified
+		response = handler(request, *args, **kwargs)
+		if response.status_code == 200:
+			_stamp(response, etag, last_modified)
+		return response
+
+	def list(self, request, *args, **kwargs):
+		queryset = self.filter_queryset(self.get_queryset())
+		return self._conditional(request, queryset, super().list, *args, **kwargs)
+
+	def retrieve(self, request, *args, **kwargs):
+		lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+		try:
+			queryset = self.filter_queryset(self.get_queryset()).filter(
+				**{self.lookup_field: kwargs[lookup_url_kwarg]}
+			)
+		except (TypeError, ValueError, ValidationError):
+			# A malformed lookup value: leave the 404 to get_object().
+			return super().retrieve(request, *args, **kwargs)
+		return self._conditional(request, queryset, super().retrieve, *args, **kwargs)
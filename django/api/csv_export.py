@@ -0,0 +1,462 @@
+"""
+Serializer-free CSV rows for bulk exports (``?format=csv``).
+
+CSVStreamingMixin streams CSV in batches, but on the article and trial
+endpoints every row used to go through the full nested ArticleSerializer /
+TrialSerializer: one serializer field object per nested item, plus the
+org-scoping mixin re-walking the prefetched relations. An exporter builds the
+same row dicts straight from values() queries instead, one query per column
+group per batch:
+
+- the plain model columns in one values() query over the batch's primary keys,
+  formatted by the serializer's own field objects, so dates, choices and JSON
+  come out exactly as the serializer renders them;
+- each nested column (authors, subjects, categories, ...) from one values()
+  query over its through table, grouped by row.
+
+Visibility follows OrgScopedSerializerMixin: subjects, team categories and ML
+predictions outside the caller's visible organisations are dropped, and the
+per-org columns (takeaways, summary_plain_english) come from the caller's
+organisation only and are left out with no organisation context, as in
+csv_header_fields. Rows are handed to stream_csv, which cleans and
+JSON-encodes them as it does serialized rows, so the CSV is the same.
+
+An exporter must produce every column of its serializer; build() raises
+ImproperlyConfigured for a column it cannot, so a field added to the
+serializer without a loader here fails loudly rather than exporting blanks.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+from api.serializers.mixins import (
+	_request_visible_subject_ids,
+	_request_visible_team_ids,
+	_resolve_per_org_fields_org,
+)
+from gregory.models import (
+	ArticleCategoryAssignment,
+	ArticleOrgContent,
+	ArticleSubjectRelevance,
+	ArticleTrialReference,
+	Articles,
+	TrialCategoryAssignment,
+	TrialCountry,
+	TrialOrgContent,
+	Trials,
+)
+
+# Serializer field types rendered straight from a model column
+_NESTED_FIELD_TYPES = (
+	serializers.BaseSerializer,
+	serializers.ManyRelatedField,
+	serializers.RelatedField,
+	serializers.SerializerMethodField,
+)
+
+
+def _country_code(value):
+	# CountryField stores the ISO code; serializers render "" as None
+	return value or None
+
+
+def _subject(row, prefix):
+	return {
+		"id": row[f"{prefix}id"],
+		"subject_name": row[f"{prefix}subject_name"],
+		"description": row[f"{prefix}description"],
+		"team_id": row[f"{prefix}team_id"],
+	}
+
+
+class CSVExporter:
+	"""
+	Base exporter: subclasses set ``model``, list their nested columns in
+	``loaders`` (column name -> method name) and implement those methods as
+	``loader(pks) -> {pk: value}``. ``serialize_batch(pks)`` returns the row
+	dicts of *pks*, in order.
+	"""
+
+	model = None
+	loaders = {}
+	# Columns only present with an organisation context (see
+	# OrgScopedSerializerMixin._per_org_fields)
+	per_org_columns = ("takeaways", "summary_plain_english")
+
+	def __init__(self, serializer, header_fields, request):
+		self.request = request
+		self.org = _resolve_per_org_fields_org(request)
+		visible_org_ids = getattr(request, "visible_org_ids", None)
+		self.visible_team_ids = None
+		self.visible_subject_ids = None
+		if visible_org_ids is not None:
+			self.visible_team_ids = _request_visible_team_ids(request, visible_org_ids)
+			self.visible_subject_ids = _request_visible_subject_ids(
+				request, visible_org_ids
+			)
+
+		self.scalar_fields = {}
+		self.nested_columns = []
+		for name in header_fields:
+			field = serializer.fields[name]
+			if name in self.loaders:
+				self.nested_columns.append(name)
+			elif not isinstance(field, _NESTED_FIELD_TYPES) and field.source != "*":
+				self.scalar_fields[name] = field
+			else:
+				raise ImproperlyConfigured(
+					f"{type(self).__name__} has no loader for the {name!r} column"
+				)
+		self.header_fields = header_fields
+
+	def serialize_batch(self, pks):
+		pks = list(pks)
+		pk_name = self.model._meta.pk.name
+		sources = {name: field.source for name, field in self.scalar_fields.items()}
+		scalars = {
+			row[pk_name]: row
+			for row in self.model.objects.filter(pk__in=pks)
+			.order_by()
+			.values(pk_name, *set(sources.values()))
+		}
+		nested = {
+			name: getattr(self, self.loaders[name])(pks) for name in self.nested_columns
+		}
+
+		rows = []
+		for pk in pks:
+			values = scalars.get(pk)
+			if values is None:
+				# Deleted between the key scan and this batch
+				continue
+			row = {}
+			for name in self.header_fields:
+				if name in nested:
+					row[name] = nested[name].get(pk, self._missing(name))
+					continue
+				value = values[sources[name]]
+				row[name] = (
+					None if value is None else self.scalar_fields[name].to_representation(value)
+				)
+			rows.append(row)
+		return rows
+
+	def _missing(self, name):
+		"""Value of a nested column for a row without related rows."""
+		return []
+
+	# --- shared loaders ---------------------------------------------------
+
+	def _grouped(self, queryset, key, build):
+		grouped = defaultdict(list)
+		for row in queryset:
+			grouped[row[key]].append(build(row))
+		return grouped
+
+	def _visible_teams(self, queryset, team_field):
+		if self.visible_team_ids is None:
+			return queryset
+		return queryset.filter(**{f"{team_field}__in": self.visible_team_ids})
+
+	def _sources(self, pks):
+		through = self.model.sources.through
+		owner = f"{self.model._meta.model_name}_id"
+		return self._grouped(
+			through.objects.filter(**{f"{owner}__in": pks})
+			.order_by("id")
+			.values(owner, "sources__name"),
+			owner,
+			lambda row: row["sources__name"],
+		)
+
+	def _categories(self, through, owner, pks):
+		queryset = self._visible_teams(
+			through.objects.filter(**{f"{owner}__in": pks}), "teamcategory__team_id"
+		)
+		return self._grouped(
+			queryset.order_by("id").values(
+				owner,
+				"teamcategory_id",
+				"teamcategory__category_name",
+				"teamcategory__category_description",
+				"teamcategory__category_slug",
+				"teamcategory__category_terms",
+				"teamcategory__category_type",
+				"teamcategory__modality",
+			),
+			owner,
+			lambda row: {
+				"id": row["teamcategory_id"],
+				"category_name": row["teamcategory__category_name"],
+				"category_description": row["teamcategory__category_description"],
+				"category_slug": row["teamcategory__category_slug"],
+				"category_terms": row["teamcategory__category_terms"],
+				"category_type": row["teamcategory__category_type"],
+				"modality": row["teamcategory__modality"],
+			},
+		)
+
+	def _org_content(self, content_model, owner, field, pks):
+		if self.org is None:
+			return {}
+		return dict(
+			content_model.objects.filter(
+				organization=self.org, **{f"{owner}__in": pks}
+			).values_list(owner, field)
+		)
+
+	def _references(self, owner, target, fields, pks):
+		return self._grouped(
+			ArticleTrialReference.objects.filter(**{f"{owner}__in": pks})
+			.order_by("id")
+			.values(owner, *(f"{target}__{name}" for name in fields)),
+			owner,
+			lambda row: {name: row[f"{target}__{name}"] for name in fields},
+		)
+
+
+class ArticleCSVExporter(CSVExporter):
+	"""The columns of ArticleSerializer."""
+
+	model = Articles
+	loaders = {
+		"sources": "_sources",
+		"subjects": "_subjects",
+		"authors": "_authors",
+		"article_subject_relevances": "_relevances",
+		"team_categories": "_team_categories",
+		"ml_predictions": "_ml_predictions",
+		"clinical_trials": "_clinical_trials",
+		"takeaways": "_takeaways",
+		"summary_plain_english": "_summaries",
+	}
+
+	def _missing(self, name):
+		return None if name in self.per_org_columns else []
+
+	def _subjects(self, pks):
+		queryset = self._visible_teams(
+			Articles.subjects.through.objects.filter(articles_id__in=pks),
+			"subject__team_id",
+		)
+		return self._grouped(
+			queryset.order_by("id").values(
+				"articles_id",
+				"subject__id",
+				"subject__subject_name",
+				"subject__description",
+				"subject__team_id",
+			),
+			"articles_id",
+			lambda row: _subject(row, "subject__"),
+		)
+
+	def _authors(self, pks):
+		return self._grouped(
+			Articles.authors.through.objects.filter(articles_id__in=pks)
+			.order_by("id")
+			.values(
+				"articles_id",
+				"authors__author_id",
+				"authors__given_name",
+				"authors__family_name",
+				"authors__full_name",
+				"authors__ORCID",
+				"authors__country",
+			),
+			"articles_id",
+			lambda row: {
+				"author_id": row["authors__author_id"],
+				"given_name": row["authors__given_name"],
+				"family_name": row["authors__family_name"],
+				"full_name": row["authors__full_name"],
+				"ORCID": row["authors__ORCID"],
+				"country": _country_code(row["authors__country"]),
+			},
+		)
+
+	def _relevances(self, pks):
+		return self._grouped(
+			ArticleSubjectRelevance.objects.filter(article_id__in=pks)
+			.order_by("id")
+			.values(
+				"article_id",
+				"is_relevant",
+				"subject__id",
+				"subject__subject_name",
+				"subject__description",
+				"subject__team_id",
+			),
+			"article_id",
+			lambda row: {
+				"subject": _subject(row, "subject__"),
+				"is_relevant": row["is_relevant"],
+			},
+		)
+
+	def _team_categories(self, pks):
+		return self._categories(ArticleCategoryAssignment, "articles_id", pks)
+
+	def _ml_predictions(self, pks):
+		# Same latest-per-(article, subject, algorithm) rows as the list
+		# endpoint's prefetch
+		from api.serializers import MLPredictionsSerializer
+		from api.views import _latest_ml_predictions_queryset
+
+		fields = MLPredictionsSerializer().fields
+		queryset = _latest_ml_predictions_queryset().filter(article_id__in=pks)
+		if self.visible_subject_ids is not None:
+			queryset = queryset.filter(subject_id__in=self.visible_subject_ids)
+
+		def build(row):
+			subject = None
+			if row["subject_id"] is not None:
+				subject = {
+					"id": row["subject_id"],
+					"subject_name": row["subject__subject_name"],
+					"description": row["subject__description"],
+				}
+			prediction = {
+				name: row[name]
+				for name in ("id", "algorithm", "model_version", "probability_score")
+			}
+			prediction["predicted_relevant"] = row["predicted_relevant"]
+			prediction["created_date"] = (
+				None
+				if row["created_date"] is None
+				else fields["created_date"].to_representation(row["created_date"])
+			)
+			prediction["subject"] = subject
+			return prediction
+
+		return self._grouped(
+			queryset.order_by("id").values(
+				"article_id",
+				"id",
+				"algorithm",
+				"model_version",
+				"probability_score",
+				"predicted_relevant",
+				"created_date",
+				"subject_id",
+				"subject__subject_name",
+				"subject__description",
+			),
+			"article_id",
+			build,
+		)
+
+	def _clinical_trials(self, pks):
+		return self._references(
+			"article_id", "trial", ("trial_id", "title", "summary", "link"), pks
+		)
+
+	def _takeaways(self, pks):
+		return self._org_content(ArticleOrgContent, "article_id", "takeaways", pks)
+
+	def _summaries(self, pks):
+		return self._org_content(
+			ArticleOrgContent, "article_id", "summary_plain_english", pks
+		)
+
+
+class TrialCSVExporter(CSVExporter):
+	"""The columns of TrialSerializer."""
+
+	model = Trials
+	loaders = {
+		"sources": "_sources",
+		"team_categories": "_team_categories",
+		"sponsor": "_sponsors",
+		"trial_countries": "_trial_countries",
+		"countries_normalized": "_countries_normalized",
+		"articles": "_articles",
+		"takeaways": "_takeaways",
+		"summary_plain_english": "_summaries",
+	}
+
+	def _missing(self, name):
+		if name in self.per_org_columns or name in ("sponsor", "countries_normalized"):
+			return None
+		return []
+
+	def _team_categories(self, pks):
+		return self._categories(TrialCategoryAssignment, "trials_id", pks)
+
+	def _sponsors(self, pks):
+		return {
+			row["trial_id"]: {
+				"id": row["primary_sponsor_normalized__id"],
+				"slug": row["primary_sponsor_normalized__slug"],
+				"name": row["primary_sponsor_normalized__name"],
+				"sponsor_type": row["primary_sponsor_normalized__sponsor_type"],
+			}
+			for row in Trials.objects.filter(
+				pk__in=pks, primary_sponsor_normalized__isnull=False
+			)
+			.order_by()
+			.values(
+				"trial_id",
+				"primary_sponsor_normalized__id",
+				"primary_sponsor_normalized__slug",
+				"primary_sponsor_normalized__name",
+				"primary_sponsor_normalized__sponsor_type",
+			)
+		}
+
+	def _country_rows(self, pks):
+		# trial_countries and countries_normalized read the same rows; keep
+		# the current batch's
+		key = tuple(pks)
+		cached = getattr(self, "_country_batch", None)
+		if cached is None or cached[0] != key:
+			rows = list(
+				TrialCountry.objects.filter(trial_id__in=pks)
+				.order_by("id")
+				.values(
+					"trial_id",
+					"country",
+					"status",
+					"decision_date",
+					"recruitment_start_date",
+					"sources",
+				)
+			)
+			cached = self._country_batch = (key, rows)
+		return cached[1]
+
+	def _trial_countries(self, pks):
+		from api.serializers import TrialCountrySerializer
+
+		fields = TrialCountrySerializer().fields
+
+		def build(row):
+			country = {"country": _country_code(row["country"])}
+			for name in ("status", "decision_date", "recruitment_start_date", "sources"):
+				value = row[name]
+				country[name] = (
+					None if value is None else fields[name].to_representation(value)
+				)
+			return country
+
+		return self._grouped(self._country_rows(pks), "trial_id", build)
+
+	def _countries_normalized(self, pks):
+		codes = defaultdict(set)
+		for row in self._country_rows(pks):
+			if row["country"]:
+				codes[row["trial_id"]].add(row["country"])
+		return {trial_id: sorted(found) for trial_id, found in codes.items()}
+
+	def _articles(self, pks):
+		return self._references(
+			"trial_id", "article", ("article_id", "title", "summary", "link"), pks
+		)
+
+	def _takeaways(self, pks):
+		return self._org_content(TrialOrgContent, "trial_id", "takeaways", pks)
+
+	def _summaries(self, pks):
+		return self._org_content(TrialOrgContent, "trial_id", "summary_plain_english", pks)
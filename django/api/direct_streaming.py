@@ -3,6 +3,7 @@ import io
 import json
 import logging
 from datetime import datetime
+from rest_framework.renderers import BaseRenderer
 from rest_framework_csv.renderers import CSVRenderer
 
 # Configure logging
@@ -381,3 +382,35 @@ def stream_csv(source, serialize_batch, header_fields, chunk_size=2000):
 			batch = []
 	if batch:
 		yield write_batch(batch)
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class XLSXRenderer(BaseRenderer):
+	"""
+	Renderer for ``?format=xlsx``.
+
+	List responses never reach it: XLSXStreamingMixin writes them with the
+	write-only trials exporter (gregory/utils/trials_xlsx.py) and returns a
+	FileResponse. It renders everything else (detail, stats, error bodies)
+	as a one-sheet workbook of the response data, which is small.
+	"""
+
+	media_type = XLSX_MEDIA_TYPE
+	format = "xlsx"
+	charset = None
+	render_style = "binary"
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		from gregory.utils.trials_xlsx import write_records_xlsx
+
+		if data is None:
+			return b""
+		if isinstance(data, dict) and isinstance(data.get("results"), list):
+			data = data["results"]
+		records = data if isinstance(data, list) else [data]
+		records = [r if isinstance(r, dict) else {"value": r} for r in records]
+		output = io.BytesIO()
+		write_records_xlsx(output, records)
+		return output.getvalue()
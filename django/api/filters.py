@@ -37,6 +37,11 @@ class ChoiceInFilter(filters.BaseInFilter, filters.ChoiceFilter):
 	"""
 
 
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+	"""Comma-separated OR filter over a numeric field (?article_id__in=1,2,3).
+	NumberFilter validates each item, so a non-numeric one is a 400."""
+
+
 def ml_relevant_articles_q(threshold=0.8, subject_ids=None):
 	"""
 	Build a database-level Q matching articles ML-relevant by consensus.
@@ -183,6 +188,16 @@ class ArticleFilter(SubjectFilterMixin, filters.FilterSet):
 			"?search=stem OR cells. Not combinable with title/summary-only search."
 		),
 	)
+	article_id__in = NumberInFilter(
+		field_name="article_id",
+		lookup_expr="in",
+		label="Article IDs",
+		help_text=(
+			"Comma-separated list of article IDs, e.g. ?article_id__in=1,2,3. "
+			"Fetches several known articles in one request; IDs that don't "
+			"exist or aren't visible to the caller are simply absent."
+		),
+	)
 	author_id = filters.NumberFilter(
 		field_name="authors__author_id",
 		lookup_expr="exact",
@@ -341,6 +356,7 @@ class ArticleFilter(SubjectFilterMixin, filters.FilterSet):
 			"title",
 			"summary",
 			"search",
+			"article_id__in",
 			"author_id",
 			"doi",
 			"category_slug",
@@ -652,6 +668,16 @@ class TrialFilter(SubjectFilterMixin, filters.FilterSet):
 		label="Trial ID",
 		help_text="Filter by a specific trial ID.",
 	)
+	trial_id__in = NumberInFilter(
+		field_name="trial_id",
+		lookup_expr="in",
+		label="Trial IDs",
+		help_text=(
+			"Comma-separated list of trial IDs, e.g. ?trial_id__in=1,2,3. "
+			"Fetches several known trials in one request; IDs that don't "
+			"exist or aren't visible to the caller are simply absent."
+		),
+	)
 	team_id = filters.NumberFilter(
 		field_name="teams__id",
 		lookup_expr="exact",
@@ -1019,6 +1045,7 @@ class TrialFilter(SubjectFilterMixin, filters.FilterSet):
 		model = Trials
 		fields = [
 			"trial_id",
+			"trial_id__in",
 			"title",
 			"summary",
 			"search",
@@ -201,6 +201,12 @@ class CategorySerializer(serializers.ModelSerializer):
 		if not author_params.get("include_authors", False):
 			return []
 
+		# CategoryViewSet.list() ranks the authors of a whole page in one
+		# windowed query and attaches them here
+		batched = getattr(obj, "top_authors_batched", None)
+		if batched is not None:
+			return CategoryTopAuthorSerializer(batched, many=True).data
+
 		# Get parameters
 		max_authors = author_params.get("max_authors", 10)
 		date_filters = author_params.get("date_filters", {})
@@ -237,7 +243,7 @@ class CategorySerializer(serializers.ModelSerializer):
 					distinct=True,
 				)
 			)
-			.order_by("-category_articles_count")[:max_authors]
+			.order_by("-category_articles_count", "author_id")[:max_authors]
 		)
 
 		return CategoryTopAuthorSerializer(top_authors, many=True).data
@@ -255,6 +261,19 @@ class CategorySerializer(serializers.ModelSerializer):
 		# Get ML threshold
 		ml_threshold = monthly_params.get("ml_threshold", 0.5)
 
+		# Answer from the daily rollups (two range scans) when the threshold is
+		# on their score bucket grid (0.05 steps, which covers the default and
+		# the thresholds the dashboards use); compute other thresholds live.
+		from gregory.utils.rollups import category_monthly_counts
+
+		counts = category_monthly_counts(obj, ml_threshold)
+		if counts is not None:
+			return counts
+		return self._live_monthly_counts(obj, ml_threshold)
+
+	def _live_monthly_counts(self, obj, ml_threshold) -> dict:
+		"""The monthly_counts payload computed from the articles, trials and
+		predictions themselves, for thresholds the rollups cannot answer."""
 		# Import here to avoid circular imports
 		from gregory.models import MLPredictions
 		from django.db.models import Max, OuterRef, Subquery
@@ -123,6 +123,21 @@ class AuthorAPITest(TestCase):
 		self.assertEqual(results[1]["author_id"], self.author2.author_id)
 		self.assertEqual(results[1]["articles_count"], 1)
 
+	def test_article_counts_come_from_the_stored_counts(self):
+		"""Unfiltered counts and the article_count sort read AuthorArticleCounts
+		(kept current by signals), not the articles join."""
+		from gregory.models import AuthorArticleCounts
+
+		AuthorArticleCounts.objects.filter(author=self.author2).update(articles=5)
+
+		response = self.client.get("/authors/?sort_by=article_count&order=desc")
+		results = response.data["results"]
+		self.assertEqual(results[0]["author_id"], self.author2.author_id)
+		self.assertEqual(results[0]["articles_count"], 5)
+
+		response = self.client.get(f"/authors/?author_id={self.author2.author_id}")
+		self.assertEqual(response.data["results"][0]["articles_count"], 5)
+
 	def test_authors_filter_by_orcid_case_insensitive(self):
 		"""ORCID filtering should be case-insensitive end to end.
 
@@ -13,6 +13,9 @@ Run with:
     docker exec gregory python manage.py test api.tests.test_category_count_annotations
 """
 
+from datetime import timedelta
+from unittest.mock import Mock
+
 from django.db import connection
 from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
@@ -378,3 +381,95 @@ class CategoryAuthorsCountOrderingTests(TestCase):
 		self.assertEqual(response.status_code, 200)
 		names = [row["category_name"] for row in self._results(response)]
 		self.assertEqual(names, sorted(names))
+
+
+class CategoryAuthorsBatchTests(TestCase):
+	"""CategoryViewSet.list() computes authors_count and top_authors for the
+	whole page (api.views._category_authors_counts/_category_top_authors)
+	rather than per category in the serializer. The batched payload must
+	match the serializer's per-category fallback, and the number of queries
+	must not grow with the page."""
+
+	def setUp(self):
+		self.organization = Organization.objects.create(
+			name="Authors Batch Org", slug="authors-batch-org"
+		)
+		OrganizationApiSettings.objects.filter(organization=self.organization).update(
+			make_api_public=True
+		)
+		self.team = Team.objects.create(
+			name="Authors Batch Team",
+			slug="authors-batch-team",
+			organization=self.organization,
+		)
+		self.subject = Subject.objects.create(
+			subject_name="Authors Batch Subject",
+			subject_slug="authors-batch-subject",
+			team=self.team,
+		)
+		self.authors = [
+			Authors.objects.create(
+				given_name=f"Batch{i}", family_name="Test", full_name=f"Batch{i} Test"
+			)
+			for i in range(4)
+		]
+		self.url = reverse("categories-list")
+		self.client = APIClient()
+
+	def add_categories(self, count):
+		"""Categories whose articles give authors distinct, overlapping
+		counts; the last article of each is old so date filters matter."""
+		now = timezone.now()
+		start = TeamCategory.objects.filter(team=self.team).count()
+		for c in range(start, start + count):
+			category = _make_category(self.team, self.subject, f"Batch Category {c}")
+			for i in range(3):
+				article = Articles.objects.create(
+					title=f"Batch Article {c} {i}",
+					link=f"https://example.com/batch-article-{c}-{i}",
+					published_date=now - timedelta(days=400 * (i == 2)),
+				)
+				article.team_categories.add(category)
+				article.authors.add(*self.authors[i : i + 2])
+
+	def get(self, **params):
+		response = self.client.get(self.url, {"team_id": self.team.id, **params})
+		self.assertEqual(response.status_code, 200)
+		return response.data["results"] if "results" in response.data else response.data
+
+	def test_batched_payload_matches_per_category_serializer(self):
+		self.add_categories(2)
+		date_from = (timezone.now() - timedelta(days=30)).date()
+		for params in ({}, {"max_authors": 2}, {"date_from": date_from.isoformat()}):
+			with self.subTest(**params):
+				results = self.get(**params)
+				view = CategoryViewSet()
+				view.request = Mock(
+					query_params=params,
+					visible_org_ids=[self.organization.id],
+				)
+				view.format_kwarg = None
+				view.kwargs = {}
+				context = view.get_serializer_context()
+				for payload in results:
+					live = CategorySerializer(
+						TeamCategory.objects.get(pk=payload["id"]), context=context
+					).data
+					self.assertEqual(payload["authors_count"], live["authors_count"])
+					self.assertEqual(payload["top_authors"], live["top_authors"])
+
+		top = self.get(max_authors=2)[0]["top_authors"]
+		self.assertEqual([a["articles_count"] for a in top], [2, 2])
+		self.assertEqual(self.get()[0]["authors_count"], 4)
+
+	def test_query_count_does_not_grow_with_page(self):
+		self.add_categories(2)
+		self.get()
+		with CaptureQueriesContext(connection) as few:
+			self.get()
+		self.add_categories(6)
+		with CaptureQueriesContext(connection) as many:
+			results = self.get()
+		self.assertEqual(len(results), 8)
+		self.assertEqual(len(many), len(few))
+		self.assertTrue(all(len(row["top_authors"]) == 4 for row in results))
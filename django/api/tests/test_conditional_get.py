@@ -0,0 +1,180 @@
+"""
+Tests for api/conditional.py: ETag / Last-Modified on the articles, trials and
+categories list and detail endpoints and on the stats endpoints. Locks in:
+
+  - 200 responses carry a weak ETag and a Last-Modified header, without
+    counting the list's rows a second time
+  - a matching If-None-Match is answered with an empty 304 before the
+    response is serialized
+  - editing, adding or deleting a row in scope changes the ETag
+  - different query params and different visible-org contexts never share
+    an ETag
+  - the stats endpoints (/articles/stats/, /stats/) revalidate too
+  - detail lookups with a malformed pk still 404
+
+Run with:
+    docker exec gregory python manage.py test api.tests.test_conditional_get
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from organizations.models import Organization
+from rest_framework.test import APIClient
+
+from api.models import APIAccessScheme
+from gregory.models import Articles, OrganizationApiSettings, Team, TeamCategory, Trials
+
+
+def _make_org_team(name, slug, public=True):
+	org = Organization.objects.create(name=name, slug=slug)
+	OrganizationApiSettings.objects.filter(organization=org).update(
+		make_api_public=public
+	)
+	team = Team.objects.create(organization=org, name=name, slug=slug)
+	return org, team
+
+
+class ConditionalGetTest(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.org, self.team = _make_org_team("Etag Org", "etag-org")
+		self.articles = []
+		for i in range(3):
+			article = Articles.objects.create(
+				title=f"Etag article {i}", link=f"https://ex.com/etag-{i}"
+			)
+			article.teams.add(self.team)
+			self.articles.append(article)
+		self.trial = Trials.objects.create(
+			title="Etag trial", link="https://ex.com/etag-trial"
+		)
+		self.trial.teams.add(self.team)
+		self.client = APIClient()
+
+	def _revalidate(self, url, etag):
+		return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+	def test_list_has_validators(self):
+		response = self.client.get("/articles/")
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response["ETag"].startswith('W/"'))
+		self.assertIn("Last-Modified", response)
+
+	def test_plain_list_reuses_the_paginator_count(self):
+		with CaptureQueriesContext(connection) as ctx:
+			response = self.client.get("/articles/")
+		self.assertIn("ETag", response)
+		counts = [
+			q["sql"] for q in ctx.captured_queries
+			if 'FROM "articles"' in q["sql"] and "COUNT(" in q["sql"].upper()
+		]
+		# The paginator's own count, and nothing else.
+		self.assertEqual(len(counts), 1, counts)
+		# Served from the count cache next time: the validators add no COUNT.
+		with CaptureQueriesContext(connection) as ctx:
+			self.assertEqual(self.client.get("/articles/")["ETag"], response["ETag"])
+		self.assertFalse(
+			[
+				q["sql"] for q in ctx.captured_queries
+				if 'FROM "articles"' in q["sql"] and "COUNT(" in q["sql"].upper()
+			]
+		)
+
+	def test_matching_etag_is_answered_with_304_without_serializing(self):
+		etag = self.client.get("/articles/")["ETag"]
+		with CaptureQueriesContext(connection) as ctx:
+			response = self._revalidate("/articles/", etag)
+		self.assertEqual(response.status_code, 304)
+		self.assertEqual(response.content, b"")
+		self.assertEqual(response["ETag"], etag)
+		# Only the validator aggregate touches the articles table: no page
+		# query, no prefetches.
+		article_queries = [
+			q["sql"] for q in ctx.captured_queries
+			if 'FROM "articles"' in q["sql"]
+		]
+		self.assertEqual(len(article_queries), 1, article_queries)
+
+	def test_if_modified_since_is_honoured(self):
+		last_modified = self.client.get("/trials/")["Last-Modified"]
+		response = self.client.get("/trials/", HTTP_IF_MODIFIED_SINCE=last_modified)
+		self.assertEqual(response.status_code, 304)
+
+	def test_edit_invalidates_etag(self):
+		etag = self.client.get("/articles/")["ETag"]
+		article = self.articles[0]
+		article.title = "Etag article, edited"
+		article.save()
+		response = self._revalidate("/articles/", etag)
+		self.assertEqual(response.status_code, 200)
+		self.assertNotEqual(response["ETag"], etag)
+
+	def test_deletion_invalidates_etag(self):
+		etag = self.client.get("/articles/")["ETag"]
+		# Deleting the oldest row leaves Max(last_updated) unchanged; the
+		# count still moves.
+		self.articles[0].delete()
+		self.assertEqual(self._revalidate("/articles/", etag).status_code, 200)
+
+	def test_params_and_orgs_do_not_share_etags(self):
+		base = self.client.get("/articles/")["ETag"]
+		filtered = self.client.get("/articles/", {"team_id": self.team.pk})["ETag"]
+		self.assertNotEqual(base, filtered)
+		self.assertEqual(
+			self._revalidate("/articles/?page_size=1", base).status_code, 200
+		)
+
+		priv_org, priv_team = _make_org_team("Etag Private", "etag-private", public=False)
+		Articles.objects.create(
+			title="Etag private article", link="https://ex.com/etag-private"
+		).teams.add(priv_team)
+		scheme = APIAccessScheme.objects.create(
+			client_name="etag-key",
+			client_contacts="etag-key@example.com",
+			organization=priv_org,
+			ip_addresses="",
+			begin_date=now() - timedelta(days=1),
+			end_date=now() + timedelta(days=30),
+		)
+		keyed = APIClient()
+		keyed.credentials(HTTP_AUTHORIZATION=scheme.api_key)
+		response = keyed.get("/articles/", HTTP_IF_NONE_MATCH=base)
+		self.assertEqual(response.status_code, 200)
+		self.assertNotEqual(response["ETag"], base)
+
+	def test_detail(self):
+		url = f"/articles/{self.articles[1].pk}/"
+		etag = self.client.get(url)["ETag"]
+		self.assertEqual(self._revalidate(url, etag).status_code, 304)
+		# A change to another article leaves the detail's validator alone.
+		self.articles[2].title = "Another edit"
+		self.articles[2].save()
+		self.assertEqual(self._revalidate(url, etag).status_code, 304)
+
+	def test_malformed_or_missing_detail_404s(self):
+		self.assertEqual(self.client.get("/articles/not-a-pk/").status_code, 404)
+		self.assertEqual(
+			self._revalidate("/articles/not-a-pk/", 'W/"x"').status_code, 404
+		)
+		self.assertEqual(self.client.get("/trials/999999/").status_code, 404)
+
+	def test_categories(self):
+		TeamCategory.objects.create(
+			team=self.team, category_name="Etag category", category_slug="etag-category"
+		)
+		etag = self.client.get("/categories/")["ETag"]
+		self.assertEqual(self._revalidate("/categories/", etag).status_code, 304)
+
+	def test_stats_endpoints(self):
+		for url in ("/articles/stats/", "/stats/"):
+			with self.subTest(url=url):
+				etag = self.client.get(url)["ETag"]
+				self.assertEqual(self._revalidate(url, etag).status_code, 304)
+		self.assertEqual(
+			self._revalidate("/articles/stats/?team_id=1", etag).status_code, 200
+		)
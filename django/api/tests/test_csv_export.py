@@ -0,0 +1,212 @@
+"""
+Tests for the serializer-free CSV exporters (api/csv_export.py) used by
+?format=csv&all_results=true on the article and trial endpoints: the rows
+must match what the serializer path writes, visibility and per-org columns
+included, in a number of queries that does not grow with the row count.
+
+Run with:
+    docker exec gregory python manage.py test api.tests.test_csv_export
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from organizations.models import Organization
+from rest_framework.test import APIClient
+
+from api.views import ArticleViewSet, TrialViewSet
+from gregory.models import (
+	ArticleOrgContent,
+	ArticleSubjectRelevance,
+	ArticleTrialReference,
+	Articles,
+	Authors,
+	MLPredictions,
+	OrganizationApiSettings,
+	Sources,
+	Sponsor,
+	Subject,
+	Team,
+	TeamCategory,
+	TrialCountry,
+	TrialOrgContent,
+	Trials,
+)
+
+
+def _rows(response):
+	"""CSV rows as header -> cell dicts, with JSON list cells decoded and
+	sorted (related rows have no defined order on either path)."""
+	content = b"".join(response.streaming_content).decode("utf-8")
+	reader = csv.reader(io.StringIO(content))
+	header = next(reader)
+	rows = []
+	for cells in reader:
+		row = {}
+		for name, cell in zip(header, cells):
+			if cell.startswith("["):
+				cell = sorted(json.dumps(item, sort_keys=True) for item in json.loads(cell))
+			row[name] = cell
+		rows.append(row)
+	return header, rows
+
+
+class CSVExporterTest(TestCase):
+	def setUp(self):
+		# Org A is public (anonymous callers see it, and ?team_id gives its
+		# per-org columns); org B is private, so its subjects, categories and
+		# predictions must stay out of the export.
+		self.org_a = Organization.objects.create(name="Export A", slug="export-a")
+		self.org_b = Organization.objects.create(name="Export B", slug="export-b")
+		OrganizationApiSettings.objects.filter(organization=self.org_a).update(
+			make_api_public=True
+		)
+		self.team_a = Team.objects.create(
+			organization=self.org_a, name="Team A", slug="export-team-a"
+		)
+		self.team_b = Team.objects.create(
+			organization=self.org_b, name="Team B", slug="export-team-b"
+		)
+		self.subject_a = Subject.objects.create(
+			team=self.team_a, subject_name="Visible subject", subject_slug="visible"
+		)
+		self.subject_b = Subject.objects.create(
+			team=self.team_b, subject_name="Hidden subject", subject_slug="hidden"
+		)
+		category_a = TeamCategory.objects.create(
+			team=self.team_a,
+			category_name="Visible category",
+			category_slug="visible-category",
+			category_terms=["alpha", "beta"],
+		)
+		category_b = TeamCategory.objects.create(
+			team=self.team_b, category_name="Hidden category", category_slug="hidden-category"
+		)
+		source = Sources.objects.create(name="Export source", source_for="science paper")
+		sponsor = Sponsor.objects.create(name="Export Sponsor", slug="export-sponsor")
+
+		self.trials = []
+		for i in range(3):
+			trial = Trials.objects.create(
+				title=f"Export trial {i}",
+				link=f"https://trials.example.com/export-{i}",
+				summary="Line one\nline two",
+				identifiers={"nct": f"NCT000{i}"},
+				date_registration=date(2024, 1, i + 1),
+				results_posted=bool(i % 2),
+			)
+			trial.teams.add(self.team_a)
+			trial.sources.add(source)
+			trial.team_categories.add(category_a, category_b)
+			TrialCountry.objects.create(
+				trial=trial, country="FR", status="recruiting", sources=["ctgov"]
+			)
+			TrialCountry.objects.create(
+				trial=trial, country="DE", decision_date=date(2024, 2, 1)
+			)
+			TrialOrgContent.objects.create(
+				trial=trial, organization=self.org_a, takeaways=f"Trial takeaway {i}"
+			)
+			self.trials.append(trial)
+		Trials.objects.filter(pk=self.trials[0].pk).update(primary_sponsor_normalized=sponsor)
+
+		for i in range(4):
+			article = Articles.objects.create(
+				title=f"Export article {i}",
+				summary="Summary with\r\nbreaks",
+				link=f"https://example.com/export-{i}",
+				kind="science paper",
+				links={"pdf": f"https://example.com/export-{i}.pdf"},
+				ml_score=0.5 + i / 10,
+			)
+			article.teams.add(self.team_a, self.team_b)
+			article.sources.add(source)
+			article.subjects.add(self.subject_a, self.subject_b)
+			article.team_categories.add(category_a, category_b)
+			article.authors.add(
+				Authors.objects.create(
+					given_name="Ada", family_name=f"Export{i}", full_name=f"Ada Export{i}", country="PT"
+				),
+				Authors.objects.create(given_name="Bo", family_name=f"Export{i}"),
+			)
+			ArticleSubjectRelevance.objects.create(
+				article=article, subject=self.subject_a, is_relevant=True
+			)
+			for subject in (self.subject_a, self.subject_b):
+				MLPredictions.objects.create(
+					article=article,
+					subject=subject,
+					algorithm="lgbm_tfidf",
+					probability_score=0.75,
+					predicted_relevant=True,
+				)
+			ArticleTrialReference.objects.create(
+				article=article,
+				trial=self.trials[i % 3],
+				identifier_type="nct_id",
+				identifier_value=f"NCT000{i % 3}",
+			)
+			if i % 2:
+				ArticleOrgContent.objects.create(
+					article=article,
+					organization=self.org_a,
+					takeaways=f"Takeaway {i}",
+					summary_plain_english=f"Plain summary {i}",
+				)
+
+		self.client = APIClient()
+
+	def export(self, path, viewset, **params):
+		"""The same export through the exporter and through the serializers."""
+		params = {"format": "csv", "all_results": "true", **params}
+		fast = _rows(self.client.get(path, params))
+		with mock.patch.object(viewset, "csv_exporter_class", None):
+			slow = _rows(self.client.get(path, params))
+		return fast, slow
+
+	def test_articles_match_the_serializer(self):
+		for params in ({}, {"team_id": self.team_a.pk}):
+			with self.subTest(params=params):
+				fast, slow = self.export("/articles/", ArticleViewSet, **params)
+				self.assertEqual(fast, slow)
+				self.assertEqual(len(fast[1]), 4)
+
+		header, rows = fast
+		self.assertIn("takeaways", header)
+		export = json.dumps(rows)
+		self.assertIn("Visible subject", export)
+		self.assertNotIn("Hidden subject", export)
+		self.assertNotIn("Hidden category", export)
+
+	def test_trials_match_the_serializer(self):
+		for params in ({}, {"team_id": self.team_a.pk}):
+			with self.subTest(params=params):
+				fast, slow = self.export("/trials/", TrialViewSet, **params)
+				self.assertEqual(fast, slow)
+				self.assertEqual(len(fast[1]), 3)
+
+		header, rows = fast
+		by_title = {row["title"]: row for row in rows}
+		self.assertIn("Export Sponsor", by_title["Export trial 0"]["sponsor"])
+		self.assertEqual(by_title["Export trial 1"]["countries_normalized"], ['"DE"', '"FR"'])
+		self.assertEqual(by_title["Export trial 2"]["takeaways"], "Trial takeaway 2")
+
+	def test_query_count_does_not_grow_with_rows(self):
+		def count_queries():
+			with CaptureQueriesContext(connection) as ctx:
+				response = self.client.get(
+					"/articles/", {"format": "csv", "all_results": "true"}
+				)
+				b"".join(response.streaming_content)
+			return len(ctx.captured_queries)
+
+		self.client.get("/articles/", {"format": "csv", "all_results": "true"})
+		small = count_queries()
+		Articles.objects.exclude(pk=Articles.objects.order_by("pk").first().pk).delete()
+		self.assertEqual(count_queries(), small)
@@ -0,0 +1,72 @@
+"""
+Tests for the ?article_id__in= / ?trial_id__in= id-list filters that back the
+MCP server's get_articles / get_trials batch tools: several known records in
+one list request, visibility rules unchanged, malformed ids rejected.
+
+Run with:
+    docker exec gregory python manage.py test api.tests.test_id_list_filters
+"""
+
+from django.test import TestCase
+from organizations.models import Organization
+from rest_framework.test import APIClient
+
+from gregory.models import Articles, OrganizationApiSettings, Team, Trials
+
+
+def _make_team(name, slug, public=True):
+	org = Organization.objects.create(name=name, slug=slug)
+	OrganizationApiSettings.objects.filter(organization=org).update(
+		make_api_public=public
+	)
+	return Team.objects.create(organization=org, name=name, slug=slug)
+
+
+class IdListFilterTest(TestCase):
+	def setUp(self):
+		self.public_team = _make_team("Ids Public", "ids-public")
+		self.private_team = _make_team("Ids Private", "ids-private", public=False)
+		self.articles = []
+		for i in range(3):
+			article = Articles.objects.create(
+				title=f"Ids article {i}", link=f"https://ex.com/ids-{i}"
+			)
+			article.teams.add(self.public_team)
+			self.articles.append(article)
+		self.hidden_article = Articles.objects.create(
+			title="Ids hidden article", link="https://ex.com/ids-hidden"
+		)
+		self.hidden_article.teams.add(self.private_team)
+		self.trials = []
+		for i in range(2):
+			trial = Trials.objects.create(
+				title=f"Ids trial {i}", link=f"https://ex.com/ids-trial-{i}"
+			)
+			trial.teams.add(self.public_team)
+			self.trials.append(trial)
+		self.client = APIClient()
+
+	def _ids(self, response, key):
+		return sorted(row[key] for row in response.data["results"])
+
+	def test_article_id_in_returns_only_listed_visible_articles(self):
+		wanted = [self.articles[0].pk, self.articles[2].pk, self.hidden_article.pk]
+		response = self.client.get(
+			"/articles/", {"article_id__in": ",".join(map(str, wanted))}
+		)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			self._ids(response, "article_id"),
+			sorted([self.articles[0].pk, self.articles[2].pk]),
+		)
+
+	def test_trial_id_in(self):
+		response = self.client.get(
+			"/trials/", {"trial_id__in": f"{self.trials[1].pk},999999"}
+		)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(self._ids(response, "trial_id"), [self.trials[1].pk])
+
+	def test_malformed_ids_are_rejected(self):
+		response = self.client.get("/articles/", {"article_id__in": "1,abc"})
+		self.assertEqual(response.status_code, 400)
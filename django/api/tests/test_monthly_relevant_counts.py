@@ -19,6 +19,7 @@ from django.utils.timezone import now
 from organizations.models import Organization
 from rest_framework.test import APIClient
 
+from api.serializers import CategorySerializer
 from gregory.models import (
 	Articles,
 	MLPredictions,
@@ -27,6 +28,7 @@ from gregory.models import (
 	Team,
 	TeamCategory,
 )
+from gregory.utils.rollups import category_monthly_counts, refresh_rollups
 
 MARCH = datetime(2025, 3, 15, 12, 0, tzinfo=dt_timezone.utc)
 APRIL = datetime(2025, 4, 10, 12, 0, tzinfo=dt_timezone.utc)
@@ -119,6 +121,8 @@ class MonthlyRelevantCountsTest(TestCase):
 		)
 
 	def _get_monthly_counts(self, **params):
+		# The endpoint answers from the daily rollups the pipeline refreshes
+		refresh_rollups(full=True)
 		query = {
 			"team_id": self.team.id,
 			"category_id": self.category.id,
@@ -211,6 +215,22 @@ class MonthlyRelevantCountsTest(TestCase):
 		# The 0.7 March article is no longer relevant.
 		self.assertIsNone(self._month_key(relevant, "2025-03"))
 
+	def test_rollups_match_live_counts(self):
+		refresh_rollups(full=True)
+		for threshold in (0.0, 0.5, 0.55, 0.8, 0.95):
+			with self.subTest(threshold=threshold):
+				self.assertEqual(
+					category_monthly_counts(self.category, threshold),
+					CategorySerializer()._live_monthly_counts(self.category, threshold),
+				)
+
+	def test_threshold_off_the_bucket_grid_is_computed_live(self):
+		self.assertIsNone(category_monthly_counts(self.category, 0.83))
+		counts = self._get_monthly_counts(ml_threshold="0.83")
+		relevant = self._by_month(counts["monthly_relevant_article_counts"])
+		april = self._month_key(relevant, "2025-04")
+		self.assertEqual(relevant[april], 2)
+
 	def test_existing_payload_fields_unchanged(self):
 		counts = self._get_monthly_counts()
 		for key in (
@@ -306,6 +326,8 @@ class MonthlyCountsPerModelLatestPredictionTest(TestCase):
 		)
 
 	def _get_monthly_counts(self, **params):
+		# The endpoint answers from the daily rollups the pipeline refreshes
+		refresh_rollups(full=True)
 		query = {
 			"team_id": self.team.id,
 			"category_id": self.category.id,
@@ -386,6 +408,8 @@ class MonthlyCountsAvailableModelsTest(TestCase):
 		)
 
 	def _get_monthly_counts(self, **params):
+		# The endpoint answers from the daily rollups the pipeline refreshes
+		refresh_rollups(full=True)
 		query = {
 			"team_id": self.team.id,
 			"category_id": self.category.id,
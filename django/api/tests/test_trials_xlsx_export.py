@@ -0,0 +1,164 @@
+"""
+Tests for ``/trials/?format=xlsx``: the list is written by the write-only
+trials exporter (gregory/utils/trials_xlsx.py) and streamed from a file,
+honours the list filters and pagination, and exports only columns the
+serializer exposes.
+
+Run:
+  docker exec gregory python manage.py test api.tests.test_trials_xlsx_export
+"""
+
+import io
+
+import openpyxl
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.direct_streaming import XLSX_MEDIA_TYPE
+from gregory.models import (
+	Organization,
+	OrganizationApiSettings,
+	Subject,
+	Team,
+	TeamCategory,
+	Trials,
+)
+
+
+class TrialsXlsxExportTests(TestCase):
+	def setUp(self):
+		self.organization = Organization.objects.create(
+			name="XLSX Export Org", slug="xlsx-export-org"
+		)
+		OrganizationApiSettings.objects.filter(organization=self.organization).update(
+			make_api_public=True
+		)
+		self.team = Team.objects.create(
+			name="XLSX Export Team",
+			slug="xlsx-export-team",
+			organization=self.organization,
+		)
+		self.subject = Subject.objects.create(
+			subject_name="XLSX Export Subject",
+			subject_slug="xlsx-export-subject",
+			team=self.team,
+		)
+		self.trials = []
+		for i in range(5):
+			trial = Trials.objects.create(
+				title=f"XLSX Trial {i}",
+				link=f"https://example.com/xlsx-{i}",
+				published_date=timezone.now(),
+				identifiers={"nct": f"NCT0000000{i}"},
+				recruitment_status="Recruiting" if i % 2 else "Completed",
+				contact_email=f"contact{i}@example.com",
+			)
+			trial.teams.add(self.team)
+			trial.subjects.add(self.subject)
+			self.trials.append(trial)
+		self.client = APIClient()
+
+	def _workbook(self, response):
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(response["Content-Type"], XLSX_MEDIA_TYPE)
+		if response.streaming:
+			content = b"".join(response.streaming_content)
+		else:
+			content = response.content
+		return openpyxl.load_workbook(io.BytesIO(content))
+
+	def _rows(self, ws):
+		rows = list(ws.iter_rows(values_only=True))
+		return list(rows[0]), rows[1:]
+
+	def test_all_results_export_streams_every_trial(self):
+		response = self.client.get(
+			"/trials/", {"format": "xlsx", "all_results": "true", "team_id": self.team.pk}
+		)
+
+		self.assertTrue(response.streaming)
+		self.assertIn(".xlsx", response["Content-Disposition"])
+		wb = self._workbook(response)
+		self.assertEqual(wb.sheetnames, ["Trials", "Glossary", "Registries"])
+		headers, rows = self._rows(wb["Trials"])
+		self.assertIn("id_nct", headers)
+		titles = {row[headers.index("title")] for row in rows}
+		self.assertEqual(titles, {f"XLSX Trial {i}" for i in range(5)})
+
+	def test_filters_and_pagination_apply(self):
+		response = self.client.get(
+			"/trials/",
+			{
+				"format": "xlsx",
+				"team_id": self.team.pk,
+				"recruitment_status": "Recruiting",
+			},
+		)
+		headers, rows = self._rows(self._workbook(response)["Trials"])
+		self.assertEqual(len(rows), 2)
+
+		response = self.client.get(
+			"/trials/", {"format": "xlsx", "team_id": self.team.pk, "page_size": 2}
+		)
+		headers, rows = self._rows(self._workbook(response)["Trials"])
+		self.assertEqual(len(rows), 2)
+
+	def test_only_serializer_fields_are_exported(self):
+		response = self.client.get(
+			"/trials/", {"format": "xlsx", "all_results": "true", "team_id": self.team.pk}
+		)
+		wb = self._workbook(response)
+		headers, rows = self._rows(wb["Trials"])
+
+		for hidden in ("contact_email", "contact_firstname", "subjects", "teams"):
+			self.assertNotIn(hidden, headers)
+		cells = {str(value) for row in rows for value in row if value is not None}
+		self.assertFalse(any("contact0@example.com" in value for value in cells))
+		# The Glossary documents exactly the exported columns.
+		self.assertEqual(wb["Glossary"].max_row - 1, len(headers))
+
+	def test_other_organisations_team_categories_are_not_exported(self):
+		private_org = Organization.objects.create(
+			name="XLSX Private Org", slug="xlsx-private-org"
+		)
+		OrganizationApiSettings.objects.filter(organization=private_org).update(
+			make_api_public=False
+		)
+		private_team = Team.objects.create(
+			name="XLSX Private Team", slug="xlsx-private-team", organization=private_org
+		)
+		visible = TeamCategory.objects.create(
+			team=self.team, category_name="Visible Category", category_slug="visible-cat"
+		)
+		hidden = TeamCategory.objects.create(
+			team=private_team, category_name="Hidden Category", category_slug="hidden-cat"
+		)
+		shared = self.trials[0]
+		shared.teams.add(private_team)
+		shared.team_categories.add(visible, hidden)
+
+		response = self.client.get(
+			"/trials/", {"format": "xlsx", "all_results": "true", "team_id": self.team.pk}
+		)
+		headers, rows = self._rows(self._workbook(response)["Trials"])
+
+		row = next(r for r in rows if r[headers.index("title")] == shared.title)
+		self.assertEqual(row[headers.index("team_categories")], "Visible Category")
+		cells = {str(value) for r in rows for value in r if value is not None}
+		self.assertFalse(any("Hidden Category" in value for value in cells))
+
+	def test_detail_renders_one_row_workbook(self):
+		trial = self.trials[0]
+		response = self.client.get(f"/trials/{trial.pk}/", {"format": "xlsx"})
+
+		headers, rows = self._rows(self._workbook(response).active)
+		self.assertEqual(len(rows), 1)
+		self.assertEqual(rows[0][headers.index("title")], "XLSX Trial 0")
+
+	def test_json_list_unaffected(self):
+		response = self.client.get("/trials/", {"team_id": self.team.pk})
+
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(response.data["count"], 5)
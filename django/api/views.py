@@ -47,8 +47,12 @@ from api.pagination import (
 	TrialSitePagination,
 	request_bypasses_pagination,
 )
+from api.conditional import ConditionalGetMixin, conditional_payload_response
+from api.csv_export import ArticleCSVExporter, TrialCSVExporter
 from api.direct_streaming import (
+	XLSX_MEDIA_TYPE,
 	DirectStreamingCSVRenderer,
+	XLSXRenderer,
 	csv_header_fields,
 	stream_csv,
 )
@@ -66,8 +70,9 @@ from django.db.models import (
 	Value,
 	When,
 	IntegerField,
+	Window,
 )
-from django.db.models.functions import Coalesce, ExtractYear
+from django.db.models.functions import Coalesce, ExtractYear, RowNumber
 from gregory.classes import SciencePaper, ClinicalTrial
 from gregory.utils.trial_field_normalizers import (
 	SponsorType,
@@ -100,6 +105,7 @@ from organizations.models import Organization
 from rest_framework import permissions, viewsets, generics, filters, status
 from rest_framework.decorators import api_view, action
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from rest_framework.throttling import ScopedRateThrottle
 from django_filters import rest_framework as django_filters
 from api.filters import (
@@ -112,7 +118,7 @@ from api.filters import (
 	SponsorFilter,
 )
 from rest_framework.response import Response
-from django.http import Http404, StreamingHttpResponse
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from drf_spectacular.utils import (
@@ -132,18 +138,24 @@ from api.schema_serializers import (
 import hashlib
 import json
 import logging
+import tempfile
 import traceback
 from django.utils.dateparse import parse_date
 from django.utils.timezone import now as tz_now
 
-from api.serializers.mixins import _resolve_per_org_fields_org
+from api.serializers.mixins import (
+	_request_visible_team_ids,
+	_resolve_per_org_fields_org,
+)
 from api.utils.utils import (
 	checkValidAccess,
 	getAPIKey,
 	getIPAddress,
 	find_trial_by_identifier,
 )
+from gregory.utils.author_counts import article_count_expression
 from gregory.utils.registry_utils import merge_links
+from gregory.utils.trials_xlsx import data_columns, identifier_keys, write_trials_xlsx
 from api.models import APIAccessSchemeLog
 from api.utils.exceptions import (
 	APIAccessDeniedError,
@@ -189,9 +201,16 @@ class CSVStreamingMixin:
 	queryset: rows are serialized chunk_size at a time inside a generator
 	(prefetch_related batches per chunk via .iterator()), so memory stays
 	flat regardless of corpus size and the first byte leaves immediately.
+
+	With csv_exporter_class set (api/csv_export.py), unpaginated exports
+	(?all_results=true) skip the serializer: the queryset is streamed as
+	primary keys and each batch's rows are built from values() queries.
+	Paginated pages keep the serializer path, their instances are already
+	loaded.
 	"""
 
 	csv_stream_chunk_size = 2000
+	csv_exporter_class = None
 
 	def list(self, request, *args, **kwargs):
 		if request.query_params.get("format", "").lower() != "csv":
@@ -207,6 +226,11 @@ class CSVStreamingMixin:
 		def serialize_batch(batch):
 			return self.get_serializer(batch, many=True).data
 
+		if page is None and self.csv_exporter_class is not None:
+			exporter = self.csv_exporter_class(header_serializer, header_fields, request)
+			source = queryset.prefetch_related(None).values_list("pk", flat=True)
+			serialize_batch = exporter.serialize_batch
+
 		filename = DirectStreamingCSVRenderer().get_filename({"request": request})
 		response = StreamingHttpResponse(
 			stream_csv(source, serialize_batch, header_fields, self.csv_stream_chunk_size),
@@ -243,6 +267,80 @@ class CSVStreamingMixin:
 		return response
 
 
+class TrialXLSXExportMixin:
+	"""
+	Viewset mixin that serves ``?format=xlsx`` list responses from the
+	write-only trials exporter (gregory/utils/trials_xlsx.py), the same engine
+	as the export_trials_xlsx command.
+
+	Like CSVStreamingMixin it intercepts list() before DRF serializes the
+	queryset. The workbook is written to a temporary file while trials arrive
+	in batches (.iterator() with per-batch prefetch), then streamed from disk,
+	so memory stays bounded however many trials match. Only columns backed by
+	a serializer field are exported: the workbook must not carry fields the
+	JSON and CSV responses hide, such as the trial contact details.
+	"""
+
+	renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, XLSXRenderer]
+	xlsx_sheet_title = "Trials"
+	# Exporter columns derived from the serializer's identifiers and sponsor fields.
+	xlsx_derived_columns = frozenset(
+		{
+			"identifiers_json",
+			"sponsor_id",
+			"sponsor_slug",
+			"primary_sponsor_normalized",
+			"sponsor_type_normalized",
+		}
+	)
+
+	def get_xlsx_columns(self, source):
+		allowed = set(self.get_serializer_class().Meta.fields) | self.xlsx_derived_columns
+		return [
+			column
+			for column in data_columns(identifier_keys(source))
+			if column in allowed or column.startswith("id_")
+		]
+
+	def list(self, request, *args, **kwargs):
+		if request.query_params.get("format", "").lower() != "xlsx":
+			return super().list(request, *args, **kwargs)
+
+		queryset = self.filter_queryset(self.get_queryset())
+		page = self.paginate_queryset(queryset)
+		source = page if page is not None else queryset
+
+		# Other organisations' teams, subjects and team categories stay out of
+		# the workbook, as they do in the JSON and CSV responses.
+		visible_org_ids = getattr(request, "visible_org_ids", None)
+		visible_team_ids = None
+		if visible_org_ids is not None:
+			visible_team_ids = _request_visible_team_ids(request, visible_org_ids)
+
+		output = tempfile.TemporaryFile()
+		try:
+			write_trials_xlsx(
+				output,
+				source,
+				columns=self.get_xlsx_columns(source),
+				sheet_title=self.xlsx_sheet_title,
+				visible_team_ids=visible_team_ids,
+			)
+		except Exception:
+			output.close()
+			raise
+		output.seek(0)
+
+		filename = DirectStreamingCSVRenderer().get_filename({"request": request})
+		# FileResponse streams the file in blocks and closes it when done.
+		return FileResponse(
+			output,
+			as_attachment=True,
+			filename=filename.replace(".csv", ".xlsx"),
+			content_type=XLSX_MEDIA_TYPE,
+		)
+
+
 class BulkExportThrottleMixin:
 	"""
 	Applies a scoped throttle only when the request bypasses pagination
@@ -475,12 +573,12 @@ class CachedStatsActionMixin:
 		cache_key = self._stats_cache_key(request)
 		cached = cache.get(cache_key)
 		if cached is not None:
-			return Response(cached)
+			return conditional_payload_response(request, cached)
 
 		filtered_qs = self.filter_queryset(self.get_queryset())
 		payload = self.build_stats_payload(filtered_qs)
 		cache.set(cache_key, payload, settings.STATS_CACHE_TTL)
-		return Response(payload)
+		return conditional_payload_response(request, payload)
 
 	def _by_subject_counts(self, filtered_qs):
 		"""``[{"subject_id", "subject_name", "count"}]`` over *filtered_qs*.
@@ -1459,6 +1557,7 @@ _ARTICLES_ORDERING_PARAM = _ordering_param(
 	retrieve=extend_schema(auth=_OPTIONAL_API_KEY_SECURITY),
 )
 class ArticleViewSet(
+	ConditionalGetMixin,
 	BulkExportThrottleMixin,
 	CSVStreamingMixin,
 	OrgVisibilityMixin,
@@ -1566,6 +1665,7 @@ class ArticleViewSet(
 		),
 	).order_by("-discovery_date")
 	serializer_class = ArticleSerializer
+	csv_exporter_class = ArticleCSVExporter
 	permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 	pagination_class = FlexiblePagination
 	# NOTE: `search` is handled solely by ArticleFilter.filter_search (boolean
@@ -1741,6 +1841,66 @@ def _category_authors_count_subquery():
 	)
 
 
+def _category_authors_counts(category_ids):
+	"""Distinct author count of each category in *category_ids*, in one
+	grouped query (the batched form of _category_authors_count_subquery).
+	Categories without authored articles are absent from the result."""
+	return dict(
+		ArticleCategoryAssignment.objects.filter(teamcategory_id__in=category_ids)
+		.order_by()
+		.values("teamcategory")
+		.annotate(c=Count("articles__authors", distinct=True))
+		.values_list("teamcategory", "c")
+	)
+
+
+# The Authors fields CategoryTopAuthorSerializer renders, read straight off
+# the ranking query.
+_TOP_AUTHOR_FIELDS = ("author_id", "given_name", "family_name", "full_name", "ORCID", "country")
+
+
+def _category_top_authors(category_ids, max_authors, date_filters):
+	"""
+	The top *max_authors* authors of each category in *category_ids*, by
+	number of the category's articles (narrowed by *date_filters*, keyed as
+	in CategoryViewSet._build_date_filters) they authored.
+
+	One windowed query ranks the (category, author) article counts with
+	ROW_NUMBER() OVER (PARTITION BY category), keeps the first *max_authors*
+	rows of each partition and carries the author fields the serializer
+	needs. Returns {category_id: [Authors with category_articles_count set]},
+	each list ordered by count, then author_id.
+	"""
+	author_fields = {
+		name: F(f"articles__authors__{name}") for name in _TOP_AUTHOR_FIELDS
+	}
+	ranked = (
+		ArticleCategoryAssignment.objects.filter(
+			teamcategory_id__in=category_ids,
+			articles__authors__isnull=False,
+			**date_filters,
+		)
+		.order_by()
+		.values("teamcategory", **author_fields)
+		.annotate(n=Count("articles", distinct=True))
+		.annotate(
+			rank=Window(
+				RowNumber(),
+				partition_by=F("teamcategory"),
+				order_by=[F("n").desc(), F("author_id").asc()],
+			)
+		)
+		.filter(rank__lte=max_authors)
+	)
+
+	top_authors = {}
+	for row in sorted(ranked, key=lambda row: (row["teamcategory"], row["rank"])):
+		author = Authors(**{name: row[name] for name in _TOP_AUTHOR_FIELDS})
+		author.category_articles_count = row["n"]
+		top_authors.setdefault(row["teamcategory"], []).append(author)
+	return top_authors
+
+
 _CATEGORIES_LIST_PARAMS = [
 	OpenApiParameter(
 		"get_categories",
@@ -1858,7 +2018,7 @@ _CATEGORY_AUTHORS_ACTION_PARAMS = [
 	list=extend_schema(parameters=_CATEGORIES_LIST_PARAMS + [_CATEGORIES_ORDERING_PARAM]),
 	authors=extend_schema(parameters=_CATEGORY_AUTHORS_ACTION_PARAMS),
 )
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
 	"""
 	List all categories in the database with optional filters for team and subject.
 	Now includes author statistics for each category.
@@ -1893,6 +2053,9 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
 	- Monthly counts (when monthly_counts=true), including monthly_relevant_article_counts:
 	  articles whose latest prediction from at least one ML model meets ml_threshold,
 	  counted once per month regardless of how many models flagged them
+	  Monthly counts are read from daily rollups that the pipeline refreshes
+	  (`refresh_rollups`), so content added since the last run shows up after
+	  the next one. Thresholds off the 0.05 grid are computed live.
 
 	# Additional Actions:
 	- `/categories/{id}/authors/` - Get detailed author statistics for a specific category
@@ -1925,6 +2088,11 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
 		"authors_count_annotated",
 	]
 	ordering = ["category_name"]
+	# Categories carry no timestamp of their own; what the list shows moves
+	# with the articles and trials assigned to them.
+	conditional_timestamp_field = None
+	conditional_dependencies = ((Articles, "last_updated"), (Trials, "last_updated"))
+	conditional_per_org_fields = False
 
 	def get_queryset(self):
 		"""
@@ -2034,6 +2202,45 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
 			for term in raw.split(",")
 		)
 
+	def list(self, request, *args, **kwargs):
+		queryset = self.filter_queryset(self.get_queryset())
+		return self._conditional(request, queryset, self._list_page, *args, **kwargs)
+
+	def _list_page(self, request, *args, **kwargs):
+		"""
+		Compute authors_count and top_authors for the whole page up front
+		(see _category_authors_counts and _category_top_authors) instead of
+		letting the serializer run one aggregate of each per category: two or
+		three queries per page whatever its size. Detail requests still go
+		through the serializer's per-category fallback.
+		"""
+		queryset = self.filter_queryset(self.get_queryset())
+		page = self.paginate_queryset(queryset)
+		target = page if page is not None else list(queryset)
+
+		if target:
+			category_ids = [category.pk for category in target]
+			if not hasattr(target[0], "authors_count_annotated"):
+				counts = _category_authors_counts(category_ids)
+				for category in target:
+					category.authors_count_annotated = counts.get(category.pk, 0)
+
+			author_params = self.get_serializer_context()["author_params"]
+			if author_params["include_authors"]:
+				top_authors = _category_top_authors(
+					category_ids,
+					author_params["max_authors"],
+					author_params["date_filters"],
+				)
+				for category in target:
+					category.top_authors_batched = top_authors.get(category.pk, [])
+
+		if page is not None:
+			serializer = self.get_serializer(page, many=True)
+			return self.get_paginated_response(serializer.data)
+		serializer = self.get_serializer(target, many=True)
+		return Response(serializer.data)
+
 	def get_serializer_context(self):
 		"""Add author parameters to serializer context"""
 		context = super().get_serializer_context()
@@ -2248,7 +2455,9 @@ _TRIALS_ORDERING_PARAM = _ordering_param(
 	retrieve=extend_schema(auth=_OPTIONAL_API_KEY_SECURITY),
 )
 class TrialViewSet(
+	ConditionalGetMixin,
 	BulkExportThrottleMixin,
+	TrialXLSXExportMixin,
 	CSVStreamingMixin,
 	OrgVisibilityMixin,
 	CachedStatsActionMixin,
@@ -2256,7 +2465,8 @@ class TrialViewSet(
 ):
 	"""
 	List all clinical trials by discovery date with comprehensive filtering options.
-	CSV responses are automatically streamed for better performance with large datasets.
+	CSV responses are automatically streamed for better performance with large datasets;
+	`?format=xlsx` returns the same trials as an Excel workbook (see TrialXLSXExportMixin).
 
 	# Core Query Parameters:
 	- **trial_id** - filter by specific trial ID
@@ -2425,6 +2635,7 @@ class TrialViewSet(
 
 	# Examples:
 	- All trials as CSV: `/trials/?format=csv&all_results=true`
+	- All trials as XLSX: `/trials/?format=xlsx&all_results=true`
 	- Multi-subject OR: `/trials/?subjects_any=1,2`
 	- Filtered trials: `/trials/?team_id=1&status=Recruiting&format=csv&all_results=true`
 	- Trials with results posted: `/trials/?has_results=true`
@@ -2435,6 +2646,7 @@ class TrialViewSet(
 
 	queryset = Trials.objects.all().order_by("-discovery_date")
 	serializer_class = TrialSerializer
+	csv_exporter_class = TrialCSVExporter
 	permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 	pagination_class = FlexiblePagination
 	# `search` is handled solely by TrialFilter.filter_search (boolean parser);
@@ -2960,20 +3172,11 @@ def author_articles_count_subquery(visible_org_ids=None, relevant_only=False):
 	A plain ``Count("articles", ...)`` annotation is corrupted whenever the
 	outer queryset already filters across the ``articles__`` join (Django
 	computes the aggregate over the same constrained join). A subquery avoids
-	that trap entirely.
+	that trap entirely. Scoped to the caller's organisations it reads the
+	stored per-organisation counts (gregory.models.AuthorArticleCounts) rather
+	than counting the author's articles per row.
 	"""
-	articles = Articles.objects.filter(authors__author_id=OuterRef("author_id"))
-	if relevant_only:
-		articles = articles.filter(relevant=True)
-	if visible_org_ids is not None:
-		articles = articles.filter(teams__organization_id__in=visible_org_ids)
-	counts = (
-		articles.order_by()
-		.values("authors__author_id")
-		.annotate(n=Count("article_id", distinct=True))
-		.values("n")[:1]
-	)
-	return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+	return article_count_expression(visible_org_ids, relevant_only=relevant_only)
 
 
 _AUTHOR_ID_PATH_PARAM = OpenApiParameter(
@@ -3293,8 +3496,13 @@ class AuthorsViewSet(viewsets.ReadOnlyModelViewSet):
 					article_count=Count("articles", filter=combined_q, distinct=True)
 				).filter(article_count__gt=0)
 			elif has_org_scope:
+				# Unfiltered counts are the stored per-organisation ones, so
+				# sorting the whole table no longer aggregates the articles
+				# join per author.
 				queryset = queryset.annotate(
-					article_count=Count("articles", filter=org_q, distinct=True)
+					article_count=author_articles_count_subquery(
+						self.request.visible_org_ids
+					)
 				)
 			else:
 				queryset = queryset.annotate(
@@ -3657,6 +3865,7 @@ class ArticleSearchView(
 	"""
 
 	serializer_class = ArticleSerializer
+	csv_exporter_class = ArticleCSVExporter
 	permission_classes = [
 		permissions.AllowAny
 	]  # Allow access to anyone since we require team_id and subject_id
@@ -3896,6 +4105,7 @@ class TrialSearchView(
 	"""
 
 	serializer_class = TrialSerializer
+	csv_exporter_class = TrialCSVExporter
 	permission_classes = [
 		permissions.AllowAny
 	]  # Allow access to anyone since we require team_id and subject_id
@@ -4483,7 +4693,7 @@ class StatsView(APIView):
 		)
 		cached = cache.get(cache_key)
 		if cached is not None:
-			return Response(cached)
+			return conditional_payload_response(request, cached)
 
 		# --- Counts (single join per queryset) --------------------------
 		if fully_unscoped and not apply_subject:
@@ -4660,7 +4870,7 @@ class StatsView(APIView):
 			"by_subject": by_subject,
 		}
 		cache.set(cache_key, payload, settings.STATS_CACHE_TTL)
-		return Response(payload)
+		return conditional_payload_response(request, payload)
 
 	@staticmethod
 	def _subject_counts(model, subject_ids, team_id_list, count_field=None):
@@ -26,6 +26,7 @@ from .models import (
 	Articles,
 	Trials,
 	Sources,
+	SourceStats,
 	Entities,
 	Authors,
 	Subject,
@@ -49,6 +50,7 @@ from .models import (
 	SponsorMergeCandidate,
 	SponsorMergeCandidateStatus,
 	default_match_weights,
+	health_from_last_date,
 )
 from .utils.sponsor_merge import merge_sponsors
 from .widgets import MLPredictionsWidget
@@ -1728,8 +1730,12 @@ class SourceAdmin(OrganizationFilterMixin, ReassignToTeamMixin, admin.ModelAdmin
 		"subject",
 		"last_article_date",
 		"article_count",
+		"ingest_rate",
 		"health_status_indicator",
 	]
+	# Last content, counts and health read the SourceStats row joined here,
+	# instead of several aggregate queries per listed source.
+	list_select_related = ("stats", "subject")
 	list_filter = [
 		"active",
 		"source_for",
@@ -1812,36 +1818,49 @@ class SourceAdmin(OrganizationFilterMixin, ReassignToTeamMixin, admin.ModelAdmin
 				f"Feedreaders will skip team association for content from this source.",
 			)
 
+	def _stats(self, obj):
+		"""The source's SourceStats row (joined by list_select_related), or None
+		for a source no feedreader run or rebuild_source_stats has reached yet."""
+		try:
+			return obj.stats
+		except SourceStats.DoesNotExist:
+			return None
+
 	def last_article_date(self, obj):
 		"""Display the date of the latest article or trial from this source."""
-		if obj.source_for == "trials":
-			latest_date = obj.get_latest_trial_date()
-			if latest_date:
-				days_since = (timezone.now() - latest_date).days
-				return f"{latest_date.strftime('%Y-%m-%d')} ({days_since} days ago)"
-			return "No trials"
-		else:
-			latest_date = obj.get_latest_article_date()
-			if latest_date:
-				days_since = (timezone.now() - latest_date).days
-				return f"{latest_date.strftime('%Y-%m-%d')} ({days_since} days ago)"
-			return "No articles"
+		stats = self._stats(obj)
+		latest_date = stats.last_item_date if stats else None
+		if latest_date:
+			days_since = (timezone.now() - latest_date).days
+			return f"{latest_date.strftime('%Y-%m-%d')} ({days_since} days ago)"
+		return "No trials" if obj.source_for == "trials" else "No articles"
 
 	last_article_date.short_description = "Last Content"
 	last_article_date.short_description = "Last Article"
+	last_article_date.admin_order_field = "stats__last_item_date"
 
 	def article_count(self, obj):
 		"""Display the count of articles or trials from this source."""
-		if obj.source_for == "trials":
-			return obj.get_trial_count()
-		else:
-			return obj.get_article_count()
+		stats = self._stats(obj)
+		return stats.item_count if stats else 0
 
 	article_count.short_description = "Content Count"
+	article_count.admin_order_field = "stats__item_count"
+
+	def ingest_rate(self, obj):
+		"""Items discovered per day over the last 7 and 30 days."""
+		stats = self._stats(obj)
+		if not stats:
+			return "-"
+		return f"{stats.items_per_day_7}/day (7d), {stats.items_per_day_30}/day (30d)"
+
+	ingest_rate.short_description = "Ingest Rate"
+	ingest_rate.admin_order_field = "stats__items_last_30_days"
 
 	def health_status_indicator(self, obj):
 		"""Display a visual indicator of the source's health status."""
-		status = obj.get_health_status()
+		stats = self._stats(obj)
+		status = health_from_last_date(obj.active, stats.last_item_date if stats else None)
 
 		if status == "healthy":
 			return format_html(
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.utils import timezone
 import datetime
 
+from gregory.utils.source_stats import filter_by_health
+
 
 class DateRangeFilter(admin.SimpleListFilter):
 	"""
@@ -81,66 +83,11 @@ class SourceHealthFilter(admin.SimpleListFilter):
 
 	def queryset(self, request, queryset):
 		"""
-		Filters the queryset based on the selected health status.
-		Uses the same logic for both article and trial sources.
+		Filters the queryset based on the selected health status, in SQL from
+		the SourceStats rows (see gregory.utils.source_stats) rather than by
+		aggregating every source's articles or trials in a loop.
 		"""
-		if self.value() == "healthy":
-			thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
-			source_ids = []
-			for source in queryset:
-				if source.active:
-					if source.source_for == "trials":
-						latest_date = source.get_latest_trial_date()
-					else:
-						latest_date = source.get_latest_article_date()
-
-					if latest_date and latest_date >= thirty_days_ago:
-						source_ids.append(source.source_id)
-			return queryset.filter(source_id__in=source_ids)
-
-		elif self.value() == "warning":
-			thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
-			sixty_days_ago = timezone.now() - datetime.timedelta(days=60)
-			source_ids = []
-			for source in queryset:
-				if source.active:
-					if source.source_for == "trials":
-						latest_date = source.get_latest_trial_date()
-					else:
-						latest_date = source.get_latest_article_date()
-
-					if latest_date and sixty_days_ago <= latest_date < thirty_days_ago:
-						source_ids.append(source.source_id)
-			return queryset.filter(source_id__in=source_ids)
-
-		elif self.value() == "error":
-			sixty_days_ago = timezone.now() - datetime.timedelta(days=60)
-			source_ids = []
-			for source in queryset:
-				if source.active:
-					if source.source_for == "trials":
-						latest_date = source.get_latest_trial_date()
-					else:
-						latest_date = source.get_latest_article_date()
-
-					if latest_date and latest_date < sixty_days_ago:
-						source_ids.append(source.source_id)
-			return queryset.filter(source_id__in=source_ids)
-
-		elif self.value() == "inactive":
-			return queryset.filter(active=False)
-
-		elif self.value() == "no_content":
-			source_ids = []
-			for source in queryset:
-				if source.active:
-					if source.source_for == "trials":
-						has_content = source.trials_set.exists()
-					else:
-						has_content = source.articles_set.exists()
-
-					if not has_content:
-						source_ids.append(source.source_id)
-			return queryset.filter(source_id__in=source_ids)
+		if self.value():
+			return filter_by_health(queryset, self.value())
 
 		return queryset
@@ -3,7 +3,7 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse
 from django.core.paginator import Paginator
 from django.utils.html import mark_safe
-from django.db.models import Q, Count
+from django.db.models import Q, F, Count, Sum
 from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
 from django.contrib import messages
 from django.utils.dateparse import parse_date
@@ -15,10 +15,15 @@ from .models import (
 	Subject,
 	ArticleSubjectRelevance,
 	MLPredictions,
+	ContentDailyRollup,
+	RollupScope,
 	Sources,
+	SourceStats,
 	Trials,
 	Team,
+	health_from_last_date,
 )
+from .utils.source_stats import filter_by_health
 import json
 from datetime import timedelta, date
 
@@ -435,7 +440,11 @@ def source_detail_view(request, source_id):
 
 	days_since = (timezone.now().date() - last_date).days if last_date else None
 
-	health_status = source.get_health_status()
+	stats = _source_stats(source)
+	if stats:
+		health_status = health_from_last_date(source.active, stats.last_item_date)
+	else:
+		health_status = source.get_health_status()
 	status_config = {
 		"healthy": {"label": "Healthy", "color": "#16a34a"},
 		"warning": {"label": "Warning", "color": "#f59e0b"},
@@ -511,35 +520,12 @@ STATUS_CONFIG = {
 }
 
 
-def _annotate_sources(qs):
-	"""Annotate a Sources queryset with last_content_date and content_count."""
-	from django.db.models import Max, Count
-
-	return qs.annotate(
-		last_article_date_ann=Max("articles__published_date"),
-		article_count_ann=Count("articles", distinct=True),
-		last_trial_date_ann=Max("trials__last_updated"),
-		trial_count_ann=Count("trials", distinct=True),
-	)
-
-
-def _health_from_source(source):
-	"""Compute health status for an annotated source row without extra queries."""
-	if not source.active:
-		return "inactive"
-	now = timezone.now()
-	if source.source_for == "trials":
-		last_date = source.last_trial_date_ann
-	else:
-		last_date = source.last_article_date_ann
-	if not last_date:
-		return "no_content"
-	days = (now - last_date).days
-	if days > 60:
-		return "error"
-	elif days > 30:
-		return "warning"
-	return "healthy"
+def _source_stats(source):
+	"""The SourceStats row of a source (select_related("stats")), or None."""
+	try:
+		return source.stats
+	except SourceStats.DoesNotExist:
+		return None
 
 
 @staff_member_required
@@ -665,25 +651,21 @@ def sources_overview_view(request):
 			| Q(keyword_filter__icontains=f_q)
 		)
 
-	qs = _annotate_sources(qs).select_related("team", "subject").order_by("name")
-
-	# Health filter is applied in-Python after annotation (same logic as SourceHealthFilter)
+	# Health, last content and counts come from the SourceStats row joined
+	# here (see gregory.utils.source_stats), so the health filter runs in SQL
+	# and the page costs one query however many sources it lists.
 	if f_health:
-		qs = [s for s in qs if _health_from_source(s) == f_health]
-	else:
-		qs = list(qs)
+		qs = filter_by_health(qs, f_health)
+	qs = list(qs.select_related("team", "subject", "stats").order_by("name"))
 
-	# Attach computed health to each source row
 	for s in qs:
-		h = _health_from_source(s)
+		stats = _source_stats(s)
+		s.last_content = stats.last_item_date if stats else None
+		s.content_count = stats.item_count if stats else 0
+		s.items_per_day = stats.items_per_day_7 if stats else 0
+		h = health_from_last_date(s.active, s.last_content)
 		s.health = h
 		s.health_info = STATUS_CONFIG.get(h, STATUS_CONFIG["no_content"])
-		if s.source_for == "trials":
-			s.last_content = s.last_trial_date_ann
-			s.content_count = s.trial_count_ann
-		else:
-			s.last_content = s.last_article_date_ann
-			s.content_count = s.article_count_ann
 
 	# ── Pagination ─────────────────────────────────────────────────────────
 	paginator = Paginator(qs, 50)
@@ -902,66 +884,89 @@ def subject_analytics_data(request):
 			else:
 				d = date(d.year, d.month + 1, 1)
 
-	def _build_series(qs, date_field):
-		counts = (
-			qs.annotate(period=trunc_fn(date_field))
-			.values("period")
-			.annotate(count=Count("pk", distinct=True))
-			.order_by("period")
-		)
-		lookup = {}
-		for item in counts:
-			p = item["period"]
-			if not p:
-				continue
-			if hasattr(p, "date"):
-				p = p.date()
-			lookup[p] = item["count"]
-		return [lookup.get(p, 0) for p in period_range]
-
-	# Scope: org → team → subject
+	# Scope: org → team → subject. The series are summed from the daily
+	# rollups (gregory.utils.rollups) of the narrowest scope asked for, a
+	# range scan over one row per day instead of a distinct count through the
+	# teams/subjects joins.
 	org_ids = _get_scoped_org_ids_for_user(request)
 
-	articles_qs = Articles.objects.filter(
-		published_date__date__gte=start_date,
-		published_date__date__lte=end_date,
-	)
-	trials_qs = Trials.objects.filter(
-		discovery_date__date__gte=start_date,
-		discovery_date__date__lte=end_date,
-	)
-
-	if org_ids is not None:
-		articles_qs = articles_qs.filter(teams__organization__id__in=org_ids)
-		trials_qs = trials_qs.filter(teams__organization__id__in=org_ids)
-
-	if team_param:
-		try:
-			tid = int(team_param)
-			articles_qs = articles_qs.filter(teams__id=tid)
-			trials_qs = trials_qs.filter(teams__id=tid)
-		except (ValueError, TypeError):
-			pass
-
-	if subject_param:
+	def _int_param(value):
 		try:
-			sid = int(subject_param)
-			articles_qs = articles_qs.filter(subjects__id=sid)
-			trials_qs = trials_qs.filter(subjects__id=sid)
+			return int(value) if value else None
 		except (ValueError, TypeError):
-			pass
-
-	articles_qs = articles_qs.distinct()
-	trials_qs = trials_qs.distinct()
+			return None
+
+	tid = _int_param(team_param)
+	sid = _int_param(subject_param)
+
+	if sid is None and tid is None and org_ids is not None and len(org_ids) > 1:
+		# Organisation rows can't be summed across organisations: an article
+		# on teams of two of them is in both rows. Count distinct items live,
+		# as the dashboard did before the rollups, for the staff who see
+		# several organisations at once.
+		def _live_series(model, date_field):
+			counts = (
+				model.objects.filter(
+					**{
+						f"{date_field}__date__gte": start_date,
+						f"{date_field}__date__lte": end_date,
+					},
+					teams__organization__id__in=org_ids,
+				)
+				.annotate(period=trunc_fn(date_field))
+				.values("period")
+				.annotate(count=Count("pk", distinct=True))
+				.order_by("period")
+			)
+			lookup = {}
+			for item in counts:
+				period = item["period"]
+				if hasattr(period, "date"):
+					period = period.date()
+				lookup[period] = item["count"]
+			return [lookup.get(p, 0) for p in period_range]
+
+		articles_data = _live_series(Articles, "published_date")
+		trials_data = _live_series(Trials, "discovery_date")
+		return _analytics_response(period_range, date_fmt, articles_data, trials_data)
+
+	rollups = ContentDailyRollup.objects.filter(day__gte=start_date, day__lte=end_date)
+	if sid is not None:
+		rollups = rollups.filter(scope=RollupScope.SUBJECT, subject_id=sid)
+		if tid is not None:
+			rollups = rollups.filter(team_id=tid)
+		if org_ids is not None:
+			rollups = rollups.filter(team__organization__id__in=org_ids)
+	elif tid is not None:
+		rollups = rollups.filter(scope=RollupScope.TEAM, team_id=tid)
+		if org_ids is not None:
+			rollups = rollups.filter(team__organization__id__in=org_ids)
+	elif org_ids is not None:
+		rollups = rollups.filter(
+			scope=RollupScope.ORGANIZATION, organization_id__in=org_ids
+		)
+	else:
+		rollups = rollups.filter(scope=RollupScope.ALL)
 
-	articles_data = _build_series(articles_qs, "published_date")
-	trials_data = _build_series(trials_qs, "discovery_date")
+	if trunc_fn is TruncDate:
+		rollups = rollups.values(period=F("day"))
+	else:
+		rollups = rollups.annotate(period=trunc_fn("day")).values("period")
+	lookup = {
+		item["period"]: item
+		for item in rollups.annotate(
+			articles=Sum("articles"), trials=Sum("trials")
+		).order_by("period")
+	}
+	articles_data = [lookup.get(p, {}).get("articles", 0) for p in period_range]
+	trials_data = [lookup.get(p, {}).get("trials", 0) for p in period_range]
+	return _analytics_response(period_range, date_fmt, articles_data, trials_data)
 
-	labels = [p.strftime(date_fmt) for p in period_range]
 
+def _analytics_response(period_range, date_fmt, articles_data, trials_data):
 	return JsonResponse(
 		{
-			"labels": labels,
+			"labels": [p.strftime(date_fmt) for p in period_range],
 			"articles": articles_data,
 			"trials": trials_data,
 			"totals": {
@@ -31,6 +31,7 @@ class SciencePaper:
 		# refresh(), for callers that need to inspect fields refresh() doesn't
 		# expose as attributes (e.g. date precision in crossref_refresh.py).
 		self._work = None
+		self.crossref_error = None
 
 	def __str__(self):
 		return f"{self.doi}, {self.title}"
@@ -60,7 +61,15 @@ class SciencePaper:
 		else:
 			logging.warning("no url found")
 
-	def refresh(self):
+	def refresh(self, site=None):
+		"""Fill the paper's missing fields from CrossRef and Unpaywall.
+
+		Returns None, or an error string on a failed CrossRef lookup (see
+		is_crossref_failed); a non-404 HTTP error is also kept on
+		``crossref_error`` for callers that pace themselves on it. *site* is
+		the CustomSetting to take the API etiquette from, looked up when
+		omitted.
+		"""
 		from gregory.unpaywall import unpaywall_utils
 		from crossref.restful import Works, Etiquette
 		import os
@@ -72,11 +81,13 @@ class SciencePaper:
 		timezone = pytz.timezone("UTC")
 		from sitesettings.models import CustomSetting
 
-		site = CustomSetting.objects.get(site__domain=os.environ.get("DOMAIN_NAME"))
+		if site is None:
+			site = CustomSetting.objects.get(site__domain=os.environ.get("DOMAIN_NAME"))
 		client_website = "https://" + site.site.domain + "/"
 		my_etiquette = Etiquette(site.title, "v8", client_website, site.admin_email)
 		works = Works(etiquette=my_etiquette)
 		work = None
+		self.crossref_error = None
 
 		if self.doi != None:
 			try:
@@ -87,6 +98,7 @@ class SciencePaper:
 					return "DOI not found"
 				else:
 					logging.error(f"CrossRef HTTP error for DOI {self.doi}: {e}")
+					self.crossref_error = e
 					return f"CrossRef HTTP error: {e}"
 			except json.JSONDecodeError as e:
 				logging.error(
@@ -594,6 +606,14 @@ class ClinicalTrialsGovAPI:
 		"""
 		Search and iterate through all pages of results.
 
+		The next page is requested on a background thread as soon as the
+		current one arrives, so its round trip overlaps with the caller
+		processing the current page instead of following it. Only one request
+		is ever in flight (the next page token comes from the previous
+		response), and no page past *max_results* is requested. A failed
+		page request raises when the caller reaches that page, exactly as
+		the sequential loop did.
+
 		Args:
 			max_results: Maximum number of results to return (None for all)
 			**search_kwargs: All parameters accepted by search()
@@ -601,25 +621,34 @@ class ClinicalTrialsGovAPI:
 		Yields:
 			dict: Individual study records
 		"""
-		count = 0
-		page_token = None
+		from concurrent.futures import ThreadPoolExecutor
 
-		while True:
-			results = self.search(page_token=page_token, **search_kwargs)
-
-			studies = results.get("studies", [])
-			if not studies:
-				break
-
-			for study in studies:
-				yield study
-				count += 1
-				if max_results and count >= max_results:
-					return
+		count = 0
+		pool = ThreadPoolExecutor(max_workers=1)
+		try:
+			pending = pool.submit(self.search, page_token=None, **search_kwargs)
+			while pending is not None:
+				results = pending.result()
+				pending = None
+
+				studies = results.get("studies", [])
+				if not studies:
+					break
+
+				page_token = results.get("nextPageToken")
+				if page_token and not (max_results and count + len(studies) >= max_results):
+					pending = pool.submit(
+						self.search, page_token=page_token, **search_kwargs
+					)
 
-			page_token = results.get("nextPageToken")
-			if not page_token:
-				break
+				for study in studies:
+					yield study
+					count += 1
+					if max_results and count >= max_results:
+						return
+		finally:
+			# A caller that stops early must not wait on a page it won't read.
+			pool.shutdown(wait=False, cancel_futures=True)
 
 	def parse_study_to_clinical_trial(self, study_data: dict) -> "ClinicalTrial":
 		"""
@@ -1063,11 +1092,48 @@ class CTISPublicAPI:
 	BASE_URL = "https://euclinicaltrials.eu/ctis-public-api"
 	SOURCE_REGISTER = "EU CTIS"
 
-	def __init__(self):
+	# Requests per second across every thread sharing this client — the old
+	# fixed 0.5 s page sleep allowed 2/s from one thread. Halved on each
+	# 429/5xx and recovered gradually (gregory.utils.rate_limit.TokenBucket).
+	DEFAULT_RATE = 4.0
+	# Attempts beyond the first for a 429/5xx, with exponential backoff
+	# (or the server's Retry-After) between them.
+	MAX_RETRIES = 4
+	BACKOFF_BASE = 2.0
+	BACKOFF_MAX = 60.0
+
+	def __init__(self, rate: float = DEFAULT_RATE):
 		import requests
 
+		from gregory.utils.rate_limit import TokenBucket
+
 		self.session = requests.Session()
 		self.timeout = 30
+		self.rate_limiter = TokenBucket(rate)
+
+	def _send(self, method: str, url: str, **kwargs):
+		"""Issue one request through the shared rate limiter, retrying a
+		429/5xx answer with backoff (and slowing every other caller down)
+		instead of surfacing it. Whatever the last attempt returns — including
+		a retryable status once retries run out — is returned as-is for the
+		caller's raise_for_status()."""
+		from gregory.utils.rate_limit import RETRYABLE_STATUSES, retry_after_seconds
+
+		backoff = self.BACKOFF_BASE
+		for attempt in range(self.MAX_RETRIES + 1):
+			self.rate_limiter.acquire()
+			response = getattr(self.session, method)(url, timeout=self.timeout, **kwargs)
+			status = getattr(response, "status_code", None)
+			if attempt < self.MAX_RETRIES and status in RETRYABLE_STATUSES:
+				delay = retry_after_seconds(response, backoff)
+				logging.warning(
+					f"CTIS {method.upper()} {url} returned {status}; retrying in {delay:.1f}s"
+				)
+				self.rate_limiter.throttled(pause=delay)
+				backoff = min(backoff * 2, self.BACKOFF_MAX)
+				continue
+			self.rate_limiter.succeeded()
+			return response
 
 	def search(
 		self,
@@ -1092,7 +1158,7 @@ class CTISPublicAPI:
 		}
 		url = f"{self.BASE_URL}/search"
 		try:
-			response = self.session.post(url, json=payload, timeout=self.timeout)
+			response = self._send("post", url, json=payload)
 			response.raise_for_status()
 		except requests.exceptions.HTTPError as e:
 			logging.error(f"HTTP Error: {e}")
@@ -1119,7 +1185,9 @@ class CTISPublicAPI:
 
 		This is a separate, much heavier request than search() — one GET per trial,
 		not paginated. Callers are responsible for keeping the call volume bounded
-		(e.g. one per record already returned by a /search run).
+		(e.g. one per record already returned by a /search run). Safe to call from
+		several threads at once: every request goes through the client's shared
+		rate limiter (see feedreader_trials_ctis, which fans these out).
 
 		Returns None on a 404 (the trial is not retrievable — some transitioned
 		trials 404 on this endpoint; callers should log and skip rather than treat
@@ -1131,7 +1199,7 @@ class CTISPublicAPI:
 
 		url = f"{self.BASE_URL}/retrieve/{ct_number}"
 		try:
-			response = self.session.get(url, timeout=self.timeout)
+			response = self._send("get", url)
 			response.raise_for_status()
 		except requests.exceptions.HTTPError as e:
 			if e.response is not None and e.response.status_code == 404:
@@ -1178,7 +1246,7 @@ class CTISPublicAPI:
 				return False
 		return True
 
-	def iter_search(self, criteria: dict, since=None, size: int = 50, sleep: float = 0.5):
+	def iter_search(self, criteria: dict, since=None, size: int = 50, sleep: float = 0):
 		"""Iterate every record across all pages of /search for *criteria*.
 
 		Pages are fetched sorted by lastPublicationUpdate DESC (the default), so the
@@ -1190,6 +1258,9 @@ class CTISPublicAPI:
 		records are still yielded (so cheap DB non-destructive-updates still run for
 		them) — callers doing expensive per-record work should check
 		record_is_stale() themselves rather than assume every yielded record is fresh.
+
+		Pages are paced by the client's rate limiter; *sleep* adds a fixed pause
+		between pages on top of it (off by default).
 		"""
 		import time
 
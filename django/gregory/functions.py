@@ -39,14 +39,33 @@ def normalize_orcid(value):
 	return s or None
 
 
-def get_doi(title):
+def current_site_settings():
+	"""The CustomSetting of this deployment (DOMAIN_NAME), or None."""
+	return (
+		CustomSetting.objects.select_related("site")
+		.filter(site__domain=os.environ.get("DOMAIN_NAME"))
+		.first()
+	)
+
+
+def crossref_works(site):
+	"""A CrossRef Works client carrying *site*'s polite-pool etiquette."""
+	client_website = "https://" + site.site.domain + "/"
+	my_etiquette = Etiquette(site.title, "v8", client_website, site.admin_email)
+	return Works(etiquette=my_etiquette)
+
+
+def get_doi(title, works=None):
+	"""DOI of the CrossRef record whose title matches *title*, or None.
+	*works* is a Works client to reuse (see crossref_works); without one it
+	is built from the site settings, which needs the ORM."""
 	doi = None
 	if title != "":
 		i = 0
-	site = CustomSetting.objects.get(site__domain=os.environ.get("DOMAIN_NAME"))
-	client_website = "https://" + site.site.domain + "/"
-	my_etiquette = Etiquette(site.title, "v8", client_website, site.admin_email)
-	works = Works(etiquette=my_etiquette)
+	if works is None:
+		works = crossref_works(
+			CustomSetting.objects.get(site__domain=os.environ.get("DOMAIN_NAME"))
+		)
 	work = works.query(bibliographic=title).sort("relevance")
 	for w in work:
 		if "title" in w:
@@ -70,7 +70,8 @@ class Command(BaseCommand):
 			"--sleep",
 			type=float,
 			default=1.0,
-			help="Seconds to wait between Unpaywall API calls (default: 1.0).",
+			help="Seconds to wait between Unpaywall API calls (default: 1.0). "
+			     "Answers from the offline snapshot index are not rate-limited.",
 		)
 		parser.add_argument(
 			"--limit",
@@ -165,6 +166,8 @@ class Command(BaseCommand):
 				access_before = article.access
 				pdf_link_before = article.pdf_link
 
+				# An unexpected error may have come after a live call: pace it
+				live_lookup = True
 				try:
 					counts = self._process_article(
 						article, i, total, run_access, run_pdf, dry_run,
@@ -175,6 +178,7 @@ class Command(BaseCommand):
 					updated_access += counts["updated_access"]
 					updated_pdf += counts["updated_pdf"]
 					no_data += counts["no_data"]
+					live_lookup = counts["live_lookup"]
 				except Exception as exc:
 					errors += 1
 					self.stderr.write(self.style.ERROR(
@@ -215,7 +219,7 @@ class Command(BaseCommand):
 				finally:
 					if verbosity >= 1 and i % 100 == 0:
 						self.stdout.write(f"  Progress: {i}/{total}")
-					if sleep and i < total:
+					if sleep and live_lookup and i < total:
 						time.sleep(sleep)
 
 		self._print_summary(
@@ -260,11 +264,16 @@ class Command(BaseCommand):
 		Raises on unexpected errors (DB/IO failures); Unpaywall lookup errors
 		are already swallowed by getDataByDOI and surface as `data == {}`.
 		"""
-		counts = {"updated_article": 0, "updated_access": 0, "updated_pdf": 0, "no_data": 0}
-
 		# getDataByDOI returns {} for both "not in Unpaywall" and internal
 		# API errors; no distinction is possible with errors="ignore".
 		data = unpaywall_utils.getDataByDOI(article.doi, admin_email)
+		# Fresh answers from the offline snapshot index carry snapshot_date
+		# and did not touch the API; stale ones were re-checked live first.
+		from_snapshot = bool(data) and "snapshot_date" in data and not data.get("stale")
+		counts = {
+			"updated_article": 0, "updated_access": 0, "updated_pdf": 0, "no_data": 0,
+			"live_lookup": not from_snapshot,
+		}
 
 		if not data:
 			counts["no_data"] = 1
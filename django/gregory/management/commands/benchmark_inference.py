@@ -0,0 +1,145 @@
+"""
+Benchmark prediction throughput per algorithm: the training wrapper versus
+its inference export (export_inference_models), on the same held-out
+articles and in the same PREDICT_BATCH_SIZE batches predict_articles uses.
+
+Reports articles/sec for each, the speed-up, and the export's recorded
+parity result. Nothing is written.
+
+Usage:
+	python manage.py benchmark_inference --team ms --subject ms
+	python manage.py benchmark_inference --all-teams --sample 1000 --repeat 3
+"""
+
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from gregory.management.commands.export_inference_models import (
+	held_out_texts,
+	iter_model_targets,
+)
+from gregory.management.commands.predict_articles import (
+	PREDICT_BATCH_SIZE,
+	load_model,
+)
+
+DEFAULT_SAMPLE = 500
+
+
+def articles_per_second(model, texts, repeat=1):
+	"""Best-of-*repeat* throughput of model.predict over *texts* in
+	PREDICT_BATCH_SIZE batches, after one untimed warm-up batch (graph
+	tracing and lazy initialisation are not steady-state cost)."""
+	model.predict(texts[:PREDICT_BATCH_SIZE])
+	best = None
+	for _ in range(max(1, repeat)):
+		started = time.perf_counter()
+		for start in range(0, len(texts), PREDICT_BATCH_SIZE):
+			model.predict(texts[start : start + PREDICT_BATCH_SIZE])
+		elapsed = time.perf_counter() - started
+		best = elapsed if best is None else min(best, elapsed)
+	return len(texts) / best if best else 0.0
+
+
+class Command(BaseCommand):
+	help = "Report articles/sec per algorithm for the training wrappers and their inference exports"
+
+	def add_arguments(self, parser):
+		parser.add_argument("--team", type=str, help="Limit scope to one team (by slug)")
+		parser.add_argument(
+			"--subject",
+			type=str,
+			help="Limit scope to one subject (by slug, requires --team)",
+		)
+		parser.add_argument(
+			"--all-teams", action="store_true", help="Process all teams"
+		)
+		parser.add_argument(
+			"--algo",
+			type=str,
+			help="Comma-separated list of algorithms (default: all)",
+		)
+		parser.add_argument(
+			"--model-version",
+			type=str,
+			help="Benchmark a specific model version (default: latest available)",
+		)
+		parser.add_argument(
+			"--sample",
+			type=int,
+			default=DEFAULT_SAMPLE,
+			help=f"Held-out articles to score (default: {DEFAULT_SAMPLE})",
+		)
+		parser.add_argument(
+			"--repeat",
+			type=int,
+			default=1,
+			help="Timed passes per model; the fastest is reported (default: 1)",
+		)
+
+	def handle(self, *args, **options):
+		from gregory.ml.inference import (
+			INFERENCE_DIR,
+			open_inference_model,
+			read_manifest,
+		)
+
+		row_fmt = "| {:<30} | {:<12} | {:>8} | {:>14} | {:>14} | {:>8} | {:<12} |"
+		self.stdout.write(
+			row_fmt.format(
+				"Team/Subject", "Algorithm", "Articles", "Trainer art/s",
+				"Export art/s", "Speed-up", "Parity",
+			)
+		)
+		self.stdout.write("-" * 120)
+
+		for team, subject, algorithm, version, model_dir in iter_model_targets(
+			options, stderr=self.stderr
+		):
+			texts = held_out_texts(subject, options["sample"])
+			if not texts:
+				self.stderr.write(f"  {subject.subject_slug}: no articles to score")
+				continue
+			try:
+				trainer = load_model(
+					team, subject, algorithm, version, use_inference_runtime=False
+				)
+				trainer_rate = articles_per_second(trainer, texts, options["repeat"])
+
+				export_dir = Path(model_dir) / INFERENCE_DIR
+				runtime = open_inference_model(export_dir)
+				export_rate = (
+					articles_per_second(runtime, texts, options["repeat"])
+					if runtime is not None
+					else None
+				)
+			except Exception as e:
+				self.stderr.write(
+					self.style.ERROR(f"  {subject.subject_slug}/{algorithm}: {e}")
+				)
+				continue
+
+			manifest = read_manifest(export_dir) or {}
+			parity = manifest.get("parity") or {}
+			if runtime is None:
+				parity_label = "no export"
+			elif parity.get("passed"):
+				parity_label = "int8 OK" if manifest.get("quantized") else "OK"
+			else:
+				parity_label = "not passed"
+
+			self.stdout.write(
+				row_fmt.format(
+					f"{team.slug}/{subject.subject_slug}"[:30],
+					algorithm,
+					len(texts),
+					f"{trainer_rate:.1f}",
+					f"{export_rate:.1f}" if export_rate is not None else "-",
+					f"{export_rate / trainer_rate:.1f}x"
+					if export_rate and trainer_rate
+					else "-",
+					parity_label,
+				)
+			)
@@ -1,16 +1,22 @@
-from collections import defaultdict
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
-from gregory.models import Articles, Trials, ArticleTrialReference
-from gregory.utils.trial_identifiers import (
-	extract_identifiers,
-	extract_identifiers_from_trial_identifiers,
+from gregory.models import Articles, Trials, ArticleTrialReference, TrialIdentifierIndex
+from gregory.services.trial_references import (
+	ScanResult,
+	due_articles,
+	rebuild_identifier_index,
+	scan_articles,
+	scan_pending_identifiers,
 )
 
 
 class Command(BaseCommand):
-	help = "Detects trial identifiers in article summaries and creates ArticleTrialReference objects"
+	help = (
+		"Detects trial identifiers in article summaries and creates ArticleTrialReference objects. "
+		"By default only articles new or changed since their last scan, and trials whose "
+		"identifiers were indexed since, are processed."
+	)
 
 	def add_arguments(self, parser):
 		parser.add_argument(
@@ -24,7 +30,20 @@ class Command(BaseCommand):
 		parser.add_argument(
 			"--reset",
 			action="store_true",
-			help="Remove all existing article-trial references before scanning",
+			help="Remove all existing article-trial references before scanning (implies --full)",
+		)
+		parser.add_argument(
+			"--full",
+			action="store_true",
+			help="Rescan every article with a summary instead of only new or changed ones",
+		)
+		parser.add_argument(
+			"--rebuild-index",
+			action="store_true",
+			help=(
+				"Recompute the trial identifier index from Trials.identifiers first "
+				"(needed after bulk_update/queryset.update() writes, which bypass Trials.save())"
+			),
 		)
 		parser.add_argument(
 			"--limit", type=int, help="Limit the number of articles processed"
@@ -47,9 +66,11 @@ class Command(BaseCommand):
 		)
 
 	def handle(self, *args, **options):
+		dry_run = options["dry_run"]
+
 		# Handle optional reset of all references
 		if options["reset"]:
-			if options["dry_run"]:
+			if dry_run:
 				count = ArticleTrialReference.objects.count()
 				self.stdout.write(f"Would delete {count} existing references (dry run)")
 			else:
@@ -57,98 +78,91 @@ class Command(BaseCommand):
 				ArticleTrialReference.objects.all().delete()
 				self.stdout.write(f"Deleted {count} existing references")
 
-		# Setup article query
+		self._ensure_index(options["rebuild_index"], dry_run)
+
+		# Setup article query. Incremental (the default) only when no explicit
+		# scope was requested; every other mode scans its scope in full.
+		incremental = False
 		if options["article_id"]:
 			articles = Articles.objects.filter(article_id=options["article_id"])
 			self.stdout.write(
 				f"Processing specific article ID: {options['article_id']}"
 			)
-		else:
+		elif options["recent"]:
+			days = options["days"]
+			date_threshold = timezone.now() - timedelta(days=days)
+			articles = Articles.objects.filter(summary__isnull=False).exclude(
+				summary=""
+			).filter(discovery_date__gte=date_threshold)
+			self.stdout.write(f"Processing articles from the last {days} days")
+		elif options["full"] or options["reset"] or options["trial_id"]:
 			articles = Articles.objects.filter(summary__isnull=False).exclude(
 				summary=""
 			)
-
-			# Filter for recent articles if the option is specified
-			if options["recent"]:
-				days = options["days"]
-				date_threshold = timezone.now() - timedelta(days=days)
-				articles = articles.filter(discovery_date__gte=date_threshold)
-				self.stdout.write(f"Processing articles from the last {days} days")
-			else:
-				self.stdout.write(f"Processing all articles with summaries")
+			self.stdout.write(f"Processing all articles with summaries")
+		else:
+			incremental = True
+			articles = due_articles()
+			self.stdout.write("Processing articles new or changed since their last scan")
 
 		# Apply limit if specified
 		if options["limit"]:
 			articles = articles[: options["limit"]]
 			self.stdout.write(f"Limiting to {options['limit']} articles")
 
-		# Setup trial query
+		# Setup trial restriction
+		trial_ids = None
 		if options["trial_id"]:
 			trials = Trials.objects.filter(trial_id=options["trial_id"])
+			trial_ids = list(trials.values_list("trial_id", flat=True))
 			self.stdout.write(f"Looking for specific trial ID: {options['trial_id']}")
 		else:
-			trials = Trials.objects.filter(identifiers__isnull=False).exclude(
-				identifiers={}
-			)
 			self.stdout.write(f"Scanning for all trials with identifiers")
 
-		self.stdout.write(
-			f"Found {articles.count()} articles and {trials.count()} trials to process"
-		)
-
-		# Build a canonical-identifier -> [trial_id, ...] index once, instead of
-		# re-scanning every trial's identifiers for every article.
-		identifier_index = defaultdict(list)
-		for trial in trials:
-			for canonical_id in extract_identifiers_from_trial_identifiers(
-				trial.identifiers
-			):
-				identifier_index[canonical_id].append(trial.trial_id)
-
-		# Track statistics
-		total_references = 0
-		total_articles_with_refs = set()
-		total_trials_with_refs = set()
-
-		# Process each article once: extract its identifiers and look them up.
-		for article in articles:
-			if not article.summary:
-				continue
-
-			text = f"{article.title or ''} {article.summary}"
-			article_refs_count = 0
-
-			for canonical_id in extract_identifiers(text):
-				id_type, id_value = canonical_id
-				for trial_id in identifier_index.get(canonical_id, []):
-					total_references += 1
-					article_refs_count += 1
-					total_articles_with_refs.add(article.article_id)
-					total_trials_with_refs.add(trial_id)
-
-					if options["dry_run"]:
-						self.stdout.write(
-							f"Would create: Article {article.article_id} -> Trial {trial_id} via {id_type}={id_value} (dry run)"
-						)
-					else:
-						ArticleTrialReference.objects.get_or_create(
-							article=article,
-							trial_id=trial_id,
-							identifier_type=id_type,
-							identifier_value=id_value,
-						)
-
-			# Print progress for articles with references
-			if article_refs_count > 0:
+		self.stdout.write(f"Found {articles.count()} articles to process")
+
+		result = scan_articles(articles, trial_ids=trial_ids, dry_run=dry_run)
+		if incremental:
+			# Trials indexed since the last run may be cited by articles that
+			# were scanned before the trial existed.
+			result.extend(scan_pending_identifiers(dry_run=dry_run))
+
+		self._report(result, dry_run)
+
+	def _ensure_index(self, rebuild, dry_run):
+		"""Build the identifier index on first use (or on --rebuild-index).
+
+		When no article has ever been scanned, the article side of this run
+		covers the whole corpus, so the freshly built rows can start out
+		scanned instead of each triggering a trial-side search."""
+		if dry_run or not (rebuild or not TrialIdentifierIndex.objects.exists()):
+			return
+		mark_scanned = not Articles.objects.filter(
+			trial_refs_scanned_at__isnull=False
+		).exists()
+		created = rebuild_identifier_index(mark_scanned=mark_scanned)
+		self.stdout.write(f"Indexed {created} trial identifiers")
+
+	def _report(self, result: ScanResult, dry_run):
+		per_article = {}
+		for article_id, trial_id, id_type, id_value in result.matches:
+			per_article[article_id] = per_article.get(article_id, 0) + 1
+			if dry_run:
 				self.stdout.write(
-					f"Article {article.article_id}: Found {article_refs_count} trial references"
+					f"Would create: Article {article_id} -> Trial {trial_id} via {id_type}={id_value} (dry run)"
 				)
 
+		# Print progress for articles with references
+		for article_id, count in per_article.items():
+			self.stdout.write(
+				f"Article {article_id}: Found {count} trial references"
+			)
+
 		# Print summary
-		action = "Would have created" if options["dry_run"] else "Created"
+		action = "Would have created" if dry_run else "Recorded"
 		self.stdout.write(
 			self.style.SUCCESS(
-				f"{action} {total_references} article-trial references "
-				f"involving {len(total_articles_with_refs)} articles and {len(total_trials_with_refs)} trials"
+				f"{action} {len(result.matches)} article-trial references "
+				f"involving {len(result.article_ids)} articles and {len(result.trial_ids)} trials"
 			)
 		)
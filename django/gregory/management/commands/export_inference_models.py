@@ -0,0 +1,201 @@
+"""
+Export trained classifiers to their inference-only form and check parity.
+
+For each (team, subject, algorithm) in scope this loads the model version
+predict_articles would use, writes ``<version>/inference/`` with
+gregory.ml.inference.export_inference_model, scores a held-out sample with
+both the trainer and the export, and records the comparison in the export's
+manifest. predict_articles only picks up exports whose parity check passed.
+
+The held-out sample is the subject's most recently discovered articles,
+prepared exactly as predict_articles prepares them. Parity needs no labels,
+and recent articles are mostly newer than the model's training snapshot.
+
+Usage:
+	python manage.py export_inference_models --all-teams
+	python manage.py export_inference_models --team ms --subject ms --algo pubmed_bert --quantize
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gregory.management.commands import predict_articles
+from gregory.management.commands.predict_articles import (
+	DEFAULT_ALGORITHMS,
+	load_model,
+	prepare_text,
+	resolve_model_version,
+)
+from gregory.models import Articles, Team
+
+DEFAULT_PARITY_SAMPLE = 200
+
+
+def held_out_texts(subject, limit):
+	"""Prepared texts of the subject's *limit* most recently discovered
+	articles that have a summary (the ones predict_articles would score)."""
+	texts = []
+	articles = (
+		Articles.objects.filter(subjects=subject)
+		.exclude(summary__isnull=True)
+		.exclude(summary="")
+		.order_by("-discovery_date")
+		.only("title", "summary")
+	)
+	for article in articles.iterator(chunk_size=500):
+		text = prepare_text(article)
+		if text:
+			texts.append(text)
+			if len(texts) >= limit:
+				break
+	return texts
+
+
+def iter_model_targets(options, stderr=None):
+	"""
+	Yield (team, subject, algorithm, model_version, model_dir) for every
+	auto_predict subject and algorithm in scope whose model version resolves,
+	using the same --team/--subject/--all-teams/--algo/--model-version rules
+	as predict_articles.
+	"""
+	team_slug = options.get("team")
+	subject_slug = options.get("subject")
+	if not team_slug and not options.get("all_teams"):
+		raise CommandError("Either --team or --all-teams must be provided")
+	if subject_slug and not team_slug:
+		raise CommandError("--subject requires --team")
+
+	algorithms = (
+		options["algo"].split(",") if options.get("algo") else DEFAULT_ALGORITHMS
+	)
+	unknown = [algo for algo in algorithms if algo not in DEFAULT_ALGORITHMS]
+	if unknown:
+		raise CommandError(
+			f"Unknown algorithm(s) {', '.join(unknown)}; valid options are: {', '.join(DEFAULT_ALGORITHMS)}"
+		)
+
+	if options.get("all_teams"):
+		teams = Team.objects.all()
+	else:
+		teams = Team.objects.filter(slug=team_slug)
+		if not teams.exists():
+			raise CommandError(f"Team '{team_slug}' not found")
+
+	for team in teams:
+		subjects = team.subjects.filter(auto_predict=True)
+		if subject_slug and not options.get("all_teams"):
+			subjects = subjects.filter(subject_slug=subject_slug)
+		for subject in subjects:
+			for algorithm in algorithms:
+				base_path = (
+					Path(predict_articles.BASE_MODEL_DIR)
+					/ team.slug
+					/ subject.subject_slug
+					/ algorithm
+				)
+				try:
+					version = resolve_model_version(
+						str(base_path), options.get("model_version")
+					)
+				except (FileNotFoundError, ValueError) as e:
+					if stderr is not None:
+						stderr.write(f"  {subject.subject_slug}/{algorithm}: {e}")
+					continue
+				yield team, subject, algorithm, version, base_path / version
+
+
+class Command(BaseCommand):
+	help = "Export trained models to an inference-only form and check parity with the originals"
+
+	def add_arguments(self, parser):
+		parser.add_argument("--team", type=str, help="Limit scope to one team (by slug)")
+		parser.add_argument(
+			"--subject",
+			type=str,
+			help="Limit scope to one subject (by slug, requires --team)",
+		)
+		parser.add_argument(
+			"--all-teams", action="store_true", help="Process all teams"
+		)
+		parser.add_argument(
+			"--algo",
+			type=str,
+			help="Comma-separated list of algorithms (default: all)",
+		)
+		parser.add_argument(
+			"--model-version",
+			type=str,
+			help="Export a specific model version (default: latest available)",
+		)
+		parser.add_argument(
+			"--quantize",
+			action="store_true",
+			help="Export pubmed_bert as TensorFlow Lite with int8 dynamic-range weights",
+		)
+		parser.add_argument(
+			"--parity-sample",
+			type=int,
+			default=DEFAULT_PARITY_SAMPLE,
+			help=f"Held-out articles scored by both models (default: {DEFAULT_PARITY_SAMPLE})",
+		)
+		parser.add_argument(
+			"--tolerance",
+			type=float,
+			help="Largest accepted probability difference (default: 1e-4, or 0.02 when quantised)",
+		)
+
+	def handle(self, *args, **options):
+		from gregory.ml.inference import (
+			PARITY_TOLERANCE,
+			QUANTIZED_PARITY_TOLERANCE,
+			check_parity,
+			export_inference_model,
+			open_inference_model,
+			record_parity,
+		)
+
+		exported = failed = 0
+		for team, subject, algorithm, version, model_dir in iter_model_targets(
+			options, stderr=self.stderr
+		):
+			label = f"{team.slug}/{subject.subject_slug}/{algorithm}/{version}"
+			quantize = options["quantize"] and algorithm == "pubmed_bert"
+			tolerance = options.get("tolerance") or (
+				QUANTIZED_PARITY_TOLERANCE if quantize else PARITY_TOLERANCE
+			)
+			try:
+				trainer = load_model(
+					team, subject, algorithm, version, use_inference_runtime=False
+				)
+				texts = held_out_texts(subject, options["parity_sample"])
+				export_dir = export_inference_model(
+					trainer, algorithm, model_dir, quantize=quantize
+				)
+				parity = check_parity(
+					trainer, open_inference_model(export_dir), texts, tolerance=tolerance
+				)
+				record_parity(export_dir, parity)
+			except Exception as e:
+				failed += 1
+				self.stderr.write(self.style.ERROR(f"{label}: export failed: {e}"))
+				continue
+
+			summary = (
+				f"{label}: {parity['samples']} articles, "
+				f"max |Δp| {parity['max_abs_diff']:.2e}, "
+				f"decisions agree {parity['decision_agreement']:.1%}"
+			)
+			if parity["passed"]:
+				exported += 1
+				self.stdout.write(self.style.SUCCESS(f"{summary} — parity OK"))
+			else:
+				failed += 1
+				self.stdout.write(
+					self.style.ERROR(
+						f"{summary} — parity FAILED (tolerance {tolerance:g}); "
+						"predict_articles will keep using the trainer"
+					)
+				)
+
+		self.stdout.write(f"Exported {exported} model(s), {failed} failed")
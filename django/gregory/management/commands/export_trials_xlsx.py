@@ -1,731 +1,19 @@
-import json
-import re
-from datetime import datetime, date, timezone as dt_timezone
+from datetime import datetime
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Count, GeneratedField
-from django.db.models.functions import Lower
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 
-from gregory.models import Trials, Subject, TeamCategory
-
-
-EXCLUDED_SCALARS = frozenset({"utitle", "usummary"})
-EXCLUDED_M2M = frozenset({"ml_predictions"})
-
-# Ordered column groups for data sheets
-IDENTITY_COLS = [
-	"trial_id",
-	"title",
-	"acronym",
-	"scientific_title",
-	"link",
-	"discovery_date",
-	"last_updated",
-	"published_date",
-	"date_registration",
-	"last_refreshed_on",
-	"export_date",
-]
-
-SCALAR_ORDER = [
-	"summary",
-	"internal_number",
-	"secondary_id",
-	"source_register",
-	"other_records",
-	"prospective_registration",
-	"study_type",
-	"study_type_normalized",
-	"study_design",
-	"phase",
-	"phase_normalized",
-	"recruitment_status",
-	"recruitment_status_normalized",
-	"target_size",
-	"date_enrollement",
-	"countries",
-	"countries_by_source",
-	"regions_normalized",
-	"condition",
-	"intervention",
-	"primary_outcome",
-	"secondary_outcome",
-	"inclusion_criteria",
-	"exclusion_criteria",
-	"inclusion_agemin",
-	"inclusion_agemax",
-	"inclusion_gender",
-	"inclusion_gender_normalized",
-	"primary_sponsor",
-	"secondary_sponsor",
-	"source_support",
-	"sponsor_type",
-	"lead_sponsor_class",
-	"contact_firstname",
-	"contact_lastname",
-	"contact_address",
-	"contact_email",
-	"contact_tel",
-	"contact_affiliation",
-	"ethics_review_status",
-	"ethics_review_approval_date",
-	"ethics_review_contact_name",
-	"ethics_review_contact_address",
-	"ethics_review_contact_phone",
-	"ethics_review_contact_email",
-	"results_posted",
-	"results_date_completed",
-	"results_url_link",
-	"results_yes_no",
-	"results_ipd_plan",
-	"results_ipd_description",
-	"therapeutic_areas",
-	"country_status",
-	"trial_region",
-	"overall_decision_date",
-	"countries_decision_date",
-	"ctg_detailed_description",
-]
-
-RELATION_COLS = [
-	"subjects",
-	"teams",
-	"sources",
-	"team_categories",
-	"articles",
-	"trial_countries",
-	"sponsor_id",
-	"sponsor_slug",
-	"primary_sponsor_normalized",
-	"sponsor_type_normalized",
-	"sponsor_type_source",
-]
-
-# Descriptions for exported columns absent from TrialAdminForm.Meta.help_texts.
-# Format: field_name → (label, description, source_registries)
-EXTRA_GLOSSARY = {
-	"trial_id": (
-		"Trial ID",
-		"Internal Gregory database identifier for this trial record.",
-		"",
-	),
-	"summary": (
-		"Summary",
-		"Plain-language summary of the trial.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"discovery_date": (
-		"Discovery date",
-		"Date this trial was first added to Gregory.",
-		"",
-	),
-	"last_updated": (
-		"Last updated",
-		"Date and time this record was last modified in Gregory.",
-		"",
-	),
-	"identifiers_json": (
-		"Identifiers (raw JSON)",
-		"Raw JSON dict of all registry identifiers for this trial.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"subjects": (
-		"Subjects",
-		"Research subjects this trial is assigned to in Gregory (semicolon-separated).",
-		"",
-	),
-	"teams": (
-		"Teams",
-		"Teams this trial is assigned to in Gregory (semicolon-separated).",
-		"",
-	),
-	"sources": (
-		"Sources",
-		"Registry sources that provided data for this trial (semicolon-separated).",
-		"",
-	),
-	"team_categories": (
-		"Categories",
-		"Team categories assigned to this trial (semicolon-separated). See the "
-		"Categories sheet for each category's description and search terms.",
-		"",
-	),
-	"articles": (
-		"Related articles",
-		"Count of articles that reference this trial, followed by their URLs.",
-		"",
-	),
-	"therapeutic_areas": (
-		"Therapeutic areas",
-		"Therapeutic areas covered by the trial.",
-		"EU CTIS",
-	),
-	"country_status": (
-		"Country status",
-		"Authorisation status of the trial in each participating country.",
-		"EU CTIS",
-	),
-	"countries_by_source": (
-		"Countries by source",
-		"Raw per-source country lists as a JSON map keyed by registry slug "
-		"(ctgov, ictrp). Each importer writes only its own key, so sources no longer "
-		"overwrite each other's country data (the flat countries column is last-writer-wins).",
-		"WHO ICTRP, ClinicalTrials.gov",
-	),
-	"regions_normalized": (
-		"Regions (normalized)",
-		"Continental regions derived from the trial's normalized countries "
-		"(africa, asia, europe, north_america, south_america, oceania), plus any "
-		"literal region tokens found in the raw country data.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"trial_countries": (
-		"Countries (normalized)",
-		"Per-country breakdown: display name and ISO 3166-1 alpha-2 code, with EU CTIS "
-		"authorisation status, decision date, and contributing source slugs where known. "
-		'Format: "Germany [DE] (recruiting; 2024-07-19; src: ctgov+ctis); …".',
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"trial_region": ("Trial region", "Geographic region of the trial.", "EU CTIS"),
-	"overall_decision_date": (
-		"Overall decision date",
-		"Date of the overall regulatory decision for the trial.",
-		"EU CTIS",
-	),
-	"countries_decision_date": (
-		"Countries decision dates",
-		"JSON map of per-country regulatory decision dates.",
-		"EU CTIS",
-	),
-	"sponsor_type": (
-		"Sponsor type (raw)",
-		"Sponsor category as reported verbatim by EU CTIS (e.g. \"Pharmaceutical "
-		"company\"). Populated for EU CTIS trials only — see sponsor_type_normalized "
-		"for a canonical category derived across all three registries.",
-		"EU CTIS",
-	),
-	"lead_sponsor_class": (
-		"Lead sponsor class (CTGov)",
-		"Sponsor agency class as classified by ClinicalTrials.gov (e.g. INDUSTRY, NIH, "
-		"FED, OTHER_GOV, INDIV, NETWORK, OTHER, AMBIG, UNKNOWN). One of the signals "
-		"feeding sponsor_type_normalized.",
-		"ClinicalTrials.gov",
-	),
-	"sponsor_id": (
-		"Sponsor ID (canonical)",
-		"Database id of the canonical sponsor entity — stable across spelling-variant "
-		"merges, so it's the reliable join key for grouping/joining against the "
-		"/sponsors/ API endpoint. Blank when primary_sponsor is empty.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"sponsor_slug": (
-		"Sponsor slug (canonical)",
-		"URL-safe slug of the canonical sponsor entity, as used by the /sponsors/ API "
-		"endpoint's sponsor_slug filter. Blank when primary_sponsor is empty.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"primary_sponsor_normalized": (
-		"Sponsor (canonical)",
-		"Canonical sponsor entity name. Spelling variants of the same real-world "
-		"sponsor across registries (e.g. \"Novartis\", \"Novartis Pharma AG\", "
-		"\"Novartis Pharmaceuticals\") resolve to one name here, so counting/grouping "
-		"trials by sponsor no longer undercounts due to spelling differences. Blank "
-		"when primary_sponsor is empty.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"sponsor_type_normalized": (
-		"Sponsor type (canonical)",
-		"Canonical sponsor category for the resolved sponsor entity: industry, "
-		"academic_medical, government, nonprofit, or other. Derived from (in priority "
-		"order) a curated hand-assignment for known sponsor families, "
-		"ClinicalTrials.gov's lead_sponsor_class, EU CTIS's raw sponsor_type, or "
-		"keyword rules on the sponsor name — so it is populated far more often than "
-		"the raw sponsor_type column, which only EU CTIS provides. See "
-		"sponsor_type_source for which of these actually applied. Blank when no "
-		"signal was available to classify the sponsor.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"sponsor_type_source": (
-		"Sponsor type source",
-		"Audit trail for sponsor_type_normalized: which signal actually determined it — "
-		"\"curated\" (set by hand for a known sponsor family, never overwritten "
-		"automatically), \"ctgov\" (ClinicalTrials.gov's lead_sponsor_class), \"ctis\" "
-		"(EU CTIS's raw sponsor_type), or \"rules\" (keyword match on the sponsor name, "
-		"the lowest-confidence tier). Blank when sponsor_type_normalized itself is blank.",
-		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-	),
-	"ctg_detailed_description": (
-		"Detailed description",
-		"Extended description from ClinicalTrials.gov.",
-		"ClinicalTrials.gov",
-	),
-}
-
-REGISTRIES_OVERVIEW = [
-	(
-		"WHO ICTRP",
-		"Varies (nct, euctr, chictr, nl, …)",
-		"Aggregator of national/regional registries worldwide",
-		"Richest field coverage: ethics review, IPD plans, enrolment dates, full sponsor "
-		"info. May lag primary registries; can overwrite a field with an empty value on "
-		"re-import.",
-	),
-	(
-		"ClinicalTrials.gov",
-		"nct",
-		"US-hosted global registry",
-		"Provides ctg_detailed_description and results_url_link. Combines exclusion into "
-		"inclusion criteria. Never blanks a field on update (non-destructive).",
-	),
-	(
-		"EU Clinical Trials (CTIS)",
-		"euctr / eudract / ctis",
-		"EU trials register",
-		"Provides therapeutic_areas, country_status, trial_region, overall_decision_date, "
-		"countries_decision_date, sponsor_type. Does not provide date_registration. "
-		"May overwrite fields with empty values on re-import.",
-	),
-]
-
-MERGE_PROSE = (
-	"A single trial can be ingested from more than one source registry. Gregory stores "
-	"one row per trial and merges data on re-import using a last-write-wins strategy. "
-	"ClinicalTrials.gov never blanks a field it previously populated; WHO ICTRP and EU "
-	"CTIS may overwrite existing values — including with empty ones — if the incoming "
-	"record omits a field. The identifiers column is always merged non-destructively: "
-	"keys are added, never removed. Fields produced by only one registry (e.g. EU CTIS "
-	"therapeutic_areas or CT.gov ctg_detailed_description) are set only by their "
-	"respective importer and are never in conflict."
+from gregory.models import Trials, Subject
+from gregory.utils.trials_xlsx import (
+	build_categories_sheet,
+	build_glossary_sheet,
+	build_registries_sheet,
+	data_columns,
+	identifier_keys,
+	new_workbook,
+	write_trials_sheet,
+	_sanitise_sheet_name,
 )
 
-REGISTRY_NAMES = ["WHO ICTRP", "ClinicalTrials.gov", "EU CTIS"]
-
-CATEGORY_COLUMNS = [
-	"Subject",
-	"Team",
-	"Category",
-	"Slug",
-	"Description",
-	"Search terms",
-	"Terms (count)",
-	"Category type",
-	"Modality",
-	"Match scope",
-	"Min score (trials)",
-	"Field weights (trials)",
-	"Trials (this subject)",
-	"Last synced",
-]
-
-CATEGORY_MATCH_PROSE = (
-	"Each row is one category assigned to one subject. Automatic categories are populated "
-	"by the rebuild_categories command: each search term is matched case-insensitively as a "
-	"whole word against the fields listed in \"Field weights (trials)\" (only those fields "
-	"are searched, per the category's match scope); every matching field adds its weight, "
-	"plus a flat 2 points per unique matched term, and a trial is assigned once the total "
-	"reaches the \"Min score (trials)\" threshold. Manual categories are curated by hand and "
-	"ignore the term list."
-)
-
-# Column widths for data sheets
-_WIDE_COLS = {
-	"title",
-	"scientific_title",
-	"summary",
-	"ctg_detailed_description",
-	"inclusion_criteria",
-	"exclusion_criteria",
-	"intervention",
-	"primary_outcome",
-	"secondary_outcome",
-	"study_design",
-	"condition",
-	"results_ipd_description",
-	"therapeutic_areas",
-	"country_status",
-	"countries_by_source",
-	"trial_countries",
-	"articles",
-}
-_URL_COLS = {"link", "results_url_link", "identifiers_json"}
-
-
-def _sanitise_sheet_name(name, used):
-	"""Return a valid, unique Excel sheet name (≤31 chars, no illegal characters)."""
-	name = re.sub(r"[\\/*?\[\]:]", "_", name)[:31]
-	base, suffix = name, 1
-	while name in used:
-		suffix += 1
-		name = base[:28] + f"_{suffix}"
-	used.add(name)
-	return name
-
-
-def _cell_value(value):
-	"""Convert a Python value to an Excel-safe type (None → empty string)."""
-	if value is None:
-		return ""
-	if isinstance(value, datetime):
-		if value.tzinfo is not None:
-			value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
-		return value
-	if isinstance(value, date):
-		return value
-	if isinstance(value, dict):
-		return json.dumps(value, ensure_ascii=False)
-	if isinstance(value, list):
-		# Lists of scalars (e.g. regions_normalized) render as a "; "-joined string;
-		# lists containing dicts/lists fall back to JSON for fidelity.
-		if all(not isinstance(v, (dict, list)) for v in value):
-			return "; ".join("" if v is None else str(v) for v in value)
-		return json.dumps(value, ensure_ascii=False)
-	if isinstance(value, bool):
-		return value
-	if isinstance(value, (int, float)):
-		return value
-	return str(value)
-
-
-def _format_trial_countries(trial):
-	"""Render a trial's normalized TrialCountry rows as one readable cell.
-
-	Format per country: "Germany [DE] (recruiting; 2024-07-19; src: ctgov+ctis)".
-	The status/date/sources clause is omitted when empty. Uses the prefetched
-	``trial_countries`` cache (sorted in Python — no extra query).
-	"""
-	rows = sorted(trial.trial_countries.all(), key=lambda tc: str(tc.country.code))
-	parts = []
-	for tc in rows:
-		bits = []
-		status = tc.status_raw or tc.status
-		if status:
-			bits.append(str(status))
-		if tc.decision_date:
-			bits.append(str(tc.decision_date))
-		if tc.sources:
-			bits.append("src: " + "+".join(tc.sources))
-		label = f"{tc.country.name} [{tc.country.code}]"
-		if bits:
-			label += " (" + "; ".join(bits) + ")"
-		parts.append(label)
-	return "; ".join(parts)
-
-
-def _apply_header(ws, columns, row=1):
-	"""Write a bold, coloured header row and return the cell count."""
-	hdr_font = Font(bold=True, color="FFFFFF")
-	hdr_fill = PatternFill(fill_type="solid", fgColor="2F4F8F")
-	hdr_align = Alignment(vertical="center")
-	for col_idx, name in enumerate(columns, 1):
-		cell = ws.cell(row=row, column=col_idx, value=name)
-		cell.font = hdr_font
-		cell.fill = hdr_fill
-		cell.alignment = hdr_align
-	return len(columns)
-
-
-def _excel_text(value, limit=32767):
-	"""Truncate a string to Excel's per-cell character limit."""
-	if not value:
-		return value
-	text = str(value)
-	if len(text) > limit:
-		text = text[: limit - 1] + "…"
-	return text
-
-
-_FORMULA_TRIGGER_CHARS = ("=", "+", "-", "@")
-
-
-def _write_safe_text_cell(ws, row, col, value, wrap=False):
-	"""Write a long/user-authored text value, truncated and defused against formula injection.
-
-	A leading apostrophe is the standard mitigation (OWASP CSV injection guidance):
-	it forces the cell to render as literal text in Excel/LibreOffice/Sheets even
-	when the value starts with =, +, -, or @. Relying on openpyxl's data_type alone
-	is not enough — several of those trigger characters (+, -, @) are never
-	auto-detected as formulas by openpyxl in the first place, so its cell.data_type
-	would stay "s" regardless, while spreadsheet applications still treat a leading
-	=, +, -, or @ as a formula cue on their own.
-	"""
-	text = _excel_text(value)
-	if isinstance(text, str) and text.startswith(_FORMULA_TRIGGER_CHARS):
-		text = "'" + text
-	cell = ws.cell(row=row, column=col, value=text)
-	cell.data_type = "s"
-	if wrap:
-		cell.alignment = Alignment(wrap_text=True)
-	return cell
-
-
-def _set_column_widths(ws, columns):
-	for col_idx, name in enumerate(columns, 1):
-		letter = get_column_letter(col_idx)
-		if name in _WIDE_COLS:
-			ws.column_dimensions[letter].width = 50
-		elif name in _URL_COLS:
-			ws.column_dimensions[letter].width = 40
-		elif name.startswith("id_"):
-			ws.column_dimensions[letter].width = 20
-		else:
-			ws.column_dimensions[letter].width = max(12, min(40, len(name) + 4))
-
-
-def _build_scalar_columns():
-	"""
-	Return an ordered list of scalar Trials column names for export.
-	Known columns follow IDENTITY_COLS + SCALAR_ORDER; unrecognised columns are appended.
-	Excludes: GeneratedField columns, m2m/relation fields, and 'identifiers' (expanded
-	separately into id_* columns and identifiers_json).
-	"""
-	known_order = IDENTITY_COLS + SCALAR_ORDER
-	# 'identifiers' is handled separately; EXCLUDED_* are never exported
-	known_set = set(known_order) | {"identifiers"} | EXCLUDED_SCALARS | EXCLUDED_M2M
-	unknown = []
-	for f in Trials._meta.get_fields():
-		if f.is_relation:
-			continue
-		if isinstance(f, GeneratedField):
-			continue
-		if f.name in known_set:
-			continue
-		unknown.append(f.name)
-	return known_order + sorted(unknown)
-
-
-def _parse_help_text(text):
-	"""
-	Split a help_text string into (description, source_registries_string).
-	Looks for a trailing 'Sources?: …' clause.
-	"""
-	match = re.search(r"\s+Sources?:\s*(.+?)\.?\s*$", text, re.IGNORECASE)
-	if match:
-		return text[: match.start()].strip(), match.group(1).strip().rstrip(".")
-	return text.strip(), ""
-
-
-def _sources_for(col_name, admin_labels, admin_help, model_help):
-	"""Return (label, description, source_str) for one exported column."""
-	if col_name.startswith("id_"):
-		key = col_name[3:]
-		return (
-			f"Identifier: {key.upper()}",
-			f'Registry identifier key "{key}" extracted from the identifiers JSON.',
-			"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
-		)
-	if col_name in EXTRA_GLOSSARY:
-		return EXTRA_GLOSSARY[col_name]
-	if col_name in admin_help:
-		label = admin_labels.get(col_name, col_name)
-		desc, sources = _parse_help_text(admin_help[col_name])
-		return label, desc, sources
-	if col_name in model_help:
-		label = admin_labels.get(col_name, col_name)
-		desc, sources = _parse_help_text(model_help[col_name])
-		return label, desc, sources
-	return admin_labels.get(col_name, col_name), "", ""
-
-
-def _build_glossary_sheet(wb, all_data_cols):
-	"""Add a Glossary sheet — one row per exported column."""
-	from gregory.admin import TrialAdminForm
-
-	admin_labels = TrialAdminForm.Meta.labels
-	admin_help = TrialAdminForm.Meta.help_texts
-	model_help = {
-		f.name: f.help_text
-		for f in Trials._meta.get_fields()
-		if not f.is_relation and hasattr(f, "help_text") and f.help_text
-	}
-
-	ws = wb.create_sheet(title="Glossary")
-	headers = ["Field", "Label", "Description", "Source registries"]
-	_apply_header(ws, headers)
-	ws.freeze_panes = "A2"
-	ws.column_dimensions["A"].width = 32
-	ws.column_dimensions["B"].width = 32
-	ws.column_dimensions["C"].width = 65
-	ws.column_dimensions["D"].width = 32
-
-	for row_idx, col_name in enumerate(all_data_cols, 2):
-		label, desc, sources = _sources_for(
-			col_name, admin_labels, admin_help, model_help
-		)
-		ws.cell(row=row_idx, column=1, value=col_name)
-		ws.cell(row=row_idx, column=2, value=label)
-		cell_desc = ws.cell(row=row_idx, column=3, value=desc)
-		cell_desc.alignment = Alignment(wrap_text=True)
-		ws.cell(row=row_idx, column=4, value=sources)
-
-
-def _build_registries_sheet(wb, all_data_cols):
-	"""Add a Registries sheet with a prose overview, registry table, and field matrix."""
-	from gregory.admin import TrialAdminForm
-
-	admin_labels = TrialAdminForm.Meta.labels
-	admin_help = TrialAdminForm.Meta.help_texts
-	model_help = {
-		f.name: f.help_text
-		for f in Trials._meta.get_fields()
-		if not f.is_relation and hasattr(f, "help_text") and f.help_text
-	}
-
-	ws = wb.create_sheet(title="Registries")
-	hdr_font = Font(bold=True, color="FFFFFF")
-	hdr_fill = PatternFill(fill_type="solid", fgColor="2F4F8F")
-	hdr_align = Alignment(vertical="center")
-	section_font = Font(bold=True, size=13)
-
-	# --- Part A: prose overview ---
-	ws.cell(row=1, column=1, value="Registry overview").font = section_font
-	prose_cell = ws.cell(row=2, column=1, value=MERGE_PROSE)
-	prose_cell.alignment = Alignment(wrap_text=True)
-	ws.merge_cells("A2:D2")
-	ws.row_dimensions[2].height = 90
-
-	# Overview table header (row 4)
-	for col_idx, h in enumerate(
-		["Registry", "Identifier key(s)", "What it is", "Notes on coverage"], 1
-	):
-		c = ws.cell(row=4, column=col_idx, value=h)
-		c.font = hdr_font
-		c.fill = hdr_fill
-		c.alignment = hdr_align
-
-	for row_offset, (reg_name, id_keys_str, what, notes) in enumerate(
-		REGISTRIES_OVERVIEW, 5
-	):
-		ws.cell(row=row_offset, column=1, value=reg_name)
-		ws.cell(row=row_offset, column=2, value=id_keys_str)
-		ws.cell(row=row_offset, column=3, value=what)
-		ws.cell(row=row_offset, column=4, value=notes).alignment = Alignment(
-			wrap_text=True
-		)
-
-	# --- Part B: field-by-registry matrix ---
-	matrix_start = 10
-	ws.cell(
-		row=matrix_start, column=1, value="Field coverage by registry"
-	).font = section_font
-
-	for col_idx, h in enumerate(["Field", "Label"] + REGISTRY_NAMES, 1):
-		c = ws.cell(row=matrix_start + 1, column=col_idx, value=h)
-		c.font = hdr_font
-		c.fill = hdr_fill
-		c.alignment = hdr_align
-
-	for row_offset, col_name in enumerate(all_data_cols, matrix_start + 2):
-		label, _, sources_str = _sources_for(
-			col_name, admin_labels, admin_help, model_help
-		)
-		ws.cell(row=row_offset, column=1, value=col_name)
-		ws.cell(row=row_offset, column=2, value=label)
-		for reg_col, reg_name in enumerate(REGISTRY_NAMES, 3):
-			# Normalise for matching: "EU CTIS" matches "EU CTIS" or "EU Clinical"
-			src_lower = sources_str.lower()
-			reg_lower = reg_name.lower()
-			tick = "✓" if reg_lower in src_lower else ""
-			if not tick and reg_name == "EU CTIS" and "eu ctis" not in src_lower:
-				if "eu clinical" in src_lower:
-					tick = "✓"
-			ws.cell(row=row_offset, column=reg_col, value=tick)
-
-	# Column widths
-	for letter, width in zip("ABCDE", [32, 32, 22, 22, 22]):
-		ws.column_dimensions[letter].width = width
-
-
-def _category_rows(subjects):
-	"""Return one row per (subject, category) pair, ordered by subject then category name.
-
-	Categories with no subject never appear here: filtering by `subjects=subject`
-	only matches categories reachable from an exported subject.
-	"""
-	rows = []
-	for subject in subjects:
-		cats = list(
-			TeamCategory.objects.filter(subjects=subject)
-			.select_related("team")
-			.order_by(Lower("category_name"))
-		)
-		if not cats:
-			continue
-		counts = {
-			r["team_categories"]: r["n"]
-			for r in (
-				Trials.objects.filter(
-					subjects=subject, team_categories__in=[c.pk for c in cats]
-				)
-				.values("team_categories")
-				.annotate(n=Count("pk", distinct=True))
-			)
-		}
-		for cat in cats:
-			weights = cat.get_scored_fields("trial")
-			weights_str = "; ".join(f"{f}:{w}" for f, w in weights.items() if w)
-			rows.append(
-				(
-					subject.subject_name,
-					cat.team.name,
-					cat.category_name,
-					cat.category_slug or "",
-					cat.category_description or "",
-					"; ".join(cat.category_terms or []),
-					len(cat.category_terms or []),
-					cat.get_category_type_display(),
-					cat.get_modality_display() if cat.modality else "",
-					cat.get_match_scope_display(),
-					cat.match_min_score_trials,
-					weights_str,
-					counts.get(cat.pk, 0),
-					_cell_value(cat.last_synced_at),
-				)
-			)
-	return rows
-
-
-def _build_categories_sheet(wb, subjects):
-	"""Add a Categories sheet — one row per (subject, category) pair."""
-	ws = wb.create_sheet(title="Categories")
-	section_font = Font(bold=True, size=13)
-
-	ws.cell(
-		row=1, column=1, value="Categories and their search terms"
-	).font = section_font
-	prose_cell = ws.cell(row=2, column=1, value=CATEGORY_MATCH_PROSE)
-	prose_cell.alignment = Alignment(wrap_text=True)
-	last_col_letter = get_column_letter(len(CATEGORY_COLUMNS))
-	ws.merge_cells(f"A2:{last_col_letter}2")
-	ws.row_dimensions[2].height = 90
-
-	_apply_header(ws, CATEGORY_COLUMNS, row=4)
-	ws.freeze_panes = "A5"
-	ws.auto_filter.ref = f"A4:{last_col_letter}4"
-
-	rows = _category_rows(subjects)
-	desc_col = CATEGORY_COLUMNS.index("Description") + 1
-	terms_col = CATEGORY_COLUMNS.index("Search terms") + 1
-
-	if not rows:
-		ws.cell(row=5, column=1, value="No categories found.")
-	else:
-		for row_idx, row_data in enumerate(rows, 5):
-			for col_idx, value in enumerate(row_data, 1):
-				if col_idx in (desc_col, terms_col):
-					_write_safe_text_cell(ws, row_idx, col_idx, value, wrap=True)
-				else:
-					ws.cell(row=row_idx, column=col_idx, value=value)
-
-	wide_widths = {"Description": 65, "Search terms": 65, "Field weights (trials)": 40}
-	for col_idx, name in enumerate(CATEGORY_COLUMNS, 1):
-		letter = get_column_letter(col_idx)
-		ws.column_dimensions[letter].width = wide_widths.get(
-			name, max(12, min(32, len(name) + 4))
-		)
-
 
 class Command(BaseCommand):
 	help = "Export clinical-trial data to an XLSX workbook, one sheet per subject."
@@ -793,143 +81,33 @@ class Command(BaseCommand):
 		)
 
 		# --- Build column plan ---
-		scalar_cols = _build_scalar_columns()
-		remaining_scalars = [
-			c for c in scalar_cols if c not in set(IDENTITY_COLS) and c != "identifiers"
-		]
-
-		# Discover all identifier keys across every exported subject (preserves first-seen order)
+		# Identifier keys across every exported subject (first-seen order)
 		all_subject_ids = [s.pk for s in subjects]
-		id_key_order, seen_keys = [], set()
-		for identifiers in (
-			Trials.objects.filter(subjects__in=all_subject_ids)
-			.exclude(identifiers=None)
-			.values_list("identifiers", flat=True)
-		):
-			if isinstance(identifiers, dict):
-				for k in identifiers:
-					if k not in seen_keys:
-						id_key_order.append(k)
-						seen_keys.add(k)
-
-		id_cols = [f"id_{k}" for k in id_key_order]
-		all_data_cols = (
-			IDENTITY_COLS
-			+ id_cols
-			+ ["identifiers_json"]
-			+ remaining_scalars
-			+ RELATION_COLS
+		all_data_cols = data_columns(
+			identifier_keys(Trials.objects.filter(subjects__in=all_subject_ids))
 		)
 
 		self.stdout.write(f"Exporting {len(subjects)} subject(s) → {output_path}")
 
 		# --- Build workbook ---
-		wb = Workbook()
-		wb.remove(wb.active)  # remove the default blank sheet
+		# Write-only: rows go to disk as they are appended, so memory does
+		# not grow with the number of trials (see gregory/utils/trials_xlsx.py).
+		wb = new_workbook()
 		used_sheet_names: set = {"Categories", "Glossary", "Registries"}
 
 		for subject in subjects:
 			sheet_name = _sanitise_sheet_name(subject.subject_name, used_sheet_names)
-			ws = wb.create_sheet(title=sheet_name)
-
 			qs = (
 				Trials.objects.filter(subjects=subject)
 				.distinct()
 				.order_by("-discovery_date")
-				.select_related("primary_sponsor_normalized")
-				.prefetch_related(
-					"subjects",
-					"teams",
-					"sources",
-					"team_categories",
-					"article_references__article",
-					"trial_countries",
-				)
 			)
-
-			count = qs.count()
+			count = write_trials_sheet(wb, sheet_name, qs, all_data_cols)
 			self.stdout.write(f'  Sheet "{sheet_name}": {count} trial(s)')
 
-			_apply_header(ws, all_data_cols)
-			ws.freeze_panes = "A2"
-			ws.auto_filter.ref = f"A1:{get_column_letter(len(all_data_cols))}1"
-
-			if count == 0:
-				ws.cell(row=2, column=1, value="No trials found for this subject.")
-			else:
-				scalar_set = set(IDENTITY_COLS) | set(remaining_scalars)
-				for row_idx, trial in enumerate(qs, 2):
-					identifiers = trial.identifiers or {}
-					row_data = []
-					for col_name in all_data_cols:
-						if col_name in scalar_set:
-							row_data.append(_cell_value(getattr(trial, col_name, None)))
-						elif col_name.startswith("id_"):
-							row_data.append(_cell_value(identifiers.get(col_name[3:])))
-						elif col_name == "identifiers_json":
-							row_data.append(
-								json.dumps(identifiers, ensure_ascii=False)
-								if identifiers
-								else ""
-							)
-						elif col_name == "subjects":
-							row_data.append(
-								"; ".join(s.subject_name for s in trial.subjects.all())
-							)
-						elif col_name == "teams":
-							row_data.append(
-								"; ".join(t.name for t in trial.teams.all())
-							)
-						elif col_name == "sources":
-							row_data.append(
-								"; ".join(src.name or "" for src in trial.sources.all())
-							)
-						elif col_name == "team_categories":
-							row_data.append(
-								"; ".join(
-									tc.category_name
-									for tc in trial.team_categories.all()
-								)
-							)
-						elif col_name == "articles":
-							refs = list(trial.article_references.all())
-							if refs:
-								links = "; ".join(r.article.link for r in refs)
-								row_data.append(f"{len(refs)}: {links}")
-							else:
-								row_data.append("")
-						elif col_name == "trial_countries":
-							row_data.append(_format_trial_countries(trial))
-						elif col_name == "sponsor_id":
-							sponsor = trial.primary_sponsor_normalized
-							row_data.append(sponsor.pk if sponsor else "")
-						elif col_name == "sponsor_slug":
-							sponsor = trial.primary_sponsor_normalized
-							row_data.append(sponsor.slug if sponsor else "")
-						elif col_name == "primary_sponsor_normalized":
-							sponsor = trial.primary_sponsor_normalized
-							row_data.append(sponsor.name if sponsor else "")
-						elif col_name == "sponsor_type_normalized":
-							sponsor = trial.primary_sponsor_normalized
-							row_data.append(
-								(sponsor.sponsor_type or "") if sponsor else ""
-							)
-						elif col_name == "sponsor_type_source":
-							sponsor = trial.primary_sponsor_normalized
-							row_data.append(
-								(sponsor.sponsor_type_source or "") if sponsor else ""
-							)
-						else:
-							row_data.append("")
-
-					for col_idx, value in enumerate(row_data, 1):
-						ws.cell(row=row_idx, column=col_idx, value=value)
-
-			_set_column_widths(ws, all_data_cols)
-
-		_build_categories_sheet(wb, subjects)
-		_build_glossary_sheet(wb, all_data_cols)
-		_build_registries_sheet(wb, all_data_cols)
+		build_categories_sheet(wb, subjects)
+		build_glossary_sheet(wb, all_data_cols)
+		build_registries_sheet(wb, all_data_cols)
 
 		wb.save(output_path)
 		self.stdout.write(self.style.SUCCESS(f"Saved: {output_path}"))
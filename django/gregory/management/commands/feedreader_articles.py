@@ -10,8 +10,10 @@ from django.db import transaction
 from django.utils import timezone
 from gregory.classes import SciencePaper
 from gregory.services.article_merge import assign_doi_or_merge
+from gregory.utils.bulk_history import deferred_history
 from gregory.utils.doi_utils import extract_doi_from_url, resolve_doi_from_pubmed_url
 from gregory.utils.registry_utils import merge_links
+from gregory.utils.source_stats import refresh_source_stats
 from sitesettings.models import CustomSetting
 import feedparser
 import gregory.functions as greg
@@ -558,38 +560,44 @@ class Command(GregoryBaseCommand):
 					level=1,
 					style_func=self.style.ERROR,
 				)
+				refresh_source_stats(source, fetch_ok=False, error=e)
 				continue
 			processor = self.get_feed_processor(source.link)
 
-			for entry in feed["entries"]:
-				try:
-					# Check if the article should be included based on keyword filtering
-					prefetched = None
-					if hasattr(
-						processor, "should_include_article"
-					) and not processor.should_include_article(entry, source):
-						# Sparse feeds (e.g. Nature) ship empty summaries, so
-						# the filter above only saw the title; give the entry a
-						# second chance against its CrossRef abstract.
-						included, prefetched = self.deferred_keyword_check(
-							entry, source, processor
-						)
-						if not included:
-							self.log(
-								f"  ➡️  Excluded by keyword filter: {entry.get('title', 'Unknown')}",
-								level=2,
+			# History rows of the source's articles and authors are inserted
+			# in bulk once its feed is processed
+			with deferred_history():
+				for entry in feed["entries"]:
+					try:
+						# Check if the article should be included based on keyword filtering
+						prefetched = None
+						if hasattr(
+							processor, "should_include_article"
+						) and not processor.should_include_article(entry, source):
+							# Sparse feeds (e.g. Nature) ship empty summaries, so
+							# the filter above only saw the title; give the entry a
+							# second chance against its CrossRef abstract.
+							included, prefetched = self.deferred_keyword_check(
+								entry, source, processor
 							)
-							continue
-
-					self.process_feed_entry(
-						entry, source, processor, prefetched=prefetched
-					)
-				except Exception as e:
-					self.log(
-						f"Error processing entry '{entry.get('title', 'Unknown')}': {str(e)}",
-						level=2,
-					)
-					continue
+							if not included:
+								self.log(
+									f"  ➡️  Excluded by keyword filter: {entry.get('title', 'Unknown')}",
+									level=2,
+								)
+								continue
+
+						self.process_feed_entry(
+							entry, source, processor, prefetched=prefetched
+						)
+					except Exception as e:
+						self.log(
+							f"Error processing entry '{entry.get('title', 'Unknown')}': {str(e)}",
+							level=2,
+						)
+						continue
+
+			refresh_source_stats(source, fetch_ok=True)
 
 	def deferred_keyword_check(
 		self, entry: dict, source: Sources, processor: FeedProcessor
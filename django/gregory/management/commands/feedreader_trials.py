@@ -6,6 +6,7 @@ from django.utils import timezone
 from gregory.classes import ClinicalTrial, EUTrialParser
 from gregory.functions import remove_utm
 from gregory.models import Trials, Sources
+from gregory.utils.source_stats import refresh_source_stats
 from gregory.utils.registry_utils import (
 	identifiers_conflict,
 	merge_links,
@@ -61,6 +62,7 @@ class Command(GregoryBaseCommand):
 					level=1,
 					style_func=self.style.ERROR,
 				)
+				refresh_source_stats(source, fetch_ok=False, error=e)
 				continue
 			for entry in feed["entries"]:
 				try:
@@ -123,6 +125,7 @@ class Command(GregoryBaseCommand):
 						style_func=self.style.ERROR,
 					)
 
+			refresh_source_stats(source, fetch_ok=True)
 			self.log(
 				f"Finished processing RSS feed: {source.name}",
 				level=1,
@@ -12,6 +12,11 @@ Source Configuration:
     - "INTERVENTION:rituximab, ocrelizumab" - search by intervention/treatment
     - "TERM:some general search" - general search terms
 
+Paging: results are processed a page (page_size studies) at a time.
+ClinicalTrialsGovAPI.search_all requests the next page while the current one
+is written, and each page's existing trials are looked up with one query per
+matching key (_load_candidates) rather than several per study.
+
 Usage:
 	python manage.py feedreader_trials_ctgov
 	python manage.py feedreader_trials_ctgov --max-results 500
@@ -19,9 +24,13 @@ Usage:
 """
 
 from datetime import timedelta
+from functools import reduce
+from itertools import islice
+from operator import or_
 
 from gregory.management.base import GregoryBaseCommand
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Q, prefetch_related_objects
 from django.utils import timezone
 from gregory.classes import ClinicalTrialsGovAPI, ClinicalTrial
 from gregory.models import Trials, Sources
@@ -33,6 +42,7 @@ from gregory.utils.registry_utils import (
 	merge_countries_by_source,
 	safe_change_reason,
 )
+from gregory.utils.source_stats import refresh_source_stats
 from gregory.utils.trial_site_sync import replace_trial_sites
 
 
@@ -143,6 +153,7 @@ class Command(GregoryBaseCommand):
 			error_count = 0
 			fetched_count = 0
 			fetch_failed = False
+			fetch_error = None
 			# Anchor candidate: taken BEFORE paging starts, so trials updated while
 			# we page are re-covered by the next run's window.
 			fetch_started = timezone.now()
@@ -165,72 +176,24 @@ class Command(GregoryBaseCommand):
 						style_func=self.style.WARNING,
 					)
 
-				# Fetch studies from the API
-				for study_data in self.api.search_all(
-					max_results=max_results, **search_kwargs
-				):
-					fetched_count += 1
-					# Pre-bind so the except handlers below can reference it even
-					# when parse_study_to_clinical_trial itself raises.
-					clinical_trial = None
-					try:
-						# Convert API response to ClinicalTrial object
-						clinical_trial = self.api.parse_study_to_clinical_trial(
-							study_data
-						)
-
-						if not clinical_trial.title:
-							self.log(f"Skipping study with no title", level=3)
-							continue
-
-						# Debug output
-						if self.debug:
-							self._print_trial_debug(clinical_trial)
-
-						# Check for existing trial
-						existing_trial = self.find_existing_trial(clinical_trial)
-
-						if existing_trial:
-							self.update_existing_trial(
-								existing_trial, clinical_trial, source
-							)
-							self._capture_trial_sites(existing_trial, study_data)
-							self.log(
-								f"Updated existing trial: {existing_trial.title[:80]}...",
-								level=2,
-								style_func=self.style.SUCCESS,
-							)
-							updated_count += 1
-						else:
-							new_trial = self.create_new_trial(clinical_trial, source)
-							self._capture_trial_sites(new_trial, study_data)
-							self.log(
-								f"Created new trial: {clinical_trial.title[:80]}...",
-								level=2,
-								style_func=self.style.SUCCESS,
-							)
-							created_count += 1
-
-					except IntegrityError as e:
-						self.stdout.write(
-							self.style.ERROR(
-								f"IntegrityError for trial '{clinical_trial.title[:50]}...' (NCT: {clinical_trial.identifiers.get('nct', 'N/A')}): {e}"
-							)
-						)
-						error_count += 1
-					except Exception as e:
-						nct_id = (
-							clinical_trial.identifiers.get("nct", "unknown")
-							if clinical_trial
-							else "unknown"
-						)
-						self.stdout.write(
-							self.style.ERROR(f"Error processing trial {nct_id}: {e}")
-						)
-						error_count += 1
+				# Fetch studies from the API a page at a time: search_all prefetches
+				# the next page while this one is written, and each page's
+				# duplicate lookups run as one set of queries (_load_candidates)
+				# instead of several per study.
+				page_size = search_kwargs.get("page_size") or 100
+				studies = iter(
+					self.api.search_all(max_results=max_results, **search_kwargs)
+				)
+				while page := list(islice(studies, page_size)):
+					fetched_count += len(page)
+					created, updated, errors = self._process_page(page, source)
+					created_count += created
+					updated_count += updated
+					error_count += errors
 
 			except Exception as e:
 				fetch_failed = True
+				fetch_error = e
 				self.fetch_errors.append(f"{source.name}: {e}")
 				self.log(
 					f"Error fetching from source {source.name}: {e}",
@@ -267,12 +230,96 @@ class Command(GregoryBaseCommand):
 				source.last_successful_fetch_at = fetch_started
 				source.save(update_fields=["last_successful_fetch_at"])
 
+			refresh_source_stats(source, fetch_ok=not fetch_failed, error=fetch_error)
+
 			self.log(
 				f"Finished processing source: {source.name} - Created: {created_count}, Updated: {updated_count}, Errors: {error_count}",
 				level=1,
 				style_func=self.style.SUCCESS,
 			)
 
+	def _process_page(self, page, source, create_missing=True):
+		"""Parse, match and write one page of studies. Returns
+		(created, updated, errors). With create_missing=False, studies that
+		match no stored trial are left out (counted in none of the three).
+
+		Each study is written in its own savepoint, so a caller may run a
+		whole page inside one transaction (import_ctgov_archive) without one
+		failing study aborting the rest."""
+		created_count = updated_count = error_count = 0
+		parsed = []
+		for study_data in page:
+			# Pre-bind so the except handler below can reference it even when
+			# parse_study_to_clinical_trial itself raises.
+			clinical_trial = None
+			try:
+				# Convert API response to ClinicalTrial object
+				clinical_trial = self.api.parse_study_to_clinical_trial(study_data)
+			except Exception as e:
+				self.stdout.write(
+					self.style.ERROR(f"Error processing trial unknown: {e}")
+				)
+				error_count += 1
+				continue
+			if not clinical_trial.title:
+				self.log(f"Skipping study with no title", level=3)
+				continue
+			parsed.append((study_data, clinical_trial))
+
+		candidates = self._load_candidates(
+			[clinical_trial for _, clinical_trial in parsed]
+		)
+		# update_existing_trial checks these memberships on every match.
+		prefetch_related_objects(candidates, "sources", "teams", "subjects")
+
+		for study_data, clinical_trial in parsed:
+			try:
+				# Debug output
+				if self.debug:
+					self._print_trial_debug(clinical_trial)
+
+				# Check for existing trial
+				existing_trial = self._match_existing(clinical_trial, candidates)
+
+				if existing_trial:
+					with transaction.atomic():
+						self.update_existing_trial(existing_trial, clinical_trial, source)
+						self._capture_trial_sites(existing_trial, study_data)
+					self.log(
+						f"Updated existing trial: {existing_trial.title[:80]}...",
+						level=2,
+						style_func=self.style.SUCCESS,
+					)
+					updated_count += 1
+				elif create_missing:
+					with transaction.atomic():
+						new_trial = self.create_new_trial(clinical_trial, source)
+						self._capture_trial_sites(new_trial, study_data)
+					# A later study on this page may be the same trial again.
+					candidates.append(new_trial)
+					self.log(
+						f"Created new trial: {clinical_trial.title[:80]}...",
+						level=2,
+						style_func=self.style.SUCCESS,
+					)
+					created_count += 1
+
+			except IntegrityError as e:
+				self.stdout.write(
+					self.style.ERROR(
+						f"IntegrityError for trial '{clinical_trial.title[:50]}...' (NCT: {clinical_trial.identifiers.get('nct', 'N/A')}): {e}"
+					)
+				)
+				error_count += 1
+			except Exception as e:
+				nct_id = clinical_trial.identifiers.get("nct", "unknown")
+				self.stdout.write(
+					self.style.ERROR(f"Error processing trial {nct_id}: {e}")
+				)
+				error_count += 1
+
+		return created_count, updated_count, error_count
+
 	def _build_search_params(self, source):
 		"""Build API search parameters from source configuration.
 
@@ -343,20 +390,68 @@ class Command(GregoryBaseCommand):
 
 	def find_existing_trial(self, clinical_trial: ClinicalTrial):
 		"""Find an existing trial by NCT ID, title, or link."""
+		return self._match_existing(
+			clinical_trial, self._load_candidates([clinical_trial])
+		)
+
+	def _load_candidates(self, clinical_trials):
+		"""Every stored trial that any of *clinical_trials* could match under
+		_match_existing's rules, ordered by pk — one query per matching key
+		for the whole batch instead of several per trial."""
+		ncts = set()
+		org_study_ids = set()
+		links = set()
+		titles = set()
+		for clinical_trial in clinical_trials:
+			identifiers = clinical_trial.identifiers or {}
+			if identifiers.get("nct"):
+				ncts.add(identifiers["nct"])
+			if identifiers.get("org_study_id"):
+				org_study_ids.add(identifiers["org_study_id"])
+			if clinical_trial.link:
+				links.add(clinical_trial.link)
+			if clinical_trial.title:
+				titles.add(clinical_trial.title.upper())
+
+		lookups = []
+		if ncts:
+			lookups.append(Q(identifiers__nct__in=ncts))
+			# Also search for NCT IDs in the link field (e.g.
+			# https://clinicaltrials.gov/study/NCT12345)
+			lookups.append(
+				reduce(or_, (Q(link__icontains=nct_id) for nct_id in sorted(ncts)))
+			)
+		if org_study_ids:
+			lookups.append(Q(identifiers__org_study_id__in=org_study_ids))
+		if links:
+			lookups.append(Q(link__in=links))
+		if titles:
+			lookups.append(Q(utitle__in=titles))
+
+		found = {}
+		for lookup in lookups:
+			for trial in Trials.objects.filter(lookup).exclude(pk__in=found):
+				found[trial.pk] = trial
+		return [found[pk] for pk in sorted(found)]
+
+	def _match_existing(self, clinical_trial: ClinicalTrial, candidates):
+		"""Pick clinical_trial's existing row out of *candidates* (from
+		_load_candidates): by NCT ID, then org study ID, link, or title. The
+		lowest pk wins within each rule, as .first() did."""
 		identifiers = clinical_trial.identifiers
-		title = clinical_trial.title.lower() if clinical_trial.title else None
 
 		# First try to find by NCT ID (most reliable)
 		if identifiers.get("nct"):
 			nct_id = identifiers["nct"]
 			# Try exact match in identifiers JSON
-			trial = Trials.objects.filter(identifiers__nct=nct_id).first()
-			if trial:
-				return trial
-			# Also search for NCT ID in link field (e.g., https://clinicaltrials.gov/study/NCT12345)
-			trial = Trials.objects.filter(link__icontains=nct_id).first()
-			if trial:
-				return trial
+			for trial in candidates:
+				if (trial.identifiers or {}).get("nct") == nct_id:
+					return trial
+			# Also search for NCT ID in link field
+			needle = str(nct_id).lower()
+			for trial in candidates:
+				if needle in (trial.link or "").lower():
+					return trial
 
 		# Org study IDs are sponsor protocol codes, not registry identifiers —
 		# they are not globally unique (two sponsors can both use "001"). An
@@ -366,10 +461,9 @@ class Command(GregoryBaseCommand):
 		# merge_trials can recover later — a wrong merge silently loses a trial.
 		org_study_id = identifiers.get("org_study_id")
 		if org_study_id:
-			candidates = Trials.objects.filter(
-				identifiers__org_study_id=org_study_id
-			)
 			for candidate in candidates:
+				if (candidate.identifiers or {}).get("org_study_id") != org_study_id:
+					continue
 				if identifiers_conflict(candidate.identifiers, identifiers):
 					continue
 				if self._corroborates(candidate, clinical_trial):
@@ -377,16 +471,18 @@ class Command(GregoryBaseCommand):
 
 		# Try by link (ClinicalTrials.gov URL)
 		if clinical_trial.link:
-			trial = Trials.objects.filter(link=clinical_trial.link).first()
-			if trial:
-				return trial
+			for trial in candidates:
+				if trial.link == clinical_trial.link:
+					return trial
 
 		# Fallback to title match (case-insensitive) — only merge when the candidate
 		# does not conflict on a shared registry key (Option B guard).
-		if title:
-			candidate = Trials.objects.filter(
-				title__iexact=clinical_trial.title
-			).first()
+		if clinical_trial.title:
+			title = clinical_trial.title.upper()
+			candidate = next(
+				(trial for trial in candidates if (trial.title or "").upper() == title),
+				None,
+			)
 			if candidate and not identifiers_conflict(
 				candidate.identifiers, clinical_trial.identifiers
 			):
@@ -471,11 +567,9 @@ class Command(GregoryBaseCommand):
 			)
 
 			if trial:
+				# Relationships first, then one save (and one Trials.save()
+				# normalisation pass) with the combined change reason.
 				trial.sources.add(source)
-				trial._change_reason = safe_change_reason(
-					f"Created from ClinicalTrials.gov API Source: {source.name}"
-				)
-				trial.save()
 				if source.team:
 					trial.teams.add(source.team)
 				else:
@@ -487,7 +581,8 @@ class Command(GregoryBaseCommand):
 				if source.subject:
 					trial.subjects.add(source.subject)
 				trial._change_reason = safe_change_reason(
-					f"Added relationships Team: {source.team} Subject: {source.subject}"
+					f"Created from ClinicalTrials.gov API Source: {source.name} "
+					f"Team: {source.team} Subject: {source.subject}"
 				)
 				trial.save()
 
@@ -503,7 +598,6 @@ class Command(GregoryBaseCommand):
 
 	def update_existing_trial(self, existing_trial, clinical_trial, source):
 		"""Update an existing trial with new data only when necessary."""
-		has_changes = False
 		updated_fields = []
 
 		# Update title only if it won't cause a duplicate conflict
@@ -522,12 +616,10 @@ class Command(GregoryBaseCommand):
 				)
 			else:
 				existing_trial.title = clinical_trial.title
-				has_changes = True
 				updated_fields.append("title")
 
 		if existing_trial.summary != clinical_trial.summary and clinical_trial.summary:
 			existing_trial.summary = clinical_trial.summary
-			has_changes = True
 			updated_fields.append("summary")
 
 		if (
@@ -535,7 +627,6 @@ class Command(GregoryBaseCommand):
 			and clinical_trial.published_date
 		):
 			existing_trial.published_date = clinical_trial.published_date
-			has_changes = True
 			updated_fields.append("published_date")
 
 		# Update identifiers (merge)
@@ -544,7 +635,6 @@ class Command(GregoryBaseCommand):
 		)
 		if merged_identifiers != existing_trial.identifiers:
 			existing_trial.identifiers = merged_identifiers
-			has_changes = True
 			updated_fields.append("identifiers")
 
 		# Record this source's URL under its registry key. The canonical link is
@@ -554,12 +644,10 @@ class Command(GregoryBaseCommand):
 		merged_links = merge_links(existing_trial.links, clinical_trial.link)
 		if merged_links != (existing_trial.links or {}):
 			existing_trial.links = merged_links
-			has_changes = True
 			updated_fields.append("links")
 		new_link = canonical_link(existing_trial.links, existing_trial.link)
 		if new_link and existing_trial.link != new_link:
 			existing_trial.link = new_link
-			has_changes = True
 			updated_fields.append("link")
 
 		# Update extra fields
@@ -608,7 +696,6 @@ class Command(GregoryBaseCommand):
 			# Only update if new value is not None/empty and different from current
 			if new_value and current_value != new_value:
 				setattr(existing_trial, field, new_value)
-				has_changes = True
 				updated_fields.append(field)
 
 		# Record this source's raw countries value under its own key (never touching any
@@ -619,7 +706,6 @@ class Command(GregoryBaseCommand):
 		)
 		if merged_countries_by_source != (existing_trial.countries_by_source or {}):
 			existing_trial.countries_by_source = merged_countries_by_source
-			has_changes = True
 			updated_fields.append("countries_by_source")
 
 		# Acronym is fill-once: a value set by an earlier import (e.g. WHO ICTRP)
@@ -627,34 +713,25 @@ class Command(GregoryBaseCommand):
 		new_acronym = extras.get("acronym")
 		if new_acronym and not existing_trial.acronym:
 			existing_trial.acronym = new_acronym
-			has_changes = True
 			updated_fields.append("acronym")
 
-		# Save if changes were detected
-		if has_changes:
-			existing_trial._change_reason = safe_change_reason(
-				f"Updated from {source.name}: {', '.join(updated_fields[:3])}"
-			)
-			existing_trial.save()
-
-		# Handle relationships
+		# Handle relationships. Membership is checked against the (prefetched,
+		# see _process_page) related sets; field and relationship changes are
+		# then written with one save instead of up to four.
 		if source.subject and source.subject not in existing_trial.subjects.all():
 			existing_trial.subjects.add(source.subject)
-			existing_trial._change_reason = safe_change_reason(
-				f"Added subject: {source.subject}"
-			)
-			existing_trial.save()
+			updated_fields.append(f"subject {source.subject}")
 
 		if source not in existing_trial.sources.all():
 			existing_trial.sources.add(source)
-			existing_trial._change_reason = safe_change_reason(
-				f"Added source: {source.name}"
-			)
-			existing_trial.save()
+			updated_fields.append(f"source {source.name}")
 
 		if source.team and source.team not in existing_trial.teams.all():
 			existing_trial.teams.add(source.team)
+			updated_fields.append(f"team {source.team}")
+
+		if updated_fields:
 			existing_trial._change_reason = safe_change_reason(
-				f"Added team: {source.team}"
+				f"Updated from {source.name}: {', '.join(updated_fields[:3])}"
 			)
 			existing_trial.save()
@@ -43,13 +43,18 @@ or a fill-if-empty).
 Usage:
 	python manage.py feedreader_trials_ctis
 	python manage.py feedreader_trials_ctis --limit 500
-	python manage.py feedreader_trials_ctis --source-id 12 --sleep 1
-	python manage.py feedreader_trials_ctis --enrich-all --sleep 0.5
+	python manage.py feedreader_trials_ctis --source-id 12 --rate 2
+	python manage.py feedreader_trials_ctis --enrich-all --workers 8
+
+/retrieve GETs are the bulk of a run's wall time, so they are fetched
+concurrently (--workers threads) a batch of records at a time, paced by the API
+client's shared token-bucket limiter (--rate requests/second, backing off on
+429/5xx). Everything that touches the database still runs on the command's own
+thread, in the order /search returned the records.
 """
 
 import logging
 import re
-import time
 from datetime import timedelta
 
 from gregory.management.base import GregoryBaseCommand
@@ -59,6 +64,7 @@ from django.utils import timezone
 from gregory.classes import ClinicalTrial, CTISPublicAPI
 from gregory.models import Trials, Sources
 from gregory.utils.ctis_backup import save_retrieve_backup
+from gregory.utils.rate_limit import map_in_order
 from gregory.utils.registry_utils import (
 	identifiers_conflict,
 	merge_links,
@@ -67,6 +73,7 @@ from gregory.utils.registry_utils import (
 	merge_countries_by_source,
 	safe_change_reason,
 )
+from gregory.utils.source_stats import refresh_source_stats
 from gregory.utils.trial_field_normalizers import _name_to_code_lookup
 from gregory.utils.trial_site_sync import replace_trial_sites
 
@@ -87,6 +94,13 @@ BACKUPS_DIR = "/code/backups"
 # without it, a non-CTIS ct_number 400s against the CTIS API.
 CTIS_NUMBER_RE = re.compile(r"^\d{4}-\d{6}-\d{2}-\d{2}$")
 
+# Concurrent /retrieve GETs in flight; the request rate itself is capped by the
+# API client's limiter (CTISPublicAPI.DEFAULT_RATE), not by this.
+DEFAULT_WORKERS = 4
+# Records gathered before their /retrieve GETs are fanned out — one default
+# /search page.
+RETRIEVE_BATCH_SIZE = 50
+
 
 def _extract_row_countries(payload: dict) -> list:
 	"""authorizedApplication.authorizedPartI.rowCountriesInfo[] -> the list of
@@ -255,8 +269,22 @@ class Command(GregoryBaseCommand):
 		parser.add_argument(
 			"--sleep",
 			type=float,
-			default=0.5,
-			help="Seconds to sleep between page requests (default: 0.5)",
+			default=0,
+			help="Extra seconds to pause between search pages, on top of the "
+			"rate limiter (default: 0)",
+		)
+		parser.add_argument(
+			"--rate",
+			type=float,
+			default=CTISPublicAPI.DEFAULT_RATE,
+			help="Maximum CTIS requests per second across all workers; halved "
+			"automatically on 429/5xx (default: %s)" % CTISPublicAPI.DEFAULT_RATE,
+		)
+		parser.add_argument(
+			"--workers",
+			type=int,
+			default=DEFAULT_WORKERS,
+			help="Concurrent /retrieve requests (default: %s)" % DEFAULT_WORKERS,
 		)
 		parser.add_argument(
 			"--limit",
@@ -283,20 +311,20 @@ class Command(GregoryBaseCommand):
 		)
 
 	def handle(self, *args, **options):
-		self.api = CTISPublicAPI()
+		self.api = CTISPublicAPI(rate=options.get("rate") or CTISPublicAPI.DEFAULT_RATE)
+		workers = options.get("workers") or DEFAULT_WORKERS
 		if options.get("enrich_all"):
-			self.enrich_all_trials(
-				sleep=options.get("sleep", 0.5), limit=options.get("limit")
-			)
+			self.enrich_all_trials(limit=options.get("limit"), workers=workers)
 			return
 		self.process_sources(
-			sleep=options.get("sleep", 0.5),
+			sleep=options.get("sleep", 0),
 			limit=options.get("limit"),
 			source_id=options.get("source_id"),
 			backup_dir=options.get("backup_dir"),
+			workers=workers,
 		)
 
-	def enrich_all_trials(self, sleep=0.5, limit=None):
+	def enrich_all_trials(self, limit=None, workers=DEFAULT_WORKERS):
 		"""One-time sweep / general re-run path: re-fetch /retrieve and re-apply the
 		enrichment for every trial already holding a genuine CTIS-format identifier,
 		regardless of whether the search sync touched it this run.
@@ -315,6 +343,19 @@ class Command(GregoryBaseCommand):
 		processed = 0
 		enriched = 0
 		skipped = 0
+		batch = []
+
+		def flush():
+			nonlocal enriched
+			payloads = self._fetch_retrieve_payloads(
+				[ct_number for _, ct_number in batch], workers
+			)
+			for (trial, _), payload in zip(batch, payloads):
+				if payload is not None:
+					self._enrich_from_retrieve(trial, payload)
+					enriched += 1
+			batch.clear()
+
 		for trial in trials.iterator():
 			identifiers = trial.identifiers or {}
 			ct_number = identifiers.get("euct")
@@ -331,15 +372,13 @@ class Command(GregoryBaseCommand):
 				continue
 
 			processed += 1
-			payload = self._fetch_retrieve_payload(ct_number)
-			if payload is not None:
-				self._enrich_from_retrieve(trial, payload)
-				enriched += 1
-
-			if sleep:
-				time.sleep(sleep)
+			batch.append((trial, ct_number))
+			if len(batch) >= RETRIEVE_BATCH_SIZE:
+				flush()
 			if limit and processed >= limit:
 				break
+		if batch:
+			flush()
 
 		self.log(
 			f"CTIS enrich-all: processed {processed} trial(s), enriched {enriched}, "
@@ -348,7 +387,9 @@ class Command(GregoryBaseCommand):
 			style_func=self.style.SUCCESS,
 		)
 
-	def process_sources(self, sleep=0.5, limit=None, source_id=None, backup_dir=None):
+	def process_sources(
+		self, sleep=0, limit=None, source_id=None, backup_dir=None, workers=DEFAULT_WORKERS
+	):
 		"""Fetch and process trials from CTIS public API sources.
 
 		Per-source fetch failures are isolated and recorded in ``self.fetch_errors``
@@ -392,6 +433,7 @@ class Command(GregoryBaseCommand):
 			error_count = 0
 			fetched_count = 0
 			fetch_failed = False
+			fetch_error = None
 			# Anchor candidate: taken BEFORE paging starts, so trials updated while
 			# we page are re-covered by the next run's window.
 			fetch_started = timezone.now()
@@ -414,105 +456,27 @@ class Command(GregoryBaseCommand):
 					style_func=self.style.WARNING,
 				)
 
+			# Records are gathered a batch at a time so their /retrieve GETs can
+			# be fetched concurrently; each batch is then written in order. A
+			# search failure mid-walk still processes what was gathered.
+			batch = []
 			try:
 				for record in self.api.iter_search(criteria, since=since, sleep=sleep):
 					fetched_count += 1
-					clinical_trial = None
-					try:
-						clinical_trial = self.api.parse_ctis_search_record(record)
-						if not clinical_trial.title or not (
-							clinical_trial.identifiers or {}
-						).get("euct"):
-							self.log(
-								"Skipping record with no title or ctNumber", level=3
-							)
-							continue
-
-						existing_trial = self.find_existing_trial(clinical_trial)
-
-						# Skip the expensive /retrieve GET for records outside the
-						# incremental window — iter_search still yields them (so the
-						# cheap DB non-destructive-update below still runs), but a
-						# wholly-stale trailing page can otherwise cost up to `size`
-						# unnecessary heavy GETs per run for trials that haven't changed.
-						# Fetched once and reused for both the disk archive and the DB
-						# enrichment below, so a changed trial costs exactly one GET.
-						# A genuinely new trial always gets fetched regardless of
-						# staleness: record_is_stale is about a record being
-						# *unchanged*, not about it being new to our DB — a trailing
-						# page can still surface a trial we've never stored (e.g. an
-						# aged registry entry seen for the first time), and skipping
-						# it here would leave that trial with no archive and no
-						# enrichment at all.
-						retrieve_payload = None
-						if (
-							since is None
-							or existing_trial is None
-							or not self.api.record_is_stale(record, since)
-						):
-							retrieve_payload = self._fetch_retrieve_payload(
-								clinical_trial.identifiers["euct"]
-							)
-							if retrieve_payload is not None:
-								self._archive_retrieve_payload(
-									retrieve_payload,
-									clinical_trial.identifiers["euct"],
-									backup_dir,
-								)
-
-						if existing_trial:
-							self.update_existing_trial(
-								existing_trial, clinical_trial, source
-							)
-							trial_obj = existing_trial
-							self.log(
-								f"Updated existing trial: {existing_trial.title[:80]}...",
-								level=2,
-								style_func=self.style.SUCCESS,
-							)
-							updated_count += 1
-						else:
-							trial_obj = self.create_new_trial(clinical_trial, source)
-							self.log(
-								f"Created new trial: {clinical_trial.title[:80]}...",
-								level=2,
-								style_func=self.style.SUCCESS,
-							)
-							created_count += 1
-
-						if retrieve_payload is not None and trial_obj is not None:
-							self._enrich_from_retrieve(trial_obj, retrieve_payload)
-
-					except IntegrityError as e:
-						ct_number = (
-							(clinical_trial.identifiers or {}).get("euct", "N/A")
-							if clinical_trial
-							else "N/A"
-						)
-						self.log(
-							f"IntegrityError for trial (CT number: {ct_number}): {e}",
-							level=1,
-							style_func=self.style.ERROR,
-						)
-						error_count += 1
-					except Exception as e:
-						ct_number = (
-							(clinical_trial.identifiers or {}).get("euct", "unknown")
-							if clinical_trial
-							else "unknown"
-						)
-						self.log(
-							f"Error processing trial {ct_number}: {e}",
-							level=1,
-							style_func=self.style.ERROR,
+					batch.append(record)
+					if len(batch) >= RETRIEVE_BATCH_SIZE:
+						created, updated, errors = self._process_batch(
+							batch, source, since, backup_dir, workers
 						)
-						error_count += 1
-
+						created_count += created
+						updated_count += updated
+						error_count += errors
+						batch = []
 					if limit and fetched_count >= limit:
 						break
-
 			except Exception as e:
 				fetch_failed = True
+				fetch_error = e
 				self.fetch_errors.append(f"{source.name}: {e}")
 				self.log(
 					f"Error fetching from source {source.name}: {e}",
@@ -520,6 +484,14 @@ class Command(GregoryBaseCommand):
 					style_func=self.style.ERROR,
 				)
 
+			if batch:
+				created, updated, errors = self._process_batch(
+					batch, source, since, backup_dir, workers
+				)
+				created_count += created
+				updated_count += updated
+				error_count += errors
+
 			# Advance the incremental anchor only after a fully successful run: every
 			# page consumed, no request failure, no item errors, cap not hit. Anything
 			# less means this window may hold trials we did not store, so the next run
@@ -548,6 +520,8 @@ class Command(GregoryBaseCommand):
 				source.last_successful_fetch_at = fetch_started
 				source.save(update_fields=["last_successful_fetch_at"])
 
+			refresh_source_stats(source, fetch_ok=not fetch_failed, error=fetch_error)
+
 			self.log(
 				f"Finished processing source: {source.name} - Created: {created_count}, "
 				f"Updated: {updated_count}, Errors: {error_count}",
@@ -555,6 +529,147 @@ class Command(GregoryBaseCommand):
 				style_func=self.style.SUCCESS,
 			)
 
+	def _process_batch(self, records, source, since, backup_dir, workers):
+		"""Parse, look up, fetch and write one batch of /search records.
+
+		Three passes: (1) parse each record and find its existing trial, on
+		this thread; (2) fetch the /retrieve dossier for every record that
+		needs one, concurrently; (3) archive, create/update and enrich each
+		record in its original order, on this thread. Per-record failures are
+		logged and counted exactly as a serial walk would.
+
+		Returns (created, updated, errors).
+		"""
+		created_count = 0
+		updated_count = 0
+		error_count = 0
+
+		parsed = []
+		for record in records:
+			clinical_trial = None
+			try:
+				clinical_trial = self.api.parse_ctis_search_record(record)
+				if not clinical_trial.title or not (
+					clinical_trial.identifiers or {}
+				).get("euct"):
+					self.log("Skipping record with no title or ctNumber", level=3)
+					continue
+
+				existing_trial = self.find_existing_trial(clinical_trial)
+			except Exception as e:
+				error_count += self._log_record_error(clinical_trial, e)
+				continue
+
+			# Skip the expensive /retrieve GET for records outside the
+			# incremental window — iter_search still yields them (so the
+			# cheap DB non-destructive-update below still runs), but a
+			# wholly-stale trailing page can otherwise cost up to `size`
+			# unnecessary heavy GETs per run for trials that haven't changed.
+			# Fetched once and reused for both the disk archive and the DB
+			# enrichment below, so a changed trial costs exactly one GET.
+			# A genuinely new trial always gets fetched regardless of
+			# staleness: record_is_stale is about a record being
+			# *unchanged*, not about it being new to our DB — a trailing
+			# page can still surface a trial we've never stored (e.g. an
+			# aged registry entry seen for the first time), and skipping
+			# it here would leave that trial with no archive and no
+			# enrichment at all.
+			needs_retrieve = (
+				since is None
+				or existing_trial is None
+				or not self.api.record_is_stale(record, since)
+			)
+			parsed.append((clinical_trial, existing_trial, needs_retrieve))
+
+		to_fetch = [
+			clinical_trial.identifiers["euct"]
+			for clinical_trial, _, needs_retrieve in parsed
+			if needs_retrieve
+		]
+		fetched = iter(self._fetch_retrieve_payloads(to_fetch, workers))
+
+		written_pks = set()
+		for clinical_trial, existing_trial, needs_retrieve in parsed:
+			ct_number = clinical_trial.identifiers["euct"]
+			retrieve_payload = next(fetched) if needs_retrieve else None
+			try:
+				if retrieve_payload is not None:
+					self._archive_retrieve_payload(
+						retrieve_payload, ct_number, backup_dir
+					)
+
+				# Looked up before any of this batch was written: re-check when
+				# an earlier record in the batch may have created or changed
+				# the same trial.
+				if existing_trial is None or existing_trial.pk in written_pks:
+					existing_trial = self.find_existing_trial(clinical_trial)
+
+				if existing_trial:
+					self.update_existing_trial(existing_trial, clinical_trial, source)
+					trial_obj = existing_trial
+					self.log(
+						f"Updated existing trial: {existing_trial.title[:80]}...",
+						level=2,
+						style_func=self.style.SUCCESS,
+					)
+					updated_count += 1
+				else:
+					trial_obj = self.create_new_trial(clinical_trial, source)
+					self.log(
+						f"Created new trial: {clinical_trial.title[:80]}...",
+						level=2,
+						style_func=self.style.SUCCESS,
+					)
+					created_count += 1
+
+				if trial_obj is not None:
+					written_pks.add(trial_obj.pk)
+				if retrieve_payload is not None and trial_obj is not None:
+					self._enrich_from_retrieve(trial_obj, retrieve_payload)
+			except Exception as e:
+				error_count += self._log_record_error(clinical_trial, e)
+
+		return created_count, updated_count, error_count
+
+	def _log_record_error(self, clinical_trial, error):
+		"""Log a per-record failure the way the serial loop always has; returns 1
+		for the caller's error count."""
+		if isinstance(error, IntegrityError):
+			ct_number = (
+				(clinical_trial.identifiers or {}).get("euct", "N/A")
+				if clinical_trial
+				else "N/A"
+			)
+			self.log(
+				f"IntegrityError for trial (CT number: {ct_number}): {error}",
+				level=1,
+				style_func=self.style.ERROR,
+			)
+		else:
+			ct_number = (
+				(clinical_trial.identifiers or {}).get("euct", "unknown")
+				if clinical_trial
+				else "unknown"
+			)
+			self.log(
+				f"Error processing trial {ct_number}: {error}",
+				level=1,
+				style_func=self.style.ERROR,
+			)
+		return 1
+
+	def _fetch_retrieve_payloads(self, ct_numbers, workers=DEFAULT_WORKERS):
+		"""Fetch /retrieve dossiers for *ct_numbers* on up to *workers* threads
+		(paced by the API client's shared rate limiter) and return the payloads
+		in the same order, each validated exactly as _fetch_retrieve_payload
+		does — None for anything unusable. Only the HTTP calls run off-thread;
+		logging and everything downstream stay on the caller's thread."""
+		results = map_in_order(self.api.retrieve, ct_numbers, workers)
+		return [
+			self._check_retrieve_payload(ct_number, payload, error)
+			for ct_number, (payload, error) in zip(ct_numbers, results)
+		]
+
 	def _fetch_retrieve_payload(self, ct_number):
 		"""Fetch the full /retrieve dossier for ct_number once. Returns None (logged)
 		on a 404, a transport failure, or an unexpected response shape — the API is
@@ -566,8 +681,13 @@ class Command(GregoryBaseCommand):
 		try:
 			payload = self.api.retrieve(ct_number)
 		except Exception as e:
+			return self._check_retrieve_payload(ct_number, None, e)
+		return self._check_retrieve_payload(ct_number, payload, None)
+
+	def _check_retrieve_payload(self, ct_number, payload, error):
+		if error is not None:
 			self.log(
-				f"Failed to retrieve dossier for {ct_number}: {e}",
+				f"Failed to retrieve dossier for {ct_number}: {error}",
 				level=2,
 				style_func=self.style.WARNING,
 			)
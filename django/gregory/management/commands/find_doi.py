@@ -3,67 +3,107 @@ from django.db import transaction
 from django.db.models import Q
 from gregory.models import Articles
 from gregory.services.article_merge import assign_doi_or_merge
-from gregory.utils.enrichment import clear_marker, due_filter, record_fruitless_attempt
+from gregory.utils.enrichment import clear_marker, record_fruitless_attempt
+from gregory.utils.enrichment_executor import (
+	DEFAULT_BATCH_SIZE,
+	DEFAULT_WORKERS,
+	EnrichmentExecutor,
+)
 import gregory.functions as greg
 
 
 class Command(BaseCommand):
 	help = "Searches the article DOI by its title"
 
-	def handle(self, *args, **kwargs):
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--workers",
+			type=int,
+			default=DEFAULT_WORKERS,
+			help="Concurrent CrossRef lookups (paced by the shared CrossRef rate limit).",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=DEFAULT_BATCH_SIZE,
+			help="Due articles claimed per batch.",
+		)
+		parser.add_argument(
+			"--limit", type=int, default=None, help="Stop after this many articles."
+		)
+
+	def handle(self, *args, **options):
 		# Update articles with DOI
-		self.update_doi()
+		self.update_doi(
+			workers=options.get("workers", DEFAULT_WORKERS),
+			batch_size=options.get("batch_size", DEFAULT_BATCH_SIZE),
+			limit=options.get("limit"),
+		)
+
+	def update_doi(self, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, limit=None):
+		articles = Articles.objects.filter(kind="science paper").filter(
+			Q(doi__isnull=True) | Q(doi="")
+		)
+		# Built here: the lookups run on worker threads, which must not query
+		site = greg.current_site_settings()
+		works = greg.crossref_works(site) if site else None
+
+		def fetch(article):
+			return greg.get_doi(article.title, works=works)
+
+		def on_error(article, e):
+			# Network/API failure: not a completed attempt, so the backoff
+			# marker must not advance — the next run retries immediately.
+			self.stderr.write(
+				self.style.WARNING(
+					f"CrossRef lookup failed for '{article.title}': {e}. "
+					"Will retry next run."
+				)
+			)
 
-	def update_doi(self):
-		# Materialise: a DOI collision may merge (and delete) rows mid-loop.
-		articles = list(
-			Articles.objects.filter(
-				due_filter("doi_lookup_next_check"),
-				kind="science paper",
-			).filter(Q(doi__isnull=True) | Q(doi=""))
+		stats = EnrichmentExecutor(["crossref"], workers=workers).run(
+			articles,
+			"doi_lookup_next_check",
+			fetch,
+			self.write_doi,
+			on_error=on_error,
+			batch_size=batch_size,
+			limit=limit,
+		)
+		self.stdout.write(
+			f"Looked up {stats.claimed} articles ({stats.failed} lookups failed)."
 		)
-		for article in articles:
-			self.stdout.write(f"Processing article '{article.title}'.")
-			try:
-				doi = greg.get_doi(article.title)
-			except Exception as e:
-				# Network/API failure: not a completed attempt, so the backoff
-				# marker must not advance — the next run retries immediately.
-				self.stderr.write(
+
+	def write_doi(self, article, doi):
+		self.stdout.write(f"Processing article '{article.title}'.")
+		if doi:
+			self.stdout.write(self.style.SUCCESS(f"Found DOI: {doi}."))
+			# Guard against two independently-created rows silently converging
+			# on the same DOI: if another article already holds it, merge
+			# rather than create a collision. assign_doi_or_merge returns the
+			# survivor (which may differ from `article` if it was the loser).
+			with transaction.atomic():
+				# save=False so the DOI and the cleared backoff marker are
+				# persisted in a single save (one history row) on the common
+				# no-collision path.
+				survivor, merged = assign_doi_or_merge(
+					article, doi, save=False
+				)
+				clear_marker(survivor, "doi_lookup", save=False)
+				survivor.save()
+			if merged:
+				self.stdout.write(
 					self.style.WARNING(
-						f"CrossRef lookup failed for '{article.title}': {e}. "
-						"Will retry next run."
+						f"DOI {doi} already existed — merged into article "
+						f"{survivor.article_id}."
 					)
 				)
-				continue
-			if doi:
-				self.stdout.write(self.style.SUCCESS(f"Found DOI: {doi}."))
-				# Guard against two independently-created rows silently converging
-				# on the same DOI: if another article already holds it, merge
-				# rather than create a collision. assign_doi_or_merge returns the
-				# survivor (which may differ from `article` if it was the loser).
-				with transaction.atomic():
-					# save=False so the DOI and the cleared backoff marker are
-					# persisted in a single save (one history row) on the common
-					# no-collision path.
-					survivor, merged = assign_doi_or_merge(
-						article, doi, save=False
-					)
-					clear_marker(survivor, "doi_lookup", save=False)
-					survivor.save()
-				if merged:
-					self.stdout.write(
-						self.style.WARNING(
-							f"DOI {doi} already existed — merged into article "
-							f"{survivor.article_id}."
-						)
-					)
-				else:
-					self.stdout.write(
-						self.style.SUCCESS(
-							f"Updated article {survivor.title} with DOI: {survivor.doi}."
-						)
-					)
 			else:
-				# CrossRef responded and had no match: back off before retrying.
-				record_fruitless_attempt(article, "doi_lookup")
\ No newline at end of file
+				self.stdout.write(
+					self.style.SUCCESS(
+						f"Updated article {survivor.title} with DOI: {survivor.doi}."
+					)
+				)
+		else:
+			# CrossRef responded and had no match: back off before retrying.
+			record_fruitless_attempt(article, "doi_lookup")
@@ -1,8 +1,31 @@
+"""
+Import WHO ICTRP trials from an XML export (https://trialsearch.who.int/).
+
+ICTRP exports run to hundreds of megabytes, so the file is streamed with
+iterparse and every <Trial> element is cleared once read. Trials are handled
+in batches of --batch-size: the stored trials any of them could match are
+loaded in one query (_load_candidates), matched in memory with the same
+rules as check_for_existing_trial, and the batch is written with
+bulk_create/bulk_update, bulk M2M links and bulk history rows
+(gregory.utils.bulk_history) in one transaction. A batch that fails (e.g. an
+IntegrityError on a registry identifier) is rolled back and retried one trial
+at a time through the single-row path, which reports the offending trial.
+
+After every batch the command reports how many <Trial> elements it has
+consumed; pass that number to --skip to resume an interrupted import.
+"""
+
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
 from dateutil.parser import parse
 from django.core.management.base import BaseCommand
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Q, prefetch_related_objects
 from django.utils import timezone
 from gregory.models import Trials, Sources
+from gregory.utils.bulk_history import bulk_create_history
 from gregory.utils.registry_utils import (
 	identifiers_conflict,
 	merge_links,
@@ -14,6 +37,8 @@ import datetime
 import xml.etree.ElementTree as ET
 import pytz
 
+DEFAULT_BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
 	help = "Update or create trials from an XML file from https://trialsearch.who.int/Default.aspx"
@@ -34,11 +59,28 @@ class Command(BaseCommand):
 			required=True,
 			help="ID of the source to associate with the trials",
 		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=DEFAULT_BATCH_SIZE,
+			help=f"Trials matched and written per transaction (default: {DEFAULT_BATCH_SIZE})",
+		)
+		parser.add_argument(
+			"--skip",
+			type=int,
+			default=0,
+			help="Skip the first N <Trial> elements, to resume an interrupted import",
+		)
 
 	def handle(self, *args, **options):
 		xml_file_path = options["xml_file_path"]
 		source_id = options["source_id"]
-		self.parse_xml(xml_file_path, source_id)
+		self.parse_xml(
+			xml_file_path,
+			source_id,
+			batch_size=max(1, options["batch_size"]),
+			skip=max(0, options["skip"]),
+		)
 		self.stdout.write(
 			self.style.SUCCESS("Successfully updated or created trials from XML")
 		)
@@ -66,7 +108,26 @@ class Command(BaseCommand):
 			return None
 
 	def update_existing_trial(self, trial, trial_data, source, subject):
-		has_changes = False
+		updated_fields = self.apply_trial_data(trial, trial_data)
+		if updated_fields:
+			trial._change_reason = self._safe_change_reason(
+				f"Updated fields from {source.name} ({source.source_id}): {', '.join(updated_fields)}"
+			)
+			self.stdout.write(
+				f"Saving changes for trial: {trial.trial_id}. Changes: {updated_fields}"
+			)
+			trial.save()
+		if source not in trial.sources.all():
+			trial.sources.add(source)
+			updated_fields.append(f"source: {source.name}")
+
+		if subject not in trial.subjects.all():
+			trial.subjects.add(subject)
+			updated_fields.append(f"subject: {subject}")
+
+	def apply_trial_data(self, trial, trial_data):
+		"""Merge *trial_data* into *trial* in memory, without saving. Returns
+		the names of the fields that changed."""
 		updated_fields = []
 		for key, value in trial_data.items():
 			current_value = getattr(trial, key, None)
@@ -99,7 +160,6 @@ class Command(BaseCommand):
 				# (see docs/trials-multi-source-merge.md).
 				if value_date is not None and current_date != value_date:
 					setattr(trial, key, value)
-					has_changes = True
 					updated_fields.append(key)
 
 			# Handle other fields
@@ -117,11 +177,9 @@ class Command(BaseCommand):
 							merged_identifiers[k] = v
 					if merged_identifiers != current_value:
 						trial.identifiers = merged_identifiers
-						has_changes = True
 						updated_fields.append(key)
 				elif current_value != value:  # In case of non-dict values, simply set
 					trial.identifiers = value
-					has_changes = True
 					updated_fields.append(key)
 			elif key == "link":
 				# Record the WHO-exported registry URL under its registry key. The
@@ -132,12 +190,10 @@ class Command(BaseCommand):
 					merged_links = merge_links(trial.links, value)
 					if merged_links != (trial.links or {}):
 						trial.links = merged_links
-						has_changes = True
 						updated_fields.append("links")
 					new_link = canonical_link(trial.links, trial.link)
 					if new_link and trial.link != new_link:
 						trial.link = new_link
-						has_changes = True
 						updated_fields.append("link")
 			elif key == "countries_by_source":
 				# Record this source's raw countries value under its own key ("ictrp"),
@@ -150,30 +206,13 @@ class Command(BaseCommand):
 					)
 					if merged != (trial.countries_by_source or {}):
 						trial.countries_by_source = merged
-						has_changes = True
 						updated_fields.append(key)
 			# Only overwrite when the incoming value is non-empty, so a missing XML
 			# field never blanks data a previous source populated.
 			elif value not in (None, "") and current_value != value:
 				setattr(trial, key, value)
-				has_changes = True
 				updated_fields.append(key)
-
-		if has_changes:
-			trial._change_reason = self._safe_change_reason(
-				f"Updated fields from {source.name} ({source.source_id}): {', '.join(updated_fields)}"
-			)
-			self.stdout.write(
-				f"Saving changes for trial: {trial.trial_id}. Changes: {updated_fields}"
-			)
-			trial.save()
-		if source not in trial.sources.all():
-			trial.sources.add(source)
-			updated_fields.append(f"source: {source.name}")
-
-		if subject not in trial.subjects.all():
-			trial.subjects.add(subject)
-			updated_fields.append(f"subject: {subject}")
+		return updated_fields
 
 	def create_new_trial(self, trial_data, source, subject):
 		try:
@@ -253,7 +292,7 @@ class Command(BaseCommand):
 				)
 			)
 
-	def parse_xml(self, xml_file_path, source_id):
+	def parse_xml(self, xml_file_path, source_id, batch_size=DEFAULT_BATCH_SIZE, skip=0):
 		try:
 			source = Sources.objects.get(pk=source_id)
 		except Sources.DoesNotExist:
@@ -269,117 +308,330 @@ class Command(BaseCommand):
 			)
 			return
 
-		tree = ET.parse(xml_file_path)
-		root = tree.getroot()
-
-		for trial in root.findall("Trial"):
-			trial_data = {}
-			trial_identifier = self.get_text(trial, "TrialID")
-			# Sanitize and validate TrialID
-			if trial_identifier:
-				trial_identifier = trial_identifier.replace("\n", "").strip()
-				key = "".join(
-					filter(str.isalpha, trial_identifier.split("-")[0])
-				).lower()
-				trial_data["identifiers"] = {key: trial_identifier}
-			if not trial_identifier:
-				self.stdout.write(
-					self.style.WARNING(
-						f"Missing or invalid TrialID for trial: {self.get_text(trial, 'Public_title')}. Skipping."
-					)
-				)
+		if skip:
+			self.stdout.write(f"Skipping the first {skip} trials.")
+		offset = 0
+		batch = []
+		for offset, element in self.iter_trial_elements(xml_file_path, start=skip):
+			trial_data = self.trial_data_from_element(element)
+			if trial_data is not None:
+				batch.append(trial_data)
+			if len(batch) >= batch_size:
+				self.import_batch(batch, source, subject)
+				batch = []
+				self.stdout.write(f"Processed {offset} trials (resume with --skip {offset}).")
+		if batch:
+			self.import_batch(batch, source, subject)
+		self.stdout.write(f"Processed {max(offset, skip)} trials.")
+
+	def iter_trial_elements(self, xml_file_path, start=0):
+		"""Yield (position, element) for every <Trial> of the file, 1-based,
+		from position *start* + 1 on. The file is streamed: each element is
+		cleared once the caller is done with it, and detached from the root,
+		so memory stays flat however large the export is."""
+		root = None
+		position = 0
+		for event, element in ET.iterparse(xml_file_path, events=("start", "end")):
+			if root is None:
+				root = element
+			if event != "end" or element.tag != "Trial":
 				continue
+			position += 1
+			if position > start:
+				yield position, element
+			element.clear()
+			root.clear()
 
-			for field in [
-				"Internal_Number",
-				"Last_Refreshed_on",
-				"Scientific_title",
-				"Primary_sponsor",
-				"Prospective_registration",
-				"Source_Register",
-				"Recruitment_Status",
-				"other_records",
-				"Inclusion_agemin",
-				"Inclusion_agemax",
-				"Inclusion_gender",
-				"Target_size",
-				"Study_type",
-				"Study_design",
-				"Phase",
-				"Countries",
-				"Contact_Firstname",
-				"Contact_Lastname",
-				"Contact_Address",
-				"Contact_Email",
-				"Contact_Tel",
-				"Contact_Affiliation",
-				"Inclusion_Criteria",
-				"Exclusion_Criteria",
-				"Condition",
-				"Intervention",
-				"Primary_outcome",
-				"Secondary_outcome",
-				"Secondary_ID",
-				"Source_Support",
-				"Ethics_review_status",
-				"Ethics_review_contact_name",
-				"Ethics_review_contact_address",
-				"Ethics_review_contact_phone",
-				"Ethics_review_contact_email",
-				"Acronym",
-				"Secondary_Sponsor",
-				"results_yes_no",
-				"results_ipd_plan",
-				"results_ipd_description",
-				"results_url_link",
-			]:
-				trial_data[field.lower()] = self.get_text(trial, field)
+	def trial_data_from_element(self, trial):
+		"""The Trials field values of one <Trial> element, or None (with a
+		warning) when it has no usable TrialID."""
+		trial_data = {}
+		trial_identifier = self.get_text(trial, "TrialID")
+		# Sanitize and validate TrialID
+		if trial_identifier:
+			trial_identifier = trial_identifier.replace("\n", "").strip()
+			key = "".join(
+				filter(str.isalpha, trial_identifier.split("-")[0])
+			).lower()
+			trial_data["identifiers"] = {key: trial_identifier}
+		if not trial_identifier:
+			self.stdout.write(
+				self.style.WARNING(
+					f"Missing or invalid TrialID for trial: {self.get_text(trial, 'Public_title')}. Skipping."
+				)
+			)
+			return None
 
-			title = self.get_text(trial, "Public_title")
-			trial_data["title"] = (
-				title.replace("\n", " ").replace("\r", " ") if title else None
+		for field in [
+			"Internal_Number",
+			"Last_Refreshed_on",
+			"Scientific_title",
+			"Primary_sponsor",
+			"Prospective_registration",
+			"Source_Register",
+			"Recruitment_Status",
+			"other_records",
+			"Inclusion_agemin",
+			"Inclusion_agemax",
+			"Inclusion_gender",
+			"Target_size",
+			"Study_type",
+			"Study_design",
+			"Phase",
+			"Countries",
+			"Contact_Firstname",
+			"Contact_Lastname",
+			"Contact_Address",
+			"Contact_Email",
+			"Contact_Tel",
+			"Contact_Affiliation",
+			"Inclusion_Criteria",
+			"Exclusion_Criteria",
+			"Condition",
+			"Intervention",
+			"Primary_outcome",
+			"Secondary_outcome",
+			"Secondary_ID",
+			"Source_Support",
+			"Ethics_review_status",
+			"Ethics_review_contact_name",
+			"Ethics_review_contact_address",
+			"Ethics_review_contact_phone",
+			"Ethics_review_contact_email",
+			"Acronym",
+			"Secondary_Sponsor",
+			"results_yes_no",
+			"results_ipd_plan",
+			"results_ipd_description",
+			"results_url_link",
+		]:
+			trial_data[field.lower()] = self.get_text(trial, field)
+
+		title = self.get_text(trial, "Public_title")
+		trial_data["title"] = (
+			title.replace("\n", " ").replace("\r", " ") if title else None
+		)
+		trial_data["link"] = self.get_text(trial, "web_address")
+
+		# Record this source's raw countries value under its own key ("ictrp"),
+		# mirroring ClinicalTrials.gov's countries_by_source write — see
+		# docs/trials-multi-source-merge.md and
+		# gregory.utils.registry_utils.merge_countries_by_source. update_existing_trial
+		# below merges this key without touching any other source's key.
+		if trial_data.get("countries"):
+			trial_data["countries_by_source"] = merge_countries_by_source(
+				None, "ictrp", trial_data["countries"]
 			)
-			trial_data["link"] = self.get_text(trial, "web_address")
-
-			# Record this source's raw countries value under its own key ("ictrp"),
-			# mirroring ClinicalTrials.gov's countries_by_source write — see
-			# docs/trials-multi-source-merge.md and
-			# gregory.utils.registry_utils.merge_countries_by_source. update_existing_trial
-			# below merges this key without touching any other source's key.
-			if trial_data.get("countries"):
-				trial_data["countries_by_source"] = merge_countries_by_source(
-					None, "ictrp", trial_data["countries"]
-				)
 
-			for date_field in [
-				"Export_date",
-				"Date_enrollement",
-				"Ethics_review_approval_date",
-				"results_date_completed",
-				"Last_Refreshed_on",
-			]:
-				raw_date = self.get_text(trial, date_field)
-				trial_data[date_field.lower()] = self.robust_parse_date(raw_date)
+		for date_field in [
+			"Export_date",
+			"Date_enrollement",
+			"Ethics_review_approval_date",
+			"results_date_completed",
+			"Last_Refreshed_on",
+		]:
+			raw_date = self.get_text(trial, date_field)
+			trial_data[date_field.lower()] = self.robust_parse_date(raw_date)
+
+		date_registration_raw = self.get_text(trial, "Date_registration")
+		parsed_registration = self.robust_parse_date(date_registration_raw)
+		# WHO ICTRP only provides a single "Date of registration"; mirror it into both
+		# published_date (used across the app) and date_registration (registry field).
+		trial_data["published_date"] = parsed_registration
+		trial_data["date_registration"] = parsed_registration
 
-			date_registration_raw = self.get_text(trial, "Date_registration")
-			parsed_registration = self.robust_parse_date(date_registration_raw)
-			# WHO ICTRP only provides a single "Date of registration"; mirror it into both
-			# published_date (used across the app) and date_registration (registry field).
-			trial_data["published_date"] = parsed_registration
-			trial_data["date_registration"] = parsed_registration
+		return trial_data
 
-			# Add logging for each trial being processed
+	def import_batch(self, batch, source, subject):
+		"""Match and write a batch of parsed trials in one transaction,
+		falling back to one transaction per trial if the batch cannot be
+		written as a whole."""
+		for trial_data in batch:
 			self.stdout.write(
 				self.style.NOTICE(
 					f"Processing trial: {trial_data['title']} with TrialID: {trial_data['identifiers']}"
 				)
 			)
-
+		try:
+			with transaction.atomic():
+				self.write_batch(batch, source, subject)
+			return
+		except Exception as e:
+			self.stdout.write(
+				self.style.WARNING(
+					f"Batch write failed ({e}); retrying its {len(batch)} trials one by one."
+				)
+			)
+		for trial_data in batch:
 			try:
-				self.check_for_existing_trial(trial_data, source, subject)
+				with transaction.atomic():
+					self.check_for_existing_trial(trial_data, source, subject)
 			except Exception as e:
 				self.stdout.write(
 					self.style.ERROR(
 						f"Error importing trial '{trial_data.get('title', 'Unknown')}': {e}"
 					)
 				)
+
+	def write_batch(self, batch, source, subject):
+		candidates = self._load_candidates(batch)
+		prefetch_related_objects(candidates, "sources", "subjects")
+		created = []
+		# pk -> [trial, changed fields, change-reason items]
+		updated = {}
+		links = {"sources": set(), "subjects": set(), "teams": set()}
+
+		for trial_data in batch:
+			trial = self._match_existing(trial_data, candidates)
+			if trial is None:
+				trial = self._build_new_trial(trial_data, source)
+				created.append(trial)
+				# A later record of this batch may be the same trial again
+				candidates.append(trial)
+				continue
+			fields = self.apply_trial_data(trial, trial_data)
+			if trial.pk is None:
+				# Created earlier in this batch: written with its final values
+				continue
+			entry = updated.setdefault(trial.pk, [trial, set(), []])
+			entry[1].update(fields)
+			for field in fields:
+				if field not in entry[2]:
+					entry[2].append(field)
+			if source not in trial.sources.all() and trial.pk not in links["sources"]:
+				links["sources"].add(trial.pk)
+				entry[2].append(f"source: {source.name}")
+			if subject not in trial.subjects.all() and trial.pk not in links["subjects"]:
+				links["subjects"].add(trial.pk)
+				entry[2].append(f"subject: {subject}")
+
+		now = timezone.now()
+		for trial in created:
+			trial.compute_derived_fields()
+		Trials.objects.bulk_create(created)
+		for trial in created:
+			links["sources"].add(trial.pk)
+			links["subjects"].add(trial.pk)
+			if source.team:
+				links["teams"].add(trial.pk)
+
+		changed = [entry for entry in updated.values() if entry[1]]
+		update_fields = {"last_updated"}
+		for trial, fields, _reasons in changed:
+			trial.last_updated = now
+			update_fields |= fields
+			update_fields.update(trial.compute_derived_fields(fields))
+		if changed:
+			Trials.objects.bulk_update([trial for trial, _, _ in changed], sorted(update_fields))
+
+		self._link("sources", links["sources"], source.pk)
+		self._link("subjects", links["subjects"], subject.pk)
+		if source.team:
+			self._link("teams", links["teams"], source.team.pk)
+
+		# Derived rows keyed on the trial, which save() would have synced
+		for trial in created:
+			trial.sync_trial_countries()
+			trial.sync_identifier_index()
+		for trial, fields, _reasons in changed:
+			if fields & {"countries", "countries_by_source"}:
+				trial.sync_trial_countries()
+			if "identifiers" in fields:
+				trial.sync_identifier_index()
+
+		history = []
+		for trial, fields, reasons in updated.values():
+			if not reasons:
+				continue
+			trial._change_reason = self._safe_change_reason(
+				f"Updated fields from {source.name} ({source.source_id}): {', '.join(reasons)}"
+			)
+			if fields:
+				self.stdout.write(
+					f"Saving changes for trial: {trial.trial_id}. Changes: {sorted(fields)}"
+				)
+			history.append(trial)
+		bulk_create_history(created)
+		bulk_create_history(history, update=True)
+
+	def _load_candidates(self, batch):
+		"""Every stored trial a record of *batch* could match under
+		_match_existing's rules, ordered by pk, in one query."""
+		identifier_values = defaultdict(set)
+		titles = set()
+		for trial_data in batch:
+			identifiers = trial_data.get("identifiers") or {}
+			if identifiers:
+				key, value = next(iter(identifiers.items()))
+				if key:
+					identifier_values[key].add(value)
+			if trial_data.get("title"):
+				titles.add(trial_data["title"].upper())
+		lookups = [
+			Q(**{f"identifiers__{key}__in": sorted(values)})
+			for key, values in identifier_values.items()
+		]
+		if titles:
+			lookups.append(Q(utitle__in=titles))
+		if not lookups:
+			return []
+		return list(Trials.objects.filter(reduce(or_, lookups)).order_by("pk"))
+
+	def _match_existing(self, trial_data, candidates):
+		"""check_for_existing_trial's matching, against *candidates*: the
+		trial's own registry key:value first, then a title match that does not
+		conflict on a shared registry key. The lowest pk wins, as .first() did."""
+		identifiers = trial_data.get("identifiers") or {}
+		if identifiers:
+			key, value = next(iter(identifiers.items()))
+			if key:
+				match = next(
+					(
+						trial
+						for trial in candidates
+						if isinstance(trial.identifiers, dict) and trial.identifiers.get(key) == value
+					),
+					None,
+				)
+				if match and not identifiers_conflict(match.identifiers, identifiers):
+					return match
+		title = trial_data.get("title")
+		if title:
+			title = title.upper()
+			candidate = next(
+				(trial for trial in candidates if (trial.title or "").upper() == title), None
+			)
+			if candidate and not identifiers_conflict(candidate.identifiers, identifiers):
+				return candidate
+		return None
+
+	def _build_new_trial(self, trial_data, source):
+		trial_data = dict(trial_data, discovery_date=timezone.now())
+		if trial_data.get("link"):
+			trial_data["links"] = merge_links(None, trial_data["link"])
+		trial = Trials(**trial_data)
+		trial._change_reason = self._safe_change_reason(
+			f"Created from Source: {source.name} ({source.source_id})"
+		)
+		return trial
+
+	@staticmethod
+	def _link(field_name, trial_ids, related_id):
+		"""Bulk-add *related_id* to the *field_name* M2M of every trial in
+		*trial_ids* (already-linked pairs are ignored)."""
+		if not trial_ids:
+			return
+		field = Trials._meta.get_field(field_name)
+		through = field.remote_field.through
+		through.objects.bulk_create(
+			[
+				through(
+					**{
+						f"{field.m2m_field_name()}_id": trial_id,
+						f"{field.m2m_reverse_field_name()}_id": related_id,
+					}
+				)
+				for trial_id in sorted(trial_ids)
+			],
+			ignore_conflicts=True,
+		)
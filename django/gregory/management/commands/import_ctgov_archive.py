@@ -0,0 +1,175 @@
+"""
+Import clinical trials from a downloaded ClinicalTrials.gov JSON archive.
+
+feedreader_trials_ctgov discovers trials through paged API searches capped at
+--max-results per source, and backfill_trial_sites_from_ctgov /
+backfill_trial_sponsors_from_ctgov then re-fetch studies in API batches.
+For a large backfill, download the source's search results once instead
+(clinicaltrials.gov search → Download → JSON, a zip with one
+``NCTxxxxxxxx.json`` file per study) and import the archive offline:
+
+	python manage.py import_ctgov_archive ctg-studies.json.zip --source-id 42
+
+The zip is read member by member without extracting it. Every batch of
+studies is parsed, matched and written exactly as feedreader_trials_ctgov
+does it (it is the same code: this command subclasses it): existing trials
+are found with find_existing_trial's rules, one query per matching key for
+the whole batch; new trials are created and matched ones updated, sponsor
+fields included, and their "ctgov" sites replaced. Each batch commits as one
+transaction.
+
+Restartable: after each committed batch the number of archive members done
+is written to a checkpoint file (default ``<archive>.checkpoint``), and a
+re-run of the same archive resumes after it. The checkpoint is removed when
+the import completes; --restart ignores it.
+
+--existing-only updates the trials already stored and never creates new
+ones, for refreshing sites and sponsors from a wider archive.
+"""
+
+import json
+import os
+import zipfile
+from itertools import islice
+
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from gregory.classes import ClinicalTrialsGovAPI
+from gregory.management.commands import feedreader_trials_ctgov
+from gregory.models import Sources
+from gregory.utils.source_stats import refresh_source_stats
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class Command(feedreader_trials_ctgov.Command):
+	help = "Import trials from a downloaded ClinicalTrials.gov JSON archive (zip of per-study files)."
+
+	def add_arguments(self, parser):
+		parser.add_argument("archive", help="Path to the ClinicalTrials.gov JSON zip.")
+		parser.add_argument(
+			"--source-id",
+			type=int,
+			required=True,
+			help="ctgov_api source the studies are attributed to (its team and subject are applied).",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=DEFAULT_BATCH_SIZE,
+			help=f"Studies matched and written per transaction (default: {DEFAULT_BATCH_SIZE}).",
+		)
+		parser.add_argument(
+			"--existing-only",
+			action="store_true",
+			help="Only update trials already in the database; never create new ones.",
+		)
+		parser.add_argument(
+			"--checkpoint",
+			metavar="PATH",
+			help="Progress file for resuming (default: <archive>.checkpoint).",
+		)
+		parser.add_argument(
+			"--restart",
+			action="store_true",
+			help="Ignore an existing checkpoint and start from the first study.",
+		)
+		parser.add_argument(
+			"--debug",
+			action="store_true",
+			help="Show detailed data for each clinical trial found",
+		)
+
+	def handle(self, *args, **options):
+		archive = options["archive"]
+		batch_size = max(1, options["batch_size"])
+		create_missing = not options["existing_only"]
+		checkpoint = options.get("checkpoint") or f"{archive}.checkpoint"
+		self.debug = options.get("debug", False)
+		self.api = ClinicalTrialsGovAPI()
+
+		try:
+			source = Sources.objects.get(source_id=options["source_id"], source_for="trials")
+		except Sources.DoesNotExist:
+			raise CommandError(f"No trials source with id {options['source_id']}.")
+
+		try:
+			zf = zipfile.ZipFile(archive)
+		except (OSError, zipfile.BadZipFile) as e:
+			raise CommandError(f"Could not open {archive}: {e}")
+
+		with zf:
+			members = [
+				info.filename
+				for info in zf.infolist()
+				if not info.is_dir() and info.filename.lower().endswith(".json")
+			]
+			identity = {"archive": os.path.basename(archive), "size": os.path.getsize(archive)}
+			done = 0 if options["restart"] else self._load_checkpoint(checkpoint, identity)
+			if done:
+				self.log(f"Resuming after {done} of {len(members)} studies ({checkpoint}).", level=1)
+			else:
+				self.log(f"Importing {len(members)} studies from {archive} into {source.name}.", level=1)
+
+			created_count = updated_count = error_count = skipped_count = 0
+			remaining = iter(members[done:])
+			while names := list(islice(remaining, batch_size)):
+				page = []
+				for name in names:
+					try:
+						with zf.open(name) as fh:
+							page.append(json.load(fh))
+					except (ValueError, OSError, zipfile.BadZipFile) as e:
+						self.log(f"Unreadable study {name}: {e}", level=1, style_func=self.style.ERROR)
+						error_count += 1
+
+				with transaction.atomic():
+					created, updated, errors = self._process_page(
+						page, source, create_missing=create_missing
+					)
+				created_count += created
+				updated_count += updated
+				error_count += errors
+				skipped_count += len(page) - created - updated - errors
+
+				done += len(names)
+				self._save_checkpoint(checkpoint, identity, done)
+				self.log(
+					f"  {done}/{len(members)} studies: {created_count} created, "
+					f"{updated_count} updated, {skipped_count} skipped, {error_count} errors",
+					level=1,
+				)
+
+		if os.path.exists(checkpoint):
+			os.remove(checkpoint)
+		refresh_source_stats(source)
+
+		self.log(
+			f"Finished importing {archive} - Created: {created_count}, Updated: {updated_count}, "
+			f"Skipped: {skipped_count}, Errors: {error_count}",
+			level=1,
+			style_func=self.style.SUCCESS,
+		)
+
+	@staticmethod
+	def _load_checkpoint(path, identity):
+		"""Members already imported from this archive, or 0. A checkpoint left
+		by a different archive (name or size) is ignored."""
+		try:
+			with open(path) as fh:
+				state = json.load(fh)
+		except (OSError, ValueError):
+			return 0
+		if {key: state.get(key) for key in identity} != identity:
+			return 0
+		return int(state.get("done") or 0)
+
+	@staticmethod
+	def _save_checkpoint(path, identity, done):
+		# Written to a temp file and renamed, so a crash mid-write never
+		# leaves a checkpoint that cannot be read back
+		tmp = f"{path}.tmp"
+		with open(tmp, "w") as fh:
+			json.dump({**identity, "done": done}, fh)
+		os.replace(tmp, path)
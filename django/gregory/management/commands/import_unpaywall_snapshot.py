@@ -0,0 +1,68 @@
+"""Load an Unpaywall snapshot (or changefile) into the offline DOI index.
+
+Download the data feed from https://unpaywall.org/products/snapshot (a gzip
+JSONL file, one record per DOI) and run:
+
+  python manage.py import_unpaywall_snapshot unpaywall_snapshot_2026-09-01.jsonl.gz --snapshot-date 2026-09-01
+
+Records are upserted, so the daily/weekly changefiles can be imported on top
+of a full snapshot to keep the index current.
+"""
+
+import sqlite3
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from gregory.management.base import GregoryBaseCommand
+from gregory.unpaywall import snapshot
+
+
+class Command(GregoryBaseCommand):
+	help = "Import an Unpaywall snapshot (gzip JSONL) into the offline DOI index used by getDataByDOI."
+
+	def add_arguments(self, parser):
+		parser.add_argument("snapshot", help="Path to the gzip JSONL snapshot or changefile.")
+		parser.add_argument(
+			"--index",
+			default=None,
+			help="Index file to write (default: settings.UNPAYWALL_SNAPSHOT_INDEX).",
+		)
+		parser.add_argument(
+			"--snapshot-date",
+			default=None,
+			help="Date the snapshot was taken, YYYY-MM-DD (default: today). "
+			     "Entries older than UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS are re-checked live.",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=snapshot.IMPORT_BATCH_SIZE,
+			help=f"Records per insert transaction (default: {snapshot.IMPORT_BATCH_SIZE}).",
+		)
+
+	def handle(self, *args, **options):
+		index = options["index"] or settings.UNPAYWALL_SNAPSHOT_INDEX
+		if not index:
+			raise CommandError("No index path: pass --index or set UNPAYWALL_SNAPSHOT_INDEX.")
+
+		snapshot_date = options["snapshot_date"]
+		if snapshot_date:
+			try:
+				snapshot_date = date.fromisoformat(snapshot_date).isoformat()
+			except ValueError:
+				raise CommandError(f"Invalid --snapshot-date {snapshot_date!r}; expected YYYY-MM-DD.")
+
+		self.log(f"Importing {options['snapshot']} into {index}", level=1)
+		try:
+			written = snapshot.build_index(
+				options["snapshot"],
+				index,
+				snapshot_date=snapshot_date,
+				batch_size=max(1, options["batch_size"]),
+				progress=lambda count: self.log(f"  {count} records", level=2),
+			)
+		except (OSError, EOFError, sqlite3.Error) as e:
+			raise CommandError(f"Could not import {options['snapshot']} into {index}: {e}")
+		self.log(f"Imported {written} records.", level=1, style_func=self.style.SUCCESS)
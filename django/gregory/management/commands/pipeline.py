@@ -10,7 +10,10 @@ class Command(BaseCommand):
 			"--recent-days",
 			type=int,
 			default=30,
-			help="Number of days to look back when processing trial references (default: 30)",
+			help=(
+				"Unused: detect_trial_references now processes only articles and trials "
+				"changed since its last run. Kept so existing invocations keep working."
+			),
 		)
 		parser.add_argument(
 			"--categories-days",
@@ -55,6 +58,10 @@ class Command(BaseCommand):
 				"get_takeaways",
 				{"limit": 50},
 			),  # 8. Get takeaways (50 > ~30 new articles/run, so the queue drains)
+			(
+				"rebuild_source_stats",
+				{},
+			),  # 9. Source statistics (moves the 7/30-day windows of unfetched sources)
 		]
 
 		# First run all the standard commands
@@ -129,15 +136,28 @@ class Command(BaseCommand):
 				self.style.ERROR(f"Error running refresh_article_relevance: {str(e)}")
 			)
 
-		# Run detect_trial_references with recent articles only
+		# Rebuild the stored author article counts, which bulk writes earlier in
+		# the run (and the full relevance pass above) bypass
+		try:
+			self.stdout.write(self.style.SUCCESS("Running rebuild_author_counts"))
+			call_command("rebuild_author_counts")
+			self.stdout.write(
+				self.style.SUCCESS("Finished running rebuild_author_counts")
+			)
+		except Exception as e:
+			self.stderr.write(
+				self.style.ERROR(f"Error running rebuild_author_counts: {str(e)}")
+			)
+
+		# Run detect_trial_references incrementally: articles new or changed since
+		# their last scan, plus trials indexed since the previous run
 		try:
-			days = options.get("recent_days", 30)
 			self.stdout.write(
 				self.style.SUCCESS(
-					f"Running detect_trial_references for articles from the last {days} days"
+					"Running detect_trial_references for new or changed articles and trials"
 				)
 			)
-			call_command("detect_trial_references", recent=True, days=days)
+			call_command("detect_trial_references")
 			self.stdout.write(
 				self.style.SUCCESS("Finished running detect_trial_references")
 			)
@@ -146,6 +166,33 @@ class Command(BaseCommand):
 				self.style.ERROR(f"Error running detect_trial_references: {str(e)}")
 			)
 
+		# Refresh the daily rollups behind subject analytics and category monthly
+		# counts, after the feedreaders, category matching and predictions they
+		# count. A full category rebuild also rewrites every rollup day.
+		try:
+			self.stdout.write(self.style.SUCCESS("Running refresh_rollups"))
+			call_command(
+				"refresh_rollups", full=bool(options.get("full_category_rebuild"))
+			)
+			self.stdout.write(self.style.SUCCESS("Finished running refresh_rollups"))
+		except Exception as e:
+			self.stderr.write(
+				self.style.ERROR(f"Error running refresh_rollups: {str(e)}")
+			)
+
+		# Drain the Postmark events the webhook staged, so suppression opt-outs
+		# and the EmailMessage aggregates the outreach breakers read never lag
+		# by more than one pipeline run even where the per-minute cron entry
+		# for drain_email_events isn't installed.
+		try:
+			self.stdout.write(self.style.SUCCESS("Running drain_email_events"))
+			call_command("drain_email_events")
+			self.stdout.write(self.style.SUCCESS("Finished running drain_email_events"))
+		except Exception as e:
+			self.stderr.write(
+				self.style.ERROR(f"Error running drain_email_events: {str(e)}")
+			)
+
 		# Prune old sent notification records (keeps last 30 days by default)
 		try:
 			self.stdout.write(
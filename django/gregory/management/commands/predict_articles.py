@@ -5,6 +5,7 @@ This command classifies articles for every team/subject that opted-in to automat
 stores the results in MLPredictions, and logs each (subject × algorithm) run in PredictionRunLog.
 """
 
+import logging
 import os
 import re
 import sys
@@ -142,15 +143,22 @@ def resolve_model_version(base_path, explicit_version=None):
 	return max(versions, key=_version_sort_key)
 
 
-def load_model(team, subject, algorithm, model_version):
+def load_model(team, subject, algorithm, model_version, use_inference_runtime=True):
 	"""
 	Load the appropriate model for a given team, subject, algorithm and version.
 
+	When the version directory holds an inference export that passed its
+	parity check (export_inference_models, see gregory.ml.inference), that
+	runtime is returned instead of the trainer; it has the same
+	predict(texts, threshold) contract. A runtime that fails to load falls
+	back to the trainer.
+
 	Args:
 	    team (Team): The team
 	    subject (Subject): The subject
 	    algorithm (str): The algorithm name ('pubmed_bert', 'lgbm_tfidf', or 'lstm')
 	    model_version (str): The model version to load
+	    use_inference_runtime (bool): Prefer a parity-checked inference export
 
 	Returns:
 	    object: The loaded model, ready for predictions
@@ -181,6 +189,19 @@ def load_model(team, subject, algorithm, model_version):
 	if not os.path.exists(model_dir):
 		raise ModelLoadError(f"Model directory not found: {model_dir}")
 
+	if use_inference_runtime:
+		from gregory.ml.inference import load_inference_model
+
+		try:
+			runtime = load_inference_model(model_dir)
+		except Exception as e:
+			logging.warning(
+				"Ignoring inference export for %s in %s: %s", algorithm, model_dir, e
+			)
+			runtime = None
+		if runtime is not None:
+			return runtime
+
 	# Each trainer's load() reads the artifacts its save() wrote, so loading
 	# stays in sync with training (file names, saved vectorizer config, etc.)
 	try:
@@ -275,6 +296,11 @@ class Command(BaseCommand):
 			action="store_true",
 			help="Run everything except database writes",
 		)
+		output_group.add_argument(
+			"--no-inference-runtime",
+			action="store_true",
+			help="Predict through the training wrappers even where an inference export exists",
+		)
 
 	def run_predictions_for(
 		self,
@@ -286,6 +312,7 @@ class Command(BaseCommand):
 		prob_threshold=0.8,
 		dry_run=False,
 		verbose=1,
+		use_inference_runtime=True,
 	):
 		"""
 		Run predictions for a specific subject and algorithm.
@@ -299,6 +326,7 @@ class Command(BaseCommand):
 		    prob_threshold (float): Probability threshold for positive class
 		    dry_run (bool): If True, don't write to the database
 		    verbose (int): Verbosity level (0-3)
+		    use_inference_runtime (bool): Prefer a parity-checked inference export
 
 		Returns:
 		    dict: Statistics about the run
@@ -359,9 +387,17 @@ class Command(BaseCommand):
 
 			# Load the model
 			try:
-				model = load_model(subject.team, subject, algorithm, resolved_version)
+				model = load_model(
+					subject.team,
+					subject,
+					algorithm,
+					resolved_version,
+					use_inference_runtime=use_inference_runtime,
+				)
 				if verbose >= 2:
-					self.stdout.write(f"    Successfully loaded {algorithm} model")
+					self.stdout.write(
+						f"    Successfully loaded {algorithm} model ({type(model).__name__})"
+					)
 			except ModelLoadError as e:
 				if run_log and not dry_run:
 					run_log.success = False
@@ -618,6 +654,9 @@ class Command(BaseCommand):
 							prob_threshold=options.get("prob_threshold"),
 							dry_run=options.get("dry_run", False),
 							verbose=verbose,
+							use_inference_runtime=not options.get(
+								"no_inference_runtime", False
+							),
 						)
 
 						# Collect statistics for summary
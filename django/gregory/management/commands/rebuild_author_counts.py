@@ -0,0 +1,29 @@
+from gregory.management.base import GregoryBaseCommand
+from gregory.utils.author_counts import rebuild_author_counts, refresh_author_counts
+
+
+class Command(GregoryBaseCommand):
+	help = (
+		"Recompute the stored per-organisation article counts of every author "
+		"(AuthorArticleCounts) in one pass. Signals keep the rows current for "
+		"ordinary saves; this catches bulk writes that bypass them."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--author-id",
+			type=int,
+			action="append",
+			help="Only refresh this author (repeatable)",
+		)
+
+	def handle(self, *args, **options):
+		if options.get("author_id"):
+			written = refresh_author_counts(options["author_id"])
+		else:
+			written = rebuild_author_counts()
+		self.log(
+			f"Wrote {written} author article count row(s).",
+			level=1,
+			style_func=self.style.SUCCESS,
+		)
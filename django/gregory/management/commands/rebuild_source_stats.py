@@ -0,0 +1,28 @@
+from gregory.management.base import GregoryBaseCommand
+from gregory.models import Sources
+from gregory.utils.source_stats import rebuild_source_stats
+
+
+class Command(GregoryBaseCommand):
+	help = (
+		"Recompute the SourceStats row (last item date, item counts, 7/30-day "
+		"ingest windows) of every source in one pass. Fetch outcome fields "
+		"(last fetch, error streak) are kept: only the feedreaders record those."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--source-id", type=int, help="Only rebuild the stats of this source"
+		)
+
+	def handle(self, *args, **options):
+		sources = Sources.objects.all()
+		if options.get("source_id"):
+			sources = sources.filter(source_id=options["source_id"])
+
+		written = rebuild_source_stats(sources)
+		self.log(
+			f"Rebuilt statistics for {written} source(s).",
+			level=1,
+			style_func=self.style.SUCCESS,
+		)
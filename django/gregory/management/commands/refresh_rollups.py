@@ -0,0 +1,31 @@
+from gregory.management.base import GregoryBaseCommand
+from gregory.utils.rollups import refresh_rollups
+
+
+class Command(GregoryBaseCommand):
+	help = (
+		"Refresh the daily rollups behind the subject analytics dashboard and the "
+		"categories endpoint's monthly counts. By default only the days touched "
+		"since the previous refresh are rewritten; --full rewrites every day."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--full",
+			action="store_true",
+			help=(
+				"Rewrite every day, e.g. after category matching changed or to pick up "
+				"removals that leave no trace on the articles and trials"
+			),
+		)
+
+	def handle(self, *args, **options):
+		days = refresh_rollups(full=options["full"])
+		if days is None:
+			self.log("Rebuilt all daily rollups.", level=1, style_func=self.style.SUCCESS)
+		else:
+			self.log(
+				f"Refreshed daily rollups for {days} day(s).",
+				level=1,
+				style_func=self.style.SUCCESS,
+			)
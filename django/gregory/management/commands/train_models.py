@@ -1,6 +1,7 @@
 import json
 import os
 import logging
+import time
 import traceback
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
@@ -13,8 +14,18 @@ from django.db import transaction
 from django.utils import timezone
 
 from gregory.models import Team, Subject, Articles, PredictionRunLog
-from gregory.utils.dataset import collect_articles, build_dataset, train_val_test_split
-from gregory.utils.text_utils import cleanHTML, cleanText, MIN_WORD_COUNT
+from gregory.ml.scheduler import TrainingJob, default_memory_budget_gb, run_jobs
+from gregory.utils.dataset import (
+	collect_articles,
+	load_or_build_dataset,
+	train_val_test_split,
+)
+from gregory.utils.unlabeled_pool import (
+	DEFAULT_POOL_SIZE,
+	SAMPLING_STRATEGIES,
+	CleanedTextCache,
+	UnlabeledPool,
+)
 from gregory.utils.versioning import make_version_path
 from gregory.utils.verboser import Verboser, VerbosityLevel
 
@@ -99,6 +110,28 @@ def _check_ml_imports(stdout=None):
 	return _ml_import_status
 
 
+# Options a training job reads; only these are sent to worker processes
+# (call_command's stdout/stderr wrappers cannot be pickled).
+JOB_OPTION_KEYS = (
+	"all_articles",
+	"lookback_days",
+	"dataset_file",
+	"prob_threshold",
+	"model_version",
+	"pseudo_label",
+	"pseudo_pool_size",
+	"pseudo_sampling",
+	"verbose",
+)
+
+
+def _train_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+	"""Process-pool entry point: run one training job in a worker process."""
+	command = Command()
+	command.setup_verboser(payload["options"]["verbose"])
+	return command.run_training_job(payload)
+
+
 class Command(BaseCommand):
 	"""
 	Train machine learning models for Gregory AI.
@@ -123,6 +156,9 @@ class Command(BaseCommand):
 
 	    # Run with pseudo-labeling and a custom probability threshold
 	    python manage.py train_models --team research --subject cardiology --pseudo-label --prob-threshold 0.75
+
+	    # Full retrain on four worker processes; LightGBM runs alongside TensorFlow
+	    python manage.py train_models --all-teams --jobs 4 --memory-budget 24
 	"""
 
 	help = "Train Gregory AI text classifiers for teams and subjects"
@@ -193,6 +229,24 @@ class Command(BaseCommand):
 			help="Run BERT self-training loop before final training",
 		)
 
+		parser.add_argument(
+			"--pseudo-pool-size",
+			type=int,
+			default=DEFAULT_POOL_SIZE,
+			help=f"Unlabeled articles sampled for pseudo-labeling (default: {DEFAULT_POOL_SIZE})",
+		)
+
+		parser.add_argument(
+			"--pseudo-sampling",
+			choices=SAMPLING_STRATEGIES,
+			default="recent",
+			help=(
+				"How the unlabeled pool is sampled: recent (weighted towards new "
+				"discoveries), stratified (even over discovery months) or uniform "
+				"(default: recent)"
+			),
+		)
+
 		parser.add_argument(
 			"--verbose",
 			type=int,
@@ -213,6 +267,38 @@ class Command(BaseCommand):
 			help="Force CPU-only training (disable GPU). Use if GPU causes bus errors on Apple Silicon.",
 		)
 
+		parser.add_argument(
+			"--jobs",
+			type=int,
+			default=1,
+			help="Training jobs to run in parallel worker processes (default: 1, in-process)",
+		)
+
+		parser.add_argument(
+			"--memory-budget",
+			type=float,
+			help="GB of memory parallel jobs may use together (default: 75%% of physical memory)",
+		)
+
+		parser.add_argument(
+			"--tf-jobs",
+			type=int,
+			default=1,
+			help="TensorFlow jobs (pubmed_bert, lstm) allowed to run at once (default: 1)",
+		)
+
+		parser.add_argument(
+			"--no-dataset-cache",
+			action="store_true",
+			help="Rebuild each dataset instead of reusing the cached label snapshot",
+		)
+
+		parser.add_argument(
+			"--report",
+			type=str,
+			help="Path for the JSON run report (default: <BASE_DIR>/models/reports/)",
+		)
+
 	def validate_arguments(self, options):
 		"""
 		Validate command arguments for consistency and correctness.
@@ -285,6 +371,13 @@ class Command(BaseCommand):
 		if not (0 < options["prob_threshold"] < 1):
 			raise CommandError("--prob-threshold must be between 0 and 1")
 
+		if options.get("jobs", 1) < 1:
+			raise CommandError("--jobs must be at least 1")
+		if options.get("tf_jobs", 1) < 1:
+			raise CommandError("--tf-jobs must be at least 1")
+		if options.get("memory_budget") is not None and options["memory_budget"] <= 0:
+			raise CommandError("--memory-budget must be positive")
+
 		# Store parsed algorithms back in options
 		options["parsed_algos"] = list(input_algos)
 
@@ -384,63 +477,36 @@ class Command(BaseCommand):
 
 		return result
 
-	def run_training_pipeline(
-		self, team_slug: str, subject_slug: str, algorithm: str, options: Dict[str, Any]
-	) -> Dict[str, Any]:
+	def prepare_dataset(
+		self, team_slug: str, subject_slug: str, options: Dict[str, Any]
+	) -> Tuple[pd.DataFrame, Dict[str, Any]]:
 		"""
-		Run the complete training pipeline for a specific team, subject, and algorithm.
+		Load the labeled dataset for a team and subject: from --dataset-file,
+		or from the database through the label-snapshot cache
+		(load_or_build_dataset), so every algorithm and every rerun over the
+		same labels shares one build.
 
 		Args:
 		    team_slug: The team slug
 		    subject_slug: The subject slug
-		    algorithm: The algorithm name
 		    options: Command options
 
 		Returns:
-		    Dict with training results including metrics
+		    Tuple of the dataset DataFrame and a dict describing it for the
+		    run report (snapshot, cache_hit, rows, seconds)
 
 		Raises:
-		    ValueError: If dataset preparation or training fails
+		    ValueError: If the dataset is invalid or empty
 		"""
-		results = {
+		started = time.monotonic()
+		dataset_info = {
 			"team": team_slug,
 			"subject": subject_slug,
-			"algorithm": algorithm,
-			"success": False,
-			"metrics": {},
+			"snapshot": None,
+			"cache_hit": False,
 		}
-
-		# Get the base model directory path
 		BASE_MODEL_DIR = os.path.join(settings.BASE_DIR, "models")
 
-		# Create version path for this run
-		model_version = options.get("model_version")
-		if model_version:
-			model_dir = (
-				Path(BASE_MODEL_DIR)
-				/ team_slug
-				/ subject_slug
-				/ algorithm
-				/ model_version
-			)
-			model_dir.mkdir(parents=True, exist_ok=True)
-		else:
-			model_dir = make_version_path(
-				BASE_MODEL_DIR, team_slug, subject_slug, algorithm
-			)
-
-		results["model_dir"] = str(model_dir)
-		results["model_version"] = model_dir.name
-
-		# Log start of training
-		self.log_message(
-			f"Starting training for {team_slug}/{subject_slug} using {algorithm}",
-			VerbosityLevel.PROGRESS,
-		)
-
-		# Step 1: Collect and prepare data
-		subject = Subject.objects.get(subject_slug=subject_slug, team__slug=team_slug)
-
 		dataset_file = options.get("dataset_file")
 		if dataset_file:
 			# Off-box training path: load a CSV produced by export_training_data
@@ -462,6 +528,7 @@ class Command(BaseCommand):
 					"Dataset file column 'relevant' must contain only 0/1 labels"
 				)
 			dataset_df["relevant"] = dataset_df["relevant"].astype(int)
+			dataset_info["source"] = dataset_file
 
 			self.log_message(
 				f"Loaded {len(dataset_df)} labeled articles from {dataset_file}",
@@ -498,18 +565,96 @@ class Command(BaseCommand):
 					VerbosityLevel.PROGRESS,
 				)
 
-			# Build dataset with collected articles
+			# Build the dataset, or reuse the one built for the same labels
+			dataset_df, snapshot, cache_hit = load_or_build_dataset(
+				team_slug,
+				subject_slug,
+				window_days,
+				cache_dir=Path(BASE_MODEL_DIR) / team_slug / subject_slug / "datasets",
+				use_cache=not options.get("no_dataset_cache", False),
+			)
+			dataset_info.update({"snapshot": snapshot, "cache_hit": cache_hit})
 			self.log_message(
-				f"Building dataset with {labeled_articles} labeled articles",
+				f"{'Reused cached' if cache_hit else 'Built'} dataset {snapshot} "
+				f"with {len(dataset_df)} labeled articles",
 				VerbosityLevel.PROGRESS,
 			)
-			dataset_df = build_dataset(articles_qs, subject)
 
 		if len(dataset_df) == 0:
 			raise ValueError(
 				f"No labeled articles found for {team_slug}/{subject_slug}"
 			)
 
+		dataset_info["rows"] = len(dataset_df)
+		dataset_info["seconds"] = round(time.monotonic() - started, 2)
+		return dataset_df, dataset_info
+
+	def run_training_pipeline(
+		self,
+		team_slug: str,
+		subject_slug: str,
+		algorithm: str,
+		options: Dict[str, Any],
+		dataset_df: pd.DataFrame = None,
+	) -> Dict[str, Any]:
+		"""
+		Run the complete training pipeline for a specific team, subject, and algorithm.
+
+		Args:
+		    team_slug: The team slug
+		    subject_slug: The subject slug
+		    algorithm: The algorithm name
+		    options: Command options
+		    dataset_df: The prepared dataset (prepare_dataset); loaded here when
+		        not given
+
+		Returns:
+		    Dict with training results including metrics
+
+		Raises:
+		    ValueError: If dataset preparation or training fails
+		"""
+		results = {
+			"team": team_slug,
+			"subject": subject_slug,
+			"algorithm": algorithm,
+			"success": False,
+			"metrics": {},
+		}
+
+		# Get the base model directory path
+		BASE_MODEL_DIR = os.path.join(settings.BASE_DIR, "models")
+
+		# Create version path for this run
+		model_version = options.get("model_version")
+		if model_version:
+			model_dir = (
+				Path(BASE_MODEL_DIR)
+				/ team_slug
+				/ subject_slug
+				/ algorithm
+				/ model_version
+			)
+			model_dir.mkdir(parents=True, exist_ok=True)
+		else:
+			model_dir = make_version_path(
+				BASE_MODEL_DIR, team_slug, subject_slug, algorithm
+			)
+
+		results["model_dir"] = str(model_dir)
+		results["model_version"] = model_dir.name
+
+		# Log start of training
+		self.log_message(
+			f"Starting training for {team_slug}/{subject_slug} using {algorithm}",
+			VerbosityLevel.PROGRESS,
+		)
+
+		# Step 1: Collect and prepare data (once per subject when called from
+		# handle(), which passes the dataset in)
+		if dataset_df is None:
+			dataset_df, _ = self.prepare_dataset(team_slug, subject_slug, options)
+
 		# Add class distribution check
 		class_counts = dataset_df["relevant"].value_counts()
 		self.log_message(
@@ -590,78 +735,63 @@ class Command(BaseCommand):
 				"Applying pseudo-labeling with self-training", VerbosityLevel.PROGRESS
 			)
 
-			# In a real implementation, we'd query for unlabeled articles
-			# For now, we'll use a custom query to get articles without subject relevance
+			subject = Subject.objects.get(
+				subject_slug=subject_slug, team__slug=team_slug
+			)
 
-			# Query for articles that don't have relevance entries for this subject
-			# This is a simplified version - in production, use a more efficient query
+			# Sample the unlabeled pool (ids only) and stream it in cleaned
+			# chunks; cleaned texts are cached per team across runs.
 			self.log_message(
 				"Collecting unlabeled articles...", VerbosityLevel.PROGRESS
 			)
+			pool = UnlabeledPool.sample(
+				team_slug,
+				subject,
+				size=options.get("pseudo_pool_size") or DEFAULT_POOL_SIZE,
+				strategy=options.get("pseudo_sampling") or "recent",
+				cache=CleanedTextCache(
+					Path(BASE_MODEL_DIR) / team_slug / "cleaned_text.sqlite3"
+				),
+				workers=min(4, os.cpu_count() or 1),
+			)
 
-			# Get articles from the same team but without relevance labels for this subject.
-			# NULL is_relevant means "Not Reviewed", which is still unlabeled and should
-			# remain eligible for pseudo-labeling. Only exclude articles that already have
-			# a reviewed (non-NULL) relevance entry for this subject.
-			unlabeled_articles = Articles.objects.filter(teams__slug=team_slug).exclude(
-				article_subject_relevances__subject=subject,
-				article_subject_relevances__is_relevant__isnull=False,
-			)[:100]  # Limit to 100 for efficiency in this example
-
-			# Convert to DataFrame with the same structure and text cleaning as build_dataset
-			unlabeled_data = []
-			for article in unlabeled_articles:
-				text = cleanText(
-					cleanHTML(f"{article.title} {article.summary or ''}"),
-					min_words=MIN_WORD_COUNT,
-				)
-				if not text:
-					continue
-				unlabeled_data.append(
-					{
-						"article_id": article.article_id,
-						"title": article.title,
-						"summary": article.summary or "",
-						"text": text,
-					}
-				)
-
-			if not unlabeled_data:
-				self.log_warning(
-					"No unlabeled articles found, skipping pseudo-labeling",
-					VerbosityLevel.WARNINGS,
-				)
-			else:
-				unlabelled_df = pd.DataFrame(unlabeled_data)
-
-				# Generate pseudo-labels
-				self.log_message(
-					f"Starting pseudo-labeling with {len(unlabelled_df)} unlabeled examples",
-					VerbosityLevel.PROGRESS,
-				)
-				enhanced_train_df = generate_pseudo_labels(
-					train_df=train_df,
-					val_df=val_df,
-					unlabelled_df=unlabelled_df,
-					confidence=0.9,
-					max_iter=7,
-					algorithm=algorithm,
-				)
+			try:
+				if not len(pool):
+					self.log_warning(
+						"No unlabeled articles found, skipping pseudo-labeling",
+						VerbosityLevel.WARNINGS,
+					)
+				else:
+					# Generate pseudo-labels
+					self.log_message(
+						f"Starting pseudo-labeling with a pool of {len(pool)} unlabeled articles",
+						VerbosityLevel.PROGRESS,
+					)
+					enhanced_train_df = generate_pseudo_labels(
+						train_df=train_df,
+						val_df=val_df,
+						unlabelled_chunks=pool.chunks,
+						confidence=0.9,
+						max_iter=7,
+						algorithm=algorithm,
+					)
 
-				# Save pseudo-labels to CSV
-				pseudo_dir = (
-					Path(BASE_MODEL_DIR) / team_slug / subject_slug / "pseudo_labels"
-				)
-				pseudo_file = save_pseudo_csv(
-					enhanced_train_df, pseudo_dir, prefix=algorithm
-				)
+					# Save pseudo-labels to CSV
+					pseudo_dir = (
+						Path(BASE_MODEL_DIR) / team_slug / subject_slug / "pseudo_labels"
+					)
+					pseudo_file = save_pseudo_csv(
+						enhanced_train_df, pseudo_dir, prefix=algorithm
+					)
 
-				self.log_message(
-					f"Saved pseudo-labels to {pseudo_file}", VerbosityLevel.PROGRESS
-				)
+					self.log_message(
+						f"Saved pseudo-labels to {pseudo_file}", VerbosityLevel.PROGRESS
+					)
 
-				# Use the enhanced training set
-				train_df = enhanced_train_df
+					# Use the enhanced training set
+					train_df = enhanced_train_df
+			finally:
+				pool.close()
 
 		# Step 5: Train the model
 		self.log_message(f"Initializing {algorithm} trainer", VerbosityLevel.PROGRESS)
@@ -857,6 +987,117 @@ class Command(BaseCommand):
 		results["success"] = True
 		return results
 
+	def run_training_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+		"""Run one scheduled job's training pipeline in this process."""
+		return self.run_training_pipeline(
+			team_slug=payload["team"],
+			subject_slug=payload["subject"],
+			algorithm=payload["algorithm"],
+			options=payload["options"],
+			dataset_df=payload["dataset"],
+		)
+
+	def start_run_log(self, team, subject, algorithm: str) -> PredictionRunLog:
+		"""Create the PredictionRunLog row for a training run as it starts."""
+		with transaction.atomic():
+			return PredictionRunLog.objects.create(
+				team=team,
+				subject=subject,
+				algorithm=algorithm,
+				run_type="train",
+				success=None,
+				model_version="pending",  # Will be updated after training
+				triggered_by=f"train_models command ({os.getenv('USER', 'system')})",
+			)
+
+	def record_failure(
+		self,
+		run_log: PredictionRunLog,
+		team_slug: str,
+		subject_slug: str,
+		algorithm: str,
+		error: BaseException,
+	) -> Dict[str, Any]:
+		"""
+		Log a failed training run and mark its PredictionRunLog as failed.
+
+		Returns:
+		    The run's entry for the run report
+		"""
+		error_msg = f"Training failed for {team_slug}/{subject_slug}/{algorithm}: {str(error)}"
+		# Errors raised in a worker process carry the worker's traceback as
+		# their __cause__, which format_exception includes.
+		stack_trace = "".join(traceback.format_exception(error))
+		self.log_error(error_msg, VerbosityLevel.PROGRESS)
+		self.log_error(stack_trace, VerbosityLevel.WARNINGS)
+
+		# Update run log with failure - wrap in try/except to handle DB issues
+		try:
+			with transaction.atomic():
+				run_log.success = False
+				run_log.run_finished = timezone.now()
+				# Trim error message to avoid overflow
+				run_log.error_message = f"{error_msg}\n\n{stack_trace[:1000]}"  # Limit length
+				run_log.save()
+		except Exception as db_error:
+			self.log_error(
+				f"Failed to update run log: {str(db_error)}",
+				VerbosityLevel.WARNINGS,
+			)
+
+		return {
+			"team": team_slug,
+			"subject": subject_slug,
+			"algorithm": algorithm,
+			"success": False,
+			"error": str(error),
+		}
+
+	def write_run_report(
+		self,
+		report: Dict[str, Any],
+		options: Dict[str, Any],
+		run_started,
+		jobs_count: int,
+		memory_budget: float,
+	) -> Path:
+		"""
+		Write the consolidated JSON report for this invocation: settings,
+		each subject's dataset (snapshot hash, cache hit, rows, build time)
+		and each training run (outcome, model version, duration, metrics).
+		"""
+		finished = timezone.now()
+		report_path = (
+			Path(options["report"])
+			if options.get("report")
+			else Path(settings.BASE_DIR)
+			/ "models"
+			/ "reports"
+			/ f"train_models_{run_started.strftime('%Y%m%d_%H%M%S')}.json"
+		)
+		report_path.parent.mkdir(parents=True, exist_ok=True)
+		runs = report["runs"]
+		with open(report_path, "w") as f:
+			json.dump(
+				{
+					"started": run_started.isoformat(),
+					"finished": finished.isoformat(),
+					"seconds": round((finished - run_started).total_seconds(), 2),
+					"jobs": jobs_count,
+					"memory_budget_gb": memory_budget,
+					"tf_jobs": options.get("tf_jobs") or 1,
+					"algorithms": options["parsed_algos"],
+					"succeeded": sum(1 for run in runs if run["success"]),
+					"failed": sum(1 for run in runs if not run["success"]),
+					"datasets": report["datasets"],
+					"runs": runs,
+				},
+				f,
+				indent=2,
+				default=str,
+			)
+		return report_path
+
 	def handle(self, *args, **options):
 		"""
 		Execute the command.
@@ -938,8 +1179,11 @@ class Command(BaseCommand):
 
 			# Initialize metrics collection for summary
 			all_results = []
+			run_started = timezone.now()
+			report = {"datasets": [], "runs": []}
 
-			# Main training loop
+			# Build each subject's dataset once; every algorithm trains on it
+			jobs = []
 			for team_slug, subject_slugs in teams_subjects:
 				# Get team object
 				team = Team.objects.get(slug=team_slug)
@@ -961,59 +1205,117 @@ class Command(BaseCommand):
 						VerbosityLevel.PROGRESS,
 					)
 
-					# Process each algorithm
-					for algo in algos:
-						# Create a PredictionRunLog entry with success=None
-						with transaction.atomic():
-							run_log = PredictionRunLog.objects.create(
-								team=team,
-								subject=subject,
-								algorithm=algo,
-								run_type="train",
-								success=None,
-								model_version="pending",  # Will be updated after training
-								triggered_by=f"train_models command ({os.getenv('USER', 'system')})",
+					try:
+						dataset_df, dataset_info = self.prepare_dataset(
+							team_slug, subject_slug, options
+						)
+					except Exception as e:
+						# Without a dataset every algorithm fails the same way
+						report["datasets"].append(
+							{"team": team_slug, "subject": subject_slug, "error": str(e)}
+						)
+						for algo in algos:
+							run_log = self.start_run_log(team, subject, algo)
+							report["runs"].append(
+								self.record_failure(
+									run_log, team_slug, subject_slug, algo, e
+								)
 							)
+						continue
 
-						try:
-							# Run the training pipeline
-							results = self.run_training_pipeline(
-								team_slug=team_slug,
-								subject_slug=subject_slug,
+					report["datasets"].append(dataset_info)
+					for algo in algos:
+						jobs.append(
+							TrainingJob.for_algorithm(
+								key=f"{team_slug}/{subject_slug}/{algo}",
 								algorithm=algo,
-								options=options,
+								payload={
+									"team": team_slug,
+									"subject": subject_slug,
+									"algorithm": algo,
+									"options": {
+										key: options.get(key) for key in JOB_OPTION_KEYS
+									},
+									"dataset": dataset_df,
+								},
 							)
+						)
 
-							# Update run log with success and model version
-							with transaction.atomic():
-								run_log.success = True
-								run_log.run_finished = timezone.now()
-								run_log.model_version = results["model_version"]
-								run_log.save()
-
-							# Add to results for summary
-							all_results.append(results)
-
-						except Exception as e:
-							# Log the error and mark as failed
-							error_msg = f"Training failed for {team_slug}/{subject_slug}/{algo}: {str(e)}"
-							stack_trace = traceback.format_exc()
-							self.log_error(error_msg, VerbosityLevel.PROGRESS)
-							self.log_error(stack_trace, VerbosityLevel.WARNINGS)
-
-							# Update run log with failure - wrap in try/except to handle DB issues
-							try:
-								with transaction.atomic():
-									run_log.success = False
-									run_log.run_finished = timezone.now()
-									# Trim error message to avoid overflow
-									run_log.error_message = f"{error_msg}\n\n{stack_trace[:1000]}"  # Limit length
-									run_log.save()
-							except Exception as db_error:
-								self.log_error(
-									f"Failed to update run log: {str(db_error)}",
-									VerbosityLevel.WARNINGS,
-								)
+			run_logs = {}
+			started_at = {}
+
+			def on_start(job):
+				payload = job.payload
+				run_logs[job.key] = self.start_run_log(
+					Team.objects.get(slug=payload["team"]),
+					Subject.objects.get(
+						subject_slug=payload["subject"], team__slug=payload["team"]
+					),
+					job.algorithm,
+				)
+				started_at[job.key] = time.monotonic()
+
+			def on_done(job, results, error):
+				payload = job.payload
+				# The dataset is no longer needed once its job has finished
+				job.payload = None
+				run_log = run_logs.pop(job.key)
+				duration = round(time.monotonic() - started_at.pop(job.key), 2)
+
+				if error is not None:
+					entry = self.record_failure(
+						run_log,
+						payload["team"],
+						payload["subject"],
+						job.algorithm,
+						error,
+					)
+				else:
+					# Update run log with success and model version
+					with transaction.atomic():
+						run_log.success = True
+						run_log.run_finished = timezone.now()
+						run_log.model_version = results["model_version"]
+						run_log.save()
+
+					# Add to results for summary
+					all_results.append(results)
+					entry = {
+						"team": results["team"],
+						"subject": results["subject"],
+						"algorithm": results["algorithm"],
+						"success": True,
+						"model_version": results["model_version"],
+						"metrics": results.get("metrics", {}),
+					}
+				entry["seconds"] = duration
+				report["runs"].append(entry)
+
+			jobs_count = options.get("jobs") or 1
+			memory_budget = options.get("memory_budget") or default_memory_budget_gb()
+			if jobs_count > 1:
+				self.log_message(
+					f"Running {len(jobs)} training job(s) on {jobs_count} worker(s) "
+					f"within {memory_budget:g} GB, {options.get('tf_jobs') or 1} TensorFlow job(s) at a time",
+					VerbosityLevel.PROGRESS,
+				)
+
+			run_jobs(
+				jobs,
+				worker=_train_job if jobs_count > 1 else self.run_training_job,
+				max_workers=jobs_count,
+				memory_budget_gb=memory_budget,
+				tensorflow_slots=options.get("tf_jobs") or 1,
+				on_start=on_start,
+				on_done=on_done,
+			)
+
+			report_path = self.write_run_report(
+				report, options, run_started, jobs_count, memory_budget
+			)
+			self.log_message(
+				f"Run report written to {report_path}", VerbosityLevel.PROGRESS
+			)
 
 			# Print summary if verbosity level is high enough
 			if all_results:
@@ -1,21 +1,47 @@
 from django.core.management.base import BaseCommand
+from gregory.functions import current_site_settings
 from gregory.models import Articles
 from gregory.classes import SciencePaper
-from gregory.utils.enrichment import clear_marker, due_filter, record_fruitless_attempt
+from gregory.utils.enrichment import clear_marker, record_fruitless_attempt
+from gregory.utils.enrichment_executor import (
+	DEFAULT_BATCH_SIZE,
+	DEFAULT_WORKERS,
+	EnrichmentExecutor,
+	FetchFailed,
+)
 from django.utils import timezone
 from django.db.models import Q
-import requests
 from datetime import timedelta
-import time
 import re
 
 
 class Command(BaseCommand):
 	help = "Updates articles with DOI, access, publisher, journal, publish date, and abstracts with minimal API calls."
 
-	def handle(self, *args, **kwargs):
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--workers",
+			type=int,
+			default=DEFAULT_WORKERS,
+			help="Concurrent CrossRef/Unpaywall lookups (paced by the shared per-API rate limits).",
+		)
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=DEFAULT_BATCH_SIZE,
+			help="Due articles claimed per batch.",
+		)
+		parser.add_argument(
+			"--limit", type=int, default=None, help="Stop after this many articles."
+		)
+
+	def handle(self, *args, **options):
 		# Fetch and update articles details with minimal API calls
-		self.update_article_details()
+		self.update_article_details(
+			workers=options.get("workers", DEFAULT_WORKERS),
+			batch_size=options.get("batch_size", DEFAULT_BATCH_SIZE),
+			limit=options.get("limit"),
+		)
 		self.stdout.write(
 			self.style.SUCCESS(
 				"Successfully updated articles information with minimal API calls."
@@ -47,34 +73,36 @@ class Command(BaseCommand):
 
 		return False
 
-	def try_refresh_paper(self, paper, retries=3, delay=5):
-		"""Attempt to refresh the paper data with retries and a delay."""
-		for attempt in range(retries):
-			try:
-				paper.refresh()
-				return True  # Success
-			except requests.exceptions.RequestException as e:
-				self.stdout.write(f"Attempt {attempt + 1} failed: {e}")
-				if attempt < retries - 1:
-					self.stdout.write(f"Retrying in {delay} seconds...")
-					time.sleep(delay)
-				else:
-					self.stdout.write("Max retries exceeded. Skipping this paper.")
-		return False  # Failed after retries
-
-	def update_article_details(self):
+	@staticmethod
+	def refresh_paper(article, site=None):
+		"""
+		CrossRef + Unpaywall lookup for *article* (runs on a worker thread).
+		SciencePaper.refresh() reports a failed CrossRef lookup by return
+		value; that is raised as FetchFailed so the backoff marker does not
+		advance. A missing DOI ("not found") is a completed lookup.
+		"""
+		paper = SciencePaper(doi=article.doi)
+		result = paper.refresh(site=site)
+		if SciencePaper.is_crossref_failed(result) and "not found" not in result.lower():
+			raise FetchFailed(
+				result, response=getattr(paper.crossref_error, "response", None)
+			)
+		return paper
+
+	def update_article_details(
+		self, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, limit=None
+	):
 		# Select articles that need updating but have a DOI
 		three_months_ago = timezone.now() - timedelta(days=90)
 
 		# Backoff: only re-check articles whose details marker is unset or due,
 		# so rows that will never gain the missing fields stop costing a
 		# CrossRef + Unpaywall round-trip twice a day.
-		details_due = due_filter("details_next_check")
+		# The marker itself is applied by the executor when it claims rows.
 
 		# First, get articles with missing or 'not available' summaries
 		articles_missing_data = Articles.objects.filter(
-			details_due
-			& Q(doi__isnull=False, doi__gt="")
+			Q(doi__isnull=False, doi__gt="")
 			& (
 				Q(crossref_check__isnull=True)
 				| Q(access__isnull=True)
@@ -90,8 +118,7 @@ class Command(BaseCommand):
 
 		# Also get articles with potentially truncated summaries (ending with ..., [...], etc.)
 		articles_with_summaries = Articles.objects.filter(
-			details_due
-			& Q(doi__isnull=False, doi__gt="")
+			Q(doi__isnull=False, doi__gt="")
 			& Q(summary__isnull=False)
 			& ~Q(summary="")
 			& ~Q(summary="not available")
@@ -110,42 +137,50 @@ class Command(BaseCommand):
 		# Combine both querysets
 		articles = (articles_missing_data | articles_with_summaries).distinct()
 
-		total_articles = articles.count()
+		# Resolved here: the lookups run on worker threads, which must not query
+		site = current_site_settings()
+
+		def on_error(article, e):
+			# Network failure: not a completed attempt, so the backoff
+			# marker must not advance — the next run retries immediately.
+			self.stdout.write(
+				f"Skipping article '{article.title}' due to connection issues: {e}"
+			)
+
+		stats = EnrichmentExecutor(["crossref", "unpaywall"], workers=workers).run(
+			articles,
+			"details_next_check",
+			lambda article: self.refresh_paper(article, site),
+			self.write_details,
+			on_error=on_error,
+			batch_size=batch_size,
+			limit=limit,
+		)
 		self.stdout.write(
-			f"Found {total_articles} articles to update (including {articles_with_summaries.count()} with truncated summaries)"
+			f"Processed {stats.claimed} articles ({stats.failed} lookups failed)"
 		)
 
-		for article in articles:
-			if article.doi:
-				paper = SciencePaper(doi=article.doi)
-				# Refresh once per article
-				if not self.try_refresh_paper(paper):
-					# Network failure: not a completed attempt, so the backoff
-					# marker must not advance — the next run retries immediately.
-					self.stdout.write(
-						f"Skipping article '{article.title}' due to connection issues."
-					)
-					continue  # Use continue instead of return to proceed with the next article
-			else:
-				self.stdout.write(f"Empty DOI for article_id {article.id}")
-				continue
-
-			# Update fields from the refreshed paper object
-			updated = self.update_article_from_paper(article, paper)
-			if updated:
-				clear_marker(article, "details")
-			else:
-				# CrossRef/Unpaywall responded but nothing new was gained:
-				# back off before re-checking this article.
-				record_fruitless_attempt(article, "details")
+	def write_details(self, article, paper):
+		# Update fields from the refreshed paper object
+		updated = self.update_article_from_paper(article, paper)
+		if updated:
+			clear_marker(article, "details")
+		else:
+			# CrossRef/Unpaywall responded but nothing new was gained:
+			# back off before re-checking this article.
+			record_fruitless_attempt(article, "details")
 
 	def update_article_from_paper(self, article, paper) -> bool:
 		"""Apply refreshed CrossRef/Unpaywall data; returns True if anything changed."""
 		update_fields = []
 		updated_info = []  # To keep track of what information is updated
-
-		# Fetch the most recent history record for comparison later
-		last_history = article.history.first()
+		# Field values before the refresh, for the change log below. Read
+		# here rather than diffed from the history rows: the executor defers
+		# those to the end of the batch.
+		previous = {
+			field: getattr(article, field)
+			for field in ("access", "pdf_link", "publisher", "container_title", "published_date", "summary")
+		}
 
 		# Only count fields where the refresh produced an actual value: assigning
 		# None over None used to mark the article "updated", write a history row,
@@ -206,20 +241,11 @@ class Command(BaseCommand):
 			article.crossref_check = timezone.now()
 			article.save(update_fields=update_fields)
 
-			# Log the changes using Django Simple History
-			new_history = article.history.first()  # The new state after save
-			if last_history and new_history:
-				changes = new_history.diff_against(last_history)
-				if changes.changes:
-					self.stdout.write(f"Changes for '{article.title}':")
-					for change in changes.changes:
-						self.stdout.write(
-							f" - {change.field}: from '{change.old}' to '{change.new}'"
-						)
-				else:
-					self.stdout.write(f"No changes detected for '{article.title}'.")
-			else:
-				self.stdout.write(f"History not available for '{article.title}'.")
+			self.stdout.write(f"Changes for '{article.title}':")
+			for field in update_fields:
+				self.stdout.write(
+					f" - {field}: from '{previous[field]}' to '{getattr(article, field)}'"
+				)
 
 			# Log the updated information
 			self.stdout.write(
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.6 on 2026-10-19 00:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gregory', '0095_index_title_and_discovery_date_ordering_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articles',
+            name='trial_refs_scanned_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='TrialIdentifierIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('identifier_type', models.CharField(max_length=50)),
+                ('identifier_value', models.CharField(max_length=100)),
+                ('indexed_at', models.DateTimeField(auto_now_add=True)),
+                ('references_scanned_at', models.DateTimeField(blank=True, null=True)),
+                ('trial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identifier_index', to='gregory.trials')),
+            ],
+            options={
+                'verbose_name': 'trial identifier index entry',
+                'verbose_name_plural': 'trial identifier index',
+                'db_table': 'trial_identifier_index',
+                'indexes': [models.Index(fields=['identifier_value', 'identifier_type'], name='trialidindex_value_type_idx'), models.Index(condition=models.Q(('references_scanned_at__isnull', True)), fields=['references_scanned_at'], name='trialidindex_unscanned_idx')],
+                'constraints': [models.UniqueConstraint(fields=('trial', 'identifier_type', 'identifier_value'), name='unique_trial_identifier_index')],
+            },
+        ),
+    ]
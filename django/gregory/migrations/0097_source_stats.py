@@ -0,0 +1,62 @@
+# Generated by Django 6.0.6 on 2026-10-19 01:50
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+
+def backfill_source_stats(apps, schema_editor):
+	# Same grouped aggregation as gregory.utils.source_stats.rebuild_source_stats,
+	# against the historical models, so the admin has statistics to show before
+	# the first feedreader run. Fetch outcome fields start empty.
+	db_alias = schema_editor.connection.alias
+	Sources = apps.get_model("gregory", "Sources")
+	SourceStats = apps.get_model("gregory", "SourceStats")
+	now = timezone.now()
+	rows = []
+	for queryset, item, date_field in (
+		(Sources.objects.using(db_alias).filter(source_for="trials"), "trials", "last_updated"),
+		(Sources.objects.using(db_alias).exclude(source_for="trials"), "articles", "published_date"),
+	):
+		for row in queryset.order_by().values("source_id").annotate(
+			last_item_date=Max(f"{item}__{date_field}"),
+			item_count=Count(item),
+			items_last_7_days=Count(item, filter=Q(**{f"{item}__discovery_date__gte": now - timedelta(days=7)})),
+			items_last_30_days=Count(item, filter=Q(**{f"{item}__discovery_date__gte": now - timedelta(days=30)})),
+		):
+			rows.append(SourceStats(**row))
+	SourceStats.objects.using(db_alias).bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gregory', '0096_trial_identifier_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceStats',
+            fields=[
+                ('source', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='gregory.sources')),
+                ('last_item_date', models.DateTimeField(blank=True, null=True)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('items_last_7_days', models.PositiveIntegerField(default=0)),
+                ('items_last_30_days', models.PositiveIntegerField(default=0)),
+                ('last_fetch_at', models.DateTimeField(blank=True, help_text='When a feedreader last processed this source.', null=True)),
+                ('last_fetch_succeeded_at', models.DateTimeField(blank=True, help_text='When a feedreader last fetched this source without a request failure. Unlike Sources.last_successful_fetch_at this is not an incremental anchor.', null=True)),
+                ('error_streak', models.PositiveIntegerField(default=0, help_text='Consecutive feedreader runs whose fetch failed.')),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'source statistics',
+                'verbose_name_plural': 'source statistics',
+                'db_table': 'source_stats',
+            },
+        ),
+        migrations.RunPython(backfill_source_stats, migrations.RunPython.noop),
+    ]
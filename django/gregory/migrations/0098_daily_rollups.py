@@ -0,0 +1,64 @@
+# Generated by Django 6.0.6 on 2026-10-19 02:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gregory', '0097_source_stats'),
+        ('organizations', '0006_alter_organization_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryDailyMLRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True)),
+                ('algorithm', models.CharField(blank=True, default='', max_length=20)),
+                ('score_bucket', models.PositiveSmallIntegerField()),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_ml_rollups', to='gregory.teamcategory')),
+            ],
+            options={
+                'db_table': 'category_daily_ml_rollup',
+                'indexes': [models.Index(fields=['category', 'day'], name='catmlrollup_category_day_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True)),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('trials', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='gregory.teamcategory')),
+            ],
+            options={
+                'db_table': 'category_daily_rollup',
+                'indexes': [models.Index(fields=['category', 'day'], name='catrollup_category_day_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'All content'), ('organization', 'Organisation'), ('team', 'Team'), ('subject', 'Subject')], max_length=12)),
+                ('day', models.DateField()),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('trials', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.organization')),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gregory.subject')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gregory.team')),
+            ],
+            options={
+                'db_table': 'content_daily_rollup',
+                'indexes': [models.Index(fields=['scope', 'day'], name='rollup_scope_day_idx'), models.Index(fields=['organization', 'day'], name='rollup_org_day_idx'), models.Index(fields=['team', 'day'], name='rollup_team_day_idx'), models.Index(fields=['subject', 'day'], name='rollup_subject_day_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.6 on 2026-10-19 02:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Same grouping as gregory.utils.author_counts.rebuild_author_counts, in one
+# INSERT ... SELECT so the authors endpoints have counts to read straight away.
+BACKFILL_SQL = """
+INSERT INTO author_article_counts
+	(author_id, organization_id, articles, relevant_articles, shared_articles, refreshed_at)
+SELECT
+	aa.authors_id,
+	t.organization_id,
+	COUNT(DISTINCT a.article_id),
+	COUNT(DISTINCT a.article_id) FILTER (WHERE a.relevant),
+	COUNT(DISTINCT a.article_id) FILTER (WHERE multi.articles_id IS NOT NULL),
+	NOW()
+FROM articles_authors aa
+JOIN articles a ON a.article_id = aa.articles_id
+JOIN articles_teams at ON at.articles_id = a.article_id
+JOIN gregory_team t ON t.id = at.team_id
+LEFT JOIN (
+	SELECT at2.articles_id
+	FROM articles_teams at2
+	JOIN gregory_team t2 ON t2.id = at2.team_id
+	GROUP BY at2.articles_id
+	HAVING COUNT(DISTINCT t2.organization_id) > 1
+) multi ON multi.articles_id = a.article_id
+WHERE t.organization_id IS NOT NULL
+GROUP BY aa.authors_id, t.organization_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gregory', '0098_daily_rollups'),
+        ('organizations', '0006_alter_organization_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorArticleCounts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('relevant_articles', models.PositiveIntegerField(default=0)),
+                ('shared_articles', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_counts', to='gregory.authors')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name': 'author article counts',
+                'verbose_name_plural': 'author article counts',
+                'db_table': 'author_article_counts',
+                'constraints': [models.UniqueConstraint(fields=('author', 'organization'), name='unique_author_org_counts')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
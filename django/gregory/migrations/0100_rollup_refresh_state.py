@@ -0,0 +1,24 @@
+# Generated by Django 6.0.6 on 2026-10-19 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gregory', '0099_author_article_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupRefreshState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=40, unique=True)),
+                ('refreshed_through', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'rollup_refresh_state',
+            },
+        ),
+    ]
@@ -54,6 +54,11 @@ from sklearn.metrics import (
 	average_precision_score,
 )
 
+from gregory.ml.inference import length_batches, pad_token_ids
+
+# Texts per model.predict() call in predict()/perform_pseudo_labeling().
+PREDICT_BATCH_SIZE = 32
+
 
 class BertTrainer:
 	"""
@@ -131,11 +136,10 @@ class BertTrainer:
 		Returns:
 		    tf.keras.Model: The compiled model.
 		"""
-		# Input layers
-		input_ids = Input(shape=(self.max_len,), dtype=tf.int32, name="input_ids")
-		attention_masks = Input(
-			shape=(self.max_len,), dtype=tf.int32, name="attention_masks"
-		)
+		# Input layers. The sequence length is left open: encode_texts pads to
+		# the longest item in the batch (at most max_len), not to max_len.
+		input_ids = Input(shape=(None,), dtype=tf.int32, name="input_ids")
+		attention_masks = Input(shape=(None,), dtype=tf.int32, name="attention_masks")
 
 		# Set whether the BERT model is trainable
 		self.bert_model.trainable = not self.freeze_weights
@@ -174,40 +178,92 @@ class BertTrainer:
 
 		return model
 
+	def _tokenize(self, texts: List[str]) -> List[List[int]]:
+		"""
+		Token ids for every text, truncated to max_len and unpadded, from a
+		single batched call to the (fast) tokenizer.
+
+		Args:
+		    texts (List[str]): List of text strings to tokenize
+
+		Returns:
+		    List[List[int]]: One list of token ids per text
+		"""
+		encoded = self.tokenizer(
+			list(texts),
+			add_special_tokens=True,
+			max_length=self.max_len,
+			truncation=True,
+			padding=False,
+			return_attention_mask=False,
+		)
+		return encoded["input_ids"]
+
+	def _pad(self, token_ids: List[List[int]]) -> Tuple[tf.Tensor, tf.Tensor]:
+		"""
+		Pad token id lists to the longest one (see
+		gregory.ml.inference.pad_token_ids) and build the attention masks.
+
+		Args:
+		    token_ids (List[List[int]]): Output of _tokenize
+
+		Returns:
+		    Tuple[tf.Tensor, tf.Tensor]: Tuple of (input_ids, attention_masks)
+		"""
+		input_ids, attention_masks = pad_token_ids(
+			token_ids, self.max_len, self.tokenizer.pad_token_id or 0
+		)
+		return tf.constant(input_ids), tf.constant(attention_masks)
+
 	def encode_texts(self, texts: List[str]) -> Tuple[tf.Tensor, tf.Tensor]:
 		"""
 		Encode text inputs for BERT processing.
 
+		All texts are tokenized in one batched call and padded to the longest
+		of them rather than to max_len; the attention mask hides the padding,
+		so the model output is the same either way, but short abstracts no
+		longer pay for max_len positions of attention.
+
 		Args:
 		    texts (List[str]): List of text strings to encode
 
 		Returns:
 		    Tuple[tf.Tensor, tf.Tensor]: Tuple of (input_ids, attention_masks)
 		"""
-		input_ids = []
-		attention_masks = []
-
-		for text in texts:
-			# Encode each text with padding and truncation
-			encoded = self.tokenizer.encode_plus(
-				text,
-				add_special_tokens=True,
-				max_length=self.max_len,
-				truncation=True,
-				padding="max_length",
-				return_attention_mask=True,
-				return_tensors="tf",
-			)
+		return self._pad(self._tokenize(texts))
 
-			# Extract and collect the encodings
-			input_ids.append(tf.squeeze(encoded["input_ids"]))
-			attention_masks.append(tf.squeeze(encoded["attention_mask"]))
+	def predict_proba(
+		self,
+		texts: List[str],
+		batch_size: int = PREDICT_BATCH_SIZE,
+		bucket_by_length: bool = True,
+	) -> np.ndarray:
+		"""
+		Class probabilities for each text, in input order.
 
-		# Stack the encodings into single tensors
-		input_ids = tf.stack(input_ids, axis=0)
-		attention_masks = tf.stack(attention_masks, axis=0)
+		Texts are tokenized once, then run through the model in batches of
+		batch_size, each padded only to its own longest item. With
+		bucket_by_length the batches are formed from texts sorted by token
+		count, so each batch holds similarly sized texts and carries almost
+		no padding; results are put back in input order either way.
 
-		return input_ids, attention_masks
+		Args:
+		    texts (List[str]): List of texts to classify
+		    batch_size (int, optional): Texts per model call. Defaults to 32.
+		    bucket_by_length (bool, optional): Batch texts of similar length
+		        together. Defaults to True.
+
+		Returns:
+		    np.ndarray: Array of shape (len(texts), 2)
+		"""
+		token_ids = self._tokenize(texts)
+		probabilities = np.zeros((len(token_ids), 2))
+		for batch in length_batches(token_ids, batch_size, bucket_by_length):
+			inputs = self._pad([token_ids[i] for i in batch])
+			probabilities[batch] = self.model.predict(
+				inputs, batch_size=len(batch), verbose=0
+			)
+		return probabilities
 
 	def train(
 		self,
@@ -292,12 +348,8 @@ class BertTrainer:
 		if self.model is None:
 			raise ValueError("Model has not been trained yet.")
 
-		# Encode the test data
-		test_inputs = self.encode_texts(test_texts)
-		test_labels_onehot = to_categorical(test_labels, num_classes=2)
-
 		# Get predictions
-		predictions_prob = self.model.predict(test_inputs)
+		predictions_prob = self.predict_proba(test_texts)
 
 		# Apply threshold to get binary predictions
 		predictions = (predictions_prob[:, 1] >= threshold).astype(int)
@@ -319,7 +371,11 @@ class BertTrainer:
 		return metrics
 
 	def predict(
-		self, texts: List[str], threshold: float = 0.8
+		self,
+		texts: List[str],
+		threshold: float = 0.8,
+		batch_size: int = PREDICT_BATCH_SIZE,
+		bucket_by_length: bool = True,
 	) -> Tuple[List[int], List[float]]:
 		"""
 		Make predictions on new data.
@@ -328,6 +384,9 @@ class BertTrainer:
 		    texts (List[str]): List of texts to classify
 		    threshold (float, optional): Probability threshold for positive class.
 		        Defaults to 0.8.
+		    batch_size (int, optional): Texts per model call. Defaults to 32.
+		    bucket_by_length (bool, optional): Batch texts of similar length
+		        together (see predict_proba). Defaults to True.
 
 		Returns:
 		    Tuple[List[int], List[float]]: Tuple of (predictions, probabilities),
@@ -336,11 +395,10 @@ class BertTrainer:
 		if self.model is None:
 			raise ValueError("Model has not been trained yet.")
 
-		# Encode the texts
-		inputs = self.encode_texts(texts)
-
 		# Get predictions
-		predictions_prob = self.model.predict(inputs)
+		predictions_prob = self.predict_proba(
+			texts, batch_size=batch_size, bucket_by_length=bucket_by_length
+		)
 
 		# Extract probabilities for the positive class
 		positive_probs = predictions_prob[:, 1].tolist()
@@ -513,6 +571,7 @@ class BertTrainer:
 		max_iterations: int = 7,
 		batch_size: int = 16,
 		epochs_per_iter: int = 3,
+		bucket_by_length: bool = True,
 	) -> Tuple[List[str], List[int]]:
 		"""
 		Perform pseudo-labeling using self-training.
@@ -529,6 +588,8 @@ class BertTrainer:
 		        Defaults to 7.
 		    batch_size (int, optional): Batch size for training. Defaults to 16.
 		    epochs_per_iter (int, optional): Epochs to train in each iteration. Defaults to 3.
+		    bucket_by_length (bool, optional): Batch unlabeled texts of similar
+		        length together when scoring them (see predict_proba). Defaults to True.
 
 		Returns:
 		    Tuple[List[str], List[int]]: Enhanced training dataset (texts, labels)
@@ -570,8 +631,9 @@ class BertTrainer:
 			)
 
 			# Get predictions on unlabeled data
-			unlabeled_inputs = self.encode_texts(remaining_unlabeled)
-			predictions_prob = self.model.predict(unlabeled_inputs)
+			predictions_prob = self.predict_proba(
+				remaining_unlabeled, bucket_by_length=bucket_by_length
+			)
 
 			# Find confident predictions (max probability across classes)
 			confidence_scores = np.max(predictions_prob, axis=1)
@@ -0,0 +1,433 @@
+"""
+Inference-only exports of trained classifiers, and the runtime that serves them.
+
+The trainer wrappers predict through training-time APIs: Keras model.predict
+per batch, and for the LSTM the TextVectorization layer running eagerly.
+On the CPU-only prediction host that is most of the cost of predict_articles.
+export_inference_model() writes, next to a trained model version's own
+artefacts, an ``inference/`` directory holding an inference-only form of it:
+
+- pubmed_bert: a SavedModel whose single ``serve`` function takes token ids
+  and attention masks of any length, plus the tokenizer files, so nothing is
+  downloaded at prediction time. With ``quantize=True`` it is converted to
+  TensorFlow Lite with dynamic-range int8 weights instead.
+- lstm: a SavedModel that takes raw strings and runs vectorisation and the
+  network as one graph.
+- lgbm_tfidf: the LightGBM booster as a model file, predicted directly
+  (LightGBM is already CPU-native; the export skips the sklearn wrapper and
+  pins the thread count).
+
+load_inference_model() returns a runtime object with the same
+``predict(texts, threshold)`` contract as the trainers, or None when there
+is no export or the export never passed check_parity(). predict_articles'
+load_model() tries it first and falls back to the trainer.
+
+Heavy imports (tensorflow, transformers, lightgbm) happen inside the
+functions that need them, so importing this module stays cheap.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+INFERENCE_DIR = "inference"
+MANIFEST_NAME = "manifest.json"
+
+# Texts per model call in the BERT runtime, as in BertTrainer.predict.
+DEFAULT_BATCH_SIZE = 32
+
+# Largest per-article probability difference an export may show against the
+# trainer it was exported from. Float graphs agree to rounding error;
+# quantised weights move probabilities by up to a few hundredths.
+PARITY_TOLERANCE = 1e-4
+QUANTIZED_PARITY_TOLERANCE = 0.02
+
+# Batches are padded to their longest item rounded up to a multiple of this
+# (capped at max_len), so the graph sees a handful of distinct shapes rather
+# than one per batch.
+PAD_TO_MULTIPLE_OF = 8
+
+
+class InferenceExportError(Exception):
+	"""Raised when a model cannot be exported for inference."""
+
+	pass
+
+
+def pad_token_ids(
+	token_ids: List[List[int]], max_len: int, pad_id: int
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Pad token id lists to the longest one (rounded up to PAD_TO_MULTIPLE_OF,
+	capped at max_len) and build the matching attention masks.
+
+	Args:
+	    token_ids (List[List[int]]): Token ids per text, already truncated
+	    max_len (int): The model's maximum sequence length
+	    pad_id (int): The tokenizer's padding id
+
+	Returns:
+	    Tuple[np.ndarray, np.ndarray]: int32 arrays (input_ids, attention_masks)
+	"""
+	longest = max((len(ids) for ids in token_ids), default=1)
+	width = min(max_len, -(-longest // PAD_TO_MULTIPLE_OF) * PAD_TO_MULTIPLE_OF)
+	input_ids = np.full((len(token_ids), width), pad_id, dtype=np.int32)
+	attention_masks = np.zeros((len(token_ids), width), dtype=np.int32)
+	for row, ids in enumerate(token_ids):
+		input_ids[row, : len(ids)] = ids
+		attention_masks[row, : len(ids)] = 1
+	return input_ids, attention_masks
+
+
+def length_batches(
+	token_ids: List[List[int]], batch_size: int, bucket_by_length: bool = True
+) -> List[List[int]]:
+	"""
+	Split the indices of *token_ids* into batches of *batch_size*; with
+	bucket_by_length, from indices sorted by token count, so each batch holds
+	texts of similar length and carries almost no padding.
+
+	Returns:
+	    List[List[int]]: Index batches; write results back by index to keep
+	        input order
+	"""
+	order = list(range(len(token_ids)))
+	if bucket_by_length:
+		order.sort(key=lambda i: len(token_ids[i]))
+	return [order[start : start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def _threshold(probabilities: List[float], threshold: float) -> List[int]:
+	return [1 if prob >= threshold else 0 for prob in probabilities]
+
+
+class BertInferenceModel:
+	"""Runs an exported pubmed_bert model: SavedModel or TensorFlow Lite."""
+
+	def __init__(self, export_dir: Path, manifest: Dict[str, Any]):
+		import tensorflow as tf
+		from transformers import AutoTokenizer
+
+		self.max_len = int(manifest["max_len"])
+		self.tokenizer = AutoTokenizer.from_pretrained(str(export_dir / "tokenizer"))
+		self.pad_id = self.tokenizer.pad_token_id or 0
+
+		if manifest.get("quantized"):
+			interpreter = tf.lite.Interpreter(
+				model_path=str(export_dir / manifest["model_file"]),
+				num_threads=os.cpu_count() or 1,
+			)
+			runner = interpreter.get_signature_runner("serving_default")
+			self._run = lambda ids, masks: next(
+				iter(runner(input_ids=ids, attention_masks=masks).values())
+			)
+		else:
+			# Keep the loaded object: its variables die with it, not with serve.
+			self._graph = tf.saved_model.load(str(export_dir / manifest["model_file"]))
+			self._run = lambda ids, masks: self._graph.serve(
+				tf.constant(ids), tf.constant(masks)
+			).numpy()
+
+	def predict(
+		self,
+		texts: List[str],
+		threshold: float = 0.8,
+		batch_size: int = DEFAULT_BATCH_SIZE,
+		bucket_by_length: bool = True,
+	) -> Tuple[List[int], List[float]]:
+		token_ids = self.tokenizer(
+			list(texts),
+			add_special_tokens=True,
+			max_length=self.max_len,
+			truncation=True,
+			padding=False,
+			return_attention_mask=False,
+		)["input_ids"]
+		positive = np.zeros(len(token_ids))
+		for batch in length_batches(token_ids, batch_size, bucket_by_length):
+			ids, masks = pad_token_ids(
+				[token_ids[i] for i in batch], self.max_len, self.pad_id
+			)
+			positive[batch] = self._run(ids, masks)[:, 1]
+		probabilities = positive.tolist()
+		return _threshold(probabilities, threshold), probabilities
+
+
+class LSTMInferenceModel:
+	"""Runs an exported lstm model: strings in, probabilities out, one graph."""
+
+	def __init__(self, export_dir: Path, manifest: Dict[str, Any]):
+		import tensorflow as tf
+
+		self._tf = tf
+		self._graph = tf.saved_model.load(str(export_dir / manifest["model_file"]))
+
+	def predict(
+		self, texts: List[str], threshold: float = 0.8
+	) -> Tuple[List[int], List[float]]:
+		if not texts:
+			return [], []
+		probabilities = (
+			self._graph.serve(self._tf.constant(list(texts))).numpy().tolist()
+		)
+		return _threshold(probabilities, threshold), probabilities
+
+
+class LGBMInferenceModel:
+	"""Runs an exported lgbm_tfidf model through the bare LightGBM booster."""
+
+	def __init__(self, export_dir: Path, manifest: Dict[str, Any]):
+		import joblib
+		import lightgbm as lgbm
+
+		self.vectorizer = joblib.load(export_dir.parent / manifest["vectorizer_file"])
+		self.booster = lgbm.Booster(model_file=str(export_dir / manifest["model_file"]))
+		self.num_threads = os.cpu_count() or 1
+
+	def predict(
+		self, texts: List[str], threshold: float = 0.8
+	) -> Tuple[List[int], List[float]]:
+		if not texts:
+			return [], []
+		X = self.vectorizer.transform(texts)
+		probabilities = self.booster.predict(X, num_threads=self.num_threads).tolist()
+		return _threshold(probabilities, threshold), probabilities
+
+
+RUNTIMES = {
+	"pubmed_bert": BertInferenceModel,
+	"lstm": LSTMInferenceModel,
+	"lgbm_tfidf": LGBMInferenceModel,
+}
+
+
+def _export_bert(trainer, export_dir: Path, quantize: bool) -> Dict[str, Any]:
+	import tensorflow as tf
+
+	class _Serving(tf.Module):
+		def __init__(self, model):
+			super().__init__()
+			self.model = model
+
+		@tf.function(
+			input_signature=[
+				tf.TensorSpec([None, None], tf.int32, name="input_ids"),
+				tf.TensorSpec([None, None], tf.int32, name="attention_masks"),
+			]
+		)
+		def serve(self, input_ids, attention_masks):
+			return self.model([input_ids, attention_masks], training=False)
+
+	trainer.tokenizer.save_pretrained(str(export_dir / "tokenizer"))
+	graph_dir = export_dir / "graph"
+	tf.saved_model.save(_Serving(trainer.model), str(graph_dir))
+	manifest = {"model_file": "graph", "max_len": trainer.max_len}
+
+	if quantize:
+		converter = tf.lite.TFLiteConverter.from_saved_model(str(graph_dir))
+		# Dynamic-range quantisation: int8 weights, float activations.
+		converter.optimizations = [tf.lite.Optimize.DEFAULT]
+		(export_dir / "model.tflite").write_bytes(converter.convert())
+		shutil.rmtree(graph_dir)
+		manifest["model_file"] = "model.tflite"
+	return manifest
+
+
+def _export_lstm(trainer, export_dir: Path, quantize: bool) -> Dict[str, Any]:
+	import tensorflow as tf
+	from keras.export import ExportArchive
+
+	if quantize:
+		raise InferenceExportError(
+			"int8 quantisation is only supported for pubmed_bert; the LSTM graph "
+			"depends on string ops TensorFlow Lite does not run natively"
+		)
+
+	vectorizer, model = trainer.vectorizer, trainer.model
+	# ExportArchive only tracks built layers; a loaded vectorizer is built on
+	# its first call.
+	vectorizer(tf.constant([""]))
+
+	archive = ExportArchive()
+	archive.track(vectorizer)
+	archive.track(model)
+	archive.add_endpoint(
+		name="serve",
+		fn=lambda texts: tf.reshape(model(vectorizer(texts), training=False), [-1]),
+		input_signature=[tf.TensorSpec([None], tf.string, name="texts")],
+	)
+	archive.write_out(str(export_dir / "graph"), verbose=False)
+	return {"model_file": "graph"}
+
+
+def _export_lgbm(trainer, export_dir: Path, quantize: bool) -> Dict[str, Any]:
+	if quantize:
+		raise InferenceExportError(
+			"int8 quantisation is only supported for pubmed_bert"
+		)
+	# save_model() without num_iteration keeps the best iteration, which is
+	# what LGBMClassifier.predict_proba uses.
+	trainer.model.booster_.save_model(str(export_dir / "lgbm_booster.txt"))
+	return {
+		"model_file": "lgbm_booster.txt",
+		"vectorizer_file": "tfidf_vectorizer.joblib",
+	}
+
+
+EXPORTERS = {
+	"pubmed_bert": _export_bert,
+	"lstm": _export_lstm,
+	"lgbm_tfidf": _export_lgbm,
+}
+
+
+def read_manifest(export_dir: Path) -> Optional[Dict[str, Any]]:
+	path = export_dir / MANIFEST_NAME
+	if not path.exists():
+		return None
+	with open(path) as f:
+		return json.load(f)
+
+
+def _write_manifest(export_dir: Path, manifest: Dict[str, Any]) -> None:
+	with open(export_dir / MANIFEST_NAME, "w") as f:
+		json.dump(manifest, f, indent=2)
+
+
+def export_inference_model(
+	trainer, algorithm: str, model_dir: Union[str, Path], quantize: bool = False
+) -> Path:
+	"""
+	Write an inference-only form of a loaded trainer to
+	``<model_dir>/inference/``, replacing any previous export.
+
+	The manifest starts without a parity result; load_inference_model() will
+	not serve the export until record_parity() has stored a passing one.
+
+	Args:
+	    trainer: A trainer with its model loaded (trainer.load(model_dir))
+	    algorithm (str): 'pubmed_bert', 'lstm' or 'lgbm_tfidf'
+	    model_dir (Union[str, Path]): The model version directory
+	    quantize (bool, optional): int8 dynamic quantisation (pubmed_bert only).
+	        Defaults to False.
+
+	Returns:
+	    Path: The export directory
+
+	Raises:
+	    InferenceExportError: If the algorithm or option is not supported
+	"""
+	exporter = EXPORTERS.get(algorithm)
+	if exporter is None:
+		raise InferenceExportError(f"Unsupported algorithm: {algorithm}")
+
+	export_dir = Path(model_dir) / INFERENCE_DIR
+	if export_dir.exists():
+		shutil.rmtree(export_dir)
+	export_dir.mkdir(parents=True)
+	try:
+		manifest = exporter(trainer, export_dir, quantize)
+	except Exception:
+		shutil.rmtree(export_dir, ignore_errors=True)
+		raise
+
+	manifest.update(
+		{
+			"algorithm": algorithm,
+			"quantized": bool(quantize),
+			"exported_at": datetime.now().isoformat(),
+			"parity": None,
+		}
+	)
+	_write_manifest(export_dir, manifest)
+	logging.info(f"Exported {algorithm} inference model to {export_dir}")
+	return export_dir
+
+
+def open_inference_model(export_dir: Union[str, Path]):
+	"""
+	Load the runtime for an export regardless of its parity result — for
+	check_parity() and benchmarks. Returns None when there is no export.
+	"""
+	export_dir = Path(export_dir)
+	manifest = read_manifest(export_dir)
+	if manifest is None:
+		return None
+	runtime_class = RUNTIMES.get(manifest.get("algorithm"))
+	if runtime_class is None:
+		raise InferenceExportError(
+			f"Unknown algorithm in {export_dir / MANIFEST_NAME}: {manifest.get('algorithm')!r}"
+		)
+	return runtime_class(export_dir, manifest)
+
+
+def load_inference_model(model_dir: Union[str, Path]):
+	"""
+	The runtime for ``<model_dir>/inference/`` if it exists and passed its
+	parity check, else None.
+	"""
+	export_dir = Path(model_dir) / INFERENCE_DIR
+	manifest = read_manifest(export_dir)
+	if not manifest or not (manifest.get("parity") or {}).get("passed"):
+		return None
+	return open_inference_model(export_dir)
+
+
+def check_parity(
+	reference,
+	candidate,
+	texts: List[str],
+	tolerance: float = PARITY_TOLERANCE,
+	threshold: float = 0.8,
+) -> Dict[str, Any]:
+	"""
+	Compare a runtime's probabilities with the trainer it was exported from
+	on the same texts.
+
+	Returns:
+	    Dict[str, Any]: samples, max_abs_diff, mean_abs_diff,
+	        decision_agreement (share of texts on the same side of
+	        *threshold*), tolerance and passed (max_abs_diff <= tolerance)
+	"""
+	if not texts:
+		# Nothing compared is not a pass.
+		return {
+			"samples": 0,
+			"max_abs_diff": 0.0,
+			"mean_abs_diff": 0.0,
+			"decision_agreement": 1.0,
+			"tolerance": tolerance,
+			"passed": False,
+		}
+	_, expected = reference.predict(texts, threshold=threshold)
+	_, actual = candidate.predict(texts, threshold=threshold)
+	expected = np.asarray(expected, dtype=np.float64)
+	actual = np.asarray(actual, dtype=np.float64)
+	diff = np.abs(expected - actual)
+	max_abs_diff = float(diff.max())
+	return {
+		"samples": len(texts),
+		"max_abs_diff": max_abs_diff,
+		"mean_abs_diff": float(diff.mean()),
+		"decision_agreement": float(
+			np.mean((expected >= threshold) == (actual >= threshold))
+		),
+		"tolerance": tolerance,
+		"passed": max_abs_diff <= tolerance,
+	}
+
+
+def record_parity(export_dir: Union[str, Path], parity: Dict[str, Any]) -> None:
+	"""Store a check_parity() result in the export's manifest."""
+	export_dir = Path(export_dir)
+	manifest = read_manifest(export_dir)
+	if manifest is None:
+		raise InferenceExportError(f"No inference export in {export_dir}")
+	manifest["parity"] = parity
+	_write_manifest(export_dir, manifest)
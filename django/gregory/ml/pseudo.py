@@ -11,7 +11,7 @@ data is scarce.
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union, Dict, Any
+from typing import Any, Callable, Dict, Iterable, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -25,10 +25,54 @@ configure_gpu_memory_growth()
 from gregory.ml.trainer import get_trainer
 
 
+def _confident_rows(
+	trainer,
+	chunk: pd.DataFrame,
+	text_column: str,
+	label_column: str,
+	confidence: float,
+	iteration: int,
+) -> pd.DataFrame:
+	"""
+	Predict one chunk of unlabelled rows and return those predicted with at
+	least *confidence*, labelled and tagged with *iteration*.
+	"""
+	predictions, probabilities = trainer.predict(
+		texts=chunk[text_column].tolist(),
+		threshold=0.5,  # Use a lower threshold for prediction (we'll filter by confidence)
+	)
+	if len(probabilities) == 0:
+		return chunk.iloc[0:0].copy()
+
+	# Get confidence scores (maximum probability across classes)
+	# Convert predictions to class probabilities if not already
+	if isinstance(probabilities[0], float):
+		# Binary classification case - probabilities are for positive class
+		confidence_scores = [max(p, 1 - p) for p in probabilities]
+		class_predictions = [1 if p >= 0.5 else 0 for p in probabilities]
+	else:
+		# Multi-class case - probabilities are arrays
+		confidence_scores = [np.max(p) for p in probabilities]
+		class_predictions = [np.argmax(p) for p in probabilities]
+
+	# Identify confident predictions
+	confident_indices = [
+		i for i, score in enumerate(confidence_scores) if score >= confidence
+	]
+
+	# Extract confident examples
+	confident_rows = chunk.iloc[confident_indices].copy()
+	confident_rows[label_column] = [class_predictions[i] for i in confident_indices]
+	confident_rows["confidence"] = [confidence_scores[i] for i in confident_indices]
+	confident_rows["pseudo_labelled"] = True
+	confident_rows["pseudo_iteration"] = iteration
+	return confident_rows
+
+
 def generate_pseudo_labels(
 	train_df: pd.DataFrame,
 	val_df: pd.DataFrame,
-	unlabelled_df: pd.DataFrame,
+	unlabelled_df: Optional[pd.DataFrame] = None,
 	text_column: str = "text",
 	label_column: str = "relevant",
 	confidence: float = 0.9,
@@ -36,14 +80,24 @@ def generate_pseudo_labels(
 	algorithm: str = "pubmed_bert",
 	model_params: Optional[Dict[str, Any]] = None,
 	verbose: bool = True,
+	unlabelled_chunks: Optional[Callable[[], Iterable[pd.DataFrame]]] = None,
+	id_column: str = "article_id",
 ) -> pd.DataFrame:
 	"""
 	Generate pseudo-labels for unlabelled data using self-training.
 
+	The unlabelled data comes either as one DataFrame (*unlabelled_df*) or,
+	for pools too large to hold in memory, as *unlabelled_chunks*: a callable
+	returning a fresh iterable of DataFrame chunks each time it is called
+	(e.g. gregory.utils.unlabeled_pool.UnlabeledPool.chunks). Every iteration
+	streams the pool once, skipping rows already pseudo-labelled (by
+	*id_column*), so only the confident rows are ever kept.
+
 	Args:
 	    train_df (pd.DataFrame): DataFrame with labelled training data.
 	    val_df (pd.DataFrame): DataFrame with validation data.
-	    unlabelled_df (pd.DataFrame): DataFrame with unlabelled data to be pseudo-labelled.
+	    unlabelled_df (Optional[pd.DataFrame]): DataFrame with unlabelled data to be
+	        pseudo-labelled. Required unless unlabelled_chunks is given.
 	    text_column (str, optional): Name of the text column. Defaults to 'text'.
 	    label_column (str, optional): Name of the label column. Defaults to 'relevant'.
 	    confidence (float, optional): Threshold for confident predictions. Defaults to 0.9.
@@ -53,6 +107,10 @@ def generate_pseudo_labels(
 	    model_params (Optional[Dict[str, Any]], optional): Parameters for the trainer.
 	        Defaults to None.
 	    verbose (bool, optional): Whether to print progress messages. Defaults to True.
+	    unlabelled_chunks (Optional[Callable[[], Iterable[pd.DataFrame]]], optional):
+	        Streaming alternative to unlabelled_df. Defaults to None.
+	    id_column (str, optional): Column identifying rows across passes over
+	        unlabelled_chunks. Defaults to 'article_id'.
 
 	Returns:
 	    pd.DataFrame: Combined DataFrame with original and pseudo-labelled data.
@@ -79,10 +137,12 @@ def generate_pseudo_labels(
 	    ... })
 	    >>> result_df = generate_pseudo_labels(train_df, val_df, unlabelled_df)
 	"""
+	if unlabelled_df is None and unlabelled_chunks is None:
+		raise ValueError("Either unlabelled_df or unlabelled_chunks is required")
+
 	# Ensure we have a copy of the original DataFrames
 	train_df = train_df.copy()
 	val_df = val_df.copy()
-	unlabelled_df = unlabelled_df.copy()
 
 	# Check if we have enough examples of each class for reliable training
 	class_counts = train_df[label_column].value_counts()
@@ -118,25 +178,36 @@ def generate_pseudo_labels(
 		model_params.setdefault("sequence_length", 100)
 
 	if verbose:
+		pool_size = (
+			len(unlabelled_df) if unlabelled_df is not None else "a stream of"
+		)
 		logging.info(
-			f"Starting pseudo-labeling with {len(train_df)} labelled and {len(unlabelled_df)} unlabelled examples"
+			f"Starting pseudo-labeling with {len(train_df)} labelled and {pool_size} unlabelled examples"
 		)
 		logging.info(
 			f"Using algorithm: {algorithm}, confidence threshold: {confidence}, max iterations: {max_iter}"
 		)
 
 	iteration = 0
-	remaining_unlabelled = unlabelled_df.copy()
+	if unlabelled_df is not None:
+		remaining_unlabelled = unlabelled_df.reset_index(drop=True)
+		remaining_count = len(remaining_unlabelled)
+	else:
+		# Unknown until the first pass; ids labelled so far are skipped on
+		# every later pass.
+		remaining_count = None
+		pseudo_ids = set()
 
 	# Initialize a column to track which rows are pseudo-labelled
 	train_df["pseudo_labelled"] = False
 
-	while len(remaining_unlabelled) > 0 and iteration < max_iter:
+	while remaining_count != 0 and iteration < max_iter:
 		iteration += 1
 		if verbose:
 			logging.info(f"\nIteration {iteration}/{max_iter}")
 			logging.info(f"Training set size: {len(train_df)}")
-			logging.info(f"Remaining unlabelled examples: {len(remaining_unlabelled)}")
+			if remaining_count is not None:
+				logging.info(f"Remaining unlabelled examples: {remaining_count}")
 
 		# Initialize a new trainer for each iteration using the factory function
 		trainer = get_trainer(algorithm, **model_params)
@@ -160,29 +231,41 @@ def generate_pseudo_labels(
 		)
 
 		# Get predictions on unlabelled data
-		unlabelled_texts = remaining_unlabelled[text_column].tolist()
-		predictions, probabilities = trainer.predict(
-			texts=unlabelled_texts,
-			threshold=0.5,  # Use a lower threshold for prediction (we'll filter by confidence)
-		)
-
-		# Get confidence scores (maximum probability across classes)
-		# Convert predictions to class probabilities if not already
-		if isinstance(probabilities[0], float):
-			# Binary classification case - probabilities are for positive class
-			confidence_scores = [max(p, 1 - p) for p in probabilities]
-			class_predictions = [1 if p >= 0.5 else 0 for p in probabilities]
+		if unlabelled_df is not None:
+			confident_rows = _confident_rows(
+				trainer,
+				remaining_unlabelled,
+				text_column,
+				label_column,
+				confidence,
+				iteration,
+			)
+			# Remove confident examples from unlabelled set
+			remaining_unlabelled = remaining_unlabelled.drop(
+				index=confident_rows.index
+			).reset_index(drop=True)
+			remaining_count = len(remaining_unlabelled)
 		else:
-			# Multi-class case - probabilities are arrays
-			confidence_scores = [np.max(p) for p in probabilities]
-			class_predictions = [np.argmax(p) for p in probabilities]
-
-		# Identify confident predictions
-		confident_indices = [
-			i for i, score in enumerate(confidence_scores) if score >= confidence
-		]
+			confident_parts = []
+			remaining_count = 0
+			for chunk in unlabelled_chunks():
+				chunk = chunk[~chunk[id_column].isin(pseudo_ids)]
+				if chunk.empty:
+					continue
+				part = _confident_rows(
+					trainer, chunk, text_column, label_column, confidence, iteration
+				)
+				confident_parts.append(part)
+				remaining_count += len(chunk) - len(part)
+			confident_rows = (
+				pd.concat(confident_parts, ignore_index=True)
+				if confident_parts
+				else pd.DataFrame()
+			)
+			if len(confident_rows):
+				pseudo_ids.update(confident_rows[id_column])
 
-		if not confident_indices:
+		if len(confident_rows) == 0:
 			if verbose:
 				logging.info(
 					f"No confident predictions above threshold {confidence} in iteration {iteration}."
@@ -190,27 +273,14 @@ def generate_pseudo_labels(
 				logging.info("Stopping pseudo-labeling process.")
 			break
 
-		# Extract confident examples
-		confident_rows = remaining_unlabelled.iloc[confident_indices].copy()
-		confident_rows[label_column] = [class_predictions[i] for i in confident_indices]
-		confident_rows["confidence"] = [confidence_scores[i] for i in confident_indices]
-		confident_rows["pseudo_labelled"] = True
-		confident_rows["pseudo_iteration"] = iteration
-
 		# Add confident examples to training set
-		train_df = pd.concat([train_df, confident_rows], ignore_index=True)
-
-		# Remove confident examples from unlabelled set
-		remaining_indices = [
-			i for i in range(len(remaining_unlabelled)) if i not in confident_indices
-		]
-		remaining_unlabelled = remaining_unlabelled.iloc[remaining_indices].reset_index(
-			drop=True
+		train_df = pd.concat(
+			[train_df, confident_rows.reset_index(drop=True)], ignore_index=True
 		)
 
 		if verbose:
 			logging.info(
-				f"Added {len(confident_indices)} pseudo-labelled examples with confidence >= {confidence}"
+				f"Added {len(confident_rows)} pseudo-labelled examples with confidence >= {confidence}"
 			)
 
 	if verbose:
@@ -0,0 +1,192 @@
+"""
+Process-pool scheduler for training runs.
+
+train_models used to train one model at a time, although the three
+algorithms for a subject are independent. run_jobs() runs TrainingJobs on a
+process pool under two limits:
+
+- a memory budget: a job only starts while the estimated peak memory of the
+  running jobs plus its own fits (a job larger than the whole budget still
+  runs, alone);
+- a TensorFlow slot count: TensorFlow trainers grab every core (and the GPU)
+  they can see, so by default only one runs at a time, while LightGBM jobs
+  fill the remaining workers.
+
+Jobs start in the order given; a job that does not fit yet is passed over
+for later ones that do, so LightGBM jobs backfill while a BERT job runs.
+
+Workers are spawned, not forked: the parent has usually imported TensorFlow
+already, and a forked TensorFlow runtime is not safe to use. Each worker
+calls django.setup() and opens its own database connection.
+"""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+# Rough peak resident memory per training job in GB, for subjects of tens of
+# thousands of abstracts. BERT holds the transformer, its optimizer state and
+# activations; LightGBM holds the TF-IDF matrix. Deliberately generous: an
+# overestimate only costs parallelism, an underestimate costs the run.
+JOB_MEMORY_GB = {
+	"pubmed_bert": 6.0,
+	"lstm": 2.0,
+	"lgbm_tfidf": 1.0,
+}
+
+TENSORFLOW_ALGORITHMS = frozenset({"pubmed_bert", "lstm"})
+
+# Share of physical memory the default budget leaves to training jobs.
+DEFAULT_MEMORY_FRACTION = 0.75
+
+
+@dataclass
+class TrainingJob:
+	"""One model to train. *payload* is passed to the worker function as-is
+	and must be picklable."""
+
+	key: str
+	algorithm: str
+	payload: Any
+	memory_gb: float = 0.0
+	uses_tensorflow: bool = False
+
+	@classmethod
+	def for_algorithm(cls, key: str, algorithm: str, payload: Any) -> "TrainingJob":
+		return cls(
+			key=key,
+			algorithm=algorithm,
+			payload=payload,
+			memory_gb=JOB_MEMORY_GB.get(algorithm, 2.0),
+			uses_tensorflow=algorithm in TENSORFLOW_ALGORITHMS,
+		)
+
+
+@dataclass
+class JobAdmission:
+	"""
+	Decides which pending jobs may start, given the ones running. Kept apart
+	from the pool so the policy can be tested without processes.
+	"""
+
+	max_workers: int
+	memory_budget_gb: float
+	tensorflow_slots: int = 1
+	running: List[TrainingJob] = field(default_factory=list)
+
+	def can_start(self, job: TrainingJob) -> bool:
+		if len(self.running) >= self.max_workers:
+			return False
+		if job.uses_tensorflow and self.tensorflow_slots > 0:
+			running_tf = sum(1 for other in self.running if other.uses_tensorflow)
+			if running_tf >= self.tensorflow_slots:
+				return False
+		if not self.running:
+			return True
+		in_use = sum(other.memory_gb for other in self.running)
+		return in_use + job.memory_gb <= self.memory_budget_gb
+
+	def take(self, pending: List[TrainingJob]) -> List[TrainingJob]:
+		"""Remove and return, in order, the pending jobs that may start now."""
+		started = []
+		for job in list(pending):
+			if self.can_start(job):
+				pending.remove(job)
+				self.running.append(job)
+				started.append(job)
+		return started
+
+	def finished(self, job: TrainingJob) -> None:
+		self.running.remove(job)
+
+
+def default_memory_budget_gb() -> float:
+	"""DEFAULT_MEMORY_FRACTION of physical memory, in GB."""
+	try:
+		import psutil
+
+		total = psutil.virtual_memory().total
+	except Exception:
+		total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+	return round(total * DEFAULT_MEMORY_FRACTION / 1024**3, 1)
+
+
+def django_worker_init(settings_module: Optional[str]) -> None:
+	"""Process-pool initializer: set up Django in a spawned worker."""
+	if settings_module:
+		os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+	import django
+
+	django.setup()
+
+
+def run_jobs(
+	jobs: List[TrainingJob],
+	worker: Callable[[Any], Dict[str, Any]],
+	max_workers: int = 1,
+	memory_budget_gb: Optional[float] = None,
+	tensorflow_slots: int = 1,
+	on_start: Optional[Callable[[TrainingJob], None]] = None,
+	on_done: Optional[
+		Callable[[TrainingJob, Optional[Dict[str, Any]], Optional[BaseException]], None]
+	] = None,
+) -> None:
+	"""
+	Run ``worker(job.payload)`` for every job and report each outcome to
+	``on_done(job, result, error)`` as soon as it finishes, in the parent
+	process (database writes belong there).
+
+	With max_workers <= 1 the jobs run in this process, in order, exactly as
+	a plain loop would. *worker* must be a module-level function so spawned
+	workers can import it.
+	"""
+	on_start = on_start or (lambda job: None)
+	on_done = on_done or (lambda job, result, error: None)
+
+	if max_workers <= 1:
+		for job in jobs:
+			on_start(job)
+			try:
+				result = worker(job.payload)
+			except Exception as e:
+				on_done(job, None, e)
+			else:
+				on_done(job, result, None)
+		return
+
+	admission = JobAdmission(
+		max_workers=max_workers,
+		memory_budget_gb=memory_budget_gb or default_memory_budget_gb(),
+		tensorflow_slots=tensorflow_slots,
+	)
+	pending = list(jobs)
+	futures = {}
+	with ProcessPoolExecutor(
+		max_workers=max_workers,
+		mp_context=get_context("spawn"),
+		initializer=django_worker_init,
+		initargs=(os.environ.get("DJANGO_SETTINGS_MODULE"),),
+	) as pool:
+		while pending or futures:
+			for job in admission.take(pending):
+				logging.info(f"Starting training job {job.key}")
+				on_start(job)
+				try:
+					futures[pool.submit(worker, job.payload)] = job
+				except BrokenProcessPool as e:
+					# A worker died (usually killed for memory); the pool
+					# accepts nothing more, so every remaining job fails.
+					admission.finished(job)
+					on_done(job, None, e)
+			if not futures:
+				continue
+			done, _ = wait(futures, return_when=FIRST_COMPLETED)
+			for future in done:
+				job = futures.pop(future)
+				admission.finished(job)
+				error = future.exception()
+				on_done(job, None if error else future.result(), error)
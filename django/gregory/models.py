@@ -13,7 +13,7 @@ from django.db.models.functions import Upper
 from django.utils.text import slugify
 from django.utils import timezone
 from organizations.models import Organization, OrganizationUser
-from simple_history.models import HistoricalRecords
+from gregory.utils.bulk_history import BatchedHistoricalRecords
 import base64
 from django.db.models.functions import Lower
 from gregory.utils.trial_field_normalizers import (
@@ -90,7 +90,7 @@ class Authors(models.Model):
 	ufull_name = GeneratedField(
 		expression=Upper("full_name"), output_field=models.TextField(), db_persist=True
 	)
-	history = HistoricalRecords()
+	history = BatchedHistoricalRecords()
 
 	def save(self, *args, **kwargs):
 		# Auto-populate full_name from given_name and family_name
@@ -411,7 +411,7 @@ class Subject(models.Model):
 		blank=False,
 		related_name="subjects",  # Helps in querying from the Team model, e.g., team.subjects.all()
 	)
-	history = HistoricalRecords()
+	history = BatchedHistoricalRecords()
 
 	def __str__(self):
 		# More readable subject representation
@@ -551,19 +551,8 @@ class Sources(models.Model):
 			# For article sources, check the Articles model
 			latest_date = self.get_latest_article_date()
 
-		if not latest_date:
-			return "no_content"
-
 		# Same status logic for both types of sources
-		now = timezone.now()
-		days_since_last_update = (now - latest_date).days
-
-		if days_since_last_update > 60:
-			return "error"
-		elif days_since_last_update > 30:
-			return "warning"
-		else:
-			return "healthy"
+		return health_from_last_date(self.active, latest_date)
 
 	def __str__(self):
 		return self.name or ""
@@ -574,6 +563,81 @@ class Sources(models.Model):
 		db_table = "sources"
 
 
+class SourceStats(models.Model):
+	"""Per-source ingest statistics, denormalised from the articles/trials joins
+	so the Sources changelist, its health filter and the sources overview read
+	one row per source instead of aggregating (or running get_health_status())
+	per row. The feedreaders refresh a source's row after processing it and
+	``manage.py rebuild_source_stats`` recomputes every row in one pass — see
+	gregory.utils.source_stats.
+
+	last_item_date follows Sources.get_health_status(): the newest article
+	published_date, or the newest trial last_updated for trial sources. The
+	7/30-day windows count items by discovery_date.
+	"""
+
+	source = models.OneToOneField(
+		Sources, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+	)
+	last_item_date = models.DateTimeField(blank=True, null=True)
+	item_count = models.PositiveIntegerField(default=0)
+	items_last_7_days = models.PositiveIntegerField(default=0)
+	items_last_30_days = models.PositiveIntegerField(default=0)
+	last_fetch_at = models.DateTimeField(
+		blank=True, null=True, help_text="When a feedreader last processed this source."
+	)
+	last_fetch_succeeded_at = models.DateTimeField(
+		blank=True,
+		null=True,
+		help_text=(
+			"When a feedreader last fetched this source without a request failure. "
+			"Unlike Sources.last_successful_fetch_at this is not an incremental anchor."
+		),
+	)
+	error_streak = models.PositiveIntegerField(
+		default=0, help_text="Consecutive feedreader runs whose fetch failed."
+	)
+	last_error = models.TextField(blank=True, default="")
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		verbose_name = "source statistics"
+		verbose_name_plural = "source statistics"
+		db_table = "source_stats"
+
+	def __str__(self):
+		return f"Stats for {self.source}"
+
+	@property
+	def items_per_day_7(self):
+		return round(self.items_last_7_days / 7, 2)
+
+	@property
+	def items_per_day_30(self):
+		return round(self.items_last_30_days / 30, 2)
+
+	@property
+	def health(self):
+		"""Same rule as Sources.get_health_status(), from the stored date."""
+		return health_from_last_date(self.source.active, self.last_item_date)
+
+
+def health_from_last_date(active, last_date, now=None):
+	"""The source health rule shared by Sources.get_health_status(), SourceStats
+	and the admin: inactive, no_content, then error/warning/healthy by the age
+	of the newest item (over 60 days, over 30 days, otherwise)."""
+	if not active:
+		return "inactive"
+	if not last_date:
+		return "no_content"
+	days_since_last_update = ((now or timezone.now()) - last_date).days
+	if days_since_last_update > 60:
+		return "error"
+	elif days_since_last_update > 30:
+		return "warning"
+	return "healthy"
+
+
 class ApiKeyHistoryMixin(models.Model):
 	"""Abstract mixin that adds API-key attribution fields to historical models.
 
@@ -670,6 +734,10 @@ class Articles(models.Model):
 	authors_attempts = models.PositiveSmallIntegerField(default=0)
 	details_next_check = models.DateTimeField(blank=True, null=True)
 	details_attempts = models.PositiveSmallIntegerField(default=0)
+	# When detect_trial_references last scanned this article's title/summary for
+	# registry identifiers. NULL, or older than last_updated, means due. Written
+	# with queryset.update() so setting it never bumps last_updated itself.
+	trial_refs_scanned_at = models.DateTimeField(blank=True, null=True, editable=False)
 	kind = models.CharField(choices=KINDS, max_length=50, default="science paper")
 	access = models.CharField(
 		choices=ACCESS_OPTIONS, max_length=50, default=None, null=True
@@ -680,7 +748,7 @@ class Articles(models.Model):
 	)
 	crossref_check = models.DateTimeField(blank=True, null=True)
 	pdf_link = models.URLField(max_length=2000, blank=True, null=True)
-	history = HistoricalRecords(
+	history = BatchedHistoricalRecords(
 		excluded_fields=[
 			"crossref_check",
 			"crossref_retraction_check",
@@ -688,6 +756,7 @@ class Articles(models.Model):
 			"usummary",
 			"ml_score",
 			"relevant",
+			"trial_refs_scanned_at",
 		],
 		bases=[ApiKeyHistoryMixin],
 		m2m_fields=["sources", "subjects", "teams"],
@@ -1055,7 +1124,7 @@ class Trials(models.Model):
 	identifiers = models.JSONField(blank=True, null=True)
 	teams = models.ManyToManyField("Team", related_name="trials")
 	subjects = models.ManyToManyField("Subject", related_name="trials")
-	history = HistoricalRecords(
+	history = BatchedHistoricalRecords(
 		bases=[ApiKeyHistoryMixin],
 		m2m_fields=["sources", "teams", "subjects"],
 	)
@@ -1277,16 +1346,21 @@ class Trials(models.Model):
 		self.primary_sponsor_normalized = alias.sponsor
 		_update_sponsor_type_from_trial(alias.sponsor, self)
 
-	def save(self, *args, **kwargs):
+	def compute_derived_fields(self, update_fields=None):
+		"""Recompute the derived columns save() keeps in step with their raw
+		counterparts: the NORMALIZED_TRIAL_FIELDS and primary_sponsor_normalized.
+		Returns the derived fields a save scoped to *update_fields* must also
+		write. Bulk writers (importWHOXML) call it before bulk_create/bulk_update,
+		then sync_trial_countries()/sync_identifier_index() once the rows exist."""
 		# Keep every derived field in lockstep with its raw counterpart(s) on every write path
-		# (feedreader_trials, feedreader_trials_ctgov, importWHOXML, TrialSerializer.create/update
-		# all go through .create()/.save()). bulk_update bypasses this — the backfill command
-		# and the admin "Recompute normalized fields" action handle that explicitly. See
+		# (feedreader_trials, feedreader_trials_ctgov, TrialSerializer.create/update all go
+		# through .create()/.save(); importWHOXML's bulk writes call this directly). Other
+		# bulk_update writers bypass it — the backfill command and the admin "Recompute
+		# normalized fields" action handle that explicitly. See
 		# gregory.utils.trial_field_normalizers.NORMALIZED_TRIAL_FIELDS for the (raw field(s),
 		# derived field, normalizer) registry driving this loop — raw_field_names() normalizes
 		# the raw-field slot (a single field name or a tuple, for multi-input fields like
 		# regions_normalized) to a tuple either way.
-		update_fields = kwargs.get("update_fields")
 		extra_update_fields = []
 		for raw_fields, derived_field, normalizer in NORMALIZED_TRIAL_FIELDS:
 			names = raw_field_names(raw_fields)
@@ -1312,6 +1386,11 @@ class Trials(models.Model):
 				and "primary_sponsor_normalized" not in update_fields
 			):
 				extra_update_fields.append("primary_sponsor_normalized")
+		return extra_update_fields
+
+	def save(self, *args, **kwargs):
+		update_fields = kwargs.get("update_fields")
+		extra_update_fields = self.compute_derived_fields(update_fields)
 
 		if extra_update_fields:
 			kwargs["update_fields"] = [*update_fields, *extra_update_fields]
@@ -1322,6 +1401,40 @@ class Trials(models.Model):
 		# so the backfill command and the admin recompute action call
 		# sync_trial_countries() explicitly for those paths.
 		self.sync_trial_countries()
+		# Same for the persistent registry-identifier index detect_trial_references
+		# matches article text against; only an identifiers change can move it.
+		if update_fields is None or "identifiers" in update_fields:
+			self.sync_identifier_index()
+
+	def sync_identifier_index(self):
+		"""Recompute this trial's TrialIdentifierIndex rows from ``identifiers`` and
+		replace the existing set. New rows start unscanned, so the next
+		detect_trial_references run looks for articles citing them. Called
+		automatically from save(); the command's --rebuild-index covers
+		bulk_update/queryset.update() writes, which bypass it."""
+		from gregory.utils.trial_identifiers import (
+			extract_identifiers_from_trial_identifiers,
+		)
+
+		wanted = extract_identifiers_from_trial_identifiers(self.identifiers)
+		existing = {
+			(row.identifier_type, row.identifier_value): row.pk
+			for row in self.identifier_index.all()
+		}
+		stale_ids = [pk for key, pk in existing.items() if key not in wanted]
+		if stale_ids:
+			TrialIdentifierIndex.objects.filter(pk__in=stale_ids).delete()
+		missing = wanted - existing.keys()
+		if missing:
+			TrialIdentifierIndex.objects.bulk_create(
+				[
+					TrialIdentifierIndex(
+						trial=self, identifier_type=id_type, identifier_value=id_value
+					)
+					for id_type, id_value in sorted(missing)
+				],
+				ignore_conflicts=True,
+			)
 
 	def sync_trial_countries(self):
 		"""Recompute this trial's TrialCountry rows from its raw country columns and replace
@@ -1589,7 +1702,7 @@ class ArticleOrgContent(models.Model):
 	summary_plain_english = models.TextField(blank=True, null=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
-	history = HistoricalRecords(bases=[ApiKeyHistoryMixin])
+	history = BatchedHistoricalRecords(bases=[ApiKeyHistoryMixin])
 
 	def __str__(self):
 		return f"{self.article_id}/{self.organization_id}"
@@ -1621,7 +1734,7 @@ class TrialOrgContent(models.Model):
 	summary_plain_english = models.TextField(blank=True, null=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
-	history = HistoricalRecords(bases=[ApiKeyHistoryMixin])
+	history = BatchedHistoricalRecords(bases=[ApiKeyHistoryMixin])
 
 	def __str__(self):
 		return f"{self.trial_id}/{self.organization_id}"
@@ -1971,6 +2084,204 @@ class ArticleTrialReference(models.Model):
 		return f"Article {self.article.article_id} references Trial {self.trial.trial_id} via {self.identifier_type}"
 
 
+class TrialIdentifierIndex(models.Model):
+	"""Canonical registry identifiers of a trial, one row per
+	(identifier_type, identifier_value) — see gregory.utils.trial_identifiers.
+	Kept in sync with ``Trials.identifiers`` by ``Trials.sync_identifier_index()``
+	(called from ``Trials.save()``), so detect_trial_references can look up the
+	identifiers it finds in article text instead of re-deriving them from every
+	trial on each run.
+	"""
+
+	trial = models.ForeignKey(
+		"Trials", on_delete=models.CASCADE, related_name="identifier_index"
+	)
+	identifier_type = models.CharField(max_length=50)
+	identifier_value = models.CharField(max_length=100)
+	indexed_at = models.DateTimeField(auto_now_add=True)
+	# NULL until detect_trial_references has looked for existing articles citing
+	# this identifier. Articles ingested later are matched from the article side.
+	references_scanned_at = models.DateTimeField(blank=True, null=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(
+				fields=["trial", "identifier_type", "identifier_value"],
+				name="unique_trial_identifier_index",
+			)
+		]
+		indexes = [
+			models.Index(
+				fields=["identifier_value", "identifier_type"],
+				name="trialidindex_value_type_idx",
+			),
+			models.Index(
+				fields=["references_scanned_at"],
+				name="trialidindex_unscanned_idx",
+				condition=Q(references_scanned_at__isnull=True),
+			),
+		]
+		verbose_name = "trial identifier index entry"
+		verbose_name_plural = "trial identifier index"
+		db_table = "trial_identifier_index"
+
+	def __str__(self):
+		return f"{self.identifier_type}={self.identifier_value} -> Trial {self.trial_id}"
+
+
+class RollupScope(models.TextChoices):
+	ALL = "all", "All content"
+	ORGANIZATION = "organization", "Organisation"
+	TEAM = "team", "Team"
+	SUBJECT = "subject", "Subject"
+
+
+class ContentDailyRollup(models.Model):
+	"""Distinct articles (by published_date) and trials (by discovery_date) per
+	day for one scope: everything, an organisation, a team or a subject (whose
+	row also carries the subject's team). The subject analytics dashboard sums
+	these over a date range instead of counting through the teams/subjects
+	joins on every load. Maintained by gregory.utils.rollups.
+	"""
+
+	scope = models.CharField(max_length=12, choices=RollupScope.choices)
+	organization = models.ForeignKey(
+		Organization, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+	)
+	team = models.ForeignKey(
+		"Team", on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+	)
+	subject = models.ForeignKey(
+		Subject, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+	)
+	day = models.DateField()
+	articles = models.PositiveIntegerField(default=0)
+	trials = models.PositiveIntegerField(default=0)
+	refreshed_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=["scope", "day"], name="rollup_scope_day_idx"),
+			models.Index(fields=["organization", "day"], name="rollup_org_day_idx"),
+			models.Index(fields=["team", "day"], name="rollup_team_day_idx"),
+			models.Index(fields=["subject", "day"], name="rollup_subject_day_idx"),
+		]
+		db_table = "content_daily_rollup"
+
+	def __str__(self):
+		return f"{self.scope} rollup for {self.day}"
+
+
+class CategoryDailyRollup(models.Model):
+	"""Articles and trials of a category per publication day (NULL day: items
+	without a published_date), summed into the categories endpoint's monthly
+	counts. Maintained by gregory.utils.rollups."""
+
+	category = models.ForeignKey(
+		TeamCategory, on_delete=models.CASCADE, related_name="daily_rollups"
+	)
+	day = models.DateField(blank=True, null=True)
+	articles = models.PositiveIntegerField(default=0)
+	trials = models.PositiveIntegerField(default=0)
+	refreshed_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=["category", "day"], name="catrollup_category_day_idx"),
+		]
+		db_table = "category_daily_rollup"
+
+	def __str__(self):
+		return f"{self.category} rollup for {self.day}"
+
+
+class CategoryDailyMLRollup(models.Model):
+	"""Articles of a category per publication day by the score of their latest
+	prediction from one algorithm (algorithm "" is the best latest score over
+	all algorithms), in buckets of 1/ML_SCORE_BUCKETS: an article is in bucket
+	k when its score is at least k/ML_SCORE_BUCKETS but below the next one.
+	Summing the buckets >= k counts the articles relevant at threshold
+	k/ML_SCORE_BUCKETS exactly, whatever threshold on that grid is asked for.
+	"""
+
+	ML_SCORE_BUCKETS = 20
+
+	category = models.ForeignKey(
+		TeamCategory, on_delete=models.CASCADE, related_name="daily_ml_rollups"
+	)
+	day = models.DateField(blank=True, null=True)
+	algorithm = models.CharField(max_length=20, blank=True, default="")
+	score_bucket = models.PositiveSmallIntegerField()
+	articles = models.PositiveIntegerField(default=0)
+	refreshed_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=["category", "day"], name="catmlrollup_category_day_idx"),
+		]
+		db_table = "category_daily_ml_rollup"
+
+	def __str__(self):
+		return f"{self.category} {self.algorithm or 'any'} >= {self.score_bucket} on {self.day}"
+
+
+class RollupRefreshState(models.Model):
+	"""How far the daily rollups are known to be up to date: the moment the
+	last successful refresh_rollups run started, before it read anything.
+	The next incremental refresh rewrites the days touched since then. One
+	row per rollup family (``name``). Maintained by gregory.utils.rollups.
+	"""
+
+	DAILY_ROLLUPS = "daily_rollups"
+
+	name = models.CharField(max_length=40, unique=True)
+	refreshed_through = models.DateTimeField()
+
+	class Meta:
+		db_table = "rollup_refresh_state"
+
+	def __str__(self):
+		return f"{self.name} refreshed through {self.refreshed_through}"
+
+
+class AuthorArticleCounts(models.Model):
+	"""An author's articles in one organisation (articles on any of its teams),
+	denormalised so author listings, sorting and exports read stored counts
+	instead of a correlated COUNT(DISTINCT) per author — see
+	gregory.utils.author_counts, which keeps the rows current on article-author
+	and article-team link changes and rebuilds them in bulk.
+
+	shared_articles counts those of the articles that are also on a team of
+	another organisation. Summing the rows of several organisations counts such
+	an article once per organisation, so readers only trust the sum when no row
+	in the sum has shared articles.
+	"""
+
+	author = models.ForeignKey(
+		Authors, on_delete=models.CASCADE, related_name="article_counts"
+	)
+	organization = models.ForeignKey(
+		Organization, on_delete=models.CASCADE, related_name="+"
+	)
+	articles = models.PositiveIntegerField(default=0)
+	relevant_articles = models.PositiveIntegerField(default=0)
+	shared_articles = models.PositiveIntegerField(default=0)
+	refreshed_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(
+				fields=["author", "organization"], name="unique_author_org_counts"
+			)
+		]
+		verbose_name = "author article counts"
+		verbose_name_plural = "author article counts"
+		db_table = "author_article_counts"
+
+	def __str__(self):
+		return f"{self.author_id}/{self.organization_id}: {self.articles}"
+
+
 class PredictionRunLog(models.Model):
 	"""
 	Logs both training and prediction runs for machine learning models.
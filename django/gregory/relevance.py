@@ -13,7 +13,8 @@ def recompute_article_relevance(article_ids=None, threshold=0.8):
 	DISTINCT-algorithm count. The lookup is backed by mlpred_art_subj_date_idx
 	on (article, subject, -created_date).
 
-	Full pass when article_ids is None. Returns number of rows changed."""
+	Full pass when article_ids is None. Returns number of rows changed, and
+	refreshes the stored author counts of the changed articles on scoped calls."""
 	scope, params = "", [threshold]
 	if article_ids is not None:
 		if not article_ids:
@@ -58,10 +59,18 @@ def recompute_article_relevance(article_ids=None, threshold=0.8):
 	) computed
 	WHERE a.article_id = computed.article_id
 	  AND a.relevant IS DISTINCT FROM computed.new_relevant
+	RETURNING a.article_id
 	"""
 	with connection.cursor() as c:
 		c.execute(sql, params)
-		return c.rowcount
+		changed = [row[0] for row in c.fetchall()]
+	if changed and article_ids is not None:
+		# Scoped calls come from the per-article signals; a full pass is
+		# followed by the pipeline's rebuild_author_counts instead.
+		from gregory.utils.author_counts import refresh_author_counts_for_articles
+
+		refresh_author_counts_for_articles(changed)
+	return len(changed)
 
 
 def compute_ml_drift(threshold=0.8):
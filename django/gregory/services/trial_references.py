@@ -0,0 +1,269 @@
+"""
+Incremental detection of registry identifiers cited in article text, behind the
+``detect_trial_references`` command.
+
+Two sides feed ``ArticleTrialReference``:
+
+  * article side — an article whose title/summary is new or changed since its
+    last scan (``Articles.trial_refs_scanned_at`` NULL or older than
+    ``last_updated``) is run through the combined identifier scanner once and
+    the identifiers found are looked up in ``TrialIdentifierIndex`` with a
+    single IN-query per batch;
+  * trial side — an index row not yet scanned (a new trial, or a trial whose
+    ``identifiers`` changed) is matched against existing articles through a
+    ``usummary``/``utitle`` substring prefilter (trigram-indexed), and only the
+    candidates are confirmed with the scanner.
+
+Between the two, a nightly run touches only what changed since the previous
+one instead of rescanning the corpus. References are written with
+``bulk_create(ignore_conflicts=True)`` against the
+(article, trial, identifier_type) unique constraint, so reruns are idempotent.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from gregory.models import (
+	Articles,
+	ArticleTrialReference,
+	TrialIdentifierIndex,
+	Trials,
+)
+from gregory.utils.trial_identifiers import (
+	extract_identifiers,
+	extract_identifiers_from_trial_identifiers,
+	search_fragment,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# OR-ed substring predicates per candidate query on the trial side.
+FRAGMENT_BATCH_SIZE = 100
+
+
+@dataclass
+class ScanResult:
+	"""Matches found by a scan: (article_id, trial_id, identifier_type,
+	identifier_value) tuples, in discovery order."""
+
+	matches: list = field(default_factory=list)
+
+	@property
+	def article_ids(self) -> set:
+		return {match[0] for match in self.matches}
+
+	@property
+	def trial_ids(self) -> set:
+		return {match[1] for match in self.matches}
+
+	def extend(self, other: "ScanResult"):
+		self.matches.extend(other.matches)
+
+
+def due_articles():
+	"""Articles with a summary whose text has not been scanned since it last
+	changed."""
+	return (
+		Articles.objects.filter(summary__isnull=False)
+		.exclude(summary="")
+		.filter(
+			Q(trial_refs_scanned_at__isnull=True)
+			| Q(last_updated__gt=F("trial_refs_scanned_at"))
+		)
+	)
+
+
+def rebuild_identifier_index(trials=None, mark_scanned: bool = False) -> int:
+	"""Recompute ``TrialIdentifierIndex`` for *trials* (default: all trials) in
+	batches, for writes that bypassed ``Trials.save()``. Rows that already
+	exist keep their scan state; new rows are left unscanned unless
+	*mark_scanned* is set (only safe when every article is due for an
+	article-side scan anyway). Returns the number of rows created."""
+	if trials is None:
+		trials = Trials.objects.all()
+	trials = trials.only("trial_id", "identifiers").order_by("trial_id")
+	scanned_at = timezone.now() if mark_scanned else None
+	created = 0
+	batch = []
+
+	def flush():
+		nonlocal created
+		trial_ids = [trial.trial_id for trial in batch]
+		wanted = {
+			(trial.trial_id, id_type, id_value)
+			for trial in batch
+			for id_type, id_value in extract_identifiers_from_trial_identifiers(
+				trial.identifiers
+			)
+		}
+		existing = {
+			(row[1], row[2], row[3]): row[0]
+			for row in TrialIdentifierIndex.objects.filter(
+				trial_id__in=trial_ids
+			).values_list("pk", "trial_id", "identifier_type", "identifier_value")
+		}
+		stale_ids = [pk for key, pk in existing.items() if key not in wanted]
+		if stale_ids:
+			TrialIdentifierIndex.objects.filter(pk__in=stale_ids).delete()
+		missing = sorted(wanted - existing.keys())
+		if missing:
+			TrialIdentifierIndex.objects.bulk_create(
+				[
+					TrialIdentifierIndex(
+						trial_id=trial_id,
+						identifier_type=id_type,
+						identifier_value=id_value,
+						references_scanned_at=scanned_at,
+					)
+					for trial_id, id_type, id_value in missing
+				],
+				ignore_conflicts=True,
+			)
+			created += len(missing)
+		batch.clear()
+
+	for trial in trials.iterator(chunk_size=BATCH_SIZE):
+		batch.append(trial)
+		if len(batch) >= BATCH_SIZE:
+			flush()
+	if batch:
+		flush()
+	return created
+
+
+def _article_text(article) -> str:
+	return f"{article.title or ''} {article.summary}"
+
+
+def _match_batch(articles, lookup) -> list:
+	"""Scan each article once and resolve its identifiers through *lookup*
+	((identifier_type, identifier_value) -> [trial_id, ...])."""
+	matches = []
+	for article in articles:
+		for id_type, id_value in sorted(extract_identifiers(_article_text(article))):
+			for trial_id in lookup.get((id_type, id_value), ()):
+				matches.append((article.article_id, trial_id, id_type, id_value))
+	return matches
+
+
+def _write_references(matches):
+	ArticleTrialReference.objects.bulk_create(
+		[
+			ArticleTrialReference(
+				article_id=article_id,
+				trial_id=trial_id,
+				identifier_type=id_type,
+				identifier_value=id_value,
+			)
+			for article_id, trial_id, id_type, id_value in matches
+		],
+		ignore_conflicts=True,
+		batch_size=BATCH_SIZE,
+	)
+
+
+def scan_articles(
+	articles,
+	*,
+	trial_ids=None,
+	dry_run: bool = False,
+	mark_scanned: bool = True,
+	batch_size: int = BATCH_SIZE,
+) -> ScanResult:
+	"""Article side: scan *articles* and reference every indexed trial whose
+	identifiers they cite, optionally restricted to *trial_ids*. Marks each
+	batch scanned unless *dry_run*, *mark_scanned* is off, or the scan was
+	restricted (a partial scan must not hide the article from the next run)."""
+	result = ScanResult()
+	mark_scanned = mark_scanned and not dry_run and trial_ids is None
+	started_at = timezone.now()
+	batch = []
+
+	def flush():
+		scannable = [article for article in batch if article.summary]
+		found = {}
+		for article in scannable:
+			found[article.article_id] = extract_identifiers(_article_text(article))
+		values = {id_value for ids in found.values() for _, id_value in ids}
+		lookup = defaultdict(list)
+		if values:
+			index = TrialIdentifierIndex.objects.filter(identifier_value__in=values)
+			if trial_ids is not None:
+				index = index.filter(trial_id__in=trial_ids)
+			for id_type, id_value, trial_id in index.values_list(
+				"identifier_type", "identifier_value", "trial_id"
+			):
+				lookup[(id_type, id_value)].append(trial_id)
+		matches = _match_batch(scannable, lookup) if lookup else []
+		if matches and not dry_run:
+			_write_references(matches)
+		if mark_scanned:
+			Articles.objects.filter(
+				pk__in=[article.article_id for article in batch]
+			).update(trial_refs_scanned_at=started_at)
+		result.matches.extend(matches)
+		batch.clear()
+
+	for article in articles.only("article_id", "title", "summary").iterator(
+		chunk_size=batch_size
+	):
+		batch.append(article)
+		if len(batch) >= batch_size:
+			flush()
+	if batch:
+		flush()
+	return result
+
+
+def scan_pending_identifiers(*, trial_ids=None, dry_run: bool = False) -> ScanResult:
+	"""Trial side: match index rows not yet scanned against existing articles,
+	then mark them scanned (unless *dry_run*)."""
+	result = ScanResult()
+	started_at = timezone.now()
+	pending = TrialIdentifierIndex.objects.filter(references_scanned_at__isnull=True)
+	if trial_ids is not None:
+		pending = pending.filter(trial_id__in=trial_ids)
+	rows = list(
+		pending.values_list("pk", "identifier_type", "identifier_value", "trial_id")
+	)
+	if not rows:
+		return result
+
+	lookup = defaultdict(list)
+	for _, id_type, id_value, trial_id in rows:
+		lookup[(id_type, id_value)].append(trial_id)
+	fragments = sorted({search_fragment(id_type, id_value) for id_type, id_value in lookup})
+
+	seen_article_ids = set()
+	for start in range(0, len(fragments), FRAGMENT_BATCH_SIZE):
+		chunk = fragments[start : start + FRAGMENT_BATCH_SIZE]
+		condition = reduce(
+			or_,
+			(Q(usummary__contains=frag) | Q(utitle__contains=frag) for frag in chunk),
+		)
+		candidates = [
+			article
+			for article in Articles.objects.filter(summary__isnull=False)
+			.exclude(summary="")
+			.filter(condition)
+			.only("article_id", "title", "summary")
+			.iterator(chunk_size=BATCH_SIZE)
+			if article.article_id not in seen_article_ids
+		]
+		seen_article_ids.update(article.article_id for article in candidates)
+		result.matches.extend(_match_batch(candidates, lookup))
+
+	if not dry_run:
+		if result.matches:
+			_write_references(result.matches)
+		TrialIdentifierIndex.objects.filter(pk__in=[row[0] for row in rows]).update(
+			references_scanned_at=started_at
+		)
+	return result
@@ -2,10 +2,12 @@ from simple_history.signals import (
 	post_create_historical_record,
 	pre_create_historical_record,
 )
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from organizations.models import Organization
 
+from gregory.utils.bulk_history import post_bulk_create_historical_records
+
 MAX_AUTHOR_HISTORY = 5
 
 
@@ -41,15 +43,24 @@ def stamp_api_access_scheme_on_history(sender, history_instance, **kwargs):
 @receiver(post_create_historical_record)
 def trim_author_history(sender, instance, history_instance, **kwargs):
 	from gregory.models import Authors
+	from gregory.utils.bulk_history import trim_history
 
 	if not isinstance(instance, Authors):
 		return
-	keep_ids = list(
-		instance.history.order_by("-history_date").values_list("pk", flat=True)[
-			:MAX_AUTHOR_HISTORY
-		]
-	)
-	instance.history.exclude(pk__in=keep_ids).delete()
+	trim_history(sender, [instance.pk], MAX_AUTHOR_HISTORY)
+
+
+@receiver(post_bulk_create_historical_records)
+def trim_author_history_in_bulk(sender, instances, **kwargs):
+	"""Set-based trim_author_history for rows written by
+	gregory.utils.bulk_history: one ranking query for every author of the
+	flush instead of two queries per author save."""
+	from gregory.models import Authors
+	from gregory.utils.bulk_history import trim_history
+
+	if sender.instance_type is not Authors:
+		return
+	trim_history(sender, {instance.pk for instance in instances}, MAX_AUTHOR_HISTORY)
 
 
 @receiver(post_save, sender=Organization)
@@ -99,3 +110,67 @@ def update_article_relevance_flag(sender, instance, **kwargs):
 	from gregory.relevance import recompute_article_relevance
 
 	recompute_article_relevance(article_ids=[instance.article_id])
+
+
+# --- Stored author article counts (gregory.utils.author_counts) ---
+# An author's counts change when an article gains or loses the author, when
+# the article moves between teams (and so organisations), and when the
+# article is deleted. Writes that bypass these signals are picked up by the
+# pipeline's rebuild_author_counts.
+
+
+def _authors_of_articles(article_ids):
+	from gregory.models import Articles
+
+	return set(
+		Articles.authors.through.objects.filter(articles_id__in=article_ids).values_list(
+			"authors_id", flat=True
+		)
+	)
+
+
+@receiver(m2m_changed, sender="gregory.Articles_authors")
+def refresh_author_counts_on_authors_change(sender, instance, action, reverse, pk_set, **kwargs):
+	from gregory.utils.author_counts import refresh_author_counts
+
+	if action == "pre_clear" and not reverse:
+		instance._cleared_author_ids = set(
+			instance.authors.values_list("author_id", flat=True)
+		)
+	elif action in ("post_add", "post_remove", "post_clear"):
+		if reverse:
+			refresh_author_counts([instance.pk])
+		elif action == "post_clear":
+			refresh_author_counts(getattr(instance, "_cleared_author_ids", ()))
+		else:
+			refresh_author_counts(pk_set or ())
+
+
+@receiver(m2m_changed, sender="gregory.Articles_teams")
+def refresh_author_counts_on_teams_change(sender, instance, action, reverse, pk_set, **kwargs):
+	from gregory.utils.author_counts import refresh_author_counts
+
+	if action == "pre_clear" and reverse:
+		instance._cleared_article_ids = set(
+			instance.articles.values_list("article_id", flat=True)
+		)
+	elif action in ("post_add", "post_remove", "post_clear"):
+		if not reverse:
+			article_ids = [instance.pk]
+		elif action == "post_clear":
+			article_ids = getattr(instance, "_cleared_article_ids", ())
+		else:
+			article_ids = pk_set or ()
+		refresh_author_counts(_authors_of_articles(article_ids))
+
+
+@receiver(pre_delete, sender="gregory.Articles")
+def remember_article_authors(sender, instance, **kwargs):
+	instance._deleted_author_ids = _authors_of_articles([instance.pk])
+
+
+@receiver(post_delete, sender="gregory.Articles")
+def refresh_author_counts_on_article_delete(sender, instance, **kwargs):
+	from gregory.utils.author_counts import refresh_author_counts
+
+	refresh_author_counts(getattr(instance, "_deleted_author_ids", ()))
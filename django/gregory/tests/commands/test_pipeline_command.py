@@ -53,6 +53,7 @@ class PipelineCommandTest(TestCase):
 			self.assertIn(cmd, called_commands)
 		self.assertIn("update_orcid", called_commands)
 		self.assertIn("predict_articles", called_commands)
+		self.assertIn("drain_email_events", called_commands)
 
 	@patch("gregory.management.commands.pipeline.call_command")
 	@patch("django.apps.apps.get_model")
@@ -254,6 +254,24 @@ class BackfillUnpaywallCommandTest(TestCase):
 		self.assertIn("No Unpaywall data:", output)
 		self.assertIn("Updated articles:", output)
 
+	# ------------------------------------------------------------------
+	# Pacing
+	# ------------------------------------------------------------------
+
+	@patch.dict(os.environ, {"DOMAIN_NAME": "test.example.com"})
+	@patch("gregory.management.commands.backfill_unpaywall.time.sleep")
+	@patch(PATCH_GET_DATA)
+	def test_snapshot_answers_are_not_paced(self, mock_get, mock_sleep):
+		mock_get.return_value = {**UNPAYWALL_OPEN, "snapshot_date": "2026-01-01"}
+		call_command("backfill_unpaywall", pdf_links=True, days=30, sleep=1, verbosity=0, log_file="")
+		mock_sleep.assert_not_called()
+
+		mock_get.return_value = {**UNPAYWALL_OPEN, "snapshot_date": "2026-01-01", "stale": True}
+		Articles.objects.filter(pk=self.needs_pdf.pk).update(pdf_link=None)
+		Articles.objects.filter(pk=self.needs_access.pk).update(pdf_link=None)
+		call_command("backfill_unpaywall", pdf_links=True, days=30, sleep=1, verbosity=0, log_file="")
+		mock_sleep.assert_called_once_with(1)
+
 	# ------------------------------------------------------------------
 	# CSV report
 	# ------------------------------------------------------------------
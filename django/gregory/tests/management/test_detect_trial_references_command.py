@@ -6,6 +6,7 @@ django.setup()
 
 from django.core.management import call_command
 from django.test import TestCase
+from io import StringIO
 from unittest.mock import patch, MagicMock
 
 
@@ -124,3 +125,102 @@ class DetectTrialReferencesIntegrationTest(TestCase):
 			).count(),
 			0,
 		)
+
+
+class DetectTrialReferencesIncrementalTest(TestCase):
+	"""The default run only touches articles new or changed since their last
+	scan, plus trials indexed since the previous run."""
+
+	def setUp(self):
+		from gregory.models import Articles, Trials
+
+		self.trial = Trials.objects.create(
+			title="OVERLORD-MS",
+			identifiers={"nct": "NCT04578639"},
+			link="https://clinicaltrials.gov/study/NCT04578639",
+		)
+		self.article = Articles.objects.create(
+			title="Rituximab versus Ocrelizumab",
+			summary="ClinicalTrials.gov number, NCT04578639.",
+			link="https://pubmed.ncbi.nlm.nih.gov/1/",
+		)
+
+	def test_trial_save_maintains_identifier_index(self):
+		from gregory.models import TrialIdentifierIndex
+
+		self.assertEqual(
+			set(
+				TrialIdentifierIndex.objects.filter(trial=self.trial).values_list(
+					"identifier_type", "identifier_value"
+				)
+			),
+			{("nct", "NCT04578639")},
+		)
+		self.trial.identifiers = {"euctr": "EUCTR2020-001205-23-NO"}
+		self.trial.save()
+		self.assertEqual(
+			set(
+				TrialIdentifierIndex.objects.filter(trial=self.trial).values_list(
+					"identifier_type", "identifier_value"
+				)
+			),
+			{("eudract", "2020-001205-23")},
+		)
+
+	def test_scanned_articles_are_skipped_until_changed(self):
+		from gregory.models import Articles
+
+		call_command("detect_trial_references", stdout=StringIO())
+		self.article.refresh_from_db()
+		self.assertIsNotNone(self.article.trial_refs_scanned_at)
+
+		out = StringIO()
+		call_command("detect_trial_references", stdout=out)
+		self.assertIn("Recorded 0 article-trial references", out.getvalue())
+
+		Articles.objects.get(pk=self.article.pk).save()
+		out = StringIO()
+		call_command("detect_trial_references", stdout=out)
+		self.assertIn("Recorded 1 article-trial references", out.getvalue())
+
+	def test_new_trial_is_matched_against_already_scanned_articles(self):
+		from gregory.models import ArticleTrialReference, Trials
+
+		self.article.summary = "Registered as ISRCTN12345678 and NCT04578639."
+		self.article.save()
+		call_command("detect_trial_references", stdout=StringIO())
+
+		later_trial = Trials.objects.create(
+			title="Later registry entry",
+			identifiers={"isrctn": "ISRCTN12345678"},
+			link="https://www.isrctn.com/ISRCTN12345678",
+		)
+		call_command("detect_trial_references", stdout=StringIO())
+		self.assertEqual(
+			list(
+				ArticleTrialReference.objects.filter(trial=later_trial).values_list(
+					"article_id", "identifier_type", "identifier_value"
+				)
+			),
+			[(self.article.pk, "isrctn", "ISRCTN12345678")],
+		)
+		self.assertFalse(
+			later_trial.identifier_index.filter(
+				references_scanned_at__isnull=True
+			).exists()
+		)
+
+	def test_rebuild_index_picks_up_writes_that_bypass_save(self):
+		from gregory.models import ArticleTrialReference, Trials
+
+		Trials.objects.filter(pk=self.trial.pk).update(
+			identifiers={"nct": "NCT04578639", "isrctn": "ISRCTN12345678"}
+		)
+		self.article.summary = "ISRCTN12345678"
+		self.article.save()
+		call_command("detect_trial_references", "--rebuild-index", stdout=StringIO())
+		self.assertTrue(
+			ArticleTrialReference.objects.filter(
+				article=self.article, trial=self.trial, identifier_type="isrctn"
+			).exists()
+		)
@@ -117,7 +117,10 @@ class FeedreaderTrialsCommandTest(TestCase):
 	@patch("gregory.management.commands.feedreader_trials.feedparser.parse")
 	@patch("gregory.management.commands.feedreader_trials.requests.get")
 	@patch("gregory.management.commands.feedreader_trials.Sources")
-	def test_process_feeds_respects_ssl_flag(self, mock_sources, mock_get, mock_parse):
+	@patch("gregory.management.commands.feedreader_trials.refresh_source_stats")
+	def test_process_feeds_respects_ssl_flag(
+		self, mock_refresh_stats, mock_sources, mock_get, mock_parse
+	):
 		cmd = Command()
 		source = MagicMock(
 			link="http://example.com",
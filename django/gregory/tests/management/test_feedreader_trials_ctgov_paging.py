@@ -0,0 +1,156 @@
+"""Tests for feedreader_trials_ctgov's paged pipeline: ClinicalTrialsGovAPI.search_all
+prefetches the next page while the caller works through the current one, and the
+command resolves each page's existing trials with one set of queries
+(_load_candidates) instead of several per study.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.management.test_feedreader_trials_ctgov_paging
+"""
+
+import os
+import threading
+from unittest.mock import MagicMock
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gregory.tests.test_settings")
+django.setup()
+
+from django.test import SimpleTestCase, TestCase
+
+from gregory.classes import ClinicalTrial, ClinicalTrialsGovAPI
+from gregory.management.commands.feedreader_trials_ctgov import Command
+from gregory.models import Sources, Trials
+
+
+def _clinical_trial(nct, title=None, link=None):
+	return ClinicalTrial(
+		title=title or f"Trial {nct}",
+		summary="A summary",
+		link=link or f"https://clinicaltrials.gov/study/{nct}",
+		published_date=None,
+		identifiers={"nct": nct},
+		extra_fields={},
+	)
+
+
+class SearchAllPrefetchTests(SimpleTestCase):
+	def setUp(self):
+		self.api = ClinicalTrialsGovAPI()
+		self.pages = {
+			None: {"studies": [{"n": 1}, {"n": 2}], "nextPageToken": "p2"},
+			"p2": {"studies": [{"n": 3}, {"n": 4}], "nextPageToken": "p3"},
+			"p3": {"studies": [{"n": 5}]},
+		}
+		self.requested = []
+		self.second_page_requested = threading.Event()
+
+		def search(page_token=None, **kwargs):
+			self.requested.append(page_token)
+			if page_token == "p2":
+				self.second_page_requested.set()
+			return self.pages[page_token]
+
+		self.api.search = search
+
+	def test_yields_every_study_in_order(self):
+		studies = [study["n"] for study in self.api.search_all(page_size=2)]
+
+		self.assertEqual(studies, [1, 2, 3, 4, 5])
+		self.assertEqual(self.requested, [None, "p2", "p3"])
+
+	def test_next_page_is_requested_before_the_current_one_is_consumed(self):
+		studies = self.api.search_all(page_size=2)
+
+		self.assertEqual(next(studies), {"n": 1})
+		self.assertTrue(self.second_page_requested.wait(timeout=5))
+		studies.close()
+
+	def test_max_results_stops_without_requesting_further_pages(self):
+		studies = [study["n"] for study in self.api.search_all(max_results=4)]
+
+		self.assertEqual(studies, [1, 2, 3, 4])
+		self.assertEqual(self.requested, [None, "p2"])
+
+	def test_failed_page_raises_when_reached(self):
+		del self.pages["p3"]
+		studies = self.api.search_all()
+
+		self.assertEqual([next(studies)["n"] for _ in range(4)], [1, 2, 3, 4])
+		with self.assertRaises(KeyError):
+			next(studies)
+
+
+class PagedDuplicateResolutionTests(TestCase):
+	def setUp(self):
+		self.source = Sources.objects.create(
+			name="CTGov Paging",
+			method="ctgov_api",
+			source_for="trials",
+			active=True,
+			ctgov_search_condition="multiple sclerosis",
+		)
+		self.cmd = Command()
+		self.cmd.debug = False
+		self.cmd.api = MagicMock()
+		self.cmd.api.extract_sites.return_value = []
+
+	def _run(self, clinical_trials):
+		self.cmd.api.search_all.return_value = iter(
+			[{"n": index} for index in range(len(clinical_trials))]
+		)
+		self.cmd.api.parse_study_to_clinical_trial.side_effect = clinical_trials
+		self.cmd.process_sources(max_results=1000)
+
+	def test_load_candidates_query_count_does_not_grow_with_the_page(self):
+		incoming = [_clinical_trial(f"NCT{n:08d}") for n in range(50)]
+		incoming[0].identifiers["org_study_id"] = "MS-001"
+
+		# nct, link, org_study_id, exact link, title — whatever the page size.
+		with self.assertNumQueries(5):
+			self.cmd._load_candidates(incoming)
+
+	def test_each_rule_matches_within_a_page(self):
+		by_nct = Trials.objects.create(
+			title="Stored by nct",
+			link="https://example.org/a",
+			identifiers={"nct": "NCT00000001"},
+		)
+		by_link = Trials.objects.create(
+			title="Stored by link",
+			link="https://clinicaltrials.gov/study/NCT00000002",
+			identifiers={"euct": "2024-000001-01-00"},
+		)
+		by_title = Trials.objects.create(
+			title="STORED BY TITLE",
+			link="https://example.org/c",
+			identifiers={"euct": "2024-000002-01-00"},
+		)
+
+		self._run(
+			[
+				_clinical_trial("NCT00000001", title="Stored by nct"),
+				_clinical_trial("NCT00000002", title="Stored by link"),
+				_clinical_trial("NCT00000003", title="Stored by title"),
+				_clinical_trial("NCT00000004"),
+			]
+		)
+
+		self.assertEqual(Trials.objects.count(), 4)
+		for trial in (by_nct, by_link, by_title):
+			trial.refresh_from_db()
+			self.assertIn(self.source, trial.sources.all())
+		self.assertEqual(by_title.identifiers["nct"], "NCT00000003")
+
+	def test_repeat_within_a_page_updates_the_row_just_created(self):
+		self._run(
+			[
+				_clinical_trial("NCT00000009", title="First sighting"),
+				_clinical_trial("NCT00000009", title="First sighting"),
+			]
+		)
+
+		trial = Trials.objects.get()
+		self.assertEqual(trial.identifiers, {"nct": "NCT00000009"})
+		self.assertEqual(list(trial.sources.all()), [self.source])
+
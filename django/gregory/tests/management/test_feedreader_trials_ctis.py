@@ -487,3 +487,59 @@ class RetrieveBackupTests(TestCase):
 
 		api.retrieve.assert_called_once_with("2026-000000-00-42")
 		self.assertEqual(Trials.objects.count(), 1)
+
+
+class ConcurrentRetrieveTests(TestCase):
+	"""/retrieve GETs for a batch are fanned out over worker threads, but
+	archiving, create/update and enrichment still happen in /search order."""
+
+	def setUp(self):
+		self.source = _source()
+		self.tmp_dir = tempfile.mkdtemp()
+
+	def test_batch_is_written_in_search_order_whatever_order_retrieves_finish_in(self):
+		import time
+
+		ct_numbers = [f"2026-000000-00-{n:02d}" for n in range(40, 46)]
+		api = MagicMock()
+		api.iter_search.return_value = iter([{"ctNumber": ct} for ct in ct_numbers])
+		api.parse_ctis_search_record.side_effect = [
+			_trial(ct, title=f"Trial {ct}") for ct in ct_numbers
+		]
+
+		def slow_first(ct_number):
+			# The first records finish last.
+			time.sleep(0.01 * (len(ct_numbers) - ct_numbers.index(ct_number)))
+			return {"ctNumber": ct_number}
+
+		api.retrieve.side_effect = slow_first
+		cmd = _make_command(api)
+		archived = []
+		cmd._archive_retrieve_payload = lambda payload, ct, backup_dir: archived.append(
+			(ct, payload["ctNumber"])
+		)
+
+		cmd.process_sources(backup_dir=self.tmp_dir, workers=4)
+
+		self.assertEqual(archived, [(ct, ct) for ct in ct_numbers])
+		self.assertEqual(
+			list(Trials.objects.order_by("trial_id").values_list("title", flat=True)),
+			[f"Trial {ct}" for ct in ct_numbers],
+		)
+		self.assertEqual(api.retrieve.call_count, len(ct_numbers))
+
+	def test_duplicate_record_within_a_batch_updates_instead_of_creating_twice(self):
+		api = MagicMock()
+		api.iter_search.return_value = iter(
+			[{"ctNumber": "2026-000000-00-50"}, {"ctNumber": "2026-000000-00-50"}]
+		)
+		api.parse_ctis_search_record.side_effect = [
+			_trial("2026-000000-00-50"),
+			_trial("2026-000000-00-50"),
+		]
+		api.retrieve.return_value = None
+		cmd = _make_command(api)
+
+		cmd.process_sources(backup_dir=self.tmp_dir, workers=2)
+
+		self.assertEqual(Trials.objects.count(), 1)
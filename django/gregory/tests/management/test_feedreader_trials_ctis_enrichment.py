@@ -374,7 +374,7 @@ class EnrichAllTests(TestCase):
 		api.retrieve.return_value = _retrieve_payload()
 		cmd = _make_command(api)
 
-		cmd.enrich_all_trials(sleep=0)
+		cmd.enrich_all_trials()
 
 		called_with = sorted(call.args[0] for call in api.retrieve.call_args_list)
 		self.assertEqual(called_with, ["2025-000000-00-01", "2025-000000-00-02"])
@@ -388,7 +388,7 @@ class EnrichAllTests(TestCase):
 		api = MagicMock()
 		api.retrieve.return_value = None
 		cmd = _make_command(api)
-		cmd.enrich_all_trials(sleep=0)  # must not raise
+		cmd.enrich_all_trials()  # must not raise
 
 	def test_null_euct_value_is_skipped_without_a_retrieve_call(self):
 		"""Regression guard: every ClinicalTrials.gov/WHO-imported trial carries
@@ -400,7 +400,7 @@ class EnrichAllTests(TestCase):
 		)
 		api = MagicMock()
 		cmd = _make_command(api)
-		cmd.enrich_all_trials(sleep=0)
+		cmd.enrich_all_trials()
 		api.retrieve.assert_not_called()
 
 	def test_legacy_euctr_style_euct_value_is_skipped_without_a_retrieve_call(self):
@@ -413,7 +413,7 @@ class EnrichAllTests(TestCase):
 		)
 		api = MagicMock()
 		cmd = _make_command(api)
-		cmd.enrich_all_trials(sleep=0)
+		cmd.enrich_all_trials()
 		api.retrieve.assert_not_called()
 
 
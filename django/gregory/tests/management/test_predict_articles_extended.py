@@ -421,6 +421,53 @@ class TestLoadModelDelegation(TestCase):
 					load_model(self.team, self.subject, "lgbm_tfidf", "v1")
 				self.assertIn("Model directory not found", str(ctx.exception))
 
+	def test_parity_checked_inference_export_is_preferred(self):
+		"""A passing inference export replaces the trainer unless disabled."""
+		runtime = MagicMock()
+		with tempfile.TemporaryDirectory() as base:
+			model_dir = self._model_dir(base, "lgbm_tfidf")
+			with (
+				patch(
+					"gregory.management.commands.predict_articles.BASE_MODEL_DIR",
+					base,
+				),
+				patch(
+					"gregory.ml.inference.load_inference_model", return_value=runtime
+				) as mock_load_inference,
+				patch("gregory.ml.lgbm_wrapper.LGBMTfidfTrainer") as mock_trainer_class,
+			):
+				self.assertIs(
+					load_model(self.team, self.subject, "lgbm_tfidf", "v1"), runtime
+				)
+				mock_load_inference.assert_called_once_with(model_dir)
+				mock_trainer_class.assert_not_called()
+
+				model = load_model(
+					self.team,
+					self.subject,
+					"lgbm_tfidf",
+					"v1",
+					use_inference_runtime=False,
+				)
+				self.assertIs(model, mock_trainer_class.return_value)
+
+	def test_broken_inference_export_falls_back_to_trainer(self):
+		with tempfile.TemporaryDirectory() as base:
+			self._model_dir(base, "lgbm_tfidf")
+			with (
+				patch(
+					"gregory.management.commands.predict_articles.BASE_MODEL_DIR",
+					base,
+				),
+				patch(
+					"gregory.ml.inference.load_inference_model",
+					side_effect=OSError("corrupt booster file"),
+				),
+				patch("gregory.ml.lgbm_wrapper.LGBMTfidfTrainer") as mock_trainer_class,
+			):
+				model = load_model(self.team, self.subject, "lgbm_tfidf", "v1")
+				self.assertIs(model, mock_trainer_class.return_value)
+
 
 # ===========================================================================
 # 13. get_articles returns distinct results
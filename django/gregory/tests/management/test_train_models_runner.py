@@ -0,0 +1,133 @@
+"""
+Tests for train_models' runner: each subject's dataset is built once for all
+algorithms (and reused from the label-snapshot cache on the next run), every
+job gets its PredictionRunLog, and the run report records the outcome.
+
+Jobs run in-process here (--jobs 1); spawned workers would not see the test
+database. The pool itself is covered by gregory/tests/test_training_scheduler.py.
+"""
+
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gregory.tests.test_settings")
+django.setup()
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from gregory.models import PredictionRunLog, Subject, Team
+from gregory.tests.management.test_export_training_data import create_labeled_articles
+from gregory.utils import dataset as dataset_utils
+from organizations.models import Organization
+
+
+class TrainModelsRunnerTest(TestCase):
+	def setUp(self):
+		organization = Organization.objects.create(name="Runner Organization")
+		self.team = Team.objects.create(
+			slug="runner-team", name="Runner Team", organization=organization
+		)
+		self.subject = Subject.objects.create(
+			subject_name="Runner Subject",
+			subject_slug="runner-subject",
+			team=self.team,
+			auto_predict=True,
+		)
+		self.temp_dir = tempfile.TemporaryDirectory()
+		self.addCleanup(self.temp_dir.cleanup)
+		self.report_path = Path(self.temp_dir.name) / "report.json"
+
+		self.trainer = MagicMock()
+		self.trainer.evaluate.return_value = {"accuracy": 0.9, "f1": 0.8}
+
+	def train(self, *args):
+		with (
+			patch(
+				"gregory.management.commands.train_models.get_trainer",
+				return_value=self.trainer,
+			),
+			patch("django.conf.settings.BASE_DIR", self.temp_dir.name),
+		):
+			call_command(
+				"train_models",
+				"--team",
+				"runner-team",
+				"--all-articles",
+				"--algo",
+				"lgbm_tfidf,lstm",
+				"--report",
+				str(self.report_path),
+				*args,
+				stdout=StringIO(),
+				stderr=StringIO(),
+			)
+		with open(self.report_path) as f:
+			return json.load(f)
+
+	def test_dataset_is_built_once_per_subject_and_cached_across_runs(self):
+		create_labeled_articles(self.team, self.subject, count=20)
+
+		with patch.object(
+			dataset_utils, "build_dataset", wraps=dataset_utils.build_dataset
+		) as build:
+			report = self.train()
+			self.assertEqual(build.call_count, 1)
+			self.assertEqual(self.trainer.train.call_count, 2)
+
+			second = self.train()
+			self.assertEqual(build.call_count, 1)
+
+		self.assertFalse(report["datasets"][0]["cache_hit"])
+		self.assertTrue(second["datasets"][0]["cache_hit"])
+		self.assertEqual(
+			report["datasets"][0]["snapshot"], second["datasets"][0]["snapshot"]
+		)
+		self.assertEqual(report["datasets"][0]["rows"], 20)
+
+		self.assertEqual(report["succeeded"], 2)
+		self.assertEqual(
+			sorted(run["algorithm"] for run in report["runs"]), ["lgbm_tfidf", "lstm"]
+		)
+		self.assertTrue(all(run["model_version"] for run in report["runs"]))
+		self.assertEqual(
+			PredictionRunLog.objects.filter(run_type="train", success=True).count(), 4
+		)
+
+	def test_dataset_failure_fails_every_algorithm(self):
+		report = self.train()
+
+		self.trainer.train.assert_not_called()
+		self.assertEqual(report["failed"], 2)
+		self.assertIn("No labeled articles", report["datasets"][0]["error"])
+		logs = PredictionRunLog.objects.filter(run_type="train")
+		self.assertEqual(logs.count(), 2)
+		self.assertFalse(logs.filter(success=True).exists())
+
+	def test_training_failure_is_isolated_to_its_job(self):
+		create_labeled_articles(self.team, self.subject, count=20)
+		self.trainer.train.side_effect = [RuntimeError("out of memory"), None]
+
+		report = self.train()
+
+		self.assertEqual(report["succeeded"], 1)
+		failed = [run for run in report["runs"] if not run["success"]]
+		self.assertEqual(len(failed), 1)
+		self.assertIn("out of memory", failed[0]["error"])
+
+	def test_invalid_jobs_rejected(self):
+		with self.assertRaises(CommandError):
+			self.train("--jobs", "0")
+
+
+if __name__ == "__main__":
+	import unittest
+
+	unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for AuthorArticleCounts, the stored per-(author, organisation) article
+counts (gregory.utils.author_counts): signal-driven refreshes, the bulk
+rebuild and migration backfill, and the read expression the authors endpoints
+use.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_author_counts
+"""
+
+import importlib
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from organizations.models import Organization
+
+from gregory.models import Articles, AuthorArticleCounts, Authors, Team
+from gregory.utils.author_counts import (
+	article_count_expression,
+	live_article_count_expression,
+	rebuild_author_counts,
+)
+
+
+class AuthorCountsTest(TestCase):
+	def setUp(self):
+		self.org_a = Organization.objects.create(name="Counts A", slug="counts-a")
+		self.org_b = Organization.objects.create(name="Counts B", slug="counts-b")
+		self.team_a = Team.objects.create(
+			organization=self.org_a, name="Team A", slug="counts-team-a"
+		)
+		self.team_b = Team.objects.create(
+			organization=self.org_b, name="Team B", slug="counts-team-b"
+		)
+		self.author = Authors.objects.create(
+			given_name="Count", family_name="Me", full_name="Count Me"
+		)
+		self.other = Authors.objects.create(
+			given_name="Other", family_name="Author", full_name="Other Author"
+		)
+
+	def article(self, title, teams, authors=None, relevant=False):
+		article = Articles.objects.create(
+			title=title, link=f"https://example.com/counts/{title}", relevant=relevant
+		)
+		article.authors.add(*(authors or [self.author]))
+		article.teams.add(*teams)
+		return article
+
+	def stored(self):
+		return {
+			(row.author_id, row.organization_id): (
+				row.articles,
+				row.relevant_articles,
+				row.shared_articles,
+			)
+			for row in AuthorArticleCounts.objects.all()
+		}
+
+	def counts(self, org_ids, relevant_only=False):
+		return dict(
+			Authors.objects.annotate(
+				n=article_count_expression(org_ids, relevant_only=relevant_only)
+			).values_list("author_id", "n")
+		)
+
+	def live_counts(self, org_ids, relevant_only=False):
+		return dict(
+			Authors.objects.annotate(
+				n=live_article_count_expression(org_ids, relevant_only=relevant_only)
+			).values_list("author_id", "n")
+		)
+
+	def test_signals_keep_counts_current(self):
+		first = self.article("first", [self.team_a], relevant=True)
+		self.article("second", [self.team_a, self.team_b])
+		a, b = self.author.pk, self.org_b.pk
+		self.assertEqual(
+			self.stored(),
+			{(a, self.org_a.pk): (2, 1, 1), (a, b): (1, 0, 1)},
+		)
+
+		first.authors.add(self.other)
+		self.assertEqual(self.stored()[(self.other.pk, self.org_a.pk)], (1, 1, 0))
+
+		first.teams.clear()
+		self.assertEqual(self.stored()[(a, self.org_a.pk)], (1, 0, 1))
+		self.assertNotIn((self.other.pk, self.org_a.pk), self.stored())
+
+		self.author.articles_set.clear()
+		self.assertFalse(AuthorArticleCounts.objects.filter(author=self.author).exists())
+
+	def test_article_delete(self):
+		article = self.article("deleted", [self.team_b])
+		self.assertIn((self.author.pk, self.org_b.pk), self.stored())
+
+		article.delete()
+		self.assertEqual(self.stored(), {})
+
+	def test_rebuild_matches_signal_refreshes_and_backfill(self):
+		self.article("one", [self.team_a], relevant=True)
+		self.article("two", [self.team_a, self.team_b], authors=[self.author, self.other])
+		self.article("no team", [])
+		expected = self.stored()
+		# Bulk writes bypass the signals
+		Articles.objects.update(relevant=True)
+		expected[(self.author.pk, self.org_a.pk)] = (2, 2, 1)
+		expected[(self.author.pk, self.org_b.pk)] = (1, 1, 1)
+		expected[(self.other.pk, self.org_a.pk)] = (1, 1, 1)
+		expected[(self.other.pk, self.org_b.pk)] = (1, 1, 1)
+
+		self.assertEqual(rebuild_author_counts(), 4)
+		self.assertEqual(self.stored(), expected)
+
+		migration = importlib.import_module("gregory.migrations.0099_author_article_counts")
+		AuthorArticleCounts.objects.all().delete()
+		with connection.cursor() as cursor:
+			cursor.execute(migration.BACKFILL_SQL)
+		self.assertEqual(self.stored(), expected)
+
+	def test_command_refreshes_given_authors(self):
+		self.article("cmd", [self.team_a])
+		AuthorArticleCounts.objects.all().delete()
+
+		call_command("rebuild_author_counts", author_id=[self.other.pk], verbosity=0)
+		self.assertEqual(self.stored(), {})
+		call_command("rebuild_author_counts", author_id=[self.author.pk], verbosity=0)
+		self.assertEqual(self.stored(), {(self.author.pk, self.org_a.pk): (1, 0, 0)})
+
+	def test_read_expression_matches_live_counts(self):
+		self.article("a only", [self.team_a], relevant=True)
+		self.article("both", [self.team_a, self.team_b], authors=[self.author, self.other])
+		self.article("b only", [self.team_b], authors=[self.other], relevant=True)
+
+		for org_ids in ([self.org_a.pk], [self.org_b.pk], [self.org_a.pk, self.org_b.pk]):
+			for relevant_only in (False, True):
+				with self.subTest(org_ids=org_ids, relevant_only=relevant_only):
+					self.assertEqual(
+						self.counts(org_ids, relevant_only),
+						self.live_counts(org_ids, relevant_only),
+					)
+		# The article on both organisations' teams counts once
+		both = self.counts([self.org_a.pk, self.org_b.pk])
+		self.assertEqual(both[self.author.pk], 2)
+		self.assertEqual(both[self.other.pk], 2)
@@ -42,10 +42,17 @@ class TestBertTrainer(unittest.TestCase):
 
 		# Configure the tokenizer mock to return sensible values
 		self.mock_tokenizer_instance = self.mock_tokenizer.from_pretrained.return_value
-		self.mock_tokenizer_instance.encode_plus.return_value = {
-			"input_ids": tf.ones((1, 10), dtype=tf.int32),
-			"attention_mask": tf.ones((1, 10), dtype=tf.int32),
-		}
+		# ([CLS], one id per word, [SEP]), truncated like the fast tokenizer.
+		def mock_tokenize(texts, max_length=None, **kwargs):
+			return {
+				"input_ids": [
+					([101] + [7] * len(text.split()))[: max_length - 1] + [102]
+					for text in texts
+				]
+			}
+
+		self.mock_tokenizer_instance.side_effect = mock_tokenize
+		self.mock_tokenizer_instance.pad_token_id = 0
 
 		# Configure the BERT mock to return sensible values
 		self.mock_bert_instance = self.mock_bert.from_pretrained.return_value
@@ -147,6 +154,43 @@ class TestBertTrainer(unittest.TestCase):
 		self.assertEqual(input_ids.shape[0], 2)  # Batch size of 2
 		self.assertEqual(attention_masks.shape[0], 2)  # Batch size of 2
 
+	def test_encode_texts_pads_to_the_longest_text(self):
+		"""Padding stops at the longest text (rounded up to 8), not max_len."""
+		self.trainer.max_len = 64
+		input_ids, attention_masks = self.trainer.encode_texts(
+			["one two three", "one"]
+		)
+
+		self.assertEqual(tuple(input_ids.shape), (2, 8))
+		self.assertEqual(attention_masks.numpy().sum(axis=1).tolist(), [5, 3])
+		self.assertEqual(input_ids.numpy()[1].tolist(), [101, 7, 102, 0, 0, 0, 0, 0])
+
+	def test_encode_texts_truncates_to_max_len(self):
+		input_ids, attention_masks = self.trainer.encode_texts(["word " * 50])
+
+		self.assertEqual(tuple(input_ids.shape), (1, 10))
+		self.assertEqual(int(input_ids.numpy()[0, -1]), 102)
+
+	def test_predict_proba_buckets_by_length_and_keeps_input_order(self):
+		"""Batches are built from length-sorted texts; results come back in input order."""
+		texts = ["a " * 9, "a", "a " * 5, "a a"]
+		widths = []
+
+		def fake_predict(inputs, **kwargs):
+			input_ids, _ = inputs
+			widths.append(int(input_ids.shape[1]))
+			# Positive probability = number of real tokens / 100.
+			lengths = inputs[1].numpy().sum(axis=1) / 100
+			return np.stack([1 - lengths, lengths], axis=1)
+
+		with patch.object(self.trainer.model, "predict", side_effect=fake_predict):
+			probabilities = self.trainer.predict_proba(texts, batch_size=2)
+
+		self.assertEqual(widths, [8, 10])
+		np.testing.assert_allclose(
+			probabilities[:, 1], [0.10, 0.03, 0.07, 0.04], rtol=1e-6
+		)
+
 	@patch("gregory.ml.bert_wrapper.time")
 	def test_train(self, mock_time):
 		"""Test model training."""
@@ -400,5 +444,69 @@ class TestBertTrainer(unittest.TestCase):
 			self.assertEqual(len(labeled_labels), 4)
 
 
+class TestBertTrainerPaddingParity(unittest.TestCase):
+	"""Dynamic padding must not change the model's output: a tiny, randomly
+	initialised BERT scores the same texts padded to max_len (the old
+	encode_plus path) and through predict_proba's length-bucketed batches."""
+
+	def setUp(self):
+		from transformers import BertConfig, BertTokenizerFast, TFBertModel
+
+		words = "multiple sclerosis trial patients treatment relapse mri lesion therapy".split()
+		self.temp_dir = tempfile.TemporaryDirectory()
+		vocab_path = Path(self.temp_dir.name) / "vocab.txt"
+		vocab_path.write_text(
+			"\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]) + "\n"
+		)
+		tokenizer = BertTokenizerFast(vocab_file=str(vocab_path))
+		tf.keras.utils.set_random_seed(0)
+		bert = TFBertModel(
+			BertConfig(
+				vocab_size=tokenizer.vocab_size,
+				hidden_size=32,
+				num_hidden_layers=2,
+				num_attention_heads=2,
+				intermediate_size=64,
+				max_position_embeddings=64,
+			)
+		)
+		with (
+			patch("gregory.ml.bert_wrapper.AutoTokenizer") as mock_tokenizer,
+			patch("gregory.ml.bert_wrapper.TFAutoModel") as mock_bert,
+		):
+			mock_tokenizer.from_pretrained.return_value = tokenizer
+			mock_bert.from_pretrained.return_value = bert
+			self.trainer = BertTrainer(max_len=48, bert_model_name="tiny", dense_units=8)
+
+		self.texts = [
+			"multiple sclerosis",
+			"mri lesion therapy in relapse patients " * 3,
+			"trial",
+			"treatment of multiple sclerosis patients with therapy",
+			"relapse " * 60,
+		]
+
+	def tearDown(self):
+		self.temp_dir.cleanup()
+
+	def test_predict_proba_matches_max_length_padding(self):
+		encoded = self.trainer.tokenizer(
+			self.texts,
+			max_length=self.trainer.max_len,
+			truncation=True,
+			padding="max_length",
+			return_tensors="tf",
+		)
+		expected = self.trainer.model.predict(
+			[encoded["input_ids"], encoded["attention_mask"]], verbose=0
+		)
+
+		for bucket_by_length in (True, False):
+			actual = self.trainer.predict_proba(
+				self.texts, batch_size=2, bucket_by_length=bucket_by_length
+			)
+			np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+
 if __name__ == "__main__":
 	unittest.main()
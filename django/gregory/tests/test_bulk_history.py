@@ -0,0 +1,140 @@
+"""
+Tests for gregory.utils.bulk_history: deferring the history rows of per-row
+saves to batch boundaries, the bulk writer's M2M snapshots and API-key
+stamping, and the set-based author history trimming.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_bulk_history
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils.timezone import now
+from organizations.models import Organization
+from simple_history.models import HistoricalRecords
+
+from api.models import APIAccessScheme
+from gregory.models import Authors, Sources, Trials
+from gregory.signals import MAX_AUTHOR_HISTORY
+from gregory.utils.bulk_history import bulk_create_history, deferred_history, trim_history
+
+
+class DeferredHistoryTests(TestCase):
+	def test_rows_are_written_when_the_block_exits(self):
+		with deferred_history():
+			trial = Trials(title="Deferred trial", identifiers={"nct": "NCT90000001"})
+			trial._change_reason = "Created by test"
+			trial.save()
+			trial.title = "Deferred trial, renamed"
+			trial.save()
+			self.assertFalse(trial.history.exists())
+
+		rows = list(trial.history.order_by("history_id"))
+		self.assertEqual([row.history_type for row in rows], ["+", "~"])
+		# Each row is the state at its save, not at the flush
+		self.assertEqual([row.title for row in rows], ["Deferred trial", "Deferred trial, renamed"])
+		self.assertEqual(rows[0].history_change_reason, "Created by test")
+
+	def test_flush_writes_at_batch_boundaries(self):
+		with deferred_history() as history:
+			Authors.objects.create(given_name="Ada", family_name="Lovelace")
+			self.assertEqual(len(history), 1)
+			self.assertEqual(history.flush(), 1)
+			self.assertEqual(Authors.history.count(), 1)
+			self.assertEqual(len(history), 0)
+
+	def test_m2m_snapshot_is_taken_at_flush(self):
+		source = Sources.objects.create(name="Deferred source", source_for="trials")
+		with deferred_history():
+			trial = Trials.objects.create(title="Trial with source")
+			trial.sources.add(source)
+
+		for row in trial.history.all():
+			self.assertEqual([link.sources_id for link in row.sources.all()], [source.pk])
+
+	def test_api_key_is_stamped_at_save_time(self):
+		org = Organization.objects.create(name="Stamping org")
+		scheme = APIAccessScheme.objects.create(
+			client_name="Importer",
+			organization=org,
+			begin_date=now() - timedelta(days=1),
+			end_date=now() + timedelta(days=30),
+		)
+		HistoricalRecords.context.request = SimpleNamespace(api_access_scheme=scheme)
+		try:
+			with deferred_history() as history:
+				trial = Trials.objects.create(title="Trial posted with a key")
+				del HistoricalRecords.context.request
+				history.flush()
+		finally:
+			if hasattr(HistoricalRecords.context, "request"):
+				del HistoricalRecords.context.request
+
+		row = trial.history.get()
+		self.assertEqual(row.api_access_scheme, scheme)
+		self.assertEqual(row.api_access_scheme_label, "Importer")
+
+	def test_saves_in_a_nested_transaction_are_recorded_at_once(self):
+		with deferred_history() as history:
+			with transaction.atomic():
+				author = Authors.objects.create(given_name="Grace", family_name="Hopper")
+			self.assertEqual(author.history.count(), 1)
+			self.assertEqual(len(history), 0)
+
+	def test_buffer_is_discarded_when_the_transaction_rolls_back(self):
+		with self.assertRaises(IntegrityError):
+			with transaction.atomic():
+				with deferred_history():
+					Authors.objects.create(given_name="Rolled", family_name="Back")
+					raise IntegrityError("batch failed")
+		self.assertFalse(Authors.history.exists())
+
+	def test_author_history_is_trimmed_in_bulk(self):
+		authors = [Authors.objects.create(given_name="Author", family_name=str(i)) for i in range(3)]
+		with deferred_history():
+			for author in authors:
+				for n in range(MAX_AUTHOR_HISTORY + 2):
+					author.given_name = f"Author {n}"
+					author.save()
+
+		for author in authors:
+			kept = list(author.history.values_list("given_name", flat=True))
+			self.assertEqual(len(kept), MAX_AUTHOR_HISTORY)
+			self.assertEqual(kept[0], f"Author {MAX_AUTHOR_HISTORY + 1}")
+
+
+class BulkCreateHistoryTests(TestCase):
+	def test_rows_for_bulk_written_objects(self):
+		source = Sources.objects.create(name="Bulk source", source_for="trials")
+		trials = Trials.objects.bulk_create([Trials(title=f"Bulk trial {i}") for i in range(2)])
+		Trials.sources.through.objects.bulk_create(
+			[Trials.sources.through(trials_id=trial.pk, sources_id=source.pk) for trial in trials]
+		)
+		trials[0]._change_reason = "Imported"
+
+		rows = bulk_create_history(trials, default_change_reason="Bulk import")
+
+		self.assertEqual([row.history_type for row in rows], ["+", "+"])
+		self.assertEqual(
+			[row.history_change_reason for row in rows], ["Imported", "Bulk import"]
+		)
+		self.assertEqual([link.sources_id for link in rows[1].sources.all()], [source.pk])
+
+	def test_trim_history_keeps_the_newest_rows(self):
+		author = Authors.objects.create(given_name="Trim", family_name="Me")
+		Authors.history.filter(author_id=author.pk).delete()
+		history_model = Authors.history.model
+		for days in range(4):
+			history_model.objects.create(
+				author_id=author.pk,
+				given_name=f"v{days}",
+				history_date=now() - timedelta(days=days),
+				history_type="~",
+			)
+		self.assertEqual(trim_history(history_model, [author.pk], keep=2), 2)
+		self.assertEqual(
+			list(author.history.values_list("given_name", flat=True)), ["v0", "v1"]
+		)
@@ -124,9 +124,13 @@ class CategoryOptimizationTestCase(TestCase):
 
 	def test_query_count_optimization(self):
 		"""Test that we're not generating excessive database queries"""
+		# The conditional-GET validator (api/conditional.py) is the newest
+		# article/trial last_updated, read after the page in one query so
+		# the 200 carries the ETag and Last-Modified that clients revalidate
+		# with. Its row count is the paginator's, not a second COUNT.
 		with self.assertNumQueries(
-			7
-		):  # site + org visibility + count + select (with count annotations) + subjects prefetch + authors count + authors select
+			8
+		):  # site + org visibility + count + select (with count annotations) + subjects prefetch + authors count + authors select + conditional-GET validator
 			response = self.client.get("/categories/")
 
 		self.assertEqual(response.status_code, 200)
@@ -196,8 +200,8 @@ class CategoryOptimizationTestCase(TestCase):
 		"""Test that our prefetch_related optimizations work correctly"""
 		# Test with include_authors=false (should be very efficient)
 		with self.assertNumQueries(
-			6
-		):  # Basic query (with count annotations) + subjects prefetch + authors count query + visibility queries
+			7
+		):  # Basic query (with count annotations) + subjects prefetch + authors count query + visibility queries + conditional-GET validator
 			response = self.client.get(
 				f"/categories/?team_id={self.team.id}&include_authors=false"
 			)
@@ -205,8 +209,8 @@ class CategoryOptimizationTestCase(TestCase):
 
 		# Test with include_authors=true (should still be reasonable; site is cached from first request)
 		with self.assertNumQueries(
-			6
-		):  # org + count + select (with count annotations) + subjects prefetch + authors count + authors select
+			7
+		):  # org + count + select (with count annotations) + subjects prefetch + authors count + authors select + conditional-GET validator
 			response = self.client.get(
 				f"/categories/?team_id={self.team.id}&include_authors=true"
 			)
@@ -20,6 +20,7 @@ Run:
 
 import datetime
 import os
+import time
 from unittest.mock import MagicMock
 
 import django
@@ -30,6 +31,7 @@ django.setup()
 from django.test import SimpleTestCase
 
 from gregory.classes import CTISPublicAPI, CTISPublicAPIError, EUTrialParser
+from gregory.utils.rate_limit import TokenBucket
 
 
 def _mock_response(payload, status_ok=True, json_error=False):
@@ -180,6 +182,70 @@ class RetrieveTests(SimpleTestCase):
 		self.assertIsNone(self.api.retrieve("2025-523726-40-00"))
 
 
+class RateLimitedRetryTests(SimpleTestCase):
+	"""Every request goes through the shared TokenBucket; a 429/5xx is retried
+	with backoff (Retry-After when given) and slows the bucket down instead
+	of failing the call."""
+
+	def setUp(self):
+		self.api = CTISPublicAPI()
+		self.api.session = MagicMock()
+		# Keep the real waits in these tests to milliseconds.
+		self.api.BACKOFF_BASE = 0.001
+		self.api.rate_limiter = TokenBucket(rate=1000)
+
+	def _status(self, status_code, payload=None, headers=None):
+		response = _mock_response(payload or {"ctNumber": "2025-523726-40-00"})
+		response.status_code = status_code
+		response.headers = headers or {}
+		return response
+
+	def test_429_is_retried_after_retry_after_and_slows_the_limiter(self):
+		self.api.session.get.side_effect = [
+			self._status(429, headers={"Retry-After": "0.05"}),
+			self._status(200),
+		]
+		started = time.monotonic()
+		result = self.api.retrieve("2025-523726-40-00")
+
+		self.assertGreaterEqual(time.monotonic() - started, 0.04)
+		self.assertEqual(result["ctNumber"], "2025-523726-40-00")
+		self.assertEqual(self.api.session.get.call_count, 2)
+		self.assertLess(self.api.rate_limiter.rate, 1000)
+
+	def test_5xx_on_search_is_retried(self):
+		self.api.session.post.side_effect = [
+			self._status(503),
+			self._status(200, payload=_page([_record()])),
+		]
+		result = self.api.search({"medicalCondition": "X"})
+		self.assertEqual(len(result["data"]), 1)
+		self.assertEqual(self.api.session.post.call_count, 2)
+
+	def test_gives_up_after_max_retries_and_surfaces_the_error(self):
+		import requests
+
+		failing = self._status(503)
+		failing.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+		self.api.session.get.return_value = failing
+		with self.assertRaises(requests.exceptions.HTTPError):
+			self.api.retrieve("2025-523726-40-00")
+		self.assertEqual(
+			self.api.session.get.call_count, CTISPublicAPI.MAX_RETRIES + 1
+		)
+
+	def test_404_is_not_retried(self):
+		import requests
+
+		response = self._status(404)
+		response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+			"404", response=MagicMock(status_code=404)
+		)
+		self.api.session.get.return_value = response
+		self.assertIsNone(self.api.retrieve("2025-523726-40-00"))
+		self.assertEqual(self.api.session.get.call_count, 1)
+
+
 class RecordIsStaleTests(SimpleTestCase):
 	"""record_is_stale is shared between iter_search's page-continuation decision
 	and feedreader_trials_ctis's decision to skip the expensive /retrieve backup
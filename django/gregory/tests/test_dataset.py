@@ -8,11 +8,22 @@ import django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "admin.settings")
 django.setup()
 
+import tempfile
 from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
 import pandas as pd
 from django.test import TestCase
 
-from gregory.utils.dataset import collect_articles, build_dataset, train_val_test_split
+from gregory.utils.dataset import (
+	DATASET_CACHE_KEEP,
+	build_dataset,
+	collect_articles,
+	label_snapshot_hash,
+	load_or_build_dataset,
+	train_val_test_split,
+)
 from gregory.models import Team, Subject, Articles, ArticleSubjectRelevance
 from organizations.models import Organization  # Import Organization model
 
@@ -358,3 +369,106 @@ class DatasetTestCase(TestCase):
 
 		# Verify all rows have valid relevance values (0 or 1, not None)
 		self.assertTrue(df["relevant"].isin([0, 1]).all())
+
+
+class DatasetCacheTestCase(TestCase):
+	"""label_snapshot_hash / load_or_build_dataset: one build per label snapshot."""
+
+	def setUp(self):
+		organization = Organization.objects.create(name="Cache Organization")
+		self.team = Team.objects.create(
+			slug="test-team", name="Test Team", organization=organization
+		)
+		self.subject = Subject.objects.create(
+			subject_name="Test Subject", subject_slug="test-subject", team=self.team
+		)
+		self.summary = (
+			"This study evaluates treatment outcomes in multiple sclerosis patients "
+			"using magnetic resonance imaging biomarkers alongside clinical disability "
+			"scores collected during a twenty four month follow up period."
+		)
+		self.articles = []
+		for i in range(4):
+			article = Articles.objects.create(
+				title=f"Cached Article {i}",
+				summary=self.summary,
+				link=f"https://example.com/cached/{i}",
+			)
+			article.teams.add(self.team)
+			article.subjects.add(self.subject)
+			ArticleSubjectRelevance.objects.create(
+				article=article, subject=self.subject, is_relevant=(i % 2 == 0)
+			)
+			self.articles.append(article)
+
+		self.temp_dir = tempfile.TemporaryDirectory()
+		self.addCleanup(self.temp_dir.cleanup)
+		self.cache_dir = Path(self.temp_dir.name)
+
+	def test_snapshot_hash_is_stable_and_tracks_labels(self):
+		before = label_snapshot_hash("test-team", "test-subject")
+		self.assertEqual(before, label_snapshot_hash("test-team", "test-subject"))
+
+		ArticleSubjectRelevance.objects.filter(article=self.articles[0]).update(
+			is_relevant=False
+		)
+		self.assertNotEqual(before, label_snapshot_hash("test-team", "test-subject"))
+
+	def test_snapshot_hash_tracks_article_edits_and_window(self):
+		before = label_snapshot_hash("test-team", "test-subject")
+		self.assertNotEqual(before, label_snapshot_hash("test-team", "test-subject", 90))
+
+		self.articles[1].summary = self.summary + " Edited."
+		self.articles[1].save()
+		self.assertNotEqual(before, label_snapshot_hash("test-team", "test-subject"))
+
+	def test_second_load_reuses_cached_dataset(self):
+		first, snapshot, hit = load_or_build_dataset(
+			"test-team", "test-subject", None, self.cache_dir
+		)
+		self.assertFalse(hit)
+		self.assertTrue((self.cache_dir / f"{snapshot}.csv").exists())
+
+		with patch("gregory.utils.dataset.build_dataset") as mock_build:
+			second, same_snapshot, hit = load_or_build_dataset(
+				"test-team", "test-subject", None, self.cache_dir
+			)
+		mock_build.assert_not_called()
+		self.assertTrue(hit)
+		self.assertEqual(snapshot, same_snapshot)
+		pd.testing.assert_frame_equal(
+			first.reset_index(drop=True), second.reset_index(drop=True)
+		)
+
+		_, _, hit = load_or_build_dataset(
+			"test-team", "test-subject", None, self.cache_dir, use_cache=False
+		)
+		self.assertFalse(hit)
+
+	def test_label_change_rebuilds_and_old_snapshots_are_pruned(self):
+		snapshots = set()
+		for flip in range(DATASET_CACHE_KEEP + 1):
+			ArticleSubjectRelevance.objects.filter(article=self.articles[0]).update(
+				is_relevant=flip % 2 == 0
+			)
+			self.articles[0].save()  # bump last_updated so every pass differs
+			_, snapshot, hit = load_or_build_dataset(
+				"test-team", "test-subject", None, self.cache_dir
+			)
+			self.assertFalse(hit)
+			snapshots.add(snapshot)
+
+		self.assertEqual(len(snapshots), DATASET_CACHE_KEEP + 1)
+		self.assertEqual(len(list(self.cache_dir.glob("*.csv"))), DATASET_CACHE_KEEP)
+		self.assertTrue((self.cache_dir / f"{snapshot}.csv").exists())
+
+	def test_empty_dataset_is_not_cached(self):
+		ArticleSubjectRelevance.objects.update(is_relevant=None)
+
+		df, _, hit = load_or_build_dataset(
+			"test-team", "test-subject", None, self.cache_dir
+		)
+
+		self.assertEqual(len(df), 0)
+		self.assertFalse(hit)
+		self.assertEqual(list(self.cache_dir.glob("*.csv")), [])
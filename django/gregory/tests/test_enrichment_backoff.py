@@ -192,7 +192,7 @@ class UpdateArticlesInfoBackoffTests(TestCase):
 		"""Run update_articles_info with SciencePaper.refresh stubbed."""
 		fields = paper_fields or {}
 
-		def fake_refresh(paper_self):
+		def fake_refresh(paper_self, site=None):
 			for key, value in fields.items():
 				setattr(paper_self, key, value)
 
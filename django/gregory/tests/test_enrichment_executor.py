@@ -0,0 +1,162 @@
+"""
+Tests for gregory.utils.enrichment_executor: claiming due rows as a durable
+queue (leases, SKIP LOCKED), concurrent fetches with every write on the
+calling thread, 429 retries, and releasing the claims of failed lookups.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_enrichment_executor
+"""
+
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from gregory.models import Articles
+from gregory.utils.enrichment import record_fruitless_attempt
+from gregory.utils.enrichment_executor import (
+	CLAIM_LEASE,
+	EnrichmentExecutor,
+	FetchFailed,
+	claim_due,
+)
+
+MARKER = "doi_lookup_next_check"
+
+
+def make_articles(n, **kwargs):
+	start = Articles.objects.count()
+	return [
+		Articles.objects.create(
+			title=f"Queued {i}", link=f"https://ex.org/queued-{i}", kind="science paper", **kwargs
+		)
+		for i in range(start, start + n)
+	]
+
+
+class ClaimDueTests(TestCase):
+	def test_claims_lease_rows_to_one_run(self):
+		articles = make_articles(5)
+		queryset = Articles.objects.all()
+
+		first = claim_due(queryset, MARKER, 3)
+		second = claim_due(queryset, MARKER, 3)
+		self.assertEqual(len(first), 3)
+		self.assertEqual(len(second), 2)
+		self.assertFalse(set(first) & set(second))
+		self.assertEqual(claim_due(queryset, MARKER, 3), {})
+
+		article = Articles.objects.get(pk=articles[0].pk)
+		lease = getattr(article, MARKER) - timezone.now()
+		self.assertAlmostEqual(lease.total_seconds(), CLAIM_LEASE.total_seconds(), delta=60)
+
+	def test_only_due_rows_of_the_queryset_are_claimed(self):
+		due, later = make_articles(2)
+		Articles.objects.filter(pk=later.pk).update(**{MARKER: timezone.now() + timedelta(days=3)})
+		other = make_articles(1, doi="10.1000/x")[0]
+
+		claimed = claim_due(Articles.objects.filter(doi__isnull=True), MARKER, 10)
+		self.assertEqual(set(claimed), {due.pk})
+		self.assertNotIn(other.pk, claimed)
+
+
+class SkipLockedTests(TransactionTestCase):
+	def test_rows_locked_by_another_run_are_skipped(self):
+		locked, free = make_articles(2)
+		holding, release = threading.Event(), threading.Event()
+
+		def hold_lock():
+			try:
+				with transaction.atomic():
+					list(Articles.objects.select_for_update().filter(pk=locked.pk))
+					holding.set()
+					release.wait(10)
+			finally:
+				connection.close()
+
+		thread = threading.Thread(target=hold_lock)
+		thread.start()
+		try:
+			self.assertTrue(holding.wait(10))
+			self.assertEqual(set(claim_due(Articles.objects.all(), MARKER, 10)), {free.pk})
+		finally:
+			release.set()
+			thread.join()
+
+
+class EnrichmentExecutorTests(TestCase):
+	def test_fetches_concurrently_and_writes_on_the_calling_thread(self):
+		articles = make_articles(6)
+		main = threading.current_thread()
+		fetch_threads, written = set(), []
+
+		def fetch(article):
+			fetch_threads.add(threading.current_thread())
+			return article.title.upper()
+
+		def write(article, result):
+			self.assertIs(threading.current_thread(), main)
+			written.append((article.pk, result))
+
+		stats = EnrichmentExecutor(["crossref"], workers=3).run(
+			Articles.objects.all(), MARKER, fetch, write, batch_size=4
+		)
+		self.assertEqual((stats.claimed, stats.written, stats.failed), (6, 6, 0))
+		self.assertEqual(sorted(written), sorted((a.pk, a.title.upper()) for a in articles))
+		self.assertNotIn(main, fetch_threads)
+
+	def test_failed_lookups_get_their_marker_back(self):
+		earlier = timezone.now() - timedelta(days=1)
+		ok, failing, fruitless = make_articles(3)
+		Articles.objects.filter(pk=failing.pk).update(**{MARKER: earlier})
+		errors = []
+
+		def fetch(article):
+			if article.pk == failing.pk:
+				raise ConnectionError("reset")
+			return article.pk == ok.pk
+
+		def write(article, found):
+			if found:
+				Articles.objects.filter(pk=article.pk).update(**{MARKER: None})
+			else:
+				record_fruitless_attempt(article, "doi_lookup")
+
+		stats = EnrichmentExecutor(["crossref"], workers=2).run(
+			Articles.objects.all(),
+			MARKER,
+			fetch,
+			write,
+			on_error=lambda article, e: errors.append(article.pk),
+		)
+		self.assertEqual((stats.claimed, stats.written, stats.failed), (3, 2, 1))
+		self.assertEqual(errors, [failing.pk])
+		markers = dict(Articles.objects.values_list("pk", MARKER))
+		self.assertIsNone(markers[ok.pk])
+		self.assertEqual(markers[failing.pk], earlier)
+		self.assertGreater(markers[fruitless.pk], timezone.now() + timedelta(days=1))
+
+	def test_throttled_lookup_is_retried(self):
+		make_articles(1)
+		response = MagicMock(status_code=429, headers={"Retry-After": "0"})
+		fetch = MagicMock(side_effect=[FetchFailed("slow down", response=response), "found"])
+		write = MagicMock()
+
+		stats = EnrichmentExecutor(["crossref"], workers=1).run(
+			Articles.objects.all(), MARKER, fetch, write
+		)
+		self.assertEqual(fetch.call_count, 2)
+		self.assertEqual(write.call_args.args[1], "found")
+		self.assertEqual(stats.failed, 0)
+
+	def test_limit_caps_the_run(self):
+		make_articles(5)
+		write = MagicMock()
+		stats = EnrichmentExecutor(["crossref"], workers=2).run(
+			Articles.objects.all(), MARKER, lambda article: None, write, batch_size=2, limit=3
+		)
+		self.assertEqual(stats.claimed, 3)
+		self.assertEqual(write.call_count, 3)
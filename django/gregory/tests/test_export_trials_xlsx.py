@@ -4,12 +4,15 @@ Run in the gregory Docker container:
     python manage.py test gregory.tests.test_export_trials_xlsx
 """
 
+import io
 import os
 import tempfile
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from organizations.models import Organization
 
 import openpyxl
@@ -27,13 +30,14 @@ from gregory.models import (
 	TrialCategoryAssignment,
 	TrialCountry,
 )
-from gregory.management.commands.export_trials_xlsx import (
+from gregory.utils.trials_xlsx import (
 	CATEGORY_COLUMNS,
 	IDENTITY_COLS,
 	RELATION_COLS,
 	REGISTRY_NAMES,
 	_build_scalar_columns,
 	_sanitise_sheet_name,
+	write_trials_xlsx,
 )
 
 
@@ -885,3 +889,49 @@ class ExportTrialsXlsxTests(TestCase):
 			"ethics_review_status",
 		]:
 			self.assertIn(col, scalar_cols, f'Expected column "{col}" in scalar list')
+
+	# ------------------------------------------------------------------
+	# Write-only engine
+	# ------------------------------------------------------------------
+
+	def _export_queries(self):
+		with CaptureQueriesContext(connection) as ctx:
+			count = write_trials_xlsx(
+				io.BytesIO(), Trials.objects.filter(subjects=self.subject_ms)
+			)
+		return count, len(ctx.captured_queries)
+
+	def test_query_count_does_not_grow_with_trials(self):
+		"""Relations are prefetched per batch, not fetched per trial."""
+		count, queries = self._export_queries()
+		for i in range(6):
+			trial = Trials.objects.create(
+				title=f"Extra MS trial {i}",
+				link=f"https://example.com/extra-{i}",
+				identifiers={"nct": f"NCT0222222{i}"},
+			)
+			trial.subjects.add(self.subject_ms)
+			trial.sources.add(self.source_ctg)
+			TrialCountry.objects.create(trial=trial, country="DE", sources=["ctgov"])
+
+		more, more_queries = self._export_queries()
+
+		self.assertEqual((count, more), (2, 8))
+		self.assertEqual(queries, more_queries)
+
+	def test_formula_like_values_stay_text(self):
+		self.trial_ms.title = "=HYPERLINK(\"https://example.com\")"
+		self.trial_ms.save()
+		path, wb = self._export(subjects=str(self.subject_ms.pk))
+		try:
+			ws = wb["Multiple Sclerosis"]
+			headers = [
+				ws.cell(row=1, column=c).value for c in range(1, ws.max_column + 1)
+			]
+			title_col = headers.index("title") + 1
+			cells = [ws.cell(row=r, column=title_col) for r in range(2, ws.max_row + 1)]
+			formula_like = [c for c in cells if str(c.value).startswith("=")]
+			self.assertEqual(len(formula_like), 1)
+			self.assertEqual(formula_like[0].data_type, "s")
+		finally:
+			os.unlink(path)
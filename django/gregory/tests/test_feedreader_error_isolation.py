@@ -53,6 +53,13 @@ class ArticlesFeedIsolationTests(TestCase):
 		# The failure is recorded for callers that need a hard signal
 		self.assertEqual(len(cmd.fetch_errors), 1)
 		self.assertIn("Broken feed", cmd.fetch_errors[0])
+		# Each source's SourceStats row records the outcome of its fetch
+		self.bad.refresh_from_db()
+		self.good.refresh_from_db()
+		self.assertEqual(self.bad.stats.error_streak, 1)
+		self.assertEqual(self.bad.stats.last_error, "boom")
+		self.assertEqual(self.good.stats.error_streak, 0)
+		self.assertIsNotNone(self.good.stats.last_fetch_succeeded_at)
 
 
 class TrialsFeedIsolationTests(TestCase):
@@ -1,4 +1,5 @@
 import os
+from io import StringIO
 from unittest.mock import patch, MagicMock
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gregory.tests.test_settings")
@@ -7,11 +8,21 @@ import django
 
 django.setup()
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from organizations.models import Organization
-from gregory.models import Articles, ArticleOrgContent
+from gregory.models import (
+	Articles,
+	ArticleOrgContent,
+	ArticleSubjectRelevance,
+	Authors,
+	Sources,
+	Subject,
+	Team,
+)
 
 
 def _make_response(results, next_url=None):
@@ -163,3 +174,136 @@ class ImportArticlesFromApiTest(TestCase):
 				"--target-org",
 				"nonexistent-org",
 			)
+
+
+def _article(n, **overrides):
+	return {
+		**ARTICLE,
+		"title": f"Paged article {n}",
+		"link": f"https://example.com/paged/{n}",
+		"doi": f"10.1234/paged.{n}",
+		**overrides,
+	}
+
+
+class PagedBulkImportTest(TestCase):
+	"""The page writer: relationships resolved per page and written in bulk,
+	the next page fetched while the current one is written."""
+
+	def setUp(self):
+		self.org = Organization.objects.create(name="Paged Org", slug="paged-org")
+		self.team = Team.objects.create(organization=self.org, name="Paged team", slug="paged-team")
+		self.subject = Subject.objects.create(subject_name="MS", team=self.team)
+
+	def _run(self, pages):
+		"""Serve *pages* (lists of items) as a chain of next URLs."""
+		urls = [f"https://api.example.com/articles/?page={i + 1}" for i in range(len(pages))]
+		responses = {
+			url: _make_response(results, urls[i + 1] if i + 1 < len(urls) else None)
+			for i, (url, results) in enumerate(zip(urls, pages))
+		}
+		with patch(
+			"gregory.management.commands.import_articles_from_api.requests.get",
+			side_effect=lambda url, **kwargs: responses[url],
+		) as mock_get:
+			call_command("import_articles_from_api", urls[0], "--target-org", "paged-org")
+		return mock_get
+
+	def _related(self, n):
+		return {
+			"authors": [
+				{"author_id": 9000 + n, "given_name": "Given", "family_name": f"Family{n}", "ORCID": None, "country": None},
+				{"author_id": 8000, "given_name": "Shared", "family_name": "Author", "ORCID": None, "country": "PT"},
+			],
+			"sources": ["Imported feed"],
+			"teams": [{"id": self.team.pk, "name": self.team.name}],
+			"subjects": [{"id": self.subject.pk, "subject_name": "MS"}],
+			"article_subject_relevances": [
+				{"subject": {"id": self.subject.pk, "subject_name": "MS"}, "is_relevant": True}
+			],
+		}
+
+	def test_pages_are_imported_with_their_relationships(self):
+		mock_get = self._run(
+			[
+				[_article(n, **self._related(n)) for n in range(3)],
+				[_article(n, **self._related(n)) for n in range(3, 5)],
+			]
+		)
+
+		self.assertEqual(mock_get.call_count, 2)
+		self.assertEqual(Articles.objects.filter(title__startswith="Paged article").count(), 5)
+		self.assertEqual(Sources.objects.filter(name="Imported feed").count(), 1)
+		article = Articles.objects.get(title="Paged article 3")
+		self.assertEqual(article.doi, "10.1234/paged.3")
+		self.assertEqual(
+			sorted(article.authors.values_list("full_name", flat=True)),
+			["Given Family3", "Shared Author"],
+		)
+		self.assertEqual(list(article.teams.all()), [self.team])
+		self.assertEqual(list(article.subjects.all()), [self.subject])
+		self.assertTrue(
+			ArticleSubjectRelevance.objects.get(article=article, subject=self.subject).is_relevant
+		)
+		self.assertEqual(Authors.objects.get(pk=8000).articles_set.count(), 5)
+		self.assertEqual(article.history.count(), 1)
+		self.assertEqual(
+			ArticleOrgContent.objects.filter(organization=self.org).count(), 5
+		)
+
+	def test_queries_do_not_grow_with_the_page(self):
+		def run(numbers):
+			with CaptureQueriesContext(connection) as queries:
+				self._run([[_article(n, **self._related(n)) for n in numbers]])
+			return len(queries)
+
+		run([0])  # creates the shared source and author
+		self.assertEqual(run(range(100, 102)), run(range(200, 220)))
+
+	def test_reimport_updates_changed_articles_only(self):
+		self._run([[_article(1), _article(2)]])
+		self._run([[_article(1), _article(2, summary="Revised abstract.")]])
+
+		revised = Articles.objects.get(title="Paged article 2")
+		self.assertEqual(revised.summary, "Revised abstract.")
+		self.assertEqual(
+			list(revised.history.values_list("history_type", flat=True)), ["~", "+"]
+		)
+		unchanged = Articles.objects.get(title="Paged article 1")
+		self.assertEqual(unchanged.history.count(), 1)
+
+	def test_failed_page_falls_back_to_item_by_item(self):
+		Articles.objects.create(
+			title="Stored article", link="https://example.com/stored", doi="10.1234/paged.2"
+		)
+		out = StringIO()
+		with patch(
+			"gregory.management.commands.import_articles_from_api.requests.get",
+			return_value=_make_response([_article(1), _article(2)]),
+		):
+			call_command(
+				"import_articles_from_api",
+				"https://api.example.com/articles/",
+				"--target-org",
+				"paged-org",
+				stdout=out,
+			)
+
+		# The DOI of item 2 belongs to another article: only that item fails
+		self.assertIn("importing them one by one", out.getvalue())
+		self.assertIn("1 articles could not be imported", out.getvalue())
+		self.assertTrue(Articles.objects.filter(title="Paged article 1").exists())
+		self.assertFalse(Articles.objects.filter(title="Paged article 2").exists())
+
+	def test_fetch_error_stops_the_import(self):
+		with patch(
+			"gregory.management.commands.import_articles_from_api.requests.get",
+			side_effect=ConnectionError("unreachable"),
+		):
+			with self.assertRaises(CommandError):
+				call_command(
+					"import_articles_from_api",
+					"https://api.example.com/articles/",
+					"--target-org",
+					"paged-org",
+				)
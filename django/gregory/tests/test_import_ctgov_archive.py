@@ -0,0 +1,121 @@
+"""
+Tests for the import_ctgov_archive management command: streaming studies out
+of a ClinicalTrials.gov JSON zip, matching and writing them with the
+feedreader_trials_ctgov rules in batches, --existing-only, and resuming from
+the checkpoint file.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_import_ctgov_archive
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from gregory.models import Sources, Trials
+
+
+def _study(nct_id, title, sponsor="Acme Pharma", locations=None):
+	return {
+		"protocolSection": {
+			"identificationModule": {"nctId": nct_id, "briefTitle": title},
+			"sponsorCollaboratorsModule": {
+				"leadSponsor": {"name": sponsor, "class": "INDUSTRY"},
+			},
+			"contactsLocationsModule": {"locations": locations or []},
+		}
+	}
+
+
+class ImportCtgovArchiveTests(TestCase):
+	def setUp(self):
+		self.source = Sources.objects.create(
+			name="CTGov archive", method="ctgov_api", source_for="trials", active=True
+		)
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.archive = os.path.join(tmp.name, "ctg-studies.json.zip")
+		self.studies = {
+			"NCT00000001": _study(
+				"NCT00000001",
+				"Stored trial",
+				locations=[{"facility": "Site A", "city": "Lisbon", "country": "Portugal"}],
+			),
+			"NCT00000002": _study("NCT00000002", "New trial two"),
+			"NCT00000003": _study("NCT00000003", "New trial three"),
+		}
+		with zipfile.ZipFile(self.archive, "w") as zf:
+			for nct, study in self.studies.items():
+				zf.writestr(f"ctg-studies/{nct}.json", json.dumps(study))
+			zf.writestr("ctg-studies/broken.json", "{not json")
+		self.existing = Trials.objects.create(
+			title="Stored trial (old title)",
+			link="https://clinicaltrials.gov/study/NCT00000001",
+			identifiers={"nct": "NCT00000001"},
+		)
+
+	def run_command(self, **kwargs):
+		out = StringIO()
+		call_command(
+			"import_ctgov_archive", self.archive, source_id=self.source.pk, stdout=out, **kwargs
+		)
+		return out.getvalue()
+
+	def test_creates_and_updates_trials_with_sites_and_sponsors(self):
+		out = self.run_command(batch_size=2)
+
+		self.assertIn("Created: 2, Updated: 1, Skipped: 0, Errors: 1", out)
+		self.existing.refresh_from_db()
+		self.assertEqual(self.existing.primary_sponsor, "Acme Pharma")
+		self.assertEqual(self.existing.lead_sponsor_class, "INDUSTRY")
+		self.assertEqual(
+			[site.name for site in self.existing.trial_sites.all()], ["Site A"]
+		)
+		self.assertIn(self.source, self.existing.sources.all())
+		created = Trials.objects.get(identifiers__nct="NCT00000002")
+		self.assertIn(self.source, created.sources.all())
+		self.assertFalse(os.path.exists(f"{self.archive}.checkpoint"))
+
+	def test_reimport_matches_instead_of_duplicating(self):
+		self.run_command()
+		out = self.run_command()
+		self.assertIn("Created: 0, Updated: 3", out)
+		self.assertEqual(Trials.objects.count(), 3)
+
+	def test_existing_only_never_creates(self):
+		out = self.run_command(existing_only=True)
+		self.assertIn("Created: 0, Updated: 1, Skipped: 2", out)
+		self.assertEqual(Trials.objects.count(), 1)
+
+	def test_resumes_after_the_checkpoint(self):
+		with zipfile.ZipFile(self.archive) as zf:
+			first_two = [name for name in zf.namelist()][:2]
+		checkpoint = f"{self.archive}.checkpoint"
+		with open(checkpoint, "w") as fh:
+			json.dump(
+				{"archive": os.path.basename(self.archive), "size": os.path.getsize(self.archive), "done": 2},
+				fh,
+			)
+
+		out = self.run_command()
+		self.assertIn("Resuming after 2 of 4 studies", out)
+		self.assertIn("Created: 1, Updated: 0", out)
+		imported = {nct for nct in self.studies if Trials.objects.filter(identifiers__nct=nct).exists()}
+		self.assertEqual(imported, {"NCT00000001", "NCT00000003"})
+		self.assertEqual([name.split("/")[-1] for name in first_two], ["NCT00000001.json", "NCT00000002.json"])
+
+	def test_checkpoint_of_another_archive_is_ignored(self):
+		with open(f"{self.archive}.checkpoint", "w") as fh:
+			json.dump({"archive": "other.zip", "size": 1, "done": 3}, fh)
+		out = self.run_command()
+		self.assertIn("Created: 2, Updated: 1", out)
+
+	def test_requires_a_trials_source(self):
+		with self.assertRaises(CommandError):
+			call_command("import_ctgov_archive", self.archive, source_id=self.source.pk + 1000)
@@ -0,0 +1,218 @@
+"""
+Tests for gregory.ml.inference: each algorithm's inference export must score
+texts the way the trainer it was exported from does, and predict_articles
+must only pick up an export once its parity check has passed.
+
+The models are tiny and trained (or randomly initialised) in the test, so
+nothing is downloaded.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import tensorflow as tf
+
+from gregory.ml.inference import (
+	INFERENCE_DIR,
+	MANIFEST_NAME,
+	PARITY_TOLERANCE,
+	QUANTIZED_PARITY_TOLERANCE,
+	BertInferenceModel,
+	InferenceExportError,
+	LGBMInferenceModel,
+	LSTMInferenceModel,
+	check_parity,
+	export_inference_model,
+	length_batches,
+	load_inference_model,
+	open_inference_model,
+	pad_token_ids,
+	record_parity,
+)
+
+POSITIVE = [
+	f"multiple sclerosis relapse trial {i} with mri lesion therapy" for i in range(30)
+]
+NEGATIVE = [f"oncology tumour chemotherapy cohort {i} survival" for i in range(30)]
+TEXTS = POSITIVE + NEGATIVE
+LABELS = [1] * len(POSITIVE) + [0] * len(NEGATIVE)
+
+
+class TestPaddingHelpers(unittest.TestCase):
+	def test_pad_token_ids_pads_to_multiple_of_eight_capped_at_max_len(self):
+		ids, masks = pad_token_ids([[1, 2, 3], [4]], max_len=16, pad_id=0)
+		self.assertEqual(ids.shape, (2, 8))
+		self.assertEqual(ids.dtype, np.int32)
+		self.assertEqual(ids[0, :4].tolist(), [1, 2, 3, 0])
+		self.assertEqual(masks.sum(axis=1).tolist(), [3, 1])
+
+		ids, _ = pad_token_ids([list(range(10))], max_len=10, pad_id=0)
+		self.assertEqual(ids.shape, (1, 10))
+
+	def test_length_batches_groups_similar_lengths(self):
+		token_ids = [[0] * n for n in (5, 1, 4, 2)]
+		self.assertEqual(length_batches(token_ids, 2), [[1, 3], [2, 0]])
+		self.assertEqual(length_batches(token_ids, 2, False), [[0, 1], [2, 3]])
+
+
+class InferenceExportTestMixin:
+	"""Export a trained trainer into a temporary model version directory."""
+
+	def setUp(self):
+		self.model_dir = Path(tempfile.mkdtemp())
+
+	def tearDown(self):
+		shutil.rmtree(self.model_dir, ignore_errors=True)
+
+	def assert_parity(self, trainer, runtime, tolerance=PARITY_TOLERANCE):
+		parity = check_parity(trainer, runtime, TEXTS, tolerance=tolerance)
+		self.assertTrue(parity["passed"], parity)
+		self.assertEqual(parity["samples"], len(TEXTS))
+		self.assertEqual(parity["decision_agreement"], 1.0)
+		return parity
+
+
+class TestLGBMExport(InferenceExportTestMixin, unittest.TestCase):
+	def setUp(self):
+		super().setUp()
+		from gregory.ml.lgbm_wrapper import LGBMTfidfTrainer
+
+		trainer = LGBMTfidfTrainer(
+			tfidf_params={"min_df": 1},
+			lgbm_params={"objective": "binary", "min_child_samples": 2, "verbose": -1},
+		)
+		trainer.train(TEXTS, LABELS, TEXTS, LABELS, num_boost_round=20, verbose_eval=False)
+		trainer.save(self.model_dir)
+		self.trainer = LGBMTfidfTrainer()
+		self.trainer.load(self.model_dir)
+
+	def test_export_round_trip_matches_trainer(self):
+		export_dir = export_inference_model(self.trainer, "lgbm_tfidf", self.model_dir)
+
+		runtime = open_inference_model(export_dir)
+		self.assertIsInstance(runtime, LGBMInferenceModel)
+		self.assert_parity(self.trainer, runtime)
+
+	def test_load_inference_model_requires_passing_parity(self):
+		export_dir = export_inference_model(self.trainer, "lgbm_tfidf", self.model_dir)
+		self.assertIsNone(load_inference_model(self.model_dir))
+
+		record_parity(export_dir, {"passed": False})
+		self.assertIsNone(load_inference_model(self.model_dir))
+
+		record_parity(
+			export_dir, check_parity(self.trainer, open_inference_model(export_dir), TEXTS)
+		)
+		self.assertIsInstance(load_inference_model(self.model_dir), LGBMInferenceModel)
+
+	def test_reexport_replaces_previous_export_and_parity(self):
+		export_dir = export_inference_model(self.trainer, "lgbm_tfidf", self.model_dir)
+		record_parity(export_dir, {"passed": True})
+		(export_dir / "stale.txt").write_text("old")
+
+		export_inference_model(self.trainer, "lgbm_tfidf", self.model_dir)
+
+		self.assertFalse((export_dir / "stale.txt").exists())
+		manifest = json.loads((export_dir / MANIFEST_NAME).read_text())
+		self.assertIsNone(manifest["parity"])
+
+	def test_quantize_is_rejected_and_leaves_no_export(self):
+		with self.assertRaises(InferenceExportError):
+			export_inference_model(
+				self.trainer, "lgbm_tfidf", self.model_dir, quantize=True
+			)
+		self.assertFalse((self.model_dir / INFERENCE_DIR).exists())
+
+	def test_empty_parity_sample_never_passes(self):
+		export_dir = export_inference_model(self.trainer, "lgbm_tfidf", self.model_dir)
+		parity = check_parity(self.trainer, open_inference_model(export_dir), [])
+		self.assertFalse(parity["passed"])
+
+
+class TestLSTMExport(InferenceExportTestMixin, unittest.TestCase):
+	def test_export_round_trip_matches_trainer(self):
+		from gregory.ml.lstm_wrapper import LSTMTrainer
+
+		params = {
+			"max_tokens": 200,
+			"sequence_length": 20,
+			"embedding_dim": 8,
+			"lstm_units": 4,
+		}
+		trainer = LSTMTrainer(**params)
+		trainer.train(TEXTS, LABELS, TEXTS[:10], LABELS[:10], epochs=1, batch_size=16)
+		trainer.save(self.model_dir)
+		trainer = LSTMTrainer(**params)
+		trainer.load(self.model_dir)
+
+		export_dir = export_inference_model(trainer, "lstm", self.model_dir)
+
+		runtime = open_inference_model(export_dir)
+		self.assertIsInstance(runtime, LSTMInferenceModel)
+		self.assert_parity(trainer, runtime)
+		self.assertEqual(runtime.predict([]), ([], []))
+
+
+class TestBertExport(InferenceExportTestMixin, unittest.TestCase):
+	"""A tiny, randomly initialised BERT, as in TestBertTrainerPaddingParity."""
+
+	def setUp(self):
+		super().setUp()
+		from transformers import BertConfig, BertTokenizerFast, TFBertModel
+
+		from gregory.ml.bert_wrapper import BertTrainer
+
+		words = "multiple sclerosis relapse trial mri lesion therapy oncology tumour".split()
+		vocab_path = self.model_dir / "vocab.txt"
+		vocab_path.write_text(
+			"\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]) + "\n"
+		)
+		tokenizer = BertTokenizerFast(vocab_file=str(vocab_path))
+		tf.keras.utils.set_random_seed(0)
+		bert = TFBertModel(
+			BertConfig(
+				vocab_size=tokenizer.vocab_size,
+				hidden_size=32,
+				num_hidden_layers=2,
+				num_attention_heads=2,
+				intermediate_size=64,
+				max_position_embeddings=64,
+			)
+		)
+		with (
+			patch("gregory.ml.bert_wrapper.AutoTokenizer") as mock_tokenizer,
+			patch("gregory.ml.bert_wrapper.TFAutoModel") as mock_bert,
+		):
+			mock_tokenizer.from_pretrained.return_value = tokenizer
+			mock_bert.from_pretrained.return_value = bert
+			self.trainer = BertTrainer(max_len=48, bert_model_name="tiny", dense_units=8)
+
+	def test_savedmodel_export_matches_trainer(self):
+		export_dir = export_inference_model(self.trainer, "pubmed_bert", self.model_dir)
+
+		runtime = open_inference_model(export_dir)
+		self.assertIsInstance(runtime, BertInferenceModel)
+		self.assert_parity(self.trainer, runtime)
+
+	def test_quantized_export_stays_within_quantized_tolerance(self):
+		export_dir = export_inference_model(
+			self.trainer, "pubmed_bert", self.model_dir, quantize=True
+		)
+
+		self.assertTrue((export_dir / "model.tflite").exists())
+		self.assertFalse((export_dir / "graph").exists())
+		parity = self.assert_parity(
+			self.trainer,
+			open_inference_model(export_dir),
+			tolerance=QUANTIZED_PARITY_TOLERANCE,
+		)
+		self.assertLessEqual(parity["max_abs_diff"], QUANTIZED_PARITY_TOLERANCE)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -248,6 +248,51 @@ class TestGeneratePseudoLabels:
 		# Check that factory was called with correct algorithm
 		mock_get_trainer.assert_called_with("lgbm_tfidf", **{"random_state": 42})
 
+	@patch("gregory.ml.pseudo.get_trainer")
+	def test_streamed_pool_skips_rows_already_labelled(self, mock_get_trainer):
+		"""Each pass re-streams the chunks without the ids labelled so far."""
+		mock_trainer_instance = MagicMock()
+		mock_get_trainer.return_value = mock_trainer_instance
+		predicted = []
+
+		def predict(texts, threshold):
+			predicted.append(list(texts))
+			# Pass 1 labels "a" and "c"; later passes are never confident.
+			scores = {"a": 0.97, "b": 0.6, "c": 0.05, "d": 0.5}
+			if len(predicted) > 2:
+				scores = {text: 0.5 for text in scores}
+			return [], [scores[text] for text in texts]
+
+		mock_trainer_instance.predict.side_effect = predict
+
+		def chunks():
+			yield pd.DataFrame({"article_id": [5, 6], "text": ["a", "b"]})
+			yield pd.DataFrame({"article_id": [7, 8], "text": ["c", "d"]})
+
+		train_df = pd.DataFrame({"text": ["t1", "t2"], "relevant": [1, 0]})
+
+		result_df = generate_pseudo_labels(
+			train_df=train_df,
+			val_df=train_df,
+			unlabelled_chunks=chunks,
+			confidence=0.9,
+			max_iter=5,
+			algorithm="lgbm_tfidf",
+			verbose=False,
+		)
+
+		assert predicted == [["a", "b"], ["c", "d"], ["b"], ["d"]]
+		pseudo_rows = result_df[result_df["pseudo_labelled"]]
+		assert list(pseudo_rows["article_id"]) == [5, 7]
+		assert list(pseudo_rows["relevant"]) == [1, 0]
+		assert mock_trainer_instance.train.call_count == 2
+
+	def test_unlabelled_source_required(self):
+		"""Either a DataFrame or a chunk source must be given."""
+		train_df = pd.DataFrame({"text": ["t1"], "relevant": [1]})
+		with pytest.raises(ValueError, match="unlabelled_chunks"):
+			generate_pseudo_labels(train_df=train_df, val_df=train_df, verbose=False)
+
 
 class TestPseudoLabelStats:
 	"""Tests for the get_pseudo_label_stats function."""
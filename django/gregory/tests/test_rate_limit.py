@@ -0,0 +1,102 @@
+"""
+Tests for gregory.utils.rate_limit — the shared token bucket, Retry-After
+parsing, and the ordered thread fan-out used by feedreader_trials_ctis.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from gregory.utils.rate_limit import TokenBucket, map_in_order, retry_after_seconds
+
+
+class TokenBucketTests(SimpleTestCase):
+	def test_burst_up_to_capacity_does_not_wait(self):
+		bucket = TokenBucket(rate=5)
+		with patch("gregory.utils.rate_limit.time.sleep") as mock_sleep:
+			for _ in range(5):
+				bucket.acquire()
+		mock_sleep.assert_not_called()
+
+	def test_waits_once_the_bucket_is_empty(self):
+		bucket = TokenBucket(rate=1000, capacity=1)
+		bucket.acquire()
+		started = time.monotonic()
+		bucket.acquire()
+		self.assertGreater(time.monotonic() - started, 0)
+
+	def test_throttled_halves_rate_down_to_the_floor(self):
+		bucket = TokenBucket(rate=8, min_rate=2)
+		bucket.throttled()
+		self.assertEqual(bucket.rate, 4)
+		bucket.throttled()
+		bucket.throttled()
+		self.assertEqual(bucket.rate, 2)
+
+	def test_succeeded_recovers_towards_but_not_past_the_configured_rate(self):
+		bucket = TokenBucket(rate=10)
+		bucket.throttled()
+		for _ in range(3):
+			bucket.succeeded()
+		self.assertEqual(bucket.rate, 8)
+		for _ in range(10):
+			bucket.succeeded()
+		self.assertEqual(bucket.rate, 10)
+
+	def test_throttled_pause_holds_every_caller(self):
+		bucket = TokenBucket(rate=1000)
+		bucket.throttled(pause=0.05)
+		started = time.monotonic()
+		bucket.acquire()
+		self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+	def test_rejects_non_positive_rate(self):
+		with self.assertRaises(ValueError):
+			TokenBucket(rate=0)
+
+
+class RetryAfterTests(SimpleTestCase):
+	def test_numeric_header_wins(self):
+		response = MagicMock(headers={"Retry-After": "7"})
+		self.assertEqual(retry_after_seconds(response, default=2), 7)
+
+	def test_missing_or_http_date_header_falls_back(self):
+		self.assertEqual(retry_after_seconds(MagicMock(headers={}), default=2), 2)
+		response = MagicMock(headers={"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"})
+		self.assertEqual(retry_after_seconds(response, default=3), 3)
+
+
+class MapInOrderTests(SimpleTestCase):
+	def test_results_follow_input_order_regardless_of_completion_order(self):
+		def slow_for_small(n):
+			time.sleep(0.01 * (5 - n))
+			return n * 10
+
+		results = map_in_order(slow_for_small, [1, 2, 3, 4], max_workers=4)
+		self.assertEqual(results, [(10, None), (20, None), (30, None), (40, None)])
+
+	def test_an_error_is_returned_in_place_and_does_not_cancel_the_rest(self):
+		def fetch(n):
+			if n == 2:
+				raise RuntimeError("boom")
+			return n
+
+		results = map_in_order(fetch, [1, 2, 3], max_workers=3)
+		self.assertEqual(results[0], (1, None))
+		self.assertIsNone(results[1][0])
+		self.assertIsInstance(results[1][1], RuntimeError)
+		self.assertEqual(results[2], (3, None))
+
+	def test_calls_run_concurrently(self):
+		barrier = threading.Barrier(3, timeout=5)
+
+		def fetch(n):
+			barrier.wait()
+			return n
+
+		self.assertEqual(
+			[result for result, _ in map_in_order(fetch, [1, 2, 3], max_workers=3)],
+			[1, 2, 3],
+		)
@@ -0,0 +1,236 @@
+"""
+Tests for the daily rollups (gregory.utils.rollups): full and incremental
+refreshes, the ML score bucket grid, and the subject analytics dashboard
+answering from them.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_rollups
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from organizations.models import Organization, OrganizationUser
+
+from gregory.models import (
+	Articles,
+	CategoryDailyRollup,
+	ContentDailyRollup,
+	RollupScope,
+	Subject,
+	Team,
+	TeamCategory,
+	Trials,
+)
+from gregory.utils import rollups
+from gregory.utils.rollups import (
+	last_refreshed_at,
+	refresh_rollups,
+	score_bucket,
+	threshold_bucket,
+)
+
+
+class ScoreBucketTest(TestCase):
+	def test_bucket_boundaries_follow_float_thresholds(self):
+		for k in range(21):
+			threshold = k / 20
+			self.assertEqual(threshold_bucket(threshold), k)
+			self.assertGreaterEqual(score_bucket(threshold), k)
+			if k:
+				self.assertLess(score_bucket(threshold - 1e-9), k)
+		self.assertEqual(score_bucket(0.74), 14)
+		self.assertEqual(threshold_bucket(0.7), 14)
+
+	def test_thresholds_off_the_grid_are_rejected(self):
+		for threshold in (0.83, 0.501, -0.05, 1.05):
+			self.assertIsNone(threshold_bucket(threshold))
+
+
+class RollupRefreshTest(TestCase):
+	def setUp(self):
+		self.now = timezone.now()
+		self.org = Organization.objects.create(name="Rollup Org", slug="rollup-org")
+		self.team = Team.objects.create(
+			organization=self.org, name="Rollup Team", slug="rollup-team"
+		)
+		self.subject_a = Subject.objects.create(
+			team=self.team, subject_name="Rollup A", subject_slug="rollup-a"
+		)
+		self.subject_b = Subject.objects.create(
+			team=self.team, subject_name="Rollup B", subject_slug="rollup-b"
+		)
+		self.category = TeamCategory.objects.create(
+			team=self.team, category_name="Rollup Cat", category_slug="rollup-cat"
+		)
+
+	def article(self, title, days_ago, subjects=(), category=False):
+		article = Articles.objects.create(
+			title=title,
+			link=f"https://example.com/rollup/{title}",
+			published_date=self.now - timedelta(days=days_ago),
+		)
+		article.teams.add(self.team)
+		article.subjects.add(*subjects)
+		if category:
+			article.team_categories.add(self.category)
+		return article
+
+	def rollup(self, scope, days_ago, **scope_ids):
+		return ContentDailyRollup.objects.get(
+			scope=scope, day=(self.now - timedelta(days=days_ago)).date(), **scope_ids
+		)
+
+	def test_full_refresh_counts_each_scope_distinctly(self):
+		self.article("both-subjects", 1, subjects=[self.subject_a, self.subject_b])
+		self.article("only-a", 1, subjects=[self.subject_a])
+		trial = Trials.objects.create(
+			title="Rollup trial", link="https://example.com/rt", discovery_date=self.now
+		)
+		trial.teams.add(self.team)
+		trial.subjects.add(self.subject_b)
+
+		refresh_rollups(full=True)
+
+		team_row = self.rollup(RollupScope.TEAM, 1, team=self.team)
+		self.assertEqual(team_row.articles, 2)
+		self.assertEqual(self.rollup(RollupScope.SUBJECT, 1, subject=self.subject_a).articles, 2)
+		self.assertEqual(self.rollup(RollupScope.SUBJECT, 1, subject=self.subject_b).articles, 1)
+		self.assertEqual(
+			self.rollup(RollupScope.ORGANIZATION, 1, organization=self.org).articles, 2
+		)
+		self.assertEqual(self.rollup(RollupScope.ALL, 1).articles, 2)
+		self.assertEqual(self.rollup(RollupScope.SUBJECT, 0, subject=self.subject_b).trials, 1)
+
+	def test_incremental_refresh_rewrites_only_dirty_days(self):
+		old = self.article("old", 10, category=True)
+		# Written well before the refresh, outside its look-back overlap
+		Articles.objects.filter(pk=old.pk).update(
+			last_updated=self.now - timedelta(hours=1),
+			discovery_date=self.now - timedelta(hours=1),
+		)
+		refresh_rollups(full=True)
+		old_row = self.rollup(RollupScope.TEAM, 10, team=self.team)
+
+		self.article("new", 2, category=True)
+		days = refresh_rollups()
+
+		self.assertEqual(days, 1)
+		self.assertEqual(self.rollup(RollupScope.TEAM, 2, team=self.team).articles, 1)
+		# The untouched day keeps its row
+		self.assertEqual(self.rollup(RollupScope.TEAM, 10, team=self.team).pk, old_row.pk)
+		category_rows = CategoryDailyRollup.objects.filter(category=self.category)
+		self.assertEqual(sum(row.articles for row in category_rows), 2)
+
+	def test_writes_during_a_refresh_are_dirty_for_the_next_one(self):
+		refresh_rollups(full=True)
+		real_dirty_days = rollups.dirty_days
+
+		def dirty_days_then_write(since):
+			days = real_dirty_days(since)
+			# Saved after this run read what was dirty, before it wrote
+			self.article("mid-refresh", 5)
+			return days
+
+		with mock.patch.object(rollups, "dirty_days", dirty_days_then_write):
+			refresh_rollups()
+		self.assertFalse(
+			ContentDailyRollup.objects.filter(
+				scope=RollupScope.TEAM, day=(self.now - timedelta(days=5)).date()
+			).exists()
+		)
+
+		self.assertEqual(refresh_rollups(), 1)
+		self.assertEqual(self.rollup(RollupScope.TEAM, 5, team=self.team).articles, 1)
+
+	def test_failed_category_refresh_keeps_the_anchor(self):
+		refresh_rollups(full=True)
+		anchor = last_refreshed_at()
+		self.article("retried", 4, category=True)
+
+		with mock.patch.object(
+			rollups, "refresh_category_rollups", side_effect=RuntimeError("boom")
+		):
+			with self.assertRaises(RuntimeError):
+				refresh_rollups()
+		self.assertEqual(last_refreshed_at(), anchor)
+
+		self.assertEqual(refresh_rollups(), 1)
+		category_rows = CategoryDailyRollup.objects.filter(category=self.category)
+		self.assertEqual(sum(row.articles for row in category_rows), 1)
+		self.assertGreater(last_refreshed_at(), anchor)
+
+	def test_first_refresh_is_full(self):
+		self.article("first", 3)
+
+		call_command("refresh_rollups", verbosity=0)
+
+		self.assertEqual(self.rollup(RollupScope.TEAM, 3, team=self.team).articles, 1)
+
+
+class SubjectAnalyticsDataTest(TestCase):
+	def setUp(self):
+		self.superuser = User.objects.create_superuser(
+			username="rollup-admin", email="rollup@example.com", password="pw"
+		)
+		self.client.force_login(self.superuser)
+		org = Organization.objects.create(name="Analytics Org", slug="analytics-org")
+		self.team = Team.objects.create(organization=org, name="Analytics", slug="analytics")
+		self.subject = Subject.objects.create(
+			team=self.team, subject_name="Analytics S", subject_slug="analytics-s"
+		)
+		self.url = reverse("admin:gregory_subject_analytics_data")
+		now = timezone.now()
+		for i, days_ago in enumerate((0, 0, 3)):
+			article = Articles.objects.create(
+				title=f"Analytics {i}",
+				link=f"https://example.com/analytics/{i}",
+				published_date=now - timedelta(days=days_ago),
+			)
+			article.teams.add(self.team)
+			if i:
+				article.subjects.add(self.subject)
+		refresh_rollups(full=True)
+
+	def get(self, **params):
+		response = self.client.get(self.url, {"range": "7d", **params})
+		self.assertEqual(response.status_code, 200)
+		return response.json()
+
+	def test_series_come_from_the_rollups(self):
+		data = self.get(team=self.team.pk)
+		self.assertEqual(len(data["labels"]), 7)
+		self.assertEqual(data["articles"][-1], 2)
+		self.assertEqual(data["articles"][-4], 1)
+		self.assertEqual(data["totals"], {"articles": 3, "trials": 0})
+
+		self.assertEqual(self.get(subject=self.subject.pk)["totals"]["articles"], 2)
+		self.assertEqual(self.get()["totals"]["articles"], 3)
+
+	def test_monthly_range_sums_days(self):
+		data = self.get(range="365d", subject=self.subject.pk)
+		self.assertEqual(sum(data["articles"]), 2)
+		self.assertEqual(data["labels"][-1], timezone.now().strftime("%Y-%m"))
+
+	def test_staff_seeing_several_organisations_count_shared_articles_once(self):
+		other_org = Organization.objects.create(name="Analytics Other", slug="analytics-other")
+		other_team = Team.objects.create(
+			organization=other_org, name="Analytics Other", slug="analytics-other"
+		)
+		Articles.objects.get(title="Analytics 0").teams.add(other_team)
+		refresh_rollups(full=True)
+		staff = User.objects.create_user(
+			username="rollup-staff", email="staff@example.com", password="pw", is_staff=True
+		)
+		for org in (self.team.organization, other_org):
+			OrganizationUser.objects.create(organization=org, user=staff)
+		self.client.force_login(staff)
+
+		data = self.get()
+		self.assertEqual(data["totals"]["articles"], 3)
+		self.assertEqual(data["articles"][-1], 2)
@@ -0,0 +1,233 @@
+"""
+Tests for SourceStats, the denormalised per-source ingest statistics
+(gregory.utils.source_stats): incremental refresh after a fetch, the one-pass
+rebuild command, the SQL health filter, and the admin pages that read them.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_source_stats
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from organizations.models import Organization
+
+from gregory.models import (
+	Articles,
+	SourceStats,
+	Sources,
+	Team,
+	Trials,
+	health_from_last_date,
+)
+from gregory.utils.source_stats import (
+	filter_by_health,
+	rebuild_source_stats,
+	refresh_source_stats,
+)
+
+
+class SourceStatsTest(TestCase):
+	def setUp(self):
+		self.now = timezone.now()
+		self.org = Organization.objects.create(name="Stats Org", slug="stats-org")
+		self.team = Team.objects.create(
+			organization=self.org, name="Stats Team", slug="stats-team"
+		)
+		self.article_source = Sources.objects.create(
+			name="Article feed", source_for="science paper", team=self.team
+		)
+		self.trial_source = Sources.objects.create(
+			name="Trial feed", source_for="trials", team=self.team
+		)
+
+	def add_articles(self, source, ages_in_days, prefix="article"):
+		for age in ages_in_days:
+			article = Articles.objects.create(
+				title=f"{prefix} {source.pk} {age}",
+				link=f"https://example.com/{prefix}/{source.pk}/{age}",
+				published_date=self.now - timedelta(days=age),
+			)
+			article.sources.add(source)
+			Articles.objects.filter(pk=article.pk).update(
+				discovery_date=self.now - timedelta(days=age)
+			)
+
+	def test_refresh_counts_items_and_windows(self):
+		self.add_articles(self.article_source, [1, 3, 10, 45])
+
+		stats = refresh_source_stats(self.article_source, now=self.now)
+
+		self.assertEqual(stats.item_count, 4)
+		self.assertEqual(stats.items_last_7_days, 2)
+		self.assertEqual(stats.items_last_30_days, 3)
+		self.assertEqual(stats.last_item_date, self.now - timedelta(days=1))
+		self.assertEqual(stats.items_per_day_7, round(2 / 7, 2))
+		self.assertEqual(stats.health, "healthy")
+
+	def test_trial_sources_use_last_updated(self):
+		trial = Trials.objects.create(title="Stats trial", link="https://example.com/t")
+		trial.sources.add(self.trial_source)
+
+		stats = refresh_source_stats(self.trial_source)
+
+		self.assertEqual(stats.item_count, 1)
+		self.assertEqual(stats.last_item_date, Trials.objects.get(pk=trial.pk).last_updated)
+
+	def test_fetch_failures_extend_the_streak_until_a_success(self):
+		refresh_source_stats(self.article_source, fetch_ok=False, error="timeout")
+		stats = refresh_source_stats(self.article_source, fetch_ok=False, error="DNS")
+
+		self.assertEqual(stats.error_streak, 2)
+		self.assertEqual(stats.last_error, "DNS")
+		self.assertIsNotNone(stats.last_fetch_at)
+		self.assertIsNone(stats.last_fetch_succeeded_at)
+
+		stats = refresh_source_stats(self.article_source, fetch_ok=True)
+
+		self.assertEqual(stats.error_streak, 0)
+		self.assertEqual(stats.last_error, "")
+		self.assertIsNotNone(stats.last_fetch_succeeded_at)
+
+	def test_rebuild_covers_every_source_and_keeps_fetch_outcome(self):
+		self.add_articles(self.article_source, [2, 40])
+		refresh_source_stats(self.article_source, fetch_ok=False, error="boom")
+		self.add_articles(self.article_source, [5], prefix="later")
+
+		written = rebuild_source_stats()
+
+		self.assertEqual(written, 2)
+		stats = SourceStats.objects.get(source=self.article_source)
+		self.assertEqual(stats.item_count, 3)
+		self.assertEqual(stats.items_last_7_days, 2)
+		self.assertEqual(stats.error_streak, 1)
+		self.assertEqual(stats.last_error, "boom")
+		empty = SourceStats.objects.get(source=self.trial_source)
+		self.assertEqual(empty.item_count, 0)
+		self.assertIsNone(empty.last_item_date)
+
+	def test_rebuild_runs_one_query_per_content_type(self):
+		for i in range(5):
+			source = Sources.objects.create(name=f"Extra {i}", team=self.team)
+			self.add_articles(source, [i + 1])
+
+		with CaptureQueriesContext(connection) as queries:
+			rebuild_source_stats()
+
+		# Two grouped aggregates and one upsert, however many sources there are.
+		self.assertEqual(len(queries), 3)
+
+	def test_command_rebuilds_one_source(self):
+		self.add_articles(self.article_source, [1])
+
+		call_command("rebuild_source_stats", source_id=self.article_source.pk, verbosity=0)
+
+		self.assertEqual(SourceStats.objects.get().source, self.article_source)
+
+	def test_filter_by_health(self):
+		fresh = self.article_source
+		self.add_articles(fresh, [2])
+		stale = Sources.objects.create(name="Stale", team=self.team)
+		self.add_articles(stale, [45])
+		dead = Sources.objects.create(name="Dead", team=self.team)
+		self.add_articles(dead, [90])
+		inactive = Sources.objects.create(name="Off", team=self.team, active=False)
+		rebuild_source_stats()
+		# A source never fetched or rebuilt has no stats row yet.
+		unseen = Sources.objects.create(name="Unseen", team=self.team)
+
+		def names(status):
+			return set(
+				filter_by_health(Sources.objects.all(), status).values_list("name", flat=True)
+			)
+
+		self.assertEqual(names("healthy"), {fresh.name})
+		self.assertEqual(names("warning"), {stale.name})
+		self.assertEqual(names("error"), {dead.name})
+		self.assertEqual(names("inactive"), {inactive.name})
+		self.assertEqual(names("no_content"), {self.trial_source.name, unseen.name})
+		for source in (fresh, stale, dead, inactive):
+			self.assertEqual(source.stats.health, source.get_health_status())
+
+	def test_filter_by_health_agrees_with_the_badge_at_day_boundaries(self):
+		# Ages either side of the 30/31 and 60/61 whole-day boundaries: the
+		# SQL filter must put every source in the bucket the badge shows.
+		ages = {
+			"30d23h": timedelta(days=30, hours=23),
+			"31d": timedelta(days=31),
+			"60d23h": timedelta(days=60, hours=23),
+			"61d": timedelta(days=61),
+		}
+		for name, age in ages.items():
+			source = Sources.objects.create(name=name, team=self.team)
+			SourceStats.objects.create(source=source, last_item_date=self.now - age)
+
+		for name, age in ages.items():
+			expected = health_from_last_date(True, self.now - age, now=self.now)
+			matched = filter_by_health(
+				Sources.objects.filter(name=name), expected, now=self.now
+			)
+			self.assertTrue(matched.exists(), f"{name} should be {expected}")
+		self.assertEqual(
+			health_from_last_date(True, self.now - ages["30d23h"], now=self.now), "healthy"
+		)
+		self.assertEqual(
+			health_from_last_date(True, self.now - ages["61d"], now=self.now), "error"
+		)
+
+
+class SourceStatsAdminTest(TestCase):
+	def setUp(self):
+		self.superuser = User.objects.create_superuser(
+			username="stats-admin", email="stats@example.com", password="pw"
+		)
+		self.client.force_login(self.superuser)
+		org = Organization.objects.create(name="Stats Admin Org", slug="stats-admin-org")
+		self.team = Team.objects.create(organization=org, name="Team", slug="stats-admin-team")
+
+	def add_sources(self, count):
+		for i in range(count):
+			source = Sources.objects.create(name=f"Source {i}", team=self.team)
+			article = Articles.objects.create(
+				title=f"Admin stats {i} {Sources.objects.count()}",
+				link=f"https://example.com/admin-stats/{source.pk}",
+				published_date=timezone.now(),
+			)
+			article.sources.add(source)
+		rebuild_source_stats()
+
+	def count_queries(self, url, params=None):
+		# Warm per-process caches (current Site) so only the page's own
+		# queries are compared.
+		self.client.get(url, params or {})
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url, params or {})
+		self.assertEqual(response.status_code, 200)
+		return len(queries)
+
+	def test_changelist_queries_do_not_grow_with_sources(self):
+		url = reverse("admin:gregory_sources_changelist")
+		self.add_sources(2)
+		few = self.count_queries(url)
+		self.add_sources(6)
+		self.assertEqual(self.count_queries(url), few)
+		self.assertEqual(self.count_queries(url, {"health_status": "healthy"}), few)
+
+	def test_overview_reads_stats(self):
+		url = reverse("admin:sources_overview")
+		self.add_sources(2)
+		few = self.count_queries(url)
+		self.add_sources(6)
+		self.assertEqual(self.count_queries(url), few)
+
+		response = self.client.get(url, {"health": "healthy"})
+		sources = list(response.context["page_obj"])
+		self.assertEqual(len(sources), 8)
+		self.assertTrue(all(s.content_count == 1 for s in sources))
+		self.assertTrue(all(s.health == "healthy" for s in sources))
@@ -0,0 +1,114 @@
+"""
+Tests for gregory.ml.scheduler: admission under the memory budget and the
+TensorFlow slot limit, and run_jobs in-process and on a spawned pool.
+"""
+
+import os
+import unittest
+
+from gregory.ml.scheduler import JobAdmission, TrainingJob, run_jobs
+
+
+def _square(payload):
+	"""Module-level so spawned workers can import it."""
+	if payload < 0:
+		raise ValueError(f"negative payload {payload}")
+	return {"value": payload * payload, "pid": os.getpid()}
+
+
+def _job(name, algorithm="lgbm_tfidf", payload=0):
+	return TrainingJob.for_algorithm(key=name, algorithm=algorithm, payload=payload)
+
+
+class TestJobAdmission(unittest.TestCase):
+	def test_one_tensorflow_job_at_a_time_while_lightgbm_backfills(self):
+		admission = JobAdmission(max_workers=4, memory_budget_gb=100)
+		pending = [
+			_job("bert", "pubmed_bert"),
+			_job("lstm", "lstm"),
+			_job("lgbm-a"),
+			_job("lgbm-b"),
+		]
+
+		started = admission.take(pending)
+
+		self.assertEqual([job.key for job in started], ["bert", "lgbm-a", "lgbm-b"])
+		self.assertEqual([job.key for job in pending], ["lstm"])
+
+		admission.finished(started[0])
+		self.assertEqual([job.key for job in admission.take(pending)], ["lstm"])
+
+	def test_memory_budget_limits_concurrency(self):
+		# bert 6 GB + lgbm 1 GB fit in 7.5 GB; a second lgbm does not.
+		admission = JobAdmission(max_workers=4, memory_budget_gb=7.5)
+		pending = [_job("bert", "pubmed_bert"), _job("lgbm-a"), _job("lgbm-b")]
+
+		self.assertEqual(
+			[job.key for job in admission.take(pending)], ["bert", "lgbm-a"]
+		)
+		self.assertEqual([job.key for job in pending], ["lgbm-b"])
+
+	def test_job_larger_than_budget_runs_alone(self):
+		admission = JobAdmission(max_workers=4, memory_budget_gb=2)
+		pending = [_job("bert", "pubmed_bert"), _job("lgbm")]
+
+		self.assertEqual([job.key for job in admission.take(pending)], ["bert"])
+		self.assertEqual(admission.take(pending), [])
+
+	def test_worker_count_is_a_hard_limit(self):
+		admission = JobAdmission(max_workers=2, memory_budget_gb=100)
+		pending = [_job(f"lgbm-{i}") for i in range(3)]
+
+		self.assertEqual(len(admission.take(pending)), 2)
+		self.assertEqual(len(pending), 1)
+
+
+class TestRunJobs(unittest.TestCase):
+	def collect(self, jobs, **kwargs):
+		outcomes = {}
+		run_jobs(
+			jobs,
+			worker=_square,
+			on_done=lambda job, result, error: outcomes.__setitem__(
+				job.key, (result, error)
+			),
+			**kwargs,
+		)
+		return outcomes
+
+	def test_in_process_runs_in_order_and_isolates_failures(self):
+		order = []
+		jobs = [_job("a", payload=2), _job("b", payload=-1), _job("c", payload=3)]
+
+		outcomes = {}
+
+		def on_done(job, result, error):
+			order.append(job.key)
+			outcomes[job.key] = (result, error)
+
+		run_jobs(jobs, worker=_square, max_workers=1, on_done=on_done)
+
+		self.assertEqual(order, ["a", "b", "c"])
+		self.assertEqual(outcomes["a"][0]["value"], 4)
+		self.assertEqual(outcomes["a"][0]["pid"], os.getpid())
+		self.assertIsInstance(outcomes["b"][1], ValueError)
+		self.assertEqual(outcomes["c"][0]["value"], 9)
+
+	def test_process_pool_runs_jobs_in_workers(self):
+		jobs = [
+			_job("bert", "pubmed_bert", payload=2),
+			_job("lgbm", payload=3),
+			_job("bad", payload=-1),
+		]
+
+		outcomes = self.collect(jobs, max_workers=2, memory_budget_gb=100)
+
+		self.assertEqual(set(outcomes), {"bert", "lgbm", "bad"})
+		self.assertEqual(outcomes["bert"][0]["value"], 4)
+		self.assertEqual(outcomes["lgbm"][0]["value"], 9)
+		self.assertNotEqual(outcomes["lgbm"][0]["pid"], os.getpid())
+		self.assertIsInstance(outcomes["bad"][1], ValueError)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -16,8 +16,10 @@ django.setup()
 
 from django.test import SimpleTestCase
 from gregory.utils.trial_identifiers import (
+	candidate_types,
 	extract_identifiers,
 	extract_identifiers_from_trial_identifiers,
+	search_fragment,
 )
 
 
@@ -151,3 +153,43 @@ class ExtractFromTrialIdentifiersTest(SimpleTestCase):
 
 	def test_none_dict(self):
 		self.assertEqual(extract_identifiers_from_trial_identifiers(None), set())
+
+
+class CombinedPrefilterTest(SimpleTestCase):
+	def test_text_without_registry_yields_no_candidates(self):
+		self.assertEqual(candidate_types("Ocrelizumab in relapsing MS, 2019-2021."), [])
+
+	def test_only_cited_families_are_candidates(self):
+		self.assertEqual(
+			candidate_types("NCT04578639 and ISRCTN12345678"), ["nct", "isrctn"]
+		)
+
+	def test_digit_shape_selects_ctis_and_eudract(self):
+		self.assertEqual(candidate_types("2020-001205-23"), ["ctis", "eudract"])
+
+	def test_prefix_nested_in_another_prefix_is_not_hidden(self):
+		"""ChiCTR-style free text can embed another registry's prefix; the
+		zero-width prefilter must still surface both families."""
+		self.assertEqual(
+			extract_identifiers("ChiCTR-NCT12345678"),
+			{("chictr", "CHICTR-NCT12345678"), ("nct", "NCT12345678")},
+		)
+
+
+class SearchFragmentTest(SimpleTestCase):
+	def test_fragment_is_contained_in_every_citation_form(self):
+		for text in ("NCT04578639", "nct 04578639", "NCT-04578639"):
+			with self.subTest(text=text):
+				((id_type, id_value),) = extract_identifiers(text)
+				self.assertIn(search_fragment(id_type, id_value), text.upper())
+
+	def test_rbr_drops_optional_dash(self):
+		self.assertEqual(search_fragment("rbr", "RBR-ABC123"), "ABC123")
+
+	def test_chictr_keeps_longest_segment(self):
+		self.assertEqual(
+			search_fragment("chictr", "CHICTR-IOR-17013030"), "17013030"
+		)
+
+	def test_other_types_use_the_canonical_value(self):
+		self.assertEqual(search_fragment("eudract", "2020-001205-23"), "2020-001205-23")
@@ -0,0 +1,167 @@
+"""
+Tests for gregory.utils.unlabeled_pool: which articles make up the
+pseudo-labeling pool, how it is sampled, and that chunks reuse cached
+cleaned text.
+"""
+
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+from organizations.models import Organization
+
+from gregory.models import ArticleSubjectRelevance, Articles, Subject, Team
+from gregory.utils import unlabeled_pool
+from gregory.utils.unlabeled_pool import (
+	CleanedTextCache,
+	UnlabeledPool,
+	sample_article_ids,
+	unlabeled_articles,
+)
+
+SUMMARY = (
+	"This study evaluates treatment outcomes in multiple sclerosis patients "
+	"using magnetic resonance imaging biomarkers alongside clinical disability "
+	"scores collected during a twenty four month follow up period."
+)
+
+
+class UnlabeledPoolTest(TestCase):
+	def setUp(self):
+		organization = Organization.objects.create(name="Pool Organization")
+		self.team = Team.objects.create(
+			slug="pool-team", name="Pool Team", organization=organization
+		)
+		self.subject = Subject.objects.create(
+			subject_name="Pool Subject", subject_slug="pool-subject", team=self.team
+		)
+		self.temp_dir = tempfile.TemporaryDirectory()
+		self.addCleanup(self.temp_dir.cleanup)
+		self.now = timezone.now()
+
+	def create_articles(self, count, age_days=0, summary=SUMMARY, prefix="Article"):
+		articles = []
+		for i in range(count):
+			article = Articles.objects.create(
+				title=f"{prefix} {age_days} {i}",
+				summary=summary,
+				link=f"https://example.com/{prefix}/{age_days}/{i}",
+			)
+			article.teams.add(self.team)
+			articles.append(article)
+		Articles.objects.filter(pk__in=[a.pk for a in articles]).update(
+			discovery_date=self.now - timedelta(days=age_days)
+		)
+		return articles
+
+	def test_pool_excludes_only_reviewed_articles(self):
+		reviewed, unreviewed, unlabeled = self.create_articles(3)
+		ArticleSubjectRelevance.objects.create(
+			article=reviewed, subject=self.subject, is_relevant=False
+		)
+		ArticleSubjectRelevance.objects.create(
+			article=unreviewed, subject=self.subject, is_relevant=None
+		)
+
+		ids = sample_article_ids(unlabeled_articles("pool-team", self.subject), 10)
+
+		self.assertEqual(ids, sorted([unreviewed.pk, unlabeled.pk]))
+
+	def test_uniform_sample_has_requested_size_and_is_reproducible(self):
+		self.create_articles(30)
+		queryset = unlabeled_articles("pool-team", self.subject)
+
+		first = sample_article_ids(queryset, 10, strategy="uniform", seed=1)
+
+		self.assertEqual(len(set(first)), 10)
+		self.assertEqual(first, sorted(first))
+		self.assertEqual(first, sample_article_ids(queryset, 10, strategy="uniform", seed=1))
+
+	def test_recent_sample_favours_new_discoveries(self):
+		new = {a.pk for a in self.create_articles(40, age_days=1, prefix="new")}
+		self.create_articles(40, age_days=3 * 365, prefix="old")
+
+		ids = sample_article_ids(
+			unlabeled_articles("pool-team", self.subject),
+			20,
+			strategy="recent",
+			now=self.now,
+		)
+
+		self.assertEqual(len(ids), 20)
+		self.assertGreaterEqual(len(new.intersection(ids)), 18)
+
+	def test_stratified_sample_spreads_over_months(self):
+		self.create_articles(50, age_days=0, prefix="this-month")
+		sparse = {a.pk for a in self.create_articles(3, age_days=70, prefix="sparse")}
+		self.create_articles(50, age_days=140, prefix="older")
+
+		ids = sample_article_ids(
+			unlabeled_articles("pool-team", self.subject), 21, strategy="stratified"
+		)
+
+		self.assertEqual(len(ids), 21)
+		# The sparse month is taken whole; the other two split the rest.
+		self.assertTrue(sparse.issubset(ids))
+
+	def test_unknown_strategy_raises(self):
+		with self.assertRaises(ValueError):
+			sample_article_ids(Articles.objects.all(), 1, strategy="newest")
+
+	def test_chunks_stream_cleaned_text_and_drop_short_articles(self):
+		kept = self.create_articles(5)
+		short = self.create_articles(1, summary="too short", prefix="short")[0]
+		pool = UnlabeledPool.sample("pool-team", self.subject, chunk_size=2)
+
+		chunks = list(pool.chunks())
+
+		self.assertEqual(len(chunks), 3)
+		self.assertTrue(all(len(chunk) <= 2 for chunk in chunks))
+		streamed = [article_id for chunk in chunks for article_id in chunk["article_id"]]
+		self.assertEqual(streamed, sorted(a.pk for a in kept))
+		self.assertNotIn(short.pk, streamed)
+		self.assertIn("multiple sclerosis", chunks[0]["text"].iloc[0])
+
+	def test_chunks_clean_on_a_spawned_process_pool(self):
+		articles = self.create_articles(4)
+		pool = UnlabeledPool([a.pk for a in articles], workers=2)
+		try:
+			chunks = list(pool.chunks())
+		finally:
+			pool.close()
+
+		texts = [text for chunk in chunks for text in chunk["text"]]
+		self.assertEqual(len(texts), 4)
+		self.assertTrue(all("multiple sclerosis" in text for text in texts))
+
+	def test_cached_text_is_reused_until_the_article_changes(self):
+		articles = self.create_articles(4)
+		cache_path = Path(self.temp_dir.name) / "cleaned_text.sqlite3"
+
+		def stream():
+			pool = UnlabeledPool(
+				[a.pk for a in articles], cache=CleanedTextCache(cache_path)
+			)
+			try:
+				return [text for chunk in pool.chunks() for text in chunk["text"]]
+			finally:
+				pool.close()
+
+		with patch.object(
+			unlabeled_pool,
+			"clean_article_text",
+			wraps=unlabeled_pool.clean_article_text,
+		) as clean:
+			first = stream()
+			self.assertEqual(clean.call_count, 4)
+
+			self.assertEqual(stream(), first)
+			self.assertEqual(clean.call_count, 4)
+
+			articles[0].summary = SUMMARY + " Revised."
+			articles[0].save()
+			stream()
+			self.assertEqual(clean.call_count, 5)
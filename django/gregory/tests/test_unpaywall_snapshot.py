@@ -0,0 +1,117 @@
+"""
+Tests for the offline Unpaywall index (gregory.unpaywall.snapshot): importing
+a gzip JSONL snapshot with import_unpaywall_snapshot, and getDataByDOI
+answering from it before (or instead of) the live API.
+
+Run:
+  docker exec gregory python manage.py test gregory.tests.test_unpaywall_snapshot
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from gregory.unpaywall import snapshot, unpaywall_utils
+
+PATCH_GET_JSON = "gregory.unpaywall.unpaywall_utils.Unpywall.get_json"
+
+RECORDS = [
+	{
+		"doi": "10.1000/Open",
+		"is_oa": True,
+		"best_oa_location": {
+			"url": "https://repo.example.org/open",
+			"url_for_pdf": "https://repo.example.org/open.pdf",
+			"license": "cc-by",
+		},
+		"title": "Open paper",
+	},
+	{"doi": "10.1000/closed", "is_oa": False, "best_oa_location": None},
+]
+
+
+class UnpaywallSnapshotTests(SimpleTestCase):
+	def setUp(self):
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.snapshot_path = os.path.join(tmp.name, "snapshot.jsonl.gz")
+		self.index_path = os.path.join(tmp.name, "unpaywall.sqlite3")
+		with gzip.open(self.snapshot_path, "wt", encoding="utf-8") as fh:
+			for record in RECORDS:
+				fh.write(json.dumps(record) + "\n")
+			fh.write("not json\n")
+		settings_override = override_settings(
+			UNPAYWALL_SNAPSHOT_INDEX=self.index_path, UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS=180
+		)
+		settings_override.enable()
+		self.addCleanup(settings_override.disable)
+
+	def import_snapshot(self, snapshot_date=None):
+		options = {"snapshot_date": snapshot_date} if snapshot_date else {}
+		call_command(
+			"import_unpaywall_snapshot", self.snapshot_path, batch_size=1, stdout=StringIO(), **options
+		)
+
+	def test_import_builds_a_lookup_index(self):
+		self.import_snapshot()
+
+		record = snapshot.lookup("10.1000/OPEN")
+		self.assertTrue(record["is_oa"])
+		self.assertEqual(
+			record["best_oa_location"],
+			{
+				"url": "https://repo.example.org/open",
+				"url_for_pdf": "https://repo.example.org/open.pdf",
+				"license": "cc-by",
+			},
+		)
+		closed = snapshot.lookup("10.1000/closed")
+		self.assertFalse(closed["is_oa"])
+		self.assertIsNone(closed["best_oa_location"])
+		self.assertIsNone(snapshot.lookup("10.1000/missing"))
+
+	def test_reimport_overwrites_entries(self):
+		self.import_snapshot(snapshot_date="2026-01-01")
+		self.import_snapshot(snapshot_date="2026-02-01")
+		self.assertEqual(snapshot.lookup("10.1000/closed")["snapshot_date"], "2026-02-01")
+
+	@patch(PATCH_GET_JSON)
+	def test_getDataByDOI_answers_from_a_fresh_snapshot(self, mock_get):
+		self.import_snapshot()
+		data = unpaywall_utils.getDataByDOI("10.1000/open", "user@test.org")
+		self.assertTrue(data["is_oa"])
+		self.assertEqual(data["best_oa_location"]["url_for_pdf"], "https://repo.example.org/open.pdf")
+		mock_get.assert_not_called()
+
+	@patch(PATCH_GET_JSON)
+	def test_getDataByDOI_falls_back_to_the_api_on_a_miss(self, mock_get):
+		self.import_snapshot()
+		mock_get.return_value = {"is_oa": True, "best_oa_location": {"url": "https://live.example.org"}}
+		data = unpaywall_utils.getDataByDOI("10.1000/missing", "user@test.org")
+		self.assertEqual(data["best_oa_location"]["url"], "https://live.example.org")
+		mock_get.assert_called_once()
+
+	@patch(PATCH_GET_JSON)
+	def test_stale_entries_are_rechecked_live(self, mock_get):
+		self.import_snapshot(snapshot_date=(date.today() - timedelta(days=365)).isoformat())
+		mock_get.return_value = {"is_oa": True, "best_oa_location": {"url": "https://live.example.org"}}
+		self.assertTrue(unpaywall_utils.getDataByDOI("10.1000/closed", "user@test.org")["is_oa"])
+
+		# The live API has nothing: the old answer beats none
+		mock_get.return_value = None
+		data = unpaywall_utils.getDataByDOI("10.1000/closed", "user@test.org")
+		self.assertFalse(data["is_oa"])
+		self.assertTrue(data["stale"])
+
+	@patch(PATCH_GET_JSON)
+	def test_missing_index_uses_the_api(self, mock_get):
+		mock_get.return_value = {"is_oa": False}
+		self.assertEqual(unpaywall_utils.getDataByDOI("10.1000/open", "user@test.org"), {"is_oa": False})
+		mock_get.assert_called_once()
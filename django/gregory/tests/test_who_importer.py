@@ -8,6 +8,7 @@ Run:
   docker exec gregory python manage.py test gregory.tests.test_who_importer
 """
 
+import io
 import os
 import tempfile
 
@@ -176,3 +177,110 @@ class WHOHTMLCleaningTest(TestCase):
 			"Diagnosis with reference to diagnostic criteria "
 			"<the guide of diagnosis and treatment> required",
 		)
+
+
+def _who_trial_xml(trial_id, title, countries=""):
+	return f"""\
+  <Trial>
+    <TrialID>{trial_id}</TrialID>
+    <Public_title>{title}</Public_title>
+    <Primary_sponsor>Batch Sponsor</Primary_sponsor>
+    <Countries>{countries}</Countries>
+    <Date_registration>2023-01-15</Date_registration>
+    <web_address>https://trialsearch.who.int/Trial2.aspx?TrialID={trial_id}</web_address>
+  </Trial>
+"""
+
+
+def _who_xml(*trials):
+	return (
+		'<?xml version="1.0" encoding="UTF-8"?>\n<Trials_central>\n'
+		+ "".join(trials)
+		+ "</Trials_central>\n"
+	)
+
+
+class WHOBatchImportTest(TestCase):
+	"""The streaming, batched write path: bulk creates/updates with the
+	relationships, derived rows and history rows save() would have written."""
+
+	def setUp(self):
+		self.source = _who_source()
+
+	def _import(self, xml, **kwargs):
+		with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as f:
+			f.write(xml)
+			path = f.name
+		try:
+			out = io.StringIO()
+			cmd = WHOCommand()
+			cmd.stdout = out
+			cmd.parse_xml(path, self.source.source_id, **kwargs)
+			return out.getvalue()
+		finally:
+			os.unlink(path)
+
+	def test_batch_creates_trials_with_relationships_and_history(self):
+		out = self._import(
+			_who_xml(
+				_who_trial_xml("ISRCTN50000001", "Batch trial one", countries="France"),
+				_who_trial_xml("ISRCTN50000002", "Batch trial two"),
+				_who_trial_xml("ISRCTN50000003", "Batch trial three"),
+			),
+			batch_size=2,
+		)
+		self.assertIn("Processed 2 trials (resume with --skip 2)", out)
+
+		trial = Trials.objects.get(identifiers__isrctn="ISRCTN50000001")
+		self.assertEqual(list(trial.sources.all()), [self.source])
+		self.assertEqual(list(trial.subjects.all()), [self.source.subject])
+		self.assertEqual(list(trial.teams.all()), [self.source.team])
+		self.assertIsNotNone(trial.primary_sponsor_normalized)
+		self.assertEqual(
+			[str(tc.country) for tc in trial.trial_countries.all()], ["FR"]
+		)
+		self.assertTrue(trial.identifier_index.exists())
+
+		history = list(trial.history.all())
+		self.assertEqual([h.history_type for h in history], ["+"])
+		self.assertIn("Created from Source", history[0].history_change_reason)
+		self.assertEqual(
+			[row.sources_id for row in history[0].sources.all()], [self.source.pk]
+		)
+
+	def test_update_is_matched_in_bulk_and_recorded_once(self):
+		existing = Trials.objects.create(
+			title="Stored WHO trial",
+			link="https://trialsearch.who.int/Trial2.aspx?TrialID=ISRCTN50000010",
+			identifiers={"isrctn": "ISRCTN50000010"},
+		)
+		self._import(
+			_who_xml(
+				_who_trial_xml("ISRCTN50000010", "Stored WHO trial", countries="Spain"),
+				# Repeated within the batch: merged, not created twice
+				_who_trial_xml("ISRCTN50000011", "New WHO trial"),
+				_who_trial_xml("ISRCTN50000011", "New WHO trial"),
+			)
+		)
+		self.assertEqual(Trials.objects.filter(identifiers__isrctn="ISRCTN50000011").count(), 1)
+
+		existing.refresh_from_db()
+		self.assertEqual(existing.countries, "Spain")
+		self.assertEqual(existing.primary_sponsor, "Batch Sponsor")
+		self.assertEqual([str(tc.country) for tc in existing.trial_countries.all()], ["ES"])
+		self.assertIn(self.source, existing.sources.all())
+		updates = existing.history.filter(history_type="~")
+		self.assertEqual(updates.count(), 1)
+		self.assertIn("Updated fields from WHO ICTRP", updates.get().history_change_reason)
+
+	def test_skip_resumes_after_the_given_offset(self):
+		out = self._import(
+			_who_xml(
+				_who_trial_xml("ISRCTN50000021", "Already imported"),
+				_who_trial_xml("ISRCTN50000022", "Still to import"),
+			),
+			skip=1,
+		)
+		self.assertFalse(Trials.objects.filter(identifiers__isrctn="ISRCTN50000021").exists())
+		self.assertTrue(Trials.objects.filter(identifiers__isrctn="ISRCTN50000022").exists())
+		self.assertIn("Processed 2 trials.", out)
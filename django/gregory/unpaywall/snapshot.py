@@ -0,0 +1,174 @@
+"""
+Offline Unpaywall index: DOI -> (is_oa, best OA location, license), in an
+SQLite file built from an Unpaywall snapshot or changefile (gzip JSONL, one
+record per line).
+
+getDataByDOI() (unpaywall_utils) asks the index first and only calls the
+live API for DOIs the index does not have or whose entry is stale, so a
+corpus-wide backfill_unpaywall run reads local rows instead of spending days
+on one rate-limited call per DOI.
+
+- build_index() streams a snapshot into the index with batched upserts.
+  Importing a newer changefile later just overwrites the DOIs it carries.
+- lookup() returns a record shaped like the API's (``is_oa`` and
+  ``best_oa_location`` with ``url``, ``url_for_pdf`` and ``license``), plus
+  ``snapshot_date``.
+- An entry is stale once its snapshot is older than
+  settings.UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS: an article closed at snapshot
+  time may have an open copy since.
+
+The index is read-only for lookups and opened once per thread (SQLite
+connections cannot be shared across threads, and the enrichment executor
+calls getDataByDOI from its workers).
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from django.conf import settings
+
+IMPORT_BATCH_SIZE = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS unpaywall (
+	doi TEXT PRIMARY KEY,
+	is_oa INTEGER NOT NULL,
+	url TEXT,
+	url_for_pdf TEXT,
+	license TEXT,
+	snapshot_date TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+_UPSERT = (
+	"INSERT OR REPLACE INTO unpaywall "
+	"(doi, is_oa, url, url_for_pdf, license, snapshot_date) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+_local = threading.local()
+
+
+def index_path():
+	"""The configured index file, or None when the index is disabled."""
+	return getattr(settings, "UNPAYWALL_SNAPSHOT_INDEX", None) or None
+
+
+def normalize_doi(doi: str) -> str:
+	# Unpaywall keys records by the lowercase DOI
+	return doi.strip().lower()
+
+
+def _row(record: dict, snapshot_date: str):
+	doi = record.get("doi")
+	if not doi:
+		return None
+	best = record.get("best_oa_location") or {}
+	return (
+		normalize_doi(doi),
+		1 if record.get("is_oa") else 0,
+		best.get("url"),
+		best.get("url_for_pdf"),
+		best.get("license"),
+		snapshot_date,
+	)
+
+
+def build_index(snapshot, path, snapshot_date=None, batch_size=IMPORT_BATCH_SIZE, progress=None):
+	"""
+	Upsert every record of *snapshot* (a path to a gzip JSONL file, or an
+	iterable of lines) into the index at *path*, creating it if needed.
+	*snapshot_date* (ISO date, default today) is when the snapshot was taken.
+	Calls ``progress(count)`` after every batch. Returns the number of
+	records written; malformed lines are skipped.
+	"""
+	snapshot_date = snapshot_date or date.today().isoformat()
+	connection = sqlite3.connect(path)
+	try:
+		# A half-written index is rebuilt from the snapshot, not recovered:
+		# skip the journal and fsyncs that make bulk inserts slow
+		connection.execute("PRAGMA journal_mode=OFF")
+		connection.execute("PRAGMA synchronous=OFF")
+		connection.execute(_SCHEMA)
+		lines = gzip.open(snapshot, "rt", encoding="utf-8") if isinstance(snapshot, (str, os.PathLike)) else snapshot
+		written = 0
+		batch = []
+		try:
+			for line in lines:
+				try:
+					row = _row(json.loads(line), snapshot_date)
+				except (ValueError, AttributeError):
+					continue
+				if row is None:
+					continue
+				batch.append(row)
+				if len(batch) >= batch_size:
+					with connection:
+						connection.executemany(_UPSERT, batch)
+					written += len(batch)
+					batch = []
+					if progress:
+						progress(written)
+			if batch:
+				with connection:
+					connection.executemany(_UPSERT, batch)
+				written += len(batch)
+				if progress:
+					progress(written)
+		finally:
+			if lines is not snapshot:
+				lines.close()
+	finally:
+		connection.close()
+	return written
+
+
+def _connection(path):
+	connections = getattr(_local, "connections", None)
+	if connections is None:
+		connections = _local.connections = {}
+	if path not in connections:
+		connections[path] = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+	return connections[path]
+
+
+def lookup(doi: str):
+	"""The index's record for *doi*, or None when the index is disabled,
+	missing, or does not have the DOI."""
+	path = index_path()
+	if not doi or not path or not os.path.exists(path):
+		return None
+	try:
+		row = _connection(path).execute(
+			"SELECT is_oa, url, url_for_pdf, license, snapshot_date FROM unpaywall WHERE doi = ?",
+			(normalize_doi(doi),),
+		).fetchone()
+	except sqlite3.Error:
+		return None
+	if row is None:
+		return None
+	is_oa, url, url_for_pdf, license, snapshot_date = row
+	best = None
+	if url or url_for_pdf:
+		best = {"url": url, "url_for_pdf": url_for_pdf, "license": license}
+	return {
+		"doi": normalize_doi(doi),
+		"is_oa": bool(is_oa),
+		"best_oa_location": best,
+		"snapshot_date": snapshot_date,
+	}
+
+
+def is_stale(record: dict) -> bool:
+	"""Whether *record*'s snapshot is older than the configured max age."""
+	max_age = getattr(settings, "UNPAYWALL_SNAPSHOT_MAX_AGE_DAYS", None)
+	if not max_age:
+		return False
+	try:
+		taken = date.fromisoformat(record["snapshot_date"])
+	except (KeyError, TypeError, ValueError):
+		return True
+	return date.today() - taken > timedelta(days=max_age)
@@ -5,6 +5,8 @@ import warnings
 from unpywall import Unpywall
 from unpywall.cache import UnpywallCache
 
+from gregory.unpaywall import snapshot
+
 
 class _EphemeralUnpywallCache(UnpywallCache):
 	"""In-memory-only stand-in for unpywall's default cache.
@@ -38,14 +40,7 @@ def _ensure_ephemeral_cache():
 		Unpywall.init_cache(cache=_EphemeralUnpywallCache())
 
 
-def getDataByDOI(doi: str, client_email: str):
-	"""Return the full Unpaywall record for a DOI, or {} if not found / on error."""
-
-	if not doi or not client_email:
-		raise ValueError(
-			f"DOI and client_email cannot be empty: {doi!r}, {client_email!r}"
-		)
-
+def _live_lookup(doi: str, client_email: str):
 	_ensure_ephemeral_cache()
 
 	os.environ["UNPAYWALL_EMAIL"] = client_email
@@ -59,6 +54,32 @@ def getDataByDOI(doi: str, client_email: str):
 		return {}
 
 
+def getDataByDOI(doi: str, client_email: str):
+	"""
+	Return the full Unpaywall record for a DOI, or {} if not found / on error.
+
+	A fresh entry of the offline snapshot index (gregory.unpaywall.snapshot)
+	is returned without calling the API; such records carry the
+	``snapshot_date`` they were taken on. A stale entry is re-checked live and
+	still returned, flagged ``stale``, when the live lookup comes back empty,
+	since an old answer beats none.
+	"""
+
+	if not doi or not client_email:
+		raise ValueError(
+			f"DOI and client_email cannot be empty: {doi!r}, {client_email!r}"
+		)
+
+	record = snapshot.lookup(doi)
+	if record is not None and not snapshot.is_stale(record):
+		return record
+
+	data = _live_lookup(doi, client_email)
+	if not data and record is not None:
+		return {**record, "stale": True}
+	return data
+
+
 def checkIfDOIIsOpenAccess(doi: str, client_email: str) -> bool:
 	data = getDataByDOI(doi, client_email)
 	return bool(data.get("is_oa")) if data else False
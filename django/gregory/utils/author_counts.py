@@ -0,0 +1,180 @@
+"""
+Maintenance and reads of AuthorArticleCounts, the per-(author, organisation)
+article counts the authors endpoints read instead of a correlated
+COUNT(DISTINCT) per author.
+
+- refresh_author_counts(author_ids) rewrites the rows of a few authors with one
+  grouped query. The m2m_changed/delete signals in gregory.signals call it when
+  an article's authors or teams change, and recompute_article_relevance calls
+  it for articles whose relevant flag flipped.
+- rebuild_author_counts() rewrites every row in one pass (one grouped query,
+  batched inserts). The pipeline runs it after the relevance refresh, which
+  catches writes that bypass the signals (bulk_create, queryset.update(), raw
+  SQL).
+- article_count_expression(org_ids, relevant_only) is the read side: the sum
+  of the stored rows of the given organisations, falling back to a live count
+  for authors whose sum could count an article twice (see shared_articles).
+"""
+
+from django.db import transaction
+from django.db.models import (
+	Case,
+	Count,
+	Exists,
+	F,
+	IntegerField,
+	OuterRef,
+	Q,
+	Subquery,
+	Sum,
+	Value,
+	When,
+)
+from django.db.models.functions import Coalesce
+
+from gregory.models import Articles, AuthorArticleCounts
+
+WRITE_BATCH_SIZE = 2000
+
+ArticleAuthors = Articles.authors.through
+ArticleTeams = Articles.teams.through
+
+
+def _count_rows(author_ids=None):
+	"""(author_id, organization_id, articles, relevant, shared) for every
+	author in *author_ids* (default: all) with articles on an organisation's
+	teams."""
+	links = ArticleAuthors.objects.filter(
+		articles__teams__organization__isnull=False
+	)
+	multi_org = ArticleTeams.objects.all()
+	if author_ids is not None:
+		links = links.filter(authors_id__in=author_ids)
+		multi_org = multi_org.filter(articles__authors__in=author_ids)
+	multi_org = (
+		multi_org.order_by()
+		.values("articles")
+		.annotate(orgs=Count("team__organization", distinct=True))
+		.filter(orgs__gt=1)
+		.values("articles")
+	)
+	return (
+		links.order_by()
+		.values(author=F("authors_id"), org=F("articles__teams__organization"))
+		.annotate(
+			n=Count("articles_id", distinct=True),
+			relevant=Count(
+				"articles_id", distinct=True, filter=Q(articles__relevant=True)
+			),
+			shared=Count(
+				"articles_id", distinct=True, filter=Q(articles_id__in=multi_org)
+			),
+		)
+		.values_list("author", "org", "n", "relevant", "shared")
+	)
+
+
+def _rows(values):
+	for author_id, org_id, n, relevant, shared in values:
+		yield AuthorArticleCounts(
+			author_id=author_id,
+			organization_id=org_id,
+			articles=n,
+			relevant_articles=relevant,
+			shared_articles=shared,
+		)
+
+
+def refresh_author_counts(author_ids):
+	"""Rewrite the rows of *author_ids*. Returns the number of rows written."""
+	author_ids = {author_id for author_id in author_ids if author_id is not None}
+	if not author_ids:
+		return 0
+	rows = list(_rows(_count_rows(author_ids)))
+	with transaction.atomic():
+		AuthorArticleCounts.objects.filter(author_id__in=author_ids).delete()
+		AuthorArticleCounts.objects.bulk_create(rows, batch_size=WRITE_BATCH_SIZE)
+	return len(rows)
+
+
+def refresh_author_counts_for_articles(article_ids):
+	"""Rewrite the rows of every author of *article_ids*."""
+	return refresh_author_counts(
+		ArticleAuthors.objects.filter(articles_id__in=article_ids).values_list(
+			"authors_id", flat=True
+		)
+	)
+
+
+def rebuild_author_counts():
+	"""Rewrite every row in one pass. Returns the number of rows written."""
+	written = 0
+	with transaction.atomic():
+		AuthorArticleCounts.objects.all().delete()
+		batch = []
+		for row in _rows(_count_rows().iterator(chunk_size=WRITE_BATCH_SIZE)):
+			batch.append(row)
+			if len(batch) >= WRITE_BATCH_SIZE:
+				AuthorArticleCounts.objects.bulk_create(batch)
+				written += len(batch)
+				batch = []
+		if batch:
+			AuthorArticleCounts.objects.bulk_create(batch)
+			written += len(batch)
+	return written
+
+
+def live_article_count_expression(org_ids=None, relevant_only=False):
+	"""Correlated count of an author's articles, straight from the joins."""
+	articles = Articles.objects.filter(authors__author_id=OuterRef("author_id"))
+	if relevant_only:
+		articles = articles.filter(relevant=True)
+	if org_ids is not None:
+		articles = articles.filter(teams__organization_id__in=org_ids)
+	counts = (
+		articles.order_by()
+		.values("authors__author_id")
+		.annotate(n=Count("article_id", distinct=True))
+		.values("n")[:1]
+	)
+	return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def article_count_expression(org_ids=None, relevant_only=False):
+	"""
+	An author's articles (relevant ones with *relevant_only*) on the teams of
+	*org_ids*, from the stored counts.
+
+	Per organisation the stored count is exact. Over several organisations the
+	sum is exact unless one of the summed rows has shared articles, so those
+	authors (a small minority: it takes an article on teams of two
+	organisations) are counted live. Without *org_ids* (no visibility scope)
+	articles on no team count too, which only the live count sees.
+	"""
+	if org_ids is None:
+		return live_article_count_expression(None, relevant_only)
+	org_ids = list(org_ids)
+	rows = AuthorArticleCounts.objects.filter(
+		author=OuterRef("author_id"), organization_id__in=org_ids
+	)
+	field = "relevant_articles" if relevant_only else "articles"
+	stored = Coalesce(
+		Subquery(
+			rows.order_by()
+			.values("author")
+			.annotate(total=Sum(field))
+			.values("total"),
+			output_field=IntegerField(),
+		),
+		Value(0),
+	)
+	if len(org_ids) < 2:
+		return stored
+	return Case(
+		When(
+			Exists(rows.filter(shared_articles__gt=0)),
+			then=live_article_count_expression(org_ids, relevant_only),
+		),
+		default=stored,
+		output_field=IntegerField(),
+	)
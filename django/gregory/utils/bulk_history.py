@@ -0,0 +1,239 @@
+"""
+History rows for pipeline writes, in bulk.
+
+django-simple-history records a historical row in its own INSERT on every
+save(), plus one query per tracked M2M field and whatever the
+post_create_historical_record receivers do (trim_author_history in
+gregory/signals.py, two more queries per author). During ingest that roughly
+doubles the write volume. Two ways around it:
+
+- bulk_create_history() records rows for objects written with bulk_create /
+  bulk_update, which bypass save() and so get no history at all.
+  simple-history's own HistoryManager.bulk_history_create only partly fills
+  that gap: it skips the pre_create_historical_record signal (which stamps the
+  API key on ApiKeyHistoryMixin models) and the M2M snapshots of models
+  declared with ``m2m_fields`` (Trials: sources, teams, subjects).
+
+- deferred_history() keeps save() but defers its history: models declaring
+  ``BatchedHistoricalRecords`` build their row (change reason, user, date,
+  API-key stamp) at save time as usual, and the rows are written with
+  bulk_create when the block exits or flush() is called — at the pipeline
+  command's batch boundaries.
+
+Both write one INSERT for the historical rows and one query plus one INSERT
+per tracked M2M field, and send post_bulk_create_historical_records instead of
+post_create_historical_record per row; receivers of the former apply their
+policies set-based (author history trimming, see gregory/signals.py).
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.dispatch import Signal
+from django.utils import timezone
+from simple_history import utils
+from simple_history.models import HistoricalRecords
+from simple_history.signals import pre_create_historical_record
+from simple_history.utils import get_change_reason_from_object
+
+# Sent once per history model and flush, after its rows and M2M snapshots are
+# written, with ``instances`` and the matching ``history_instances``.
+post_bulk_create_historical_records = Signal()
+
+_active_buffer = ContextVar("deferred_history_buffer", default=None)
+
+
+def _build_history_row(history_model, instance, history_type, history_date, history_user, change_reason):
+	attrs = {field.attname: getattr(instance, field.attname) for field in history_model.tracked_fields}
+	if getattr(history_model, "history_relation", None) is not None:
+		attrs["history_relation"] = instance
+	row = history_model(
+		history_date=history_date,
+		history_user=history_user,
+		history_change_reason=change_reason,
+		history_type=history_type,
+		**attrs,
+	)
+	pre_create_historical_record.send(
+		sender=history_model,
+		instance=instance,
+		history_date=history_date,
+		history_user=history_user,
+		history_change_reason=change_reason,
+		history_instance=row,
+		using=None,
+	)
+	return row
+
+
+def _write_history(history_model, instances, rows, batch_size):
+	"""Insert *rows* (one per entry of *instances*, same order) with the M2M
+	snapshots of their instances' current links, then notify receivers."""
+	rows = history_model.objects.bulk_create(rows, batch_size=batch_size)
+
+	rows_by_pk = defaultdict(list)
+	for instance, row in zip(instances, rows):
+		rows_by_pk[instance.pk].append(row)
+	for field in getattr(history_model, "_history_m2m_fields", ()):
+		m2m_history_model = HistoricalRecords.m2m_models[field]
+		through = field.remote_field.through
+		owner = f"{utils.get_m2m_field_name(field)}_id"
+		through_fields = [f.attname for f in through._meta.fields]
+		links = through.objects.filter(**{f"{owner}__in": list(rows_by_pk)}).values(*through_fields)
+		m2m_history_model.objects.bulk_create(
+			[
+				m2m_history_model(history=row, **link)
+				for link in links
+				for row in rows_by_pk[link[owner]]
+			],
+			batch_size=batch_size,
+		)
+
+	post_bulk_create_historical_records.send(
+		sender=history_model, instances=instances, history_instances=rows
+	)
+	return rows
+
+
+def bulk_create_history(instances, update=False, default_change_reason="", batch_size=500):
+	"""
+	Record one historical row per saved instance in *instances* (all of one
+	model), as of their current in-memory state and M2M links: "+" rows, or
+	"~" rows with update=True. Each instance's ``_change_reason`` and
+	``_history_user`` are honoured as in save(). Returns the historical rows.
+	"""
+	instances = [instance for instance in instances if instance.pk is not None]
+	if not instances:
+		return []
+	history_model = type(instances[0]).history.model
+	history_type = "~" if update else "+"
+	now = timezone.now()
+
+	rows = [
+		_build_history_row(
+			history_model,
+			instance,
+			history_type,
+			history_date=getattr(instance, "_history_date", now),
+			history_user=getattr(
+				instance, "_history_user", history_model.get_default_history_user(instance)
+			),
+			change_reason=get_change_reason_from_object(instance) or default_change_reason,
+		)
+		for instance in instances
+	]
+	return _write_history(history_model, instances, rows, batch_size)
+
+
+class HistoryBuffer:
+	"""Historical rows recorded inside a deferred_history() block, waiting to
+	be written. Rows are grouped per history model in recording order."""
+
+	def __init__(self, batch_size=500):
+		self.batch_size = batch_size
+		self.depth = len(connection.atomic_blocks)
+		self.pending = defaultdict(list)
+
+	def __len__(self):
+		return sum(len(entries) for entries in self.pending.values())
+
+	def accepts(self):
+		# A row saved inside an atomic block opened within the deferred block
+		# is written at once, like save() does: that block may roll back
+		# after the row is buffered, and the buffer cannot tell.
+		return len(connection.atomic_blocks) == self.depth
+
+	def add(self, history_model, instance, row):
+		self.pending[history_model].append((instance, row))
+
+	def flush(self):
+		"""Write the buffered rows. Returns how many were written."""
+		pending, self.pending = self.pending, defaultdict(list)
+		written = 0
+		for history_model, entries in pending.items():
+			instances = [instance for instance, _ in entries]
+			rows = [row for _, row in entries]
+			written += len(_write_history(history_model, instances, rows, self.batch_size))
+		return written
+
+	def discard(self):
+		self.pending = defaultdict(list)
+
+
+@contextmanager
+def deferred_history(batch_size=500):
+	"""
+	Defer the historical rows of BatchedHistoricalRecords models saved inside
+	the block and write them in bulk when it exits (or at each
+	``buffer.flush()``)::
+
+		with deferred_history() as history:
+			for batch in batches:
+				...  # per-row save()s, as before
+				history.flush()
+
+	Each row still snapshots its instance's fields, change reason, user and
+	API key at save time; M2M snapshots (Trials) are taken at flush. Open the
+	block outside the transaction of the writes it defers, or inside it with
+	the flush before the transaction ends: rows are written in the
+	connection's current transaction. If the block exits with an exception
+	while that transaction is marked for rollback, the buffer is discarded.
+	"""
+	buffer = HistoryBuffer(batch_size=batch_size)
+	token = _active_buffer.set(buffer)
+	try:
+		yield buffer
+	except BaseException:
+		_active_buffer.reset(token)
+		if connection.needs_rollback:
+			buffer.discard()
+		else:
+			buffer.flush()
+		raise
+	_active_buffer.reset(token)
+	buffer.flush()
+
+
+class BatchedHistoricalRecords(HistoricalRecords):
+	"""HistoricalRecords whose rows go to the active deferred_history() buffer,
+	when there is one, instead of being inserted one save() at a time."""
+
+	def create_historical_record(self, instance, history_type, using=None):
+		buffer = _active_buffer.get()
+		if buffer is None or not buffer.accepts():
+			return super().create_historical_record(instance, history_type, using=using)
+		history_model = getattr(instance, self.manager_name).model
+		row = _build_history_row(
+			history_model,
+			instance,
+			history_type,
+			history_date=getattr(instance, "_history_date", timezone.now()),
+			history_user=self.get_history_user(instance),
+			change_reason=self.get_change_reason_for_object(instance, history_type, using),
+		)
+		buffer.add(history_model, instance, row)
+
+
+def trim_history(history_model, object_ids, keep):
+	"""Delete all but the *keep* newest historical rows of each object in
+	*object_ids*, in one ranking query and one DELETE."""
+	pk_name = history_model.instance_type._meta.pk.attname
+	stale = list(
+		history_model.objects.filter(**{f"{pk_name}__in": list(object_ids)})
+		.annotate(
+			rank=Window(
+				RowNumber(),
+				partition_by=[F(pk_name)],
+				order_by=[F("history_date").desc(), F("history_id").desc()],
+			)
+		)
+		.filter(rank__gt=keep)
+		.values_list("history_id", flat=True)
+	)
+	if stale:
+		history_model.objects.filter(history_id__in=stale).delete()
+	return len(stale)
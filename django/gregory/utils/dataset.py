@@ -5,17 +5,26 @@ This module provides functions to collect article data, build datasets,
 and split data for training, validation, and testing of ML models.
 """
 
+import hashlib
 import logging
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional, Tuple
 
 import pandas as pd
 from django.db.models import QuerySet
 from sklearn.model_selection import train_test_split
 
-from gregory.models import Articles, Team, Subject
+from gregory.models import ArticleSubjectRelevance, Articles, Team, Subject
 from gregory.utils.text_utils import cleanHTML, cleanText, MIN_WORD_COUNT
 
+# Bump when build_dataset's output for the same labels changes (cleaning,
+# columns), so cached datasets built the old way stop matching.
+DATASET_CACHE_VERSION = 1
+
+# Cached datasets kept per subject; older snapshots are deleted on write.
+DATASET_CACHE_KEEP = 3
+
 
 def collect_articles(
 	team_slug: str, subject_slug: str, window_days: Optional[int] = None
@@ -250,3 +259,97 @@ def train_val_test_split(
 	)
 
 	return train_df, val_df, test_df
+
+
+def label_snapshot_hash(
+	team_slug: str, subject_slug: str, window_days: Optional[int] = None
+) -> str:
+	"""
+	Hash of everything build_dataset's output depends on for a subject: each
+	reviewed article's id, label and last_updated (edits to title or summary
+	bump it), the window, and DATASET_CACHE_VERSION/MIN_WORD_COUNT.
+
+	One query over ArticleSubjectRelevance, without loading any text, so it
+	is cheap to check before deciding whether a cached dataset is still valid.
+
+	Returns:
+	    str: A 16-character hex digest
+	"""
+	team = Team.objects.get(slug=team_slug)
+	subject = Subject.objects.get(subject_slug=subject_slug, team=team)
+
+	relevances = ArticleSubjectRelevance.objects.filter(
+		subject=subject,
+		is_relevant__isnull=False,
+		article__teams=team,
+		article__subjects=subject,
+	)
+	if window_days is not None:
+		cutoff_date = datetime.now() - timedelta(days=window_days)
+		relevances = relevances.filter(article__discovery_date__gte=cutoff_date)
+
+	digest = hashlib.sha256(
+		f"v{DATASET_CACHE_VERSION}:{MIN_WORD_COUNT}:{window_days}".encode()
+	)
+	for article_id, is_relevant, last_updated in relevances.order_by(
+		"article_id"
+	).values_list("article_id", "is_relevant", "article__last_updated").iterator(
+		chunk_size=5000
+	):
+		digest.update(f"|{article_id}:{int(is_relevant)}:{last_updated}".encode())
+	return digest.hexdigest()[:16]
+
+
+def load_or_build_dataset(
+	team_slug: str,
+	subject_slug: str,
+	window_days: Optional[int],
+	cache_dir: Path,
+	use_cache: bool = True,
+) -> Tuple[pd.DataFrame, str, bool]:
+	"""
+	collect_articles + build_dataset, cached on disk under the label
+	snapshot hash, so every algorithm (and every rerun) trained on the same
+	labels reuses one build instead of re-cleaning every abstract.
+
+	The cache file is a CSV in the format export_training_data writes, so a
+	cached snapshot can also be fed to ``train_models --dataset-file``.
+
+	Args:
+	    team_slug (str): The team slug
+	    subject_slug (str): The subject slug
+	    window_days (Optional[int]): As for collect_articles
+	    cache_dir (Path): Directory for this subject's cached datasets
+	    use_cache (bool, optional): Read an existing snapshot. When False the
+	        dataset is rebuilt (and the cache rewritten). Defaults to True.
+
+	Returns:
+	    Tuple[pd.DataFrame, str, bool]: The dataset, its snapshot hash, and
+	        whether it came from the cache
+	"""
+	snapshot = label_snapshot_hash(team_slug, subject_slug, window_days)
+	cache_path = Path(cache_dir) / f"{snapshot}.csv"
+
+	if use_cache and cache_path.exists():
+		logging.info(f"Using cached dataset {cache_path}")
+		return pd.read_csv(cache_path), snapshot, True
+
+	subject = Subject.objects.get(subject_slug=subject_slug, team__slug=team_slug)
+	dataset_df = build_dataset(
+		collect_articles(team_slug, subject_slug, window_days), subject
+	)
+
+	# An empty frame has no columns to write; there is nothing worth caching.
+	if len(dataset_df):
+		cache_path.parent.mkdir(parents=True, exist_ok=True)
+		# Write then rename, so a concurrent reader never sees half a file.
+		partial_path = cache_path.with_suffix(".csv.partial")
+		dataset_df.to_csv(partial_path, index=False)
+		partial_path.replace(cache_path)
+		stale = sorted(
+			cache_path.parent.glob("*.csv"), key=lambda path: path.stat().st_mtime
+		)[:-DATASET_CACHE_KEEP]
+		for path in stale:
+			path.unlink(missing_ok=True)
+
+	return dataset_df, snapshot, False
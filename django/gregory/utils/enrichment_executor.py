@@ -0,0 +1,249 @@
+"""
+Concurrent executor for the pipeline enrichment tasks (find_doi,
+update_articles_info, get_authors).
+
+Each of those commands used to walk its due articles one at a time, blocking
+on CrossRef (and Unpaywall inside SciencePaper.refresh) for every row.
+`EnrichmentExecutor.run()` splits the work the way the CTIS fetcher does
+(gregory.utils.rate_limit): network lookups run on a pool of worker threads,
+paced by one shared TokenBucket per external API, and every database write
+happens on the calling thread — the single writer — as results arrive. The
+history rows of each batch's writes are deferred and inserted in bulk at the
+end of the batch (gregory.utils.bulk_history.deferred_history).
+
+The backoff markers of gregory.utils.enrichment double as a durable work
+queue. Due rows are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED
+and their marker is pushed `CLAIM_LEASE` into the future in the same
+transaction, so a second process running the same command (or an overlapping
+pipeline run) claims different rows instead of repeating the same lookups.
+The enrichment contract is unchanged:
+
+- the writer still clears the marker on success and records a fruitless
+  attempt when the API answered with nothing useful — both overwrite the
+  lease;
+- a lookup that failed (network error, timeout, 429/5xx after the retries)
+  is not a completed attempt, so its marker is put back to what it was
+  before the claim and the next run retries it;
+- a process that dies mid-run leaves its claims to expire after CLAIM_LEASE.
+
+Fetch callables run off the main thread, so they must not use the ORM; the
+commands resolve site settings up front and hand them in.
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from gregory.utils.bulk_history import deferred_history
+from gregory.utils.enrichment import due_filter
+from gregory.utils.rate_limit import RETRYABLE_STATUSES, TokenBucket, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+# Requests per second per API, shared by every worker thread of a process.
+# CrossRef's polite pool (requests carrying a mailto etiquette) allows
+# considerably more; Unpaywall asks for no more than 100k calls a day.
+API_RATES = {
+	"crossref": 10.0,
+	"unpaywall": 5.0,
+}
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 100
+
+# How long a claimed row stays invisible to other runs if this one dies
+# before writing it back.
+CLAIM_LEASE = timedelta(hours=1)
+
+# Attempts beyond the first for a 429/5xx answer, with exponential backoff
+# (or the server's Retry-After) between them; this replaces the fixed 5 s
+# sleeps update_articles_info used to retry with.
+MAX_RETRIES = 3
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def api_limiter(api: str) -> TokenBucket:
+	"""The process-wide TokenBucket for *api* (a key of API_RATES)."""
+	with _buckets_lock:
+		if api not in _buckets:
+			_buckets[api] = TokenBucket(API_RATES[api])
+		return _buckets[api]
+
+
+class FetchFailed(Exception):
+	"""A lookup that did not complete (the API never gave a usable answer).
+	Raise it from a fetch callable that reports errors by return value, such
+	as SciencePaper.refresh(); `response` lets a 429/5xx slow the API down."""
+
+	def __init__(self, message, response=None):
+		super().__init__(message)
+		self.response = response
+
+
+def _response_status(exc):
+	return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def claim_due(queryset, marker: str, limit: int, after=None) -> dict:
+	"""
+	Claim up to *limit* rows of *queryset* whose *marker* is due (and whose
+	pk is above *after*, when given): lock them with SKIP LOCKED, push the
+	marker CLAIM_LEASE ahead and commit. Returns {pk: marker value before the
+	claim}, for release_claims().
+
+	The lock is taken on the model's own table through a pk__in subquery, as
+	the enrichment querysets use DISTINCT and outer joins that FOR UPDATE
+	cannot be combined with.
+	"""
+	model = queryset.model
+	due = model.objects.filter(due_filter(marker), pk__in=queryset.values("pk"))
+	if after is not None:
+		due = due.filter(pk__gt=after)
+	with transaction.atomic():
+		claimed = dict(
+			due.select_for_update(skip_locked=True)
+			.order_by("pk")
+			.values_list("pk", marker)[:limit]
+		)
+		if claimed:
+			model.objects.filter(pk__in=claimed).update(
+				**{marker: timezone.now() + CLAIM_LEASE}
+			)
+	return claimed
+
+
+def release_claims(model, marker: str, previous: dict):
+	"""Put the markers of claimed rows that were not written back to their
+	pre-claim values (queryset updates: no history rows for a no-op)."""
+	by_value = {}
+	for pk, value in previous.items():
+		by_value.setdefault(value, []).append(pk)
+	for value, pks in by_value.items():
+		model.objects.filter(pk__in=pks).update(**{marker: value})
+
+
+@dataclass
+class EnrichmentStats:
+	claimed: int = 0
+	written: int = 0
+	failed: int = 0
+
+
+class EnrichmentExecutor:
+	"""
+	Runs ``fetch(row)`` for every due row of a queryset on *workers* threads
+	and ``write(row, result)`` on the calling thread as results come in.
+
+	*apis* names the API_RATES buckets one fetch draws from: a token of each
+	is taken before every attempt, and a 429/5xx answer throttles all of
+	them. A fetch that raises is reported to ``on_error(row, exc)`` (on the
+	calling thread) and its claim is released at the end of the run.
+	"""
+
+	def __init__(self, apis, workers: int = DEFAULT_WORKERS, max_retries: int = MAX_RETRIES):
+		self.limiters = [api_limiter(api) for api in apis]
+		self.workers = max(1, workers)
+		self.max_retries = max_retries
+
+	def _fetch(self, fetch, row):
+		backoff = BACKOFF_BASE
+		for attempt in range(self.max_retries + 1):
+			for limiter in self.limiters:
+				limiter.acquire()
+			try:
+				result = fetch(row)
+			except Exception as exc:
+				if attempt < self.max_retries and _response_status(exc) in RETRYABLE_STATUSES:
+					delay = retry_after_seconds(exc.response, backoff)
+					logger.warning(f"Enrichment lookup throttled ({exc}); retrying in {delay:.1f}s")
+					for limiter in self.limiters:
+						limiter.throttled(pause=delay)
+					backoff = min(backoff * 2, BACKOFF_MAX)
+					continue
+				raise
+			for limiter in self.limiters:
+				limiter.succeeded()
+			return result
+
+	def _worker(self, fetch, tasks, results):
+		while True:
+			row = tasks.get()
+			if row is None:
+				return
+			try:
+				results.put((row, self._fetch(fetch, row), None))
+			except Exception as exc:
+				results.put((row, None, exc))
+
+	def run(
+		self,
+		queryset,
+		marker: str,
+		fetch,
+		write,
+		on_error=None,
+		batch_size: int = DEFAULT_BATCH_SIZE,
+		limit: int | None = None,
+	) -> EnrichmentStats:
+		"""Process every due row of *queryset* (at most *limit*), claiming
+		*batch_size* rows at a time in pk order. Returns the run's counts.
+
+		A run passes over the table once: a row written back as due again
+		(e.g. its marker cleared while fields are still missing) waits for
+		the next run instead of being claimed again."""
+		model = queryset.model
+		stats = EnrichmentStats()
+		unreleased = {}
+		last_pk = None
+		tasks, results = queue.Queue(), queue.Queue()
+		threads = [
+			threading.Thread(target=self._worker, args=(fetch, tasks, results), daemon=True)
+			for _ in range(self.workers)
+		]
+		for thread in threads:
+			thread.start()
+		try:
+			while limit is None or stats.claimed < limit:
+				size = batch_size if limit is None else min(batch_size, limit - stats.claimed)
+				claimed = claim_due(queryset, marker, size, after=last_pk)
+				if not claimed:
+					break
+				last_pk = max(claimed)
+				unreleased.update(claimed)
+				stats.claimed += len(claimed)
+				rows = list(model.objects.filter(pk__in=claimed).order_by("pk"))
+				for row in rows:
+					tasks.put(row)
+				# The batch's history rows are written together when it ends
+				with deferred_history():
+					for _ in rows:
+						row, result, error = results.get()
+						if error is not None:
+							stats.failed += 1
+							if on_error is not None:
+								on_error(row, error)
+							continue
+						write(row, result)
+						unreleased.pop(row.pk, None)
+						stats.written += 1
+				# Rows deleted since the claim (e.g. merged away) have nothing
+				# to release
+				for pk in set(claimed) - {row.pk for row in rows}:
+					unreleased.pop(pk, None)
+		finally:
+			for _ in threads:
+				tasks.put(None)
+			for thread in threads:
+				thread.join()
+			if unreleased:
+				release_claims(model, marker, unreleased)
+		return stats
@@ -0,0 +1,122 @@
+"""
+Client-side pacing for the external registries and APIs Gregory pulls from.
+
+`TokenBucket` is a thread-safe token bucket whose refill rate adapts to the
+server: `throttled()` halves it (and pauses every caller) when the server
+answers 429/5xx, `succeeded()` creeps it back towards the configured rate.
+That replaces the fixed `time.sleep()` between requests the fetchers used
+to do, which was both too slow when the server was idle and too fast when
+it was shedding load.
+
+`retry_after_seconds` reads a response's Retry-After header (seconds form
+only; the HTTP-date form is rare on APIs and falls back to the caller's
+own backoff).
+
+`map_in_order` fans I/O calls out over a thread pool and hands results back
+in input order, so a command can fetch concurrently and still process (and
+write) sequentially, exactly as before.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Statuses that mean "slow down and try again", not "this request is wrong".
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+	"""
+	Thread-safe token bucket. `acquire()` blocks until a token is available,
+	so any number of worker threads can share one bucket and together never
+	exceed *rate* requests per second (bursting up to *capacity*).
+
+	The effective rate adapts (AIMD): `throttled()` halves it, down to
+	*min_rate*; `succeeded()` adds back a tenth of the configured rate per
+	call, up to the configured rate.
+	"""
+
+	def __init__(self, rate: float, capacity: float | None = None, min_rate: float | None = None):
+		if rate <= 0:
+			raise ValueError("rate must be positive")
+		self.max_rate = float(rate)
+		self.rate = float(rate)
+		self.min_rate = float(min_rate) if min_rate else self.max_rate / 16
+		self.capacity = float(capacity) if capacity else max(1.0, self.max_rate)
+		self._tokens = self.capacity
+		self._updated_at = time.monotonic()
+		self._paused_until = 0.0
+		self._lock = threading.Lock()
+
+	def _refill(self, now: float):
+		elapsed = max(0.0, now - self._updated_at)
+		self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+		self._updated_at = now
+
+	def acquire(self):
+		"""Block until one token is available, then take it."""
+		while True:
+			with self._lock:
+				now = time.monotonic()
+				if now < self._paused_until:
+					wait = self._paused_until - now
+				else:
+					self._refill(now)
+					if self._tokens >= 1:
+						self._tokens -= 1
+						return
+					wait = (1 - self._tokens) / self.rate
+			time.sleep(wait)
+
+	def throttled(self, pause: float = 0.0):
+		"""The server pushed back: halve the rate, drop any saved-up burst, and
+		hold every caller for *pause* seconds (e.g. the Retry-After value)."""
+		with self._lock:
+			self.rate = max(self.min_rate, self.rate / 2)
+			self._tokens = 0.0
+			self._updated_at = time.monotonic()
+			if pause > 0:
+				self._paused_until = max(self._paused_until, self._updated_at + pause)
+
+	def succeeded(self):
+		"""A request went through: recover a step towards the configured rate."""
+		if self.rate >= self.max_rate:
+			return
+		with self._lock:
+			self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def retry_after_seconds(response, default: float) -> float:
+	"""Seconds to wait before retrying *response*, from its Retry-After header
+	when it carries a number of seconds, else *default*."""
+	headers = getattr(response, "headers", None) or {}
+	raw = headers.get("Retry-After") if hasattr(headers, "get") else None
+	try:
+		return max(0.0, float(raw))
+	except (TypeError, ValueError):
+		return default
+
+
+def map_in_order(func, items, max_workers: int) -> list:
+	"""
+	Call ``func(item)`` for every item on up to *max_workers* threads and
+	return ``[(result, error), ...]`` aligned with *items* — one of the two
+	is always None. A failure never cancels the other calls; the caller
+	decides per item what an error means.
+
+	Meant for I/O only: the worker threads must not touch the Django ORM
+	(each thread would open its own connection), so callers fetch
+	concurrently here and write from their own thread afterwards.
+	"""
+
+	def call(item):
+		try:
+			return func(item), None
+		except Exception as e:
+			return None, e
+
+	items = list(items)
+	if max_workers <= 1 or len(items) <= 1:
+		return [call(item) for item in items]
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+		return list(pool.map(call, items))
@@ -0,0 +1,379 @@
+"""
+Daily rollups behind the subject analytics dashboard and the categories
+endpoint's monthly counts (see ContentDailyRollup, CategoryDailyRollup and
+CategoryDailyMLRollup).
+
+refresh_rollups() recomputes whole days: every rollup row of a day is deleted
+and rewritten from grouped aggregates in one transaction, so a day is always
+internally consistent. A full refresh rewrites every day; the incremental
+refresh the pipeline runs rewrites only the days touched since the previous
+successful refresh started (see dirty_days and RollupRefreshState) plus the
+undated category rows. Changes that leave no
+trace on the articles or trials themselves (a category assignment removed
+from an old article, an article moved to another team) are picked up by the
+next full refresh.
+
+Reads sum the daily rows over a date range; category_monthly_counts answers
+the monthly_counts payload from them for any ML threshold on the
+1/ML_SCORE_BUCKETS grid and returns None for other thresholds, which the
+caller computes live.
+"""
+
+import datetime
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from gregory.models import (
+	Articles,
+	CategoryDailyMLRollup,
+	CategoryDailyRollup,
+	ContentDailyRollup,
+	MLPredictions,
+	RollupRefreshState,
+	RollupScope,
+	Trials,
+)
+
+ML_SCORE_BUCKETS = CategoryDailyMLRollup.ML_SCORE_BUCKETS
+WRITE_BATCH_SIZE = 1000
+
+# dirty_days looks back this far before the anchor. last_updated is stamped
+# when the writing statement runs, so a transaction that commits a moment
+# after the previous run's reads would otherwise fall before the anchor.
+REFRESH_OVERLAP = datetime.timedelta(minutes=5)
+
+
+def score_bucket(score):
+	"""The bucket k with k/ML_SCORE_BUCKETS <= score < (k+1)/ML_SCORE_BUCKETS,
+	compared against the same float thresholds a request would use."""
+	n = ML_SCORE_BUCKETS
+	bucket = min(max(math.floor(score * n), 0), n)
+	if bucket < n and score >= (bucket + 1) / n:
+		bucket += 1
+	elif bucket > 0 and score < bucket / n:
+		bucket -= 1
+	return bucket
+
+
+def threshold_bucket(threshold):
+	"""The bucket a threshold starts at, or None when it is not on the grid."""
+	bucket = round(threshold * ML_SCORE_BUCKETS)
+	if 0 <= bucket <= ML_SCORE_BUCKETS and bucket / ML_SCORE_BUCKETS == threshold:
+		return bucket
+	return None
+
+
+def _on_days(field, days):
+	"""Q for *field* falling on one of *days* (None: any day)."""
+	return Q() if days is None else Q(**{f"{field}__date__in": days})
+
+
+def last_refreshed_at():
+	"""Where the next incremental refresh starts: when the last successful
+	refresh began (see RollupRefreshState), or None before the first one."""
+	return (
+		RollupRefreshState.objects.filter(name=RollupRefreshState.DAILY_ROLLUPS)
+		.values_list("refreshed_through", flat=True)
+		.first()
+	)
+
+
+def dirty_days(since):
+	"""
+	Days whose rollups may have changed since *since*: the publication and
+	discovery days of articles and trials created or updated since, and the
+	publication days of articles predicted since.
+	"""
+	changed_articles = Articles.objects.filter(
+		Q(last_updated__gte=since) | Q(discovery_date__gte=since)
+	)
+	changed_trials = Trials.objects.filter(
+		Q(last_updated__gte=since) | Q(discovery_date__gte=since)
+	)
+	predicted_articles = Articles.objects.filter(
+		ml_predictions_detail__created_date__gte=since
+	)
+	days = set()
+	for queryset, field in (
+		(changed_articles, "published_date"),
+		(predicted_articles, "published_date"),
+		(changed_trials, "discovery_date"),
+		(changed_trials, "published_date"),
+	):
+		days.update(
+			queryset.filter(**{f"{field}__isnull": False})
+			.annotate(day=TruncDate(field))
+			.order_by()
+			.values_list("day", flat=True)
+			.distinct()
+		)
+	return days
+
+
+def refresh_rollups(full=False):
+	"""
+	Refresh the rollups: every day when *full* or when nothing has been rolled
+	up yet, otherwise the dirty days since the last refresh. Returns the
+	number of days rewritten (None for a full refresh).
+	"""
+	# The anchor is taken before anything is read. An item written while this
+	# run reads or writes is then dirty for the next run, where an anchor
+	# taken at write time (refreshed_at) would have skipped it for good.
+	started = timezone.now()
+	since = None if full else last_refreshed_at()
+	days = None if since is None else sorted(dirty_days(since - REFRESH_OVERLAP))
+	refresh_content_rollups(days)
+	refresh_category_rollups(days)
+	# Only once both families are rewritten: a failed category refresh leaves
+	# the anchor where it was, so the next run retries the same days.
+	RollupRefreshState.objects.update_or_create(
+		name=RollupRefreshState.DAILY_ROLLUPS,
+		defaults={"refreshed_through": started},
+	)
+	return None if days is None else len(days)
+
+
+def _bulk_create(model, rows):
+	model.objects.bulk_create(rows, batch_size=WRITE_BATCH_SIZE)
+
+
+def refresh_content_rollups(days=None):
+	"""Rewrite the ContentDailyRollup rows of *days* (None: all days)."""
+	counts = defaultdict(lambda: [0, 0])
+	for slot, (model, field) in enumerate(
+		((Articles, "published_date"), (Trials, "discovery_date"))
+	):
+		base = (
+			model.objects.filter(_on_days(field, days), **{f"{field}__isnull": False})
+			.annotate(day=TruncDate(field))
+			.order_by()
+		)
+		for day, n in base.values("day").annotate(n=Count("pk")).values_list("day", "n"):
+			counts[(RollupScope.ALL, None, None, None, day)][slot] = n
+		grouped = (
+			(RollupScope.ORGANIZATION, {"org": F("teams__organization")}),
+			(RollupScope.TEAM, {"team": F("teams")}),
+			(RollupScope.SUBJECT, {"subj": F("subjects"), "team": F("subjects__team")}),
+		)
+		for scope, keys in grouped:
+			rows = (
+				base.values("day", **keys)
+				.annotate(n=Count("pk", distinct=True))
+				.values("day", "n", *keys)
+			)
+			for row in rows.iterator():
+				key = (
+					scope,
+					row.get("org"),
+					row.get("team"),
+					row.get("subj"),
+					row["day"],
+				)
+				if key[1:4] == (None, None, None):
+					# Items with no team or subject only count towards "all"
+					continue
+				counts[key][slot] = row["n"]
+
+	rows = [
+		ContentDailyRollup(
+			scope=scope,
+			organization_id=org,
+			team_id=team,
+			subject_id=subject,
+			day=day,
+			articles=articles,
+			trials=trials,
+		)
+		for (scope, org, team, subject, day), (articles, trials) in counts.items()
+	]
+	with transaction.atomic():
+		stale = ContentDailyRollup.objects.all()
+		if days is not None:
+			stale = stale.filter(day__in=days)
+		stale.delete()
+		_bulk_create(ContentDailyRollup, rows)
+
+
+def refresh_category_rollups(days=None):
+	"""Rewrite the category rollup rows of *days* (None: all days) and the
+	undated rows."""
+	on_days = _on_days("published_date", days) | Q(published_date__isnull=True)
+	if days is None:
+		on_days = Q()
+
+	counts = defaultdict(lambda: [0, 0])
+	for slot, model in enumerate((Articles, Trials)):
+		rows = (
+			model.objects.filter(on_days)
+			.order_by()
+			.values(day=TruncDate("published_date"), category=F("team_categories"))
+			.annotate(n=Count("pk", distinct=True))
+			.values_list("category", "day", "n")
+		)
+		for category, day, n in rows.iterator():
+			if category is not None:
+				counts[(category, day)][slot] = n
+
+	ml_counts = _ml_bucket_counts(days)
+
+	with transaction.atomic():
+		for model in (CategoryDailyRollup, CategoryDailyMLRollup):
+			stale = model.objects.all()
+			if days is not None:
+				stale = stale.filter(Q(day__in=days) | Q(day__isnull=True))
+			stale.delete()
+		_bulk_create(
+			CategoryDailyRollup,
+			[
+				CategoryDailyRollup(
+					category_id=category, day=day, articles=articles, trials=trials
+				)
+				for (category, day), (articles, trials) in counts.items()
+			],
+		)
+		_bulk_create(
+			CategoryDailyMLRollup,
+			[
+				CategoryDailyMLRollup(
+					category_id=category,
+					day=day,
+					algorithm=algorithm,
+					score_bucket=bucket,
+					articles=n,
+				)
+				for (category, day, algorithm, bucket), n in ml_counts.items()
+			],
+		)
+
+
+def _ml_bucket_counts(days):
+	"""
+	Count the category articles of *days* (and undated ones) by the bucket of
+	their latest score per algorithm, and of their best latest score over all
+	algorithms (algorithm ""). As in the live monthly counts, the latest
+	prediction of an (article, algorithm) pair is the one with the newest
+	created_date, and tied latest rows count with their highest score.
+	"""
+	latest_date_per_pair = (
+		MLPredictions.objects.filter(
+			article=OuterRef("article"),
+			algorithm=OuterRef("algorithm"),
+		)
+		.values("article", "algorithm")
+		.annotate(latest=Max("created_date"))
+		.values("latest")[:1]
+	)
+	on_days = Q()
+	if days is not None:
+		on_days = _on_days("article__published_date", days) | Q(
+			article__published_date__isnull=True
+		)
+	rows = (
+		MLPredictions.objects.filter(
+			on_days,
+			algorithm__isnull=False,
+			created_date=Subquery(latest_date_per_pair),
+		)
+		.values(
+			category=F("article__team_categories"),
+			day=TruncDate("article__published_date"),
+			article_pk=F("article_id"),
+			alg=F("algorithm"),
+		)
+		.annotate(score=Max("probability_score"))
+		.order_by("category", "day", "article_pk")
+		.values_list("category", "day", "article_pk", "alg", "score")
+	)
+
+	counts = Counter()
+	current, best = None, None
+	for category, day, article_pk, algorithm, score in rows.iterator():
+		if category is None or score is None:
+			continue
+		counts[(category, day, algorithm, score_bucket(score))] += 1
+		key = (category, day, article_pk)
+		if key != current:
+			if current is not None:
+				counts[(current[0], current[1], "", score_bucket(best))] += 1
+			current, best = key, score
+		else:
+			best = max(best, score)
+	if current is not None:
+		counts[(current[0], current[1], "", score_bucket(best))] += 1
+	return counts
+
+
+def _as_month(value):
+	"""A month from TruncMonth over a DateField, as the aware datetime the live
+	TruncMonth over published_date returns, so the payload is unchanged."""
+	if value is None:
+		return None
+	return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def _month_order(entry):
+	# Undated items last, as PostgreSQL orders NULLs in an ascending sort
+	return (entry["month"] is None, entry["month"] or datetime.datetime.min)
+
+
+def category_monthly_counts(category, ml_threshold):
+	"""
+	The monthly_counts payload of the categories endpoint, from the rollups;
+	None when *ml_threshold* is not on the score bucket grid.
+	"""
+	bucket = threshold_bucket(ml_threshold)
+	if bucket is None:
+		return None
+
+	article_counts, trial_counts = [], []
+	for row in (
+		CategoryDailyRollup.objects.filter(category=category)
+		.annotate(month=TruncMonth("day"))
+		.values("month")
+		.annotate(articles=Sum("articles"), trials=Sum("trials"))
+		.order_by("month")
+	):
+		month = _as_month(row["month"])
+		if row["articles"]:
+			article_counts.append({"month": month, "count": row["articles"]})
+		if row["trials"]:
+			trial_counts.append({"month": month, "count": row["trials"]})
+
+	ml_rows = (
+		CategoryDailyMLRollup.objects.filter(category=category)
+		.annotate(month=TruncMonth("day"))
+		.values("month", "algorithm")
+		.annotate(count=Sum("articles", filter=Q(score_bucket__gte=bucket)))
+		.order_by("algorithm", "month")
+	)
+	available_models = []
+	ml_counts_by_model = {}
+	relevant_counts = []
+	for row in ml_rows:
+		algorithm = row["algorithm"]
+		if algorithm and algorithm not in ml_counts_by_model:
+			available_models.append(algorithm)
+			ml_counts_by_model[algorithm] = []
+		if not row["count"]:
+			continue
+		entry = {"month": _as_month(row["month"]), "count": row["count"]}
+		if algorithm:
+			ml_counts_by_model[algorithm].append(entry)
+		elif row["month"] is not None:
+			relevant_counts.append(entry)
+
+	for series in (*ml_counts_by_model.values(), relevant_counts):
+		series.sort(key=_month_order)
+	return {
+		"ml_threshold": ml_threshold,
+		"available_models": available_models,
+		"monthly_article_counts": article_counts,
+		"monthly_ml_article_counts_by_model": ml_counts_by_model,
+		"monthly_relevant_article_counts": relevant_counts,
+		"monthly_trial_counts": trial_counts,
+	}
@@ -0,0 +1,156 @@
+"""
+Maintenance of SourceStats, the per-source ingest statistics the Sources admin
+and the sources overview read instead of aggregating per row.
+
+- refresh_source_stats(source, ...) recomputes one source's row with a single
+  aggregate query and records the outcome of the fetch that just ran (last
+  fetch time, consecutive-failure streak, last error). The feedreaders call it
+  after each source they process.
+- rebuild_source_stats() recomputes the item statistics of every source with
+  one grouped query per content type and upserts the rows in batches. Fetch
+  outcome fields are left alone: only the feedreaders know them. The pipeline
+  runs it last so the 7/30-day windows of sources that were not fetched (RSS
+  sources that failed, inactive sources) keep moving.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from gregory.models import Articles, SourceStats, Sources, Trials
+
+UPSERT_BATCH_SIZE = 500
+LAST_ERROR_MAX_LENGTH = 2000
+
+ITEM_FIELDS = [
+	"last_item_date",
+	"item_count",
+	"items_last_7_days",
+	"items_last_30_days",
+	"updated_at",
+]
+
+
+def _date_field(source_for):
+	"""The date the health rule reads (see Sources.get_health_status())."""
+	return "last_updated" if source_for == "trials" else "published_date"
+
+
+def _item_aggregates(prefix, date_field, now):
+	"""Aggregate expressions over the items reached through *prefix* ("" for a
+	direct Articles/Trials queryset, "articles__"/"trials__" from Sources)."""
+	item = prefix.rstrip("_") or "pk"
+	return {
+		"last_item_date": Max(f"{prefix}{date_field}"),
+		"item_count": Count(item),
+		"items_last_7_days": Count(
+			item, filter=Q(**{f"{prefix}discovery_date__gte": now - timedelta(days=7)})
+		),
+		"items_last_30_days": Count(
+			item, filter=Q(**{f"{prefix}discovery_date__gte": now - timedelta(days=30)})
+		),
+	}
+
+
+def refresh_source_stats(source, fetch_ok=None, error=None, now=None):
+	"""
+	Recompute the item statistics of *source* and, when *fetch_ok* is given,
+	record the fetch that just ran: a success resets the error streak, a
+	failure extends it and keeps *error* as last_error.
+
+	Returns the saved SourceStats row.
+	"""
+	now = now or timezone.now()
+	model = Trials if source.source_for == "trials" else Articles
+	values = model.objects.filter(sources=source).aggregate(
+		**_item_aggregates("", _date_field(source.source_for), now)
+	)
+
+	stats, _ = SourceStats.objects.get_or_create(source=source)
+	for field, value in values.items():
+		setattr(stats, field, value)
+	if fetch_ok is not None:
+		stats.last_fetch_at = now
+		if fetch_ok:
+			stats.last_fetch_succeeded_at = now
+			stats.error_streak = 0
+			stats.last_error = ""
+		else:
+			stats.error_streak += 1
+			stats.last_error = str(error or "")[:LAST_ERROR_MAX_LENGTH]
+	stats.save()
+	return stats
+
+
+def rebuild_source_stats(sources=None, now=None):
+	"""
+	Recompute the item statistics of every source in *sources* (default: all)
+	in one pass and upsert their SourceStats rows. Returns the number of rows
+	written.
+	"""
+	now = now or timezone.now()
+	sources = Sources.objects.all() if sources is None else sources
+	groups = [
+		(sources.filter(source_for="trials"), "trials__", "last_updated"),
+		(sources.exclude(source_for="trials"), "articles__", "published_date"),
+	]
+
+	written = 0
+	batch = []
+	for queryset, prefix, date_field in groups:
+		rows = (
+			queryset.order_by()
+			.values("source_id")
+			.annotate(**_item_aggregates(prefix, date_field, now))
+		)
+		for row in rows.iterator(chunk_size=UPSERT_BATCH_SIZE):
+			batch.append(SourceStats(source_id=row.pop("source_id"), **row))
+			if len(batch) >= UPSERT_BATCH_SIZE:
+				written += _upsert(batch)
+				batch = []
+	if batch:
+		written += _upsert(batch)
+	return written
+
+
+def _upsert(batch):
+	SourceStats.objects.bulk_create(
+		batch,
+		update_conflicts=True,
+		unique_fields=["source"],
+		update_fields=ITEM_FIELDS,
+	)
+	return len(batch)
+
+
+def filter_by_health(queryset, status, now=None):
+	"""
+	Narrow a Sources queryset to one health status (see
+	gregory.models.health_from_last_date) in SQL, from the stored stats. A
+	source without a stats row has not been fetched or rebuilt yet and counts
+	as no_content.
+	"""
+	now = now or timezone.now()
+	# health_from_last_date compares whole days (``.days > 30``), so an item
+	# 30 days and some hours old is still healthy: warning starts at a full
+	# 31 days, error at a full 61.
+	warning_from = now - timedelta(days=31)
+	error_from = now - timedelta(days=61)
+	if status == "inactive":
+		return queryset.filter(active=False)
+	queryset = queryset.filter(active=True)
+	if status == "no_content":
+		return queryset.filter(
+			Q(stats__isnull=True) | Q(stats__last_item_date__isnull=True)
+		)
+	if status == "healthy":
+		return queryset.filter(stats__last_item_date__gt=warning_from)
+	if status == "warning":
+		return queryset.filter(
+			stats__last_item_date__gt=error_from,
+			stats__last_item_date__lte=warning_from,
+		)
+	if status == "error":
+		return queryset.filter(stats__last_item_date__lte=error_from)
+	return queryset
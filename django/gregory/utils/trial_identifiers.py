@@ -73,15 +73,59 @@ def _normalize_match(canonical_type: str, match: re.Match) -> str:
 	raise ValueError(f"Unhandled canonical_type: {canonical_type}")
 
 
+# Single-pass prefilter over the registry prefixes (plus the EudraCT/CTIS digit
+# shape). Most article text cites no registry at all, so one scan of this
+# alternation lets extract_identifiers skip all of PATTERNS for it, and for the
+# rest run only the families whose prefix actually appears. The lookahead makes
+# every match zero-width, so one prefix can never hide another that starts
+# inside it (finditer would otherwise resume after the consumed span).
+_PREFILTER_FAMILIES: dict[str, tuple[str, ...]] = {
+	"NCT": ("nct",),
+	"ISRCTN": ("isrctn",),
+	"ACTRN": ("actrn",),
+	"DRKS": ("drks",),
+	"CTRI/": ("ctri",),
+	"PACTR": ("pactr",),
+	"RPCEC": ("rpcec",),
+	"TCTR": ("tctr",),
+	"SLCTR/": ("slctr",),
+	"ITMCTR": ("itmctr",),
+	"UMIN": ("umin",),
+	"JRCT": ("jrct",),
+	"RBR": ("rbr",),
+	"IRCT": ("irct",),
+	"CHICTR": ("chictr",),
+}
+_DIGIT_FAMILIES = ("ctis", "eudract")
+PREFILTER = re.compile(
+	r"(?=("
+	+ "|".join(re.escape(prefix) for prefix in _PREFILTER_FAMILIES)
+	+ r"|\d{4}-\d{6}-\d{2}))",
+	_FLAGS,
+)
+_PATTERNS_BY_TYPE = dict(PATTERNS)
+
+
+def candidate_types(text: str | None) -> list[str]:
+	"""Return the PATTERNS types worth running on *text*, in PATTERNS order,
+	from one pass of the combined prefilter. Empty when the text cites no
+	registry at all."""
+	if not text:
+		return []
+	families: set[str] = set()
+	for match in PREFILTER.finditer(text):
+		token = match.group(1).upper()
+		families.update(_PREFILTER_FAMILIES.get(token, _DIGIT_FAMILIES))
+	return [canonical_type for canonical_type, _ in PATTERNS if canonical_type in families]
+
+
 def extract_identifiers(text: str | None) -> set[tuple[str, str]]:
 	"""Return the set of (canonical_type, canonical_value) identifiers found
 	in *text*. Safe to call on both article text and a trial's identifier
 	values — both sides land in the same canonical space."""
-	if not text:
-		return set()
 	found: set[tuple[str, str]] = set()
-	for canonical_type, pattern in PATTERNS:
-		for match in pattern.finditer(text):
+	for canonical_type in candidate_types(text):
+		for match in _PATTERNS_BY_TYPE[canonical_type].finditer(text):
 			found.add((canonical_type, _normalize_match(canonical_type, match)))
 	return found
 
@@ -93,3 +137,22 @@ def extract_identifiers_from_trial_identifiers(identifiers: dict | None) -> set[
 		return set()
 	blob = " ".join(str(v) for v in identifiers.values() if v)
 	return extract_identifiers(blob)
+
+
+def search_fragment(canonical_type: str, canonical_value: str) -> str:
+	"""Return an uppercase substring every article text citing this identifier
+	must contain, for a database-side prefilter (``usummary__contains``) before
+	the text is confirmed with extract_identifiers.
+
+	Only the parts PATTERNS let vary are dropped: the optional separator after
+	NCT/RBR, and ChiCTR's free-form dashes (where the longest segment is kept).
+	"""
+	value = canonical_value.upper()
+	if canonical_type == "nct":
+		return value[len("NCT") :]
+	if canonical_type == "rbr":
+		return value[len("RBR-") :]
+	if canonical_type == "chictr":
+		segments = value[len("CHICTR") :].split("-")
+		return max(segments, key=len) or value
+	return value
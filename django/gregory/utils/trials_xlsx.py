@@ -0,0 +1,942 @@
+"""
+Write-only XLSX export of clinical trials, shared by the export_trials_xlsx
+command and ``/trials/?format=xlsx``.
+
+The export used to build a regular openpyxl Workbook, holding every cell of
+every sheet in memory until ``wb.save``; a full export OOM-killed the worker.
+Sheets here are openpyxl write-only worksheets: each row is serialised to a
+temporary file as it is appended, so memory stays bounded by one batch of
+trials however large the export. Trials are read with ``.iterator()`` and
+their relations are prefetched one batch (EXPORT_BATCH_SIZE) at a time.
+
+Write-only sheets cannot be revisited, so each sheet is written top to bottom
+and its column widths, frozen panes and filters are set before the first row.
+"""
+
+import json
+import re
+from datetime import datetime, date, timezone as dt_timezone
+
+from django.db.models import GeneratedField, Count, QuerySet, prefetch_related_objects
+from django.db.models.functions import Lower
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+
+from gregory.models import Trials, TeamCategory
+
+# Trials read (and relations prefetched) per query batch.
+EXPORT_BATCH_SIZE = 500
+
+# Relations the data rows read.
+EXPORT_PREFETCH = (
+	"subjects",
+	"teams",
+	"sources",
+	"team_categories",
+	"article_references__article",
+	"trial_countries",
+)
+
+EXCLUDED_SCALARS = frozenset({"utitle", "usummary"})
+EXCLUDED_M2M = frozenset({"ml_predictions"})
+
+# Ordered column groups for data sheets
+IDENTITY_COLS = [
+	"trial_id",
+	"title",
+	"acronym",
+	"scientific_title",
+	"link",
+	"discovery_date",
+	"last_updated",
+	"published_date",
+	"date_registration",
+	"last_refreshed_on",
+	"export_date",
+]
+
+SCALAR_ORDER = [
+	"summary",
+	"internal_number",
+	"secondary_id",
+	"source_register",
+	"other_records",
+	"prospective_registration",
+	"study_type",
+	"study_type_normalized",
+	"study_design",
+	"phase",
+	"phase_normalized",
+	"recruitment_status",
+	"recruitment_status_normalized",
+	"target_size",
+	"date_enrollement",
+	"countries",
+	"countries_by_source",
+	"regions_normalized",
+	"condition",
+	"intervention",
+	"primary_outcome",
+	"secondary_outcome",
+	"inclusion_criteria",
+	"exclusion_criteria",
+	"inclusion_agemin",
+	"inclusion_agemax",
+	"inclusion_gender",
+	"inclusion_gender_normalized",
+	"primary_sponsor",
+	"secondary_sponsor",
+	"source_support",
+	"sponsor_type",
+	"lead_sponsor_class",
+	"contact_firstname",
+	"contact_lastname",
+	"contact_address",
+	"contact_email",
+	"contact_tel",
+	"contact_affiliation",
+	"ethics_review_status",
+	"ethics_review_approval_date",
+	"ethics_review_contact_name",
+	"ethics_review_contact_address",
+	"ethics_review_contact_phone",
+	"ethics_review_contact_email",
+	"results_posted",
+	"results_date_completed",
+	"results_url_link",
+	"results_yes_no",
+	"results_ipd_plan",
+	"results_ipd_description",
+	"therapeutic_areas",
+	"country_status",
+	"trial_region",
+	"overall_decision_date",
+	"countries_decision_date",
+	"ctg_detailed_description",
+]
+
+RELATION_COLS = [
+	"subjects",
+	"teams",
+	"sources",
+	"team_categories",
+	"articles",
+	"trial_countries",
+	"sponsor_id",
+	"sponsor_slug",
+	"primary_sponsor_normalized",
+	"sponsor_type_normalized",
+	"sponsor_type_source",
+]
+
+# Descriptions for exported columns absent from TrialAdminForm.Meta.help_texts.
+# Format: field_name → (label, description, source_registries)
+EXTRA_GLOSSARY = {
+	"trial_id": (
+		"Trial ID",
+		"Internal Gregory database identifier for this trial record.",
+		"",
+	),
+	"summary": (
+		"Summary",
+		"Plain-language summary of the trial.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"discovery_date": (
+		"Discovery date",
+		"Date this trial was first added to Gregory.",
+		"",
+	),
+	"last_updated": (
+		"Last updated",
+		"Date and time this record was last modified in Gregory.",
+		"",
+	),
+	"identifiers_json": (
+		"Identifiers (raw JSON)",
+		"Raw JSON dict of all registry identifiers for this trial.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"subjects": (
+		"Subjects",
+		"Research subjects this trial is assigned to in Gregory (semicolon-separated).",
+		"",
+	),
+	"teams": (
+		"Teams",
+		"Teams this trial is assigned to in Gregory (semicolon-separated).",
+		"",
+	),
+	"sources": (
+		"Sources",
+		"Registry sources that provided data for this trial (semicolon-separated).",
+		"",
+	),
+	"team_categories": (
+		"Categories",
+		"Team categories assigned to this trial (semicolon-separated). See the "
+		"Categories sheet for each category's description and search terms.",
+		"",
+	),
+	"articles": (
+		"Related articles",
+		"Count of articles that reference this trial, followed by their URLs.",
+		"",
+	),
+	"therapeutic_areas": (
+		"Therapeutic areas",
+		"Therapeutic areas covered by the trial.",
+		"EU CTIS",
+	),
+	"country_status": (
+		"Country status",
+		"Authorisation status of the trial in each participating country.",
+		"EU CTIS",
+	),
+	"countries_by_source": (
+		"Countries by source",
+		"Raw per-source country lists as a JSON map keyed by registry slug "
+		"(ctgov, ictrp). Each importer writes only its own key, so sources no longer "
+		"overwrite each other's country data (the flat countries column is last-writer-wins).",
+		"WHO ICTRP, ClinicalTrials.gov",
+	),
+	"regions_normalized": (
+		"Regions (normalized)",
+		"Continental regions derived from the trial's normalized countries "
+		"(africa, asia, europe, north_america, south_america, oceania), plus any "
+		"literal region tokens found in the raw country data.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"trial_countries": (
+		"Countries (normalized)",
+		"Per-country breakdown: display name and ISO 3166-1 alpha-2 code, with EU CTIS "
+		"authorisation status, decision date, and contributing source slugs where known. "
+		'Format: "Germany [DE] (recruiting; 2024-07-19; src: ctgov+ctis); …".',
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"trial_region": ("Trial region", "Geographic region of the trial.", "EU CTIS"),
+	"overall_decision_date": (
+		"Overall decision date",
+		"Date of the overall regulatory decision for the trial.",
+		"EU CTIS",
+	),
+	"countries_decision_date": (
+		"Countries decision dates",
+		"JSON map of per-country regulatory decision dates.",
+		"EU CTIS",
+	),
+	"sponsor_type": (
+		"Sponsor type (raw)",
+		"Sponsor category as reported verbatim by EU CTIS (e.g. \"Pharmaceutical "
+		"company\"). Populated for EU CTIS trials only — see sponsor_type_normalized "
+		"for a canonical category derived across all three registries.",
+		"EU CTIS",
+	),
+	"lead_sponsor_class": (
+		"Lead sponsor class (CTGov)",
+		"Sponsor agency class as classified by ClinicalTrials.gov (e.g. INDUSTRY, NIH, "
+		"FED, OTHER_GOV, INDIV, NETWORK, OTHER, AMBIG, UNKNOWN). One of the signals "
+		"feeding sponsor_type_normalized.",
+		"ClinicalTrials.gov",
+	),
+	"sponsor_id": (
+		"Sponsor ID (canonical)",
+		"Database id of the canonical sponsor entity — stable across spelling-variant "
+		"merges, so it's the reliable join key for grouping/joining against the "
+		"/sponsors/ API endpoint. Blank when primary_sponsor is empty.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"sponsor_slug": (
+		"Sponsor slug (canonical)",
+		"URL-safe slug of the canonical sponsor entity, as used by the /sponsors/ API "
+		"endpoint's sponsor_slug filter. Blank when primary_sponsor is empty.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"primary_sponsor_normalized": (
+		"Sponsor (canonical)",
+		"Canonical sponsor entity name. Spelling variants of the same real-world "
+		"sponsor across registries (e.g. \"Novartis\", \"Novartis Pharma AG\", "
+		"\"Novartis Pharmaceuticals\") resolve to one name here, so counting/grouping "
+		"trials by sponsor no longer undercounts due to spelling differences. Blank "
+		"when primary_sponsor is empty.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"sponsor_type_normalized": (
+		"Sponsor type (canonical)",
+		"Canonical sponsor category for the resolved sponsor entity: industry, "
+		"academic_medical, government, nonprofit, or other. Derived from (in priority "
+		"order) a curated hand-assignment for known sponsor families, "
+		"ClinicalTrials.gov's lead_sponsor_class, EU CTIS's raw sponsor_type, or "
+		"keyword rules on the sponsor name — so it is populated far more often than "
+		"the raw sponsor_type column, which only EU CTIS provides. See "
+		"sponsor_type_source for which of these actually applied. Blank when no "
+		"signal was available to classify the sponsor.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"sponsor_type_source": (
+		"Sponsor type source",
+		"Audit trail for sponsor_type_normalized: which signal actually determined it — "
+		"\"curated\" (set by hand for a known sponsor family, never overwritten "
+		"automatically), \"ctgov\" (ClinicalTrials.gov's lead_sponsor_class), \"ctis\" "
+		"(EU CTIS's raw sponsor_type), or \"rules\" (keyword match on the sponsor name, "
+		"the lowest-confidence tier). Blank when sponsor_type_normalized itself is blank.",
+		"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+	),
+	"ctg_detailed_description": (
+		"Detailed description",
+		"Extended description from ClinicalTrials.gov.",
+		"ClinicalTrials.gov",
+	),
+}
+
+REGISTRIES_OVERVIEW = [
+	(
+		"WHO ICTRP",
+		"Varies (nct, euctr, chictr, nl, …)",
+		"Aggregator of national/regional registries worldwide",
+		"Richest field coverage: ethics review, IPD plans, enrolment dates, full sponsor "
+		"info. May lag primary registries; can overwrite a field with an empty value on "
+		"re-import.",
+	),
+	(
+		"ClinicalTrials.gov",
+		"nct",
+		"US-hosted global registry",
+		"Provides ctg_detailed_description and results_url_link. Combines exclusion into "
+		"inclusion criteria. Never blanks a field on update (non-destructive).",
+	),
+	(
+		"EU Clinical Trials (CTIS)",
+		"euctr / eudract / ctis",
+		"EU trials register",
+		"Provides therapeutic_areas, country_status, trial_region, overall_decision_date, "
+		"countries_decision_date, sponsor_type. Does not provide date_registration. "
+		"May overwrite fields with empty values on re-import.",
+	),
+]
+
+MERGE_PROSE = (
+	"A single trial can be ingested from more than one source registry. Gregory stores "
+	"one row per trial and merges data on re-import using a last-write-wins strategy. "
+	"ClinicalTrials.gov never blanks a field it previously populated; WHO ICTRP and EU "
+	"CTIS may overwrite existing values — including with empty ones — if the incoming "
+	"record omits a field. The identifiers column is always merged non-destructively: "
+	"keys are added, never removed. Fields produced by only one registry (e.g. EU CTIS "
+	"therapeutic_areas or CT.gov ctg_detailed_description) are set only by their "
+	"respective importer and are never in conflict."
+)
+
+REGISTRY_NAMES = ["WHO ICTRP", "ClinicalTrials.gov", "EU CTIS"]
+
+CATEGORY_COLUMNS = [
+	"Subject",
+	"Team",
+	"Category",
+	"Slug",
+	"Description",
+	"Search terms",
+	"Terms (count)",
+	"Category type",
+	"Modality",
+	"Match scope",
+	"Min score (trials)",
+	"Field weights (trials)",
+	"Trials (this subject)",
+	"Last synced",
+]
+
+CATEGORY_MATCH_PROSE = (
+	"Each row is one category assigned to one subject. Automatic categories are populated "
+	"by the rebuild_categories command: each search term is matched case-insensitively as a "
+	"whole word against the fields listed in \"Field weights (trials)\" (only those fields "
+	"are searched, per the category's match scope); every matching field adds its weight, "
+	"plus a flat 2 points per unique matched term, and a trial is assigned once the total "
+	"reaches the \"Min score (trials)\" threshold. Manual categories are curated by hand and "
+	"ignore the term list."
+)
+
+# Column widths for data sheets
+_WIDE_COLS = {
+	"title",
+	"scientific_title",
+	"summary",
+	"ctg_detailed_description",
+	"inclusion_criteria",
+	"exclusion_criteria",
+	"intervention",
+	"primary_outcome",
+	"secondary_outcome",
+	"study_design",
+	"condition",
+	"results_ipd_description",
+	"therapeutic_areas",
+	"country_status",
+	"countries_by_source",
+	"trial_countries",
+	"articles",
+}
+_URL_COLS = {"link", "results_url_link", "identifiers_json"}
+
+
+def _sanitise_sheet_name(name, used):
+	"""Return a valid, unique Excel sheet name (≤31 chars, no illegal characters)."""
+	name = re.sub(r"[\\/*?\[\]:]", "_", name)[:31]
+	base, suffix = name, 1
+	while name in used:
+		suffix += 1
+		name = base[:28] + f"_{suffix}"
+	used.add(name)
+	return name
+
+
+def _cell_value(value):
+	"""Convert a Python value to an Excel-safe type (None → empty string)."""
+	if value is None:
+		return ""
+	if isinstance(value, datetime):
+		if value.tzinfo is not None:
+			value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+		return value
+	if isinstance(value, date):
+		return value
+	if isinstance(value, dict):
+		return json.dumps(value, ensure_ascii=False)
+	if isinstance(value, list):
+		# Lists of scalars (e.g. regions_normalized) render as a "; "-joined string;
+		# lists containing dicts/lists fall back to JSON for fidelity.
+		if all(not isinstance(v, (dict, list)) for v in value):
+			return "; ".join("" if v is None else str(v) for v in value)
+		return json.dumps(value, ensure_ascii=False)
+	if isinstance(value, bool):
+		return value
+	if isinstance(value, (int, float)):
+		return value
+	return str(value)
+
+
+def _format_trial_countries(trial):
+	"""Render a trial's normalized TrialCountry rows as one readable cell.
+
+	Format per country: "Germany [DE] (recruiting; 2024-07-19; src: ctgov+ctis)".
+	The status/date/sources clause is omitted when empty. Uses the prefetched
+	``trial_countries`` cache (sorted in Python — no extra query).
+	"""
+	rows = sorted(trial.trial_countries.all(), key=lambda tc: str(tc.country.code))
+	parts = []
+	for tc in rows:
+		bits = []
+		status = tc.status_raw or tc.status
+		if status:
+			bits.append(str(status))
+		if tc.decision_date:
+			bits.append(str(tc.decision_date))
+		if tc.sources:
+			bits.append("src: " + "+".join(tc.sources))
+		label = f"{tc.country.name} [{tc.country.code}]"
+		if bits:
+			label += " (" + "; ".join(bits) + ")"
+		parts.append(label)
+	return "; ".join(parts)
+
+
+
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_HEADER_FILL = PatternFill(fill_type="solid", fgColor="2F4F8F")
+_HEADER_ALIGN = Alignment(vertical="center")
+_SECTION_FONT = Font(bold=True, size=13)
+_WRAP = Alignment(wrap_text=True)
+
+
+def _styled(ws, value, font=None, fill=None, alignment=None):
+	"""A write-only cell carrying the given styles."""
+	cell = WriteOnlyCell(ws, value=value)
+	if font is not None:
+		cell.font = font
+	if fill is not None:
+		cell.fill = fill
+	if alignment is not None:
+		cell.alignment = alignment
+	return cell
+
+
+def _header_row(ws, columns):
+	"""A bold, coloured header row, ready for ws.append()."""
+	return [
+		_styled(ws, name, _HEADER_FONT, _HEADER_FILL, _HEADER_ALIGN) for name in columns
+	]
+
+
+def _excel_text(value, limit=32767):
+	"""Truncate a string to Excel's per-cell character limit."""
+	if not value:
+		return value
+	text = str(value)
+	if len(text) > limit:
+		text = text[: limit - 1] + "…"
+	return text
+
+
+_FORMULA_TRIGGER_CHARS = ("=", "+", "-", "@")
+
+
+def _safe_text_cell(ws, value, wrap=False):
+	"""A long/user-authored text value, truncated and defused against formula injection.
+
+	A leading apostrophe is the standard mitigation (OWASP CSV injection guidance):
+	it forces the cell to render as literal text in Excel/LibreOffice/Sheets even
+	when the value starts with =, +, -, or @. Relying on openpyxl's data_type alone
+	is not enough — several of those trigger characters (+, -, @) are never
+	auto-detected as formulas by openpyxl in the first place, so its cell.data_type
+	would stay "s" regardless, while spreadsheet applications still treat a leading
+	=, +, -, or @ as a formula cue on their own.
+	"""
+	text = _excel_text(value)
+	if isinstance(text, str) and text.startswith(_FORMULA_TRIGGER_CHARS):
+		text = "'" + text
+	cell = _styled(ws, text, alignment=_WRAP if wrap else None)
+	cell.data_type = "s"
+	return cell
+
+
+def _literal(ws, value):
+	"""Keep a data value that openpyxl would store as a formula (a string
+	starting with "=") as plain text; other values pass through unchanged."""
+	if isinstance(value, str) and value.startswith("="):
+		cell = WriteOnlyCell(ws, value=value)
+		cell.data_type = "s"
+		return cell
+	return value
+
+
+def _set_column_widths(ws, columns):
+	for col_idx, name in enumerate(columns, 1):
+		letter = get_column_letter(col_idx)
+		if name in _WIDE_COLS:
+			ws.column_dimensions[letter].width = 50
+		elif name in _URL_COLS:
+			ws.column_dimensions[letter].width = 40
+		elif name.startswith("id_"):
+			ws.column_dimensions[letter].width = 20
+		else:
+			ws.column_dimensions[letter].width = max(12, min(40, len(name) + 4))
+
+
+def _build_scalar_columns():
+	"""
+	Return an ordered list of scalar Trials column names for export.
+	Known columns follow IDENTITY_COLS + SCALAR_ORDER; unrecognised columns are appended.
+	Excludes: GeneratedField columns, m2m/relation fields, and 'identifiers' (expanded
+	separately into id_* columns and identifiers_json).
+	"""
+	known_order = IDENTITY_COLS + SCALAR_ORDER
+	# 'identifiers' is handled separately; EXCLUDED_* are never exported
+	known_set = set(known_order) | {"identifiers"} | EXCLUDED_SCALARS | EXCLUDED_M2M
+	unknown = []
+	for f in Trials._meta.get_fields():
+		if f.is_relation:
+			continue
+		if isinstance(f, GeneratedField):
+			continue
+		if f.name in known_set:
+			continue
+		unknown.append(f.name)
+	return known_order + sorted(unknown)
+
+
+def _parse_help_text(text):
+	"""
+	Split a help_text string into (description, source_registries_string).
+	Looks for a trailing 'Sources?: …' clause.
+	"""
+	match = re.search(r"\s+Sources?:\s*(.+?)\.?\s*$", text, re.IGNORECASE)
+	if match:
+		return text[: match.start()].strip(), match.group(1).strip().rstrip(".")
+	return text.strip(), ""
+
+
+def _sources_for(col_name, admin_labels, admin_help, model_help):
+	"""Return (label, description, source_str) for one exported column."""
+	if col_name.startswith("id_"):
+		key = col_name[3:]
+		return (
+			f"Identifier: {key.upper()}",
+			f'Registry identifier key "{key}" extracted from the identifiers JSON.',
+			"WHO ICTRP, ClinicalTrials.gov, EU CTIS",
+		)
+	if col_name in EXTRA_GLOSSARY:
+		return EXTRA_GLOSSARY[col_name]
+	if col_name in admin_help:
+		label = admin_labels.get(col_name, col_name)
+		desc, sources = _parse_help_text(admin_help[col_name])
+		return label, desc, sources
+	if col_name in model_help:
+		label = admin_labels.get(col_name, col_name)
+		desc, sources = _parse_help_text(model_help[col_name])
+		return label, desc, sources
+	return admin_labels.get(col_name, col_name), "", ""
+
+
+
+def _column_help():
+	"""(labels, admin help texts, model help texts) for _sources_for()."""
+	from gregory.admin import TrialAdminForm
+
+	model_help = {
+		f.name: f.help_text
+		for f in Trials._meta.get_fields()
+		if not f.is_relation and hasattr(f, "help_text") and f.help_text
+	}
+	return TrialAdminForm.Meta.labels, TrialAdminForm.Meta.help_texts, model_help
+
+
+def build_glossary_sheet(wb, all_data_cols):
+	"""Add a Glossary sheet — one row per exported column."""
+	admin_labels, admin_help, model_help = _column_help()
+
+	ws = wb.create_sheet(title="Glossary")
+	ws.freeze_panes = "A2"
+	ws.column_dimensions["A"].width = 32
+	ws.column_dimensions["B"].width = 32
+	ws.column_dimensions["C"].width = 65
+	ws.column_dimensions["D"].width = 32
+	ws.append(_header_row(ws, ["Field", "Label", "Description", "Source registries"]))
+
+	for col_name in all_data_cols:
+		label, desc, sources = _sources_for(
+			col_name, admin_labels, admin_help, model_help
+		)
+		ws.append([col_name, label, _styled(ws, desc, alignment=_WRAP), sources])
+
+
+def build_registries_sheet(wb, all_data_cols):
+	"""Add a Registries sheet with a prose overview, registry table, and field matrix."""
+	admin_labels, admin_help, model_help = _column_help()
+
+	ws = wb.create_sheet(title="Registries")
+	for letter, width in zip("ABCDE", [32, 32, 22, 22, 22]):
+		ws.column_dimensions[letter].width = width
+	ws.merged_cells.add("A2:D2")
+	ws.row_dimensions[2].height = 90
+
+	# --- Part A: prose overview (rows 1-2), overview table (row 4 on) ---
+	ws.append([_styled(ws, "Registry overview", font=_SECTION_FONT)])
+	ws.append([_styled(ws, MERGE_PROSE, alignment=_WRAP)])
+	ws.append([])
+	ws.append(
+		_header_row(ws, ["Registry", "Identifier key(s)", "What it is", "Notes on coverage"])
+	)
+	for reg_name, id_keys_str, what, notes in REGISTRIES_OVERVIEW:
+		ws.append([reg_name, id_keys_str, what, _styled(ws, notes, alignment=_WRAP)])
+
+	# --- Part B: field-by-registry matrix, from row 10 ---
+	matrix_start = 10
+	for _ in range(matrix_start - 5 - len(REGISTRIES_OVERVIEW)):
+		ws.append([])
+	ws.append([_styled(ws, "Field coverage by registry", font=_SECTION_FONT)])
+	ws.append(_header_row(ws, ["Field", "Label"] + REGISTRY_NAMES))
+
+	for col_name in all_data_cols:
+		label, _, sources_str = _sources_for(
+			col_name, admin_labels, admin_help, model_help
+		)
+		row = [col_name, label]
+		for reg_name in REGISTRY_NAMES:
+			# Normalise for matching: "EU CTIS" matches "EU CTIS" or "EU Clinical"
+			src_lower = sources_str.lower()
+			reg_lower = reg_name.lower()
+			tick = "✓" if reg_lower in src_lower else ""
+			if not tick and reg_name == "EU CTIS" and "eu ctis" not in src_lower:
+				if "eu clinical" in src_lower:
+					tick = "✓"
+			row.append(tick)
+		ws.append(row)
+
+
+def _category_rows(subjects):
+	"""Return one row per (subject, category) pair, ordered by subject then category name.
+
+	Categories with no subject never appear here: filtering by `subjects=subject`
+	only matches categories reachable from an exported subject.
+	"""
+	rows = []
+	for subject in subjects:
+		cats = list(
+			TeamCategory.objects.filter(subjects=subject)
+			.select_related("team")
+			.order_by(Lower("category_name"))
+		)
+		if not cats:
+			continue
+		counts = {
+			r["team_categories"]: r["n"]
+			for r in (
+				Trials.objects.filter(
+					subjects=subject, team_categories__in=[c.pk for c in cats]
+				)
+				.values("team_categories")
+				.annotate(n=Count("pk", distinct=True))
+			)
+		}
+		for cat in cats:
+			weights = cat.get_scored_fields("trial")
+			weights_str = "; ".join(f"{f}:{w}" for f, w in weights.items() if w)
+			rows.append(
+				(
+					subject.subject_name,
+					cat.team.name,
+					cat.category_name,
+					cat.category_slug or "",
+					cat.category_description or "",
+					"; ".join(cat.category_terms or []),
+					len(cat.category_terms or []),
+					cat.get_category_type_display(),
+					cat.get_modality_display() if cat.modality else "",
+					cat.get_match_scope_display(),
+					cat.match_min_score_trials,
+					weights_str,
+					counts.get(cat.pk, 0),
+					_cell_value(cat.last_synced_at),
+				)
+			)
+	return rows
+
+
+
+def build_categories_sheet(wb, subjects):
+	"""Add a Categories sheet — one row per (subject, category) pair."""
+	ws = wb.create_sheet(title="Categories")
+	last_col_letter = get_column_letter(len(CATEGORY_COLUMNS))
+	wide_widths = {"Description": 65, "Search terms": 65, "Field weights (trials)": 40}
+	for col_idx, name in enumerate(CATEGORY_COLUMNS, 1):
+		ws.column_dimensions[get_column_letter(col_idx)].width = wide_widths.get(
+			name, max(12, min(32, len(name) + 4))
+		)
+	ws.merged_cells.add(f"A2:{last_col_letter}2")
+	ws.row_dimensions[2].height = 90
+	ws.freeze_panes = "A5"
+	ws.auto_filter.ref = f"A4:{last_col_letter}4"
+
+	ws.append(
+		[_styled(ws, "Categories and their search terms", font=_SECTION_FONT)]
+	)
+	ws.append([_styled(ws, CATEGORY_MATCH_PROSE, alignment=_WRAP)])
+	ws.append([])
+	ws.append(_header_row(ws, CATEGORY_COLUMNS))
+
+	rows = _category_rows(subjects)
+	desc_col = CATEGORY_COLUMNS.index("Description")
+	terms_col = CATEGORY_COLUMNS.index("Search terms")
+
+	if not rows:
+		ws.append(["No categories found."])
+	for row_data in rows:
+		ws.append(
+			[
+				_safe_text_cell(ws, value, wrap=True)
+				if col_idx in (desc_col, terms_col)
+				else value
+				for col_idx, value in enumerate(row_data)
+			]
+		)
+
+
+def identifier_keys(trials):
+	"""
+	Every identifier key used by *trials* (a queryset or a list), in
+	first-seen order. A queryset is read as bare identifier values with
+	.iterator(), never as model instances.
+	"""
+	if isinstance(trials, QuerySet):
+		values = (
+			trials.exclude(identifiers=None)
+			.order_by()
+			.values_list("identifiers", flat=True)
+			.iterator(chunk_size=EXPORT_BATCH_SIZE * 4)
+		)
+	else:
+		values = (trial.identifiers for trial in trials)
+	id_key_order, seen_keys = [], set()
+	for identifiers in values:
+		if isinstance(identifiers, dict):
+			for k in identifiers:
+				if k not in seen_keys:
+					id_key_order.append(k)
+					seen_keys.add(k)
+	return id_key_order
+
+
+def data_columns(id_keys):
+	"""The ordered data-sheet columns for the given identifier keys."""
+	remaining_scalars = [
+		c
+		for c in _build_scalar_columns()
+		if c not in set(IDENTITY_COLS) and c != "identifiers"
+	]
+	return (
+		IDENTITY_COLS
+		+ [f"id_{k}" for k in id_keys]
+		+ ["identifiers_json"]
+		+ remaining_scalars
+		+ RELATION_COLS
+	)
+
+
+def iter_export_trials(trials, batch_size=EXPORT_BATCH_SIZE):
+	"""
+	Yield *trials* with every relation the data rows read loaded. A queryset
+	is streamed with .iterator(), prefetching one batch at a time; a list
+	(e.g. one API page) is prefetched in place.
+	"""
+	if isinstance(trials, QuerySet):
+		yield from (
+			trials.select_related("primary_sponsor_normalized")
+			.prefetch_related(*EXPORT_PREFETCH)
+			.iterator(chunk_size=batch_size)
+		)
+		return
+	trials = list(trials)
+	prefetch_related_objects(trials, "primary_sponsor_normalized", *EXPORT_PREFETCH)
+	yield from trials
+
+
+def _visible(items, visible_team_ids, team_attr):
+	"""*items* whose team is in *visible_team_ids* (None: no restriction)."""
+	if visible_team_ids is None:
+		return list(items)
+	return [item for item in items if getattr(item, team_attr) in visible_team_ids]
+
+
+def trial_row(trial, columns, scalar_set, visible_team_ids=None):
+	"""One data-sheet row for *trial*; *scalar_set* holds the plain model
+	columns among *columns*. With *visible_team_ids*, the teams, subjects and
+	team categories of other teams are left out, as OrgScopedSerializerMixin
+	leaves them out of the JSON responses."""
+	identifiers = trial.identifiers or {}
+	sponsor = trial.primary_sponsor_normalized
+	row_data = []
+	for col_name in columns:
+		if col_name in scalar_set:
+			row_data.append(_cell_value(getattr(trial, col_name, None)))
+		elif col_name.startswith("id_"):
+			row_data.append(_cell_value(identifiers.get(col_name[3:])))
+		elif col_name == "identifiers_json":
+			row_data.append(
+				json.dumps(identifiers, ensure_ascii=False) if identifiers else ""
+			)
+		elif col_name == "subjects":
+			subjects = _visible(trial.subjects.all(), visible_team_ids, "team_id")
+			row_data.append("; ".join(s.subject_name for s in subjects))
+		elif col_name == "teams":
+			teams = _visible(trial.teams.all(), visible_team_ids, "pk")
+			row_data.append("; ".join(t.name for t in teams))
+		elif col_name == "sources":
+			row_data.append("; ".join(src.name or "" for src in trial.sources.all()))
+		elif col_name == "team_categories":
+			categories = _visible(trial.team_categories.all(), visible_team_ids, "team_id")
+			row_data.append("; ".join(tc.category_name for tc in categories))
+		elif col_name == "articles":
+			refs = list(trial.article_references.all())
+			if refs:
+				links = "; ".join(r.article.link for r in refs)
+				row_data.append(f"{len(refs)}: {links}")
+			else:
+				row_data.append("")
+		elif col_name == "trial_countries":
+			row_data.append(_format_trial_countries(trial))
+		elif col_name == "sponsor_id":
+			row_data.append(sponsor.pk if sponsor else "")
+		elif col_name == "sponsor_slug":
+			row_data.append(sponsor.slug if sponsor else "")
+		elif col_name == "primary_sponsor_normalized":
+			row_data.append(sponsor.name if sponsor else "")
+		elif col_name == "sponsor_type_normalized":
+			row_data.append((sponsor.sponsor_type or "") if sponsor else "")
+		elif col_name == "sponsor_type_source":
+			row_data.append((sponsor.sponsor_type_source or "") if sponsor else "")
+		else:
+			row_data.append("")
+	return row_data
+
+
+def write_trials_sheet(
+	wb,
+	title,
+	trials,
+	columns,
+	empty_message="No trials found for this subject.",
+	batch_size=EXPORT_BATCH_SIZE,
+	visible_team_ids=None,
+):
+	"""
+	Add a data sheet of *trials* (a queryset or a list) with *columns*,
+	appending each row as its batch arrives. Returns the number of trials
+	written. *visible_team_ids* restricts the team-owned relations (see
+	trial_row).
+	"""
+	ws = wb.create_sheet(title=title)
+	_set_column_widths(ws, columns)
+	ws.freeze_panes = "A2"
+	ws.auto_filter.ref = f"A1:{get_column_letter(len(columns))}1"
+	ws.append(_header_row(ws, columns))
+
+	scalar_set = set(_build_scalar_columns())
+	count = 0
+	for trial in iter_export_trials(trials, batch_size):
+		row = trial_row(trial, columns, scalar_set, visible_team_ids)
+		ws.append([_literal(ws, v) for v in row])
+		count += 1
+	if count == 0:
+		ws.append([empty_message])
+	return count
+
+
+def new_workbook():
+	"""An empty write-only workbook (it starts without any sheet)."""
+	return Workbook(write_only=True)
+
+
+def write_trials_xlsx(
+	output, trials, columns=None, sheet_title="Trials", visible_team_ids=None
+):
+	"""
+	Write *trials* as one data sheet plus the Glossary and Registries sheets
+	to *output* (a path or a binary file object). *columns* defaults to every
+	data column; pass a subset to leave columns out. *visible_team_ids*
+	restricts the teams, subjects and team categories written (None: all).
+	Returns the number of trials written.
+	"""
+	if columns is None:
+		columns = data_columns(identifier_keys(trials))
+	wb = new_workbook()
+	count = write_trials_sheet(
+		wb,
+		sheet_title,
+		trials,
+		columns,
+		empty_message="No trials found.",
+		visible_team_ids=visible_team_ids,
+	)
+	build_glossary_sheet(wb, columns)
+	build_registries_sheet(wb, columns)
+	wb.save(output)
+	return count
+
+
+def write_records_xlsx(output, records, sheet_title="Data"):
+	"""
+	Write a list of flat-ish dicts (API response data) as one sheet, one
+	column per key in first-seen order; nested values are written as JSON.
+	"""
+	columns = []
+	for record in records:
+		for key in record:
+			if key not in columns:
+				columns.append(key)
+	wb = new_workbook()
+	ws = wb.create_sheet(title=sheet_title)
+	ws.append(_header_row(ws, columns))
+	for record in records:
+		ws.append([_literal(ws, _cell_value(record.get(c))) for c in columns])
+	wb.save(output)
@@ -0,0 +1,288 @@
+"""
+The unlabeled-article pool pseudo-labeling draws from.
+
+train_models used to take the first 100 unlabeled articles of the team and
+clean them in a loop. UnlabeledPool instead:
+
+- samples up to *size* article ids from every article of the team that has
+  no reviewed label for the subject, either uniformly, weighted towards
+  recent discoveries ("recent": weight halves every RECENCY_HALF_LIFE_DAYS),
+  or spread evenly over discovery months ("stratified"). Only ids and
+  discovery dates are loaded to sample;
+- yields the sample as DataFrame chunks (article_id, text), fetching and
+  cleaning one chunk at a time, so the pool is never held in memory whole.
+  generate_pseudo_labels(unlabelled_chunks=pool.chunks) streams it once per
+  self-training iteration;
+- cleans on a process pool and keeps the cleaned text in CleanedTextCache,
+  a small SQLite file per team keyed by article id and last_updated, so
+  later passes, the other algorithms and the next night's run skip
+  BeautifulSoup and the stopword filter for every article that has not
+  changed.
+"""
+
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+
+from gregory.ml.scheduler import django_worker_init
+from gregory.models import Articles, Subject
+from gregory.utils.text_utils import MIN_WORD_COUNT, cleanHTML, cleanText
+
+SAMPLING_STRATEGIES = ("recent", "stratified", "uniform")
+DEFAULT_POOL_SIZE = 20000
+DEFAULT_CHUNK_SIZE = 1000
+RECENCY_HALF_LIFE_DAYS = 180
+
+# Cleaned texts fetched from SQLite per query (its default host-parameter
+# limit is 32766; stay well below it).
+CACHE_QUERY_BATCH = 900
+
+
+def unlabeled_articles(team_slug: str, subject: Subject):
+	"""
+	Articles of the team without a reviewed label for *subject*. NULL
+	is_relevant means "Not Reviewed", which is still unlabeled and stays
+	eligible; only reviewed (non-NULL) relevance rows exclude an article.
+	"""
+	return Articles.objects.filter(teams__slug=team_slug).exclude(
+		article_subject_relevances__subject=subject,
+		article_subject_relevances__is_relevant__isnull=False,
+	)
+
+
+def sample_article_ids(
+	queryset,
+	size: int,
+	strategy: str = "recent",
+	seed: int = 69,
+	now: Optional[datetime] = None,
+) -> List[int]:
+	"""
+	Sample up to *size* distinct article ids from *queryset* by *strategy*
+	(see the module docstring). Returns them in ascending id order, which
+	keeps each chunk's database fetch index-friendly.
+	"""
+	if strategy not in SAMPLING_STRATEGIES:
+		raise ValueError(
+			f"Unknown sampling strategy '{strategy}'; valid options are: {', '.join(SAMPLING_STRATEGIES)}"
+		)
+
+	rows = list(
+		queryset.order_by().values_list("article_id", "discovery_date").distinct()
+	)
+	if len(rows) <= size:
+		return sorted(article_id for article_id, _ in rows)
+
+	rng = np.random.default_rng(seed)
+	ids = np.fromiter((article_id for article_id, _ in rows), dtype=np.int64, count=len(rows))
+	now = now or timezone.now()
+
+	if strategy == "uniform":
+		chosen = rng.choice(ids, size=size, replace=False)
+	elif strategy == "recent":
+		age_days = np.fromiter(
+			((now - discovered).total_seconds() / 86400 if discovered else 0.0 for _, discovered in rows),
+			dtype=np.float64,
+			count=len(rows),
+		)
+		weights = np.power(0.5, np.clip(age_days, 0, None) / RECENCY_HALF_LIFE_DAYS)
+		chosen = rng.choice(ids, size=size, replace=False, p=weights / weights.sum())
+	else:
+		chosen = _stratified_by_month(rows, ids, size, rng)
+	return sorted(int(article_id) for article_id in chosen)
+
+
+def _stratified_by_month(rows, ids, size, rng) -> np.ndarray:
+	"""Equal shares per discovery month; months with fewer articles than
+	their share give the remainder to the others."""
+	strata: Dict[Tuple[int, int], List[int]] = {}
+	for position, (_, discovered) in enumerate(rows):
+		key = (discovered.year, discovered.month) if discovered else (0, 0)
+		strata.setdefault(key, []).append(position)
+
+	remaining = size
+	chosen = []
+	# Smallest strata first, so their unused share rolls over to the rest.
+	ordered = sorted(strata.values(), key=len)
+	for index, positions in enumerate(ordered):
+		share = remaining // (len(ordered) - index)
+		take = min(share, len(positions))
+		chosen.extend(rng.choice(positions, size=take, replace=False))
+		remaining -= take
+	return ids[np.asarray(chosen, dtype=np.int64)]
+
+
+def clean_article_text(title: str, summary: Optional[str]) -> Optional[str]:
+	"""Title and summary cleaned exactly as build_dataset and predict_articles
+	clean them; None when the result is under MIN_WORD_COUNT words."""
+	return cleanText(cleanHTML(f"{title} {summary or ''}"), min_words=MIN_WORD_COUNT)
+
+
+def _clean_rows(rows: List[Tuple[int, str, Optional[str]]]) -> List[Tuple[int, Optional[str]]]:
+	"""Process-pool entry point: clean a batch of (id, title, summary)."""
+	return [(article_id, clean_article_text(title, summary)) for article_id, title, summary in rows]
+
+
+class CleanedTextCache:
+	"""
+	Cleaned article texts on disk, keyed by article id and the article's
+	last_updated, so an edited article is cleaned again. An article cleaned
+	to nothing (too short) is cached as NULL and skipped without re-cleaning.
+	"""
+
+	def __init__(self, path):
+		self.path = Path(path)
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self.connection = sqlite3.connect(str(self.path))
+		self.connection.execute(
+			"CREATE TABLE IF NOT EXISTS cleaned_text ("
+			"article_id INTEGER PRIMARY KEY, last_updated TEXT, text TEXT)"
+		)
+
+	def get_many(self, versions: Dict[int, str]) -> Dict[int, Optional[str]]:
+		"""Cached texts for the ids in *versions* whose last_updated matches."""
+		found = {}
+		ids = list(versions)
+		for start in range(0, len(ids), CACHE_QUERY_BATCH):
+			batch = ids[start : start + CACHE_QUERY_BATCH]
+			placeholders = ",".join("?" * len(batch))
+			for article_id, last_updated, text in self.connection.execute(
+				f"SELECT article_id, last_updated, text FROM cleaned_text WHERE article_id IN ({placeholders})",
+				batch,
+			):
+				if versions[article_id] == last_updated:
+					found[article_id] = text
+		return found
+
+	def put_many(self, rows: List[Tuple[int, str, Optional[str]]]) -> None:
+		"""Store (article_id, last_updated, text) rows."""
+		with self.connection:
+			self.connection.executemany(
+				"INSERT OR REPLACE INTO cleaned_text VALUES (?, ?, ?)", rows
+			)
+
+	def close(self) -> None:
+		self.connection.close()
+
+
+class UnlabeledPool:
+	"""
+	A sampled pool of unlabeled article ids, readable as cleaned-text chunks.
+
+	Args:
+	    article_ids (List[int]): The sampled ids (sample_article_ids)
+	    chunk_size (int, optional): Articles per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+	    cache (Optional[CleanedTextCache], optional): Cleaned-text cache. Defaults to None.
+	    workers (int, optional): Cleaning processes; 1 cleans in this process.
+	        Defaults to 1.
+	"""
+
+	def __init__(
+		self,
+		article_ids: List[int],
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		cache: Optional[CleanedTextCache] = None,
+		workers: int = 1,
+	):
+		self.article_ids = list(article_ids)
+		self.chunk_size = chunk_size
+		self.cache = cache
+		self.workers = workers
+		self._executor = None
+
+	@classmethod
+	def sample(
+		cls,
+		team_slug: str,
+		subject: Subject,
+		size: int = DEFAULT_POOL_SIZE,
+		strategy: str = "recent",
+		seed: int = 69,
+		**kwargs,
+	) -> "UnlabeledPool":
+		"""Sample the pool for a team and subject (see sample_article_ids)."""
+		article_ids = sample_article_ids(
+			unlabeled_articles(team_slug, subject), size, strategy=strategy, seed=seed
+		)
+		logging.info(
+			f"Sampled {len(article_ids)} unlabeled articles ({strategy}) for {team_slug}/{subject.subject_slug}"
+		)
+		return cls(article_ids, **kwargs)
+
+	def __len__(self) -> int:
+		return len(self.article_ids)
+
+	def _clean(self, rows):
+		if self.workers <= 1 or len(rows) < 2:
+			return _clean_rows(rows)
+		if self._executor is None:
+			# Spawned, not forked: the caller has usually imported TensorFlow.
+			# A spawned worker starts bare, and unpickling _clean_rows imports
+			# this module and so gregory.models: Django must be set up first.
+			self._executor = ProcessPoolExecutor(
+				max_workers=self.workers,
+				mp_context=get_context("spawn"),
+				initializer=django_worker_init,
+				initargs=(os.environ.get("DJANGO_SETTINGS_MODULE"),),
+			)
+		batch = -(-len(rows) // self.workers)
+		cleaned = []
+		for part in self._executor.map(
+			_clean_rows, [rows[i : i + batch] for i in range(0, len(rows), batch)]
+		):
+			cleaned.extend(part)
+		return cleaned
+
+	def chunks(self) -> Iterator[pd.DataFrame]:
+		"""
+		Yield the pool as DataFrames with article_id and text columns, one
+		chunk of ids at a time. Articles that clean to nothing are dropped.
+		"""
+		for start in range(0, len(self.article_ids), self.chunk_size):
+			chunk_ids = self.article_ids[start : start + self.chunk_size]
+			versions = {
+				article_id: str(last_updated)
+				for article_id, last_updated in Articles.objects.filter(
+					pk__in=chunk_ids
+				).values_list("article_id", "last_updated")
+			}
+			cached = self.cache.get_many(versions) if self.cache else {}
+
+			missing = [article_id for article_id in versions if article_id not in cached]
+			texts = dict(cached)
+			if missing:
+				rows = list(
+					Articles.objects.filter(pk__in=missing).values_list(
+						"article_id", "title", "summary"
+					)
+				)
+				cleaned = self._clean(rows)
+				texts.update(cleaned)
+				if self.cache:
+					self.cache.put_many(
+						[(article_id, versions[article_id], text) for article_id, text in cleaned]
+					)
+
+			ordered = [
+				(article_id, texts[article_id])
+				for article_id in chunk_ids
+				if texts.get(article_id)
+			]
+			yield pd.DataFrame(ordered, columns=["article_id", "text"])
+
+	def close(self) -> None:
+		"""Shut the cleaning processes down and close the cache."""
+		if self._executor is not None:
+			self._executor.shutdown()
+			self._executor = None
+		if self.cache:
+			self.cache.close()
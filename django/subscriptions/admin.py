@@ -29,6 +29,7 @@ from .models import (
 from .forms import ListsAdminForm, AnnouncementAdminForm
 from gregory.models import Team
 from subscriptions.utils.render_email_body import strip_scheme
+from subscriptions.utils.blocked_emails import refresh_blocked_emails
 from subscriptions.utils.suppression import deactivate_subscribers
 from subscriptions.utils.announcement_send import (
 	render_announcement_email,
@@ -928,7 +929,10 @@ class SubscriberAdmin(admin.ModelAdmin):
 	# out of every list, so the global switch and per-list state stay consistent and the
 	# subscription-based analytics agree with the account flag (no drift).
 	def make_active(self, request, queryset):
+		emails = list(queryset.values_list("email", flat=True))
 		updated_count = queryset.update(active=True)
+		# queryset.update() fires no signals — see BlockedEmail.
+		refresh_blocked_emails(emails)
 		self.message_user(
 			request,
 			f"{updated_count} subscriber(s) marked active — global email suppression removed. "
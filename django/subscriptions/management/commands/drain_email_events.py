@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from subscriptions.models import PendingEmailEvent
+from subscriptions.utils.email_events import (
+	DRAIN_BATCH_SIZE,
+	drain_pending_email_events,
+)
+
+
+class Command(BaseCommand):
+	help = (
+		"Turns Postmark webhook events staged in PendingEmailEvent (Delivery, "
+		"Bounce, SpamComplaint, Open, Click) into EmailEvent rows, in batches: "
+		"messages resolved with IN-queries, events bulk-inserted, aggregates "
+		"applied with one UPDATE per batch. Safe to run concurrently — batches "
+		"are claimed with SKIP LOCKED. Run it from cron every minute, or keep it "
+		"running with --loop."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--batch-size",
+			type=int,
+			default=DRAIN_BATCH_SIZE,
+			help=f"Staged events per transaction (default: {DRAIN_BATCH_SIZE})",
+		)
+		parser.add_argument(
+			"--max-batches",
+			type=int,
+			default=None,
+			help="Stop after this many batches even if the queue is not empty",
+		)
+		parser.add_argument(
+			"--loop",
+			action="store_true",
+			help="Keep polling the queue instead of exiting once it is empty",
+		)
+		parser.add_argument(
+			"--interval",
+			type=float,
+			default=5.0,
+			help="Seconds to wait between polls of an empty queue with --loop (default: 5)",
+		)
+
+	def handle(self, *args, **options):
+		batch_size = options["batch_size"]
+		max_batches = options["max_batches"]
+
+		pending = PendingEmailEvent.objects.count()
+		self.stdout.write(f"{pending:,} staged email events")
+
+		batches = 0
+		drained = 0
+		while max_batches is None or batches < max_batches:
+			consumed = drain_pending_email_events(batch_size=batch_size)
+			if consumed:
+				batches += 1
+				drained += consumed
+				continue
+			if not options["loop"]:
+				break
+			time.sleep(options["interval"])
+
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Drained {drained:,} staged email events in {batches:,} batches"
+			)
+		)
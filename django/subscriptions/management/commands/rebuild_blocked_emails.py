@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from subscriptions.models import BlockedEmail
+from subscriptions.utils.blocked_emails import rebuild_blocked_emails
+
+
+class Command(BaseCommand):
+	help = (
+		"Recomputes the BlockedEmail projection (opt-outs, inactive subscribers, "
+		"suppressed addresses) from its source tables. Normally kept current "
+		"by the write paths themselves; run this after bulk edits made outside "
+		"them (a shell queryset.update(), a raw SQL fix) or as a nightly "
+		"safety net."
+	)
+
+	def handle(self, *args, **options):
+		refreshed = rebuild_blocked_emails()
+		blocked = BlockedEmail.objects.filter(is_blocked=True).count()
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Refreshed {refreshed:,} addresses; {blocked:,} currently blocked"
+			)
+		)
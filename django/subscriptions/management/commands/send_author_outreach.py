@@ -11,11 +11,14 @@ incidental plumbing:
   never sent, regardless of --limit or how the queue looks.
 - Immediately before *every individual* send (not once per run): the
   recipient's address is re-checked against the opt-out/suppression
-  tables (subscriptions.utils.author_outreach.is_contact_blocked — the
-  exact same checks build_author_outreach applies at queue-build time),
+  tables (through the BlockedEmail projection, refreshed before each send
+  — subscriptions.utils.blocked_emails; the exact same checks
+  build_author_outreach applies at queue-build time),
   then the campaign's circuit breakers are re-evaluated against its live
   EmailMessage aggregates (subscriptions.utils.author_outreach_send.
-  evaluate_circuit_breakers). Either can stop a row that looked fine when
+  evaluate_circuit_breakers), after the run has drained the Postmark
+  events the webhook staged (drain_pending_email_events) into those
+  aggregates. Either can stop a row that looked fine when
   the queue was built or even one row ago in this same run.
 - A breaker trip sets campaign.halted=True with a reason and stops the
   run outright — the row being considered when it tripped is left
@@ -49,14 +52,13 @@ from subscriptions.management.commands.utils.send_email import (
 	send_email,
 )
 from subscriptions.models import AuthorOutreach, AuthorOutreachCampaign, EmailMessage
-from subscriptions.utils.author_outreach import (
-	currently_qualifying_article_ids,
-	is_contact_blocked,
-)
+from subscriptions.utils.author_outreach import currently_qualifying_article_ids
 from subscriptions.utils.author_outreach_send import (
 	evaluate_circuit_breakers,
 	render_author_outreach_email,
 )
+from subscriptions.utils.blocked_emails import BlockedEmailSet
+from subscriptions.utils.email_events import drain_pending_email_events
 from subscriptions.utils.postmark import (
 	POSTMARK_INACTIVE_RECIPIENT,
 	classify_postmark_response,
@@ -64,6 +66,11 @@ from subscriptions.utils.postmark import (
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the staged-event batches drained before a run, so a
+# webhook burst arriving while we drain can't hold the send off forever;
+# anything left is picked up by the scheduled drain_email_events.
+PRE_SEND_DRAIN_MAX_BATCHES = 20
+
 
 class Command(BaseCommand):
 	help = (
@@ -205,6 +212,14 @@ class Command(BaseCommand):
 			)
 			return
 
+		# The breakers read EmailMessage aggregates, which the Postmark
+		# webhook only stages; fold everything staged so far in before the
+		# first evaluation, so a complaint or hard bounce that arrived since
+		# the last drain_email_events run still counts.
+		drained = self._drain_email_events()
+		if drained:
+			self.stdout.write(f"Drained {drained} staged email event(s) before sending.")
+
 		self._send_batch(
 			campaign=campaign,
 			site=site,
@@ -219,6 +234,15 @@ class Command(BaseCommand):
 	# --test-to
 	# ------------------------------------------------------------------
 
+	def _drain_email_events(self):
+		drained = 0
+		for _ in range(PRE_SEND_DRAIN_MAX_BATCHES):
+			consumed = drain_pending_email_events()
+			if not consumed:
+				break
+			drained += consumed
+		return drained
+
 	def _send_test(
 		self,
 		*,
@@ -324,6 +348,10 @@ class Command(BaseCommand):
 		# Lazily computed on the first upcoming-mode row, then reused for the
 		# rest of the run — see the re-validation block below.
 		still_qualifying = None
+		# Loaded once, then brought up to date before each send with one
+		# query over BlockedEmail rows changed since — see the opt-out
+		# re-check below.
+		blocked = BlockedEmailSet()
 
 		for index, row in enumerate(rows):
 			today_start = timezone.now().replace(
@@ -427,8 +455,11 @@ class Command(BaseCommand):
 			# Re-check the opt-out tables immediately before this send —
 			# an address can have been opted out, suppressed, or
 			# deactivated since the queue was built, or even since the
-			# previous row in this same run.
-			if is_contact_blocked(row.email):
+			# previous row in this same run. The projection refresh picks up
+			# exactly those changes without re-reading the three source
+			# tables for every recipient.
+			blocked.refresh()
+			if row.email in blocked:
 				row.status = AuthorOutreach.STATUS_SKIPPED
 				row.error_message = (
 					"Recipient is opted out, suppressed, or deactivated as "
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.6 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0043_alter_authoroutreachcampaign_body_template_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingEmailEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_type', models.CharField(choices=[('Delivery', 'Delivery'), ('Bounce', 'Bounce'), ('SpamComplaint', 'Spam Complaint'), ('Open', 'Open'), ('Click', 'Click')], max_length=20)),
+                ('payload', models.JSONField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Pending Email Event',
+                'verbose_name_plural': 'Pending Email Events',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.6 on 2026-10-19 00:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0044_pendingemailevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(help_text='Lowercased address this row is for.', max_length=254, unique=True)),
+                ('opted_out', models.BooleanField(default=False, help_text='An AuthorContactOptOut row exists for this address.')),
+                ('inactive_subscriber', models.BooleanField(default=False, help_text='A Subscribers row with active=False exists.')),
+                ('suppressed', models.BooleanField(default=False, help_text='The latest SuppressionEvent for this address has suppress_sending=True.')),
+                ('is_blocked', models.BooleanField(default=False, help_text='Any of the three flags above.')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Blocked Email',
+                'verbose_name_plural': 'Blocked Emails',
+                'indexes': [models.Index(condition=models.Q(('is_blocked', True)), fields=['email'], name='blockedemail_blocked_idx')],
+            },
+        ),
+    ]
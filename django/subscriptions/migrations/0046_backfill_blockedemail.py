@@ -0,0 +1,63 @@
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def backfill(apps, schema_editor):
+	# Self-contained copy of subscriptions.utils.blocked_emails.
+	# rebuild_blocked_emails — migrations must not import runtime code. Without
+	# it the projection would start empty and every address would read as
+	# sendable until the first rebuild_blocked_emails run.
+	AuthorContactOptOut = apps.get_model("subscriptions", "AuthorContactOptOut")
+	BlockedEmail = apps.get_model("subscriptions", "BlockedEmail")
+	Subscribers = apps.get_model("subscriptions", "Subscribers")
+	SuppressionEvent = apps.get_model("subscriptions", "SuppressionEvent")
+
+	opted_out = set(
+		AuthorContactOptOut.objects.annotate(key=Lower("email")).values_list(
+			"key", flat=True
+		)
+	)
+	inactive = set(
+		Subscribers.objects.filter(active=False)
+		.annotate(key=Lower("email"))
+		.values_list("key", flat=True)
+	)
+	suppressed = {
+		key
+		for key, suppress_sending in SuppressionEvent.objects.annotate(
+			key=Lower("email")
+		)
+		.order_by("key", "-changed_at")
+		.distinct("key")
+		.values_list("key", "suppress_sending")
+		if suppress_sending
+	}
+
+	keys = sorted((opted_out | inactive | suppressed) - {""})
+	BlockedEmail.objects.bulk_create(
+		[
+			BlockedEmail(
+				email=key,
+				opted_out=key in opted_out,
+				inactive_subscriber=key in inactive,
+				suppressed=key in suppressed,
+				is_blocked=True,
+			)
+			for key in keys
+		],
+		batch_size=500,
+		ignore_conflicts=True,
+	)
+	if keys:
+		print(f"Backfilled {len(keys)} blocked email(s)")
+
+
+def reverse(apps, schema_editor):
+	apps.get_model("subscriptions", "BlockedEmail").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+	dependencies = [
+		("subscriptions", "0045_blockedemail"),
+	]
+	operations = [migrations.RunPython(backfill, reverse)]
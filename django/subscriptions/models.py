@@ -854,6 +854,43 @@ class EmailEvent(models.Model):
 		return f"{self.record_type} — {self.recipient} @ {self.occurred_at:%Y-%m-%d %H:%M}"
 
 
+class PendingEmailEvent(models.Model):
+	"""
+	Staging queue between subscriptions.views.postmark_webhook and EmailEvent.
+
+	Postmark replays thousands of Delivery/Open/Bounce events in a burst after
+	an outage, and resolving the EmailMessage, inserting the EmailEvent and
+	updating the aggregates inline made each webhook call cost several
+	queries. The view now does a single INSERT here and returns 200;
+	subscriptions.utils.email_events.drain_pending_email_events (run by the
+	drain_email_events command) turns batches of these rows into EmailEvent
+	rows in bulk and deletes them in the same transaction. A row only leaves
+	this table once its batch committed, so an event is never lost if the
+	worker is down — it just waits here.
+
+	`payload` is NOT the raw webhook body: stage_email_event_payload keeps
+	only the fields handle_email_event reads (see EmailEvent's "Deliberately
+	NOT stored" list — Geo, IP, UserAgent, Bounce Content and the rest never
+	reach this table either).
+
+	SubscriptionChange is never staged: it stays inline in the view, where
+	handle_subscription_change's ordering guard and Postmark's ~21-minute
+	retry window both assume it is applied before the 200 goes out.
+	"""
+
+	record_type = models.CharField(max_length=20, choices=EmailEvent.RECORD_TYPE_CHOICES)
+	payload = models.JSONField()
+	received_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ["pk"]
+		verbose_name = "Pending Email Event"
+		verbose_name_plural = "Pending Email Events"
+
+	def __str__(self):
+		return f"{self.record_type} (queued {self.received_at:%Y-%m-%d %H:%M})"
+
+
 class AnnouncementRecipient(models.Model):
 	announcement = models.ForeignKey(
 		Announcement,
@@ -1366,3 +1403,60 @@ class AuthorContactOptOut(models.Model):
 	def save(self, *args, **kwargs):
 		self.email = self.email.lower()
 		super().save(*args, **kwargs)
+
+
+class BlockedEmail(models.Model):
+	"""
+	Projection of every address-only reason not to email someone, one row
+	per lowercased address: an `AuthorContactOptOut` row, a
+	`Subscribers.active=False` subscriber, or a latest `SuppressionEvent`
+	with `suppress_sending=True` — the same three checks
+	`subscriptions.utils.author_outreach.is_contact_blocked` runs against
+	the source tables, three case-insensitive queries per address.
+
+	Derived, never authoritative: maintained by
+	`subscriptions.utils.blocked_emails.refresh_blocked_emails`, which
+	recomputes a row from the source tables. `deactivate_subscribers`,
+	`reactivate_subscribers` and the admin "Enable all emails" action call
+	it explicitly (their writes are queryset updates, which fire no
+	signals); every other write — the Postmark webhook handlers, the
+	opt-out link, the unsubscribe page, admin edits and deletes — goes
+	through a `save()` or `delete()` that `subscriptions.signals` hooks. `rebuild_blocked_emails`
+	recomputes the whole table from scratch.
+
+	Rows are kept, not deleted, once an address is no longer blocked
+	(`is_blocked=False`), so `BlockedEmailSet.refresh` — which reads only
+	rows touched since its last load — also sees an unblock.
+	"""
+
+	email = models.EmailField(
+		unique=True, help_text="Lowercased address this row is for."
+	)
+	opted_out = models.BooleanField(
+		default=False, help_text="An AuthorContactOptOut row exists for this address."
+	)
+	inactive_subscriber = models.BooleanField(
+		default=False, help_text="A Subscribers row with active=False exists."
+	)
+	suppressed = models.BooleanField(
+		default=False,
+		help_text="The latest SuppressionEvent for this address has suppress_sending=True.",
+	)
+	is_blocked = models.BooleanField(
+		default=False, help_text="Any of the three flags above."
+	)
+	updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+	class Meta:
+		indexes = [
+			models.Index(
+				fields=["email"],
+				condition=models.Q(is_blocked=True),
+				name="blockedemail_blocked_idx",
+			)
+		]
+		verbose_name = "Blocked Email"
+		verbose_name_plural = "Blocked Emails"
+
+	def __str__(self):
+		return f"{self.email} ({'blocked' if self.is_blocked else 'not blocked'})"
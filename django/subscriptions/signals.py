@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+def _refresh(email):
+	from subscriptions.utils.blocked_emails import refresh_blocked_emails
+
+	refresh_blocked_emails([email])
+
+
+@receiver(post_save, sender="subscriptions.Subscribers")
+@receiver(post_delete, sender="subscriptions.Subscribers")
+def refresh_blocked_email_for_subscriber(sender, instance, **kwargs):
+	"""Keep BlockedEmail in step with Subscribers.active. Saves that name
+	neither `active` nor `email` in update_fields can't change the answer."""
+	update_fields = kwargs.get("update_fields")
+	if update_fields is not None and not {"active", "email"} & set(update_fields):
+		return
+	_refresh(instance.email)
+
+
+@receiver(post_save, sender="subscriptions.AuthorContactOptOut")
+@receiver(post_save, sender="subscriptions.SuppressionEvent")
+@receiver(post_delete, sender="subscriptions.AuthorContactOptOut")
+@receiver(post_delete, sender="subscriptions.SuppressionEvent")
+def refresh_blocked_email_for_event(sender, instance, **kwargs):
+	"""Keep BlockedEmail in step with opt-outs and suppression events — this
+	is what covers the Postmark webhook handlers and the opt-out link. A
+	delete (say, an opt-out or a suppression removed in the admin) refreshes
+	too: the address may now be unblocked, or fall back to an earlier
+	suppression event."""
+	_refresh(instance.email)
@@ -0,0 +1,172 @@
+"""
+Tests for the BlockedEmail projection — subscriptions.utils.blocked_emails
+and the write paths that keep it current (subscriptions.signals,
+deactivate_subscribers / reactivate_subscribers, the Postmark webhook
+handlers). The invariant under test throughout: `email in BlockedEmailSet()`
+agrees with is_contact_blocked(email), which reads the source tables.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from subscriptions.models import (
+	AuthorContactOptOut,
+	BlockedEmail,
+	Subscribers,
+	SuppressionEvent,
+)
+from subscriptions.tests.test_email_events import _bounce_payload
+from subscriptions.tests.test_postmark_webhook import _subscription_change_payload
+from subscriptions.utils.author_optout import record_author_opt_out
+from subscriptions.utils.author_outreach import is_contact_blocked
+from subscriptions.utils.blocked_emails import (
+	BlockedEmailSet,
+	rebuild_blocked_emails,
+	refresh_blocked_emails,
+)
+from subscriptions.utils.email_events import handle_email_event
+from subscriptions.utils.postmark_webhook import handle_subscription_change
+from subscriptions.utils.suppression import (
+	deactivate_subscribers,
+	reactivate_subscribers,
+)
+
+
+def _subscriber(email, active=True):
+	return Subscribers.objects.create(
+		first_name="Blocked", last_name="Email", email=email, active=active
+	)
+
+
+class BlockedEmailMaintenanceTest(TestCase):
+	def assertBlocked(self, email, expected):
+		self.assertEqual(is_contact_blocked(email), expected)
+		self.assertEqual(email in BlockedEmailSet(), expected)
+
+	def test_opt_out_blocks_case_insensitively(self):
+		record_author_opt_out("Opted.Out@Example.com", AuthorContactOptOut.REASON_OPT_OUT)
+
+		self.assertBlocked("opted.out@example.com", True)
+		self.assertIn("OPTED.OUT@EXAMPLE.COM", BlockedEmailSet())
+		row = BlockedEmail.objects.get(email="opted.out@example.com")
+		self.assertTrue(row.opted_out)
+		self.assertFalse(row.inactive_subscriber)
+
+	def test_hard_bounce_webhook_blocks(self):
+		handle_email_event(_bounce_payload(Email="bounced@example.com"))
+
+		self.assertBlocked("bounced@example.com", True)
+
+	def test_inactive_subscriber_saved_through_the_model_blocks(self):
+		subscriber = _subscriber("reader@example.com")
+		self.assertBlocked("reader@example.com", False)
+
+		subscriber.active = False
+		subscriber.save(update_fields=["active"])
+		self.assertBlocked("reader@example.com", True)
+
+	def test_suppress_then_auto_restore_round_trips(self):
+		_subscriber("suppressed@example.com")
+
+		handle_subscription_change(
+			_subscription_change_payload(
+				"suppressed@example.com",
+				True,
+				reason="HardBounce",
+				changed_at=timezone.now() - timedelta(hours=1),
+			)
+		)
+		self.assertBlocked("suppressed@example.com", True)
+
+		handle_subscription_change(
+			_subscription_change_payload(
+				"suppressed@example.com", False, reason="HardBounce"
+			)
+		)
+		self.assertBlocked("suppressed@example.com", False)
+		self.assertFalse(
+			BlockedEmail.objects.get(email="suppressed@example.com").is_blocked
+		)
+
+	def test_deleting_an_opt_out_or_suppression_unblocks(self):
+		record_author_opt_out("removed@example.com", AuthorContactOptOut.REASON_OPT_OUT)
+		self.assertBlocked("removed@example.com", True)
+
+		AuthorContactOptOut.objects.filter(email="removed@example.com").delete()
+		self.assertBlocked("removed@example.com", False)
+
+		handle_subscription_change(
+			_subscription_change_payload("removed@example.com", True, reason="ManualSuppression")
+		)
+		self.assertBlocked("removed@example.com", True)
+
+		SuppressionEvent.objects.get(email="removed@example.com").delete()
+		self.assertBlocked("removed@example.com", False)
+		self.assertFalse(BlockedEmail.objects.get(email="removed@example.com").is_blocked)
+
+	def test_deactivate_and_reactivate_refresh_the_projection(self):
+		subscriber = _subscriber("admin-toggled@example.com")
+
+		_, _, events = deactivate_subscribers([subscriber.pk])
+		self.assertBlocked("admin-toggled@example.com", True)
+
+		# reactivate_subscribers restores `active` only; the admin-manual
+		# SuppressionEvent is still the latest event and still suppresses.
+		reactivate_subscribers(events[0])
+		row = BlockedEmail.objects.get(email="admin-toggled@example.com")
+		self.assertFalse(row.inactive_subscriber)
+		self.assertTrue(row.suppressed)
+		self.assertBlocked("admin-toggled@example.com", True)
+
+	def test_queryset_update_is_caught_by_rebuild(self):
+		_subscriber("bulk@example.com")
+		Subscribers.objects.filter(email="bulk@example.com").update(active=False)
+		self.assertNotIn("bulk@example.com", BlockedEmailSet())
+
+		rebuild_blocked_emails()
+
+		self.assertBlocked("bulk@example.com", True)
+
+	def test_rebuild_command_reports_counts(self):
+		record_author_opt_out("one@example.com", AuthorContactOptOut.REASON_ADMIN)
+		out = StringIO()
+
+		call_command("rebuild_blocked_emails", stdout=out)
+
+		self.assertIn("1 currently blocked", out.getvalue())
+
+
+class BlockedEmailSetRefreshTest(TestCase):
+	def test_refresh_picks_up_blocks_and_unblocks_since_load(self):
+		subscriber = _subscriber("toggle@example.com", active=False)
+		blocked = BlockedEmailSet()
+		self.assertIn("toggle@example.com", blocked)
+
+		subscriber.active = True
+		subscriber.save()
+		record_author_opt_out("late@example.com", AuthorContactOptOut.REASON_OPT_OUT)
+		self.assertIn("toggle@example.com", blocked)
+
+		blocked.refresh()
+		self.assertNotIn("toggle@example.com", blocked)
+		self.assertIn("late@example.com", blocked)
+
+	def test_latest_suppression_event_decides(self):
+		SuppressionEvent.objects.create(
+			email="events@example.com",
+			suppress_sending=True,
+			changed_at=timezone.now() - timedelta(days=2),
+		)
+		SuppressionEvent.objects.create(
+			email="events@example.com",
+			suppress_sending=False,
+			changed_at=timezone.now() - timedelta(days=1),
+		)
+		refresh_blocked_emails(["events@example.com"])
+
+		self.assertNotIn("events@example.com", BlockedEmailSet())
+		self.assertFalse(is_contact_blocked("events@example.com"))
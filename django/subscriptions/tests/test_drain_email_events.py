@@ -0,0 +1,216 @@
+"""
+Tests for the staged EmailEvent path: subscriptions.utils.email_events.
+enqueue_email_event (what the Postmark webhook calls) and
+drain_pending_email_events / the drain_email_events command (what turns the
+staged rows into EmailEvent rows in bulk).
+
+The drain must reach the same end state as handle_email_event applied to
+each payload in turn — same correlation, same aggregate rules, same replay
+dedupe, same opt-out side effects — so several tests here mirror ones in
+test_email_events.py and test_author_contact_optout_wiring.py.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.test import TestCase
+
+from subscriptions.models import (
+	AuthorContactOptOut,
+	EmailEvent,
+	EmailMessage,
+	PendingEmailEvent,
+)
+from subscriptions.tests.test_email_events import (
+	_bounce_payload,
+	_click_payload,
+	_delivery_payload,
+	_open_payload,
+	_subscription_change_payload,
+)
+from subscriptions.utils.email_events import (
+	drain_pending_email_events,
+	enqueue_email_event,
+)
+
+
+class EnqueueEmailEventTest(TestCase):
+	def test_stages_one_row_and_writes_no_email_event(self):
+		staged = enqueue_email_event(_delivery_payload())
+
+		self.assertIsNotNone(staged)
+		self.assertEqual(staged.record_type, EmailEvent.RECORD_TYPE_DELIVERY)
+		self.assertEqual(PendingEmailEvent.objects.count(), 1)
+		self.assertEqual(EmailEvent.objects.count(), 0)
+
+	def test_subscription_change_and_unknown_types_are_not_staged(self):
+		self.assertIsNone(enqueue_email_event(_subscription_change_payload()))
+		self.assertIsNone(enqueue_email_event({"RecordType": "SomethingNew"}))
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
+
+	def test_staged_payload_drops_device_location_and_content_fields(self):
+		payload = _open_payload(Metadata={"msg_token": "not-checked-here", "campaign": "x"})
+		staged = enqueue_email_event(payload)
+
+		for key in ("Geo", "Client", "OS", "Platform", "UserAgent", "ReadSeconds"):
+			self.assertNotIn(key, staged.payload)
+		self.assertEqual(staged.payload["Metadata"], {"msg_token": "not-checked-here"})
+		self.assertEqual(staged.payload["Recipient"], "researcher@example.com")
+
+	def test_staging_failure_falls_back_to_inline_processing(self):
+		with mock.patch.object(
+			PendingEmailEvent.objects, "create", side_effect=RuntimeError("db down")
+		):
+			result = enqueue_email_event(_delivery_payload())
+
+		self.assertIsNone(result)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
+		self.assertEqual(EmailEvent.objects.count(), 1)
+
+
+class DrainPendingEmailEventsTest(TestCase):
+	def setUp(self):
+		self.site = Site.objects.get_or_create(
+			id=1, defaults={"domain": "testserver", "name": "Test Site"}
+		)[0]
+
+	def _message(self, message_id, recipient="john@example.com"):
+		return EmailMessage.objects.create(
+			message_id=message_id,
+			recipient=recipient,
+			tag="weekly_summary",
+			message_stream="broadcast",
+			site=self.site,
+			accepted=True,
+		)
+
+	def test_empty_queue_returns_zero(self):
+		self.assertEqual(drain_pending_email_events(), 0)
+
+	def test_resolves_messages_by_message_id_and_msg_token(self):
+		by_id = self._message("id-by-message-id")
+		by_token = self._message("id-never-reported", recipient="jane@example.com")
+
+		enqueue_email_event(_delivery_payload(MessageID="id-by-message-id"))
+		enqueue_email_event(
+			_delivery_payload(
+				MessageID="some-other-id",
+				Recipient="jane@example.com",
+				Metadata={"msg_token": str(by_token.msg_token)},
+			)
+		)
+		enqueue_email_event(_click_payload(MessageID="unknown-id"))
+
+		self.assertEqual(drain_pending_email_events(), 3)
+
+		self.assertEqual(
+			EmailEvent.objects.get(message_id="id-by-message-id").email_message_id,
+			by_id.pk,
+		)
+		self.assertEqual(
+			EmailEvent.objects.get(message_id="some-other-id").email_message_id,
+			by_token.pk,
+		)
+		self.assertIsNone(EmailEvent.objects.get(message_id="unknown-id").email_message)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
+
+	def test_applies_aggregates_in_one_pass(self):
+		message = self._message("883953f4-6105-42a2-a16a-77a8eac79483")
+
+		enqueue_email_event(_delivery_payload())
+		enqueue_email_event(_open_payload(ReceivedAt="2026-08-02T12:00:00Z"))
+		enqueue_email_event(_open_payload(ReceivedAt="2026-08-01T13:00:00Z"))
+		enqueue_email_event(_bounce_payload(Type="SoftBounce", TypeCode=4096))
+		drain_pending_email_events()
+
+		message.refresh_from_db()
+		self.assertIsNotNone(message.delivered_at)
+		self.assertEqual(message.first_opened_at.isoformat(), "2026-08-01T13:00:00+00:00")
+		self.assertIsNotNone(message.bounced_at)
+		self.assertEqual(message.bounce_type, "SoftBounce")
+		self.assertEqual(
+			EmailEvent.objects.filter(record_type=EmailEvent.RECORD_TYPE_OPEN).count(), 2
+		)
+
+	def test_a_later_batch_never_moves_first_opened_at(self):
+		message = self._message("883953f4-6105-42a2-a16a-77a8eac79483")
+
+		enqueue_email_event(_open_payload(ReceivedAt="2026-08-02T12:00:00Z"))
+		drain_pending_email_events()
+		message.refresh_from_db()
+		first_opened_at = message.first_opened_at
+
+		enqueue_email_event(_open_payload(ReceivedAt="2026-08-01T12:00:00Z"))
+		drain_pending_email_events()
+		message.refresh_from_db()
+		self.assertEqual(message.first_opened_at, first_opened_at)
+
+	def test_replayed_payload_dedupes_across_and_within_batches(self):
+		enqueue_email_event(_delivery_payload())
+		enqueue_email_event(_delivery_payload())
+		drain_pending_email_events()
+		enqueue_email_event(_delivery_payload())
+		drain_pending_email_events()
+
+		self.assertEqual(EmailEvent.objects.count(), 1)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
+
+	def test_replay_does_not_reapply_aggregates(self):
+		message = self._message("883953f4-6105-42a2-a16a-77a8eac79483")
+		enqueue_email_event(_delivery_payload(DeliveredAt="2026-08-01T12:00:00Z"))
+		drain_pending_email_events()
+		enqueue_email_event(_delivery_payload(DeliveredAt="2026-08-03T12:00:00Z"))
+		drain_pending_email_events()
+
+		# A provider retry of the first Delivery, in a later batch and twice
+		# within it, must not pull delivered_at back.
+		enqueue_email_event(_delivery_payload(DeliveredAt="2026-08-01T12:00:00Z"))
+		enqueue_email_event(_delivery_payload(DeliveredAt="2026-08-01T12:00:00Z"))
+		self.assertEqual(drain_pending_email_events(), 2)
+
+		message.refresh_from_db()
+		self.assertEqual(message.delivered_at.isoformat(), "2026-08-03T12:00:00+00:00")
+		self.assertEqual(EmailEvent.objects.count(), 2)
+
+	def test_batch_size_limits_rows_consumed(self):
+		for index in range(5):
+			enqueue_email_event(_delivery_payload(MessageID=f"id-{index}"))
+
+		self.assertEqual(drain_pending_email_events(batch_size=2), 2)
+		self.assertEqual(PendingEmailEvent.objects.count(), 3)
+		self.assertEqual(EmailEvent.objects.count(), 2)
+
+	def test_hard_bounce_writes_author_opt_out(self):
+		enqueue_email_event(_bounce_payload(Type="HardBounce", Email="hard@example.com"))
+		enqueue_email_event(
+			_bounce_payload(Type="SoftBounce", MessageID="soft", Email="soft@example.com")
+		)
+		drain_pending_email_events()
+
+		self.assertTrue(AuthorContactOptOut.objects.filter(email="hard@example.com").exists())
+		self.assertFalse(AuthorContactOptOut.objects.filter(email="soft@example.com").exists())
+
+
+class DrainEmailEventsCommandTest(TestCase):
+	def test_drains_every_batch_and_reports_totals(self):
+		for index in range(5):
+			enqueue_email_event(_delivery_payload(MessageID=f"id-{index}"))
+
+		out = StringIO()
+		call_command("drain_email_events", "--batch-size", "2", stdout=out)
+
+		self.assertEqual(EmailEvent.objects.count(), 5)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
+		self.assertIn("Drained 5 staged email events in 3 batches", out.getvalue())
+
+	def test_max_batches_stops_early(self):
+		for index in range(5):
+			enqueue_email_event(_delivery_payload(MessageID=f"id-{index}"))
+
+		call_command(
+			"drain_email_events", "--batch-size", "2", "--max-batches", "1", stdout=StringIO()
+		)
+
+		self.assertEqual(PendingEmailEvent.objects.count(), 3)
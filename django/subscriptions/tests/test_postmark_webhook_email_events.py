@@ -7,11 +7,13 @@ handling — see test_postmark_webhook.py for that, unchanged).
 import base64
 import json
 import os
+from io import StringIO
 from unittest import mock
 
+from django.core.management import call_command
 from django.test import Client, TestCase
 
-from subscriptions.models import EmailEvent, SuppressionEvent
+from subscriptions.models import EmailEvent, PendingEmailEvent, SuppressionEvent
 
 WEBHOOK_ENV = {
 	"POSTMARK_WEBHOOK_USERNAME": "webhook-user",
@@ -41,7 +43,7 @@ class PostmarkWebhookEmailEventDispatchTest(TestCase):
 		)
 
 	@mock.patch.dict(os.environ, WEBHOOK_ENV)
-	def test_delivery_open_bounce_click_spam_each_write_one_email_event(self):
+	def test_delivery_open_bounce_click_spam_each_stage_then_drain_to_one_email_event(self):
 		payloads = [
 			{
 				"RecordType": "Delivery",
@@ -88,6 +90,13 @@ class PostmarkWebhookEmailEventDispatchTest(TestCase):
 			response = self._post(payload)
 			self.assertEqual(response.status_code, 200)
 
+		# The webhook only stages; EmailEvent rows appear once drained.
+		self.assertEqual(PendingEmailEvent.objects.count(), 5)
+		self.assertEqual(EmailEvent.objects.count(), 0)
+
+		call_command("drain_email_events", stdout=StringIO())
+
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
 		self.assertEqual(EmailEvent.objects.count(), 5)
 		recipients = set(EmailEvent.objects.values_list("recipient", flat=True))
 		self.assertEqual(
@@ -123,6 +132,7 @@ class PostmarkWebhookEmailEventDispatchTest(TestCase):
 		self.assertEqual(response.status_code, 200)
 		self.assertEqual(SuppressionEvent.objects.count(), 1)
 		self.assertEqual(EmailEvent.objects.count(), 0)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
 
 	@mock.patch.dict(os.environ, WEBHOOK_ENV)
 	def test_unauthenticated_post_writes_no_email_event(self):
@@ -143,3 +153,4 @@ class PostmarkWebhookEmailEventDispatchTest(TestCase):
 		response = self._post({"RecordType": "SomethingPostmarkMightAddLater"})
 		self.assertEqual(response.status_code, 200)
 		self.assertEqual(EmailEvent.objects.count(), 0)
+		self.assertEqual(PendingEmailEvent.objects.count(), 0)
@@ -34,7 +34,10 @@ from subscriptions.models import (
 	AuthorOutreach,
 	AuthorOutreachCampaign,
 	EmailMessage,
+	PendingEmailEvent,
 )
+from subscriptions.tests.test_email_events import _spam_complaint_payload
+from subscriptions.utils.email_events import enqueue_email_event
 
 SEND_EMAIL_POST_TARGET = "subscriptions.management.commands.utils.send_email.requests.post"
 SLEEP_TARGET = "subscriptions.management.commands.send_author_outreach.time.sleep"
@@ -281,6 +284,34 @@ class SendAuthorOutreachCommandTestCase(TestCase):
 		self.assertIn("spam complaint", w.campaign.halted_reason)
 		self.assertIn("halt", output.lower())
 
+	def test_staged_complaint_is_drained_before_the_breakers_run(self):
+		w = self._new_world("breaker-staged", campaign_kwargs={"complaint_halt_absolute": 1})
+		earlier = self._new_row(w, "bs0", status=AuthorOutreach.STATUS_SENT)
+		earlier.email_message = EmailMessage.objects.create(
+			message_id="staged-complaint-msg",
+			recipient=earlier.email,
+			tag="author_outreach",
+			site=w.site,
+			accepted=True,
+		)
+		earlier.save(update_fields=["email_message"])
+		# The complaint has reached the webhook but no drain has run yet.
+		enqueue_email_event(
+			_spam_complaint_payload(MessageID="staged-complaint-msg", Email=earlier.email)
+		)
+		row = self._new_row(w, "bs1", status=AuthorOutreach.STATUS_APPROVED)
+
+		with mock.patch(SEND_EMAIL_POST_TARGET) as mock_post:
+			output = self._run(w.campaign.utm_campaign_slug)
+
+		mock_post.assert_not_called()
+		self.assertFalse(PendingEmailEvent.objects.exists())
+		self.assertIn("Drained 1 staged email event(s)", output)
+		row.refresh_from_db()
+		self.assertEqual(row.status, AuthorOutreach.STATUS_APPROVED)
+		w.campaign.refresh_from_db()
+		self.assertTrue(w.campaign.halted)
+
 	def test_breaker_trip_stops_remaining_rows_in_same_run(self):
 		w = self._new_world("breaker2", campaign_kwargs={"complaint_halt_absolute": 1})
 		row1 = self._new_row(w, "r1", status=AuthorOutreach.STATUS_APPROVED)
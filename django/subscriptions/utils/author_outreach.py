@@ -57,6 +57,7 @@ from subscriptions.models import (
 	Subscribers,
 	SuppressionEvent,
 )
+from subscriptions.utils.blocked_emails import BlockedEmailSet
 
 # Sort key floor for articles with no published_date, so they rank last
 # within an author's row instead of a None/datetime comparison blowing up.
@@ -138,6 +139,16 @@ def eligible_authors(campaign, since=None):
 	if not articles_by_author:
 		return []
 
+	# Rules 6-7 for every candidate at once: one query for the (site,
+	# author) slots already taken, and the BlockedEmail projection loaded
+	# into memory, instead of four queries per author.
+	claimed_author_ids = set(
+		AuthorOutreach.objects.filter(
+			site=campaign.site, author_id__in=articles_by_author.keys()
+		).values_list("author_id", flat=True)
+	)
+	blocked = BlockedEmailSet()
+
 	results = []
 	for author in Authors.objects.filter(pk__in=articles_by_author.keys()):
 		if not _author_qualifies(author):
@@ -145,7 +156,7 @@ def eligible_authors(campaign, since=None):
 		email = _primary_email(author)
 		if email is None:
 			continue
-		if _is_excluded(campaign, author, email):
+		if _is_excluded(author, email, claimed_author_ids, blocked):
 			continue
 		articles = sorted(
 			(qualifying_articles[aid] for aid in articles_by_author[author.pk]),
@@ -300,16 +311,20 @@ def _primary_email(author):
 	return str(raw).strip().lower()
 
 
-def _is_excluded(campaign, author, email):
+def _is_excluded(author, email, claimed_author_ids, blocked):
 	"""Spec "Who qualifies", shared rule 6-7: every independent reason an
 	otherwise-qualifying author must not be queued. Each check stands
-	alone — losing on any single one is enough to exclude the author."""
-	if AuthorOutreach.objects.filter(site=campaign.site, author=author).exists():
+	alone — losing on any single one is enough to exclude the author.
+
+	`claimed_author_ids` and `blocked` (a BlockedEmailSet) are loaded once
+	per build by eligible_authors; `email in blocked` is the projected form
+	of is_contact_blocked below."""
+	if author.pk in claimed_author_ids:
 		# Rule 7. Keyed on (site, author), not (campaign, author) — see
 		# AuthorOutreach's UniqueConstraint — so a slot claimed by any
 		# campaign on this site (including a different one) burns it here.
 		return True
-	return is_contact_blocked(email)
+	return email in blocked
 
 
 def is_contact_blocked(email):
@@ -326,6 +341,10 @@ def is_contact_blocked(email):
 	out, suppressed, or deactivated in the time between build and send
 	must not receive the email just because it passed this check once
 	at queue-build time.
+
+	Reads the source tables directly. Loops over many addresses use the
+	BlockedEmail projection instead (subscriptions.utils.blocked_emails.
+	BlockedEmailSet), which answers the same question from memory.
 	"""
 	if AuthorContactOptOut.objects.filter(email__iexact=email).exists():
 		return True
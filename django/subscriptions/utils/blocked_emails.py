@@ -0,0 +1,164 @@
+"""
+The BlockedEmail projection — see BlockedEmail's model docstring
+(subscriptions/models.py).
+
+`is_contact_blocked` (subscriptions.utils.author_outreach) answers "may we
+email this address?" from the source tables, three case-insensitive queries
+per address. A send or build loop over thousands of recipients paid that per
+recipient. This module keeps the same answer precomputed, one row per
+lowercased address, and `BlockedEmailSet` loads it into memory once per run
+so the loop checks a hash set instead.
+
+`refresh_blocked_emails` is the only writer; it recomputes rows from the
+source tables rather than patching a flag in place, so a caller never has to
+know *which* of the three reasons it just changed.
+"""
+
+from datetime import timedelta
+
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from subscriptions.models import (
+	AuthorContactOptOut,
+	BlockedEmail,
+	Subscribers,
+	SuppressionEvent,
+)
+
+BATCH_SIZE = 500
+
+# BlockedEmailSet.refresh re-reads rows updated this long before its last
+# load, not just after it: updated_at is stamped when the writing statement
+# runs, and a transaction that commits a moment after our read would
+# otherwise be skipped for good.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def normalize_email(email):
+	return (email or "").strip().lower()
+
+
+def _compute(keys):
+	"""(opted_out, inactive_subscriber, suppressed) per key in *keys*, read
+	from the source tables with one query each."""
+	opted_out = set(
+		AuthorContactOptOut.objects.annotate(key=Lower("email"))
+		.filter(key__in=keys)
+		.values_list("key", flat=True)
+	)
+	inactive = set(
+		Subscribers.objects.annotate(key=Lower("email"))
+		.filter(key__in=keys, active=False)
+		.values_list("key", flat=True)
+	)
+	# Latest event per address, exactly as is_contact_blocked orders it.
+	suppressed = {
+		key
+		for key, suppress_sending in SuppressionEvent.objects.annotate(
+			key=Lower("email")
+		)
+		.filter(key__in=keys)
+		.order_by("key", "-changed_at")
+		.distinct("key")
+		.values_list("key", "suppress_sending")
+		if suppress_sending
+	}
+	return {key: (key in opted_out, key in inactive, key in suppressed) for key in keys}
+
+
+def refresh_blocked_emails(emails):
+	"""
+	Recompute the BlockedEmail rows for *emails* (any case) from the source
+	tables, in batches. Returns the number of addresses refreshed.
+
+	Rows are upserted for every address given, blocked or not, so an
+	unblock is recorded too (see BlockedEmail's docstring for why rows are
+	kept rather than deleted).
+	"""
+	keys = sorted({normalize_email(email) for email in emails} - {""})
+	for start in range(0, len(keys), BATCH_SIZE):
+		chunk = keys[start : start + BATCH_SIZE]
+		rows = [
+			BlockedEmail(
+				email=key,
+				opted_out=opted_out,
+				inactive_subscriber=inactive,
+				suppressed=suppressed,
+				is_blocked=opted_out or inactive or suppressed,
+			)
+			for key, (opted_out, inactive, suppressed) in _compute(chunk).items()
+		]
+		BlockedEmail.objects.bulk_create(
+			rows,
+			update_conflicts=True,
+			unique_fields=["email"],
+			update_fields=[
+				"opted_out",
+				"inactive_subscriber",
+				"suppressed",
+				"is_blocked",
+				"updated_at",
+			],
+		)
+	return len(keys)
+
+
+def rebuild_blocked_emails():
+	"""
+	Recompute the whole projection: every address any source table knows,
+	plus every existing row (so a row whose source rows are gone is
+	refreshed to not-blocked rather than left stale). Returns the number of
+	addresses refreshed.
+	"""
+	keys = set(
+		AuthorContactOptOut.objects.annotate(key=Lower("email")).values_list(
+			"key", flat=True
+		)
+	)
+	keys.update(
+		Subscribers.objects.filter(active=False)
+		.annotate(key=Lower("email"))
+		.values_list("key", flat=True)
+	)
+	keys.update(
+		SuppressionEvent.objects.annotate(key=Lower("email"))
+		.values_list("key", flat=True)
+		.distinct()
+	)
+	keys.update(BlockedEmail.objects.values_list("email", flat=True))
+	return refresh_blocked_emails(keys)
+
+
+class BlockedEmailSet:
+	"""
+	In-memory snapshot of the blocked addresses, for one send or build run.
+
+	`email in blocked` is a hash-set lookup (case-insensitive). `refresh()`
+	brings the snapshot up to date with a single indexed query over rows
+	touched since the previous load — usually none — so a loop that must
+	re-check before every send (send_author_outreach) can afford to.
+	"""
+
+	def __init__(self):
+		self._loaded_at = timezone.now()
+		self._blocked = set(
+			BlockedEmail.objects.filter(is_blocked=True).values_list("email", flat=True)
+		)
+
+	def refresh(self):
+		started_at = timezone.now()
+		for email, is_blocked in BlockedEmail.objects.filter(
+			updated_at__gte=self._loaded_at - REFRESH_OVERLAP
+		).values_list("email", "is_blocked"):
+			if is_blocked:
+				self._blocked.add(email)
+			else:
+				self._blocked.discard(email)
+		self._loaded_at = started_at
+
+	def __contains__(self, email):
+		return normalize_email(email) in self._blocked
+
+	def __len__(self):
+		return len(self._blocked)
@@ -30,15 +30,30 @@ again anywhere, via subscriptions.utils.author_optout.record_author_opt_out,
 which is itself failure-tolerant. See that module's docstring for why every
 caller, this one included, needs the write to be unable to turn a success
 into a failure.
+
+Two entry points write EmailEvent: handle_email_event processes one payload
+inline, and drain_pending_email_events processes a batch of payloads the
+webhook staged in PendingEmailEvent (enqueue_email_event) — resolving every
+message in the batch with two IN-queries, inserting the events with one
+bulk_create and applying every aggregate with one UPDATE. Both read the
+payload through the same _event_fields, so what gets stored is identical.
 """
 
 import logging
+import uuid
 
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from subscriptions.models import AuthorContactOptOut, EmailEvent, EmailMessage
+from subscriptions.models import (
+	AuthorContactOptOut,
+	EmailEvent,
+	EmailMessage,
+	PendingEmailEvent,
+)
 from subscriptions.utils.author_optout import record_author_opt_out
 
 logger = logging.getLogger(__name__)
@@ -153,6 +168,77 @@ def _update_message_aggregates(message, record_type, occurred_at, extra):
 		message.save(update_fields=update_fields)
 
 
+def _event_fields(record_type, payload):
+	"""
+	The EmailEvent column values for one payload, minus email_message.
+
+	The single place a payload is read for storage — handle_email_event and
+	drain_pending_email_events both go through it, so the "deliberately NOT
+	stored" guarantees in EmailEvent's docstring hold on both paths.
+	"""
+	recipient_field = _RECIPIENT_FIELD.get(record_type, "Recipient")
+	fields = {
+		"record_type": record_type,
+		"message_id": payload.get("MessageID") or "",
+		"recipient": (payload.get(recipient_field) or "").strip().lower(),
+		"occurred_at": _parse_occurred_at(record_type, payload),
+		"tag": payload.get("Tag") or "",
+		"message_stream": payload.get("MessageStream") or "",
+	}
+	if record_type in (
+		EmailEvent.RECORD_TYPE_BOUNCE,
+		EmailEvent.RECORD_TYPE_SPAM_COMPLAINT,
+	):
+		# Type/TypeCode/Details only — never Details' sibling `Content`,
+		# which Postmark also embeds in Bounce payloads and which this
+		# model deliberately never stores (see EmailEvent docstring).
+		fields["bounce_type"] = payload.get("Type") or ""
+		fields["bounce_type_code"] = payload.get("TypeCode")
+		fields["details"] = payload.get("Details") or ""
+	elif record_type == EmailEvent.RECORD_TYPE_CLICK:
+		fields["link_url"] = payload.get("OriginalLink") or ""
+	return fields
+
+
+def _extra(fields):
+	"""The per-kind subset of _event_fields that the aggregate/opt-out code reads."""
+	return {
+		key: fields[key]
+		for key in ("bounce_type", "bounce_type_code", "details", "link_url")
+		if key in fields
+	}
+
+
+def _record_opt_out_for_event(record_type, recipient, extra, event_label):
+	"""
+	Write the AuthorContactOptOut a hard bounce or spam complaint implies.
+
+	Never raises: record_author_opt_out never raises on its own (see its
+	docstring), but this call is additionally wrapped, separately from
+	whatever recorded the event, so that even a hypothetical failure here can
+	never cost us the EmailEvent row already committed.
+	"""
+	try:
+		if (
+			record_type == EmailEvent.RECORD_TYPE_BOUNCE
+			and extra.get("bounce_type") in HARD_BOUNCE_TYPES
+		):
+			record_author_opt_out(
+				recipient,
+				AuthorContactOptOut.REASON_HARD_BOUNCE,
+				note=f"Postmark Bounce Type={extra.get('bounce_type')!r}.",
+			)
+		elif record_type == EmailEvent.RECORD_TYPE_SPAM_COMPLAINT:
+			record_author_opt_out(recipient, AuthorContactOptOut.REASON_SPAM_COMPLAINT)
+	except Exception:
+		logger.exception(
+			"email_events: failed to record an author opt-out for %s event "
+			"(EmailEvent %s was still recorded).",
+			record_type,
+			event_label,
+		)
+
+
 def handle_email_event(payload):
 	"""
 	Process one Postmark webhook payload and write one EmailEvent row.
@@ -160,10 +246,10 @@ def handle_email_event(payload):
 	Accepts RecordType Delivery, Bounce, SpamComplaint, Open, or Click;
 	anything else — including SubscriptionChange, which is handled
 	entirely by handle_subscription_change instead, see the module
-	docstring — is a no-op (returns None). Dispatch on RecordType happens
-	in subscriptions.views.postmark_webhook, which only calls this for the
-	five types above, but this function stays defensive on its own via the
-	EmailEvent.RECORD_TYPES check below.
+	docstring — is a no-op (returns None). The webhook itself now stages
+	these five types via enqueue_email_event; this inline path is what
+	enqueue_email_event falls back to when the staging insert fails, and
+	stays defensive on its own via the EmailEvent.RECORD_TYPES check below.
 
 	Never raises. Any exception — including a payload shaped unexpectedly —
 	is logged and swallowed, so a bug here can never turn a webhook call
@@ -179,69 +265,22 @@ def handle_email_event(payload):
 		return None
 
 	try:
-		recipient_field = _RECIPIENT_FIELD.get(record_type, "Recipient")
-		recipient = (payload.get(recipient_field) or "").strip().lower()
-		message_id = payload.get("MessageID") or ""
-		occurred_at = _parse_occurred_at(record_type, payload)
-		tag = payload.get("Tag") or ""
-		message_stream = payload.get("MessageStream") or ""
+		fields = _event_fields(record_type, payload)
+		extra = _extra(fields)
 		message = _find_message(payload)
 
-		extra = {}
-		if record_type in (
-			EmailEvent.RECORD_TYPE_BOUNCE,
-			EmailEvent.RECORD_TYPE_SPAM_COMPLAINT,
-		):
-			# Type/TypeCode/Details only — never Details' sibling `Content`,
-			# which Postmark also embeds in Bounce payloads and which this
-			# model deliberately never stores (see EmailEvent docstring).
-			extra["bounce_type"] = payload.get("Type") or ""
-			extra["bounce_type_code"] = payload.get("TypeCode")
-			extra["details"] = payload.get("Details") or ""
-		elif record_type == EmailEvent.RECORD_TYPE_CLICK:
-			extra["link_url"] = payload.get("OriginalLink") or ""
-
 		with transaction.atomic():
-			event = EmailEvent.objects.create(
-				email_message=message,
-				record_type=record_type,
-				message_id=message_id,
-				recipient=recipient,
-				occurred_at=occurred_at,
-				tag=tag,
-				message_stream=message_stream,
-				**extra,
-			)
+			event = EmailEvent.objects.create(email_message=message, **fields)
 			if message is not None:
-				_update_message_aggregates(message, record_type, occurred_at, extra)
+				_update_message_aggregates(
+					message, record_type, fields["occurred_at"], extra
+				)
 
 		# Not inside the transaction above: this is an independent write to
-		# a different table (AuthorContactOptOut). record_author_opt_out
-		# never raises on its own (see its docstring), but this call is
-		# additionally wrapped on its own, separately from the outer
-		# try/except below, so that even a hypothetical failure here can
-		# never cost us the EmailEvent row already committed above — the
-		# function still returns `event`, and a webhook caller still sees
-		# it as processed, either way.
-		try:
-			if (
-				record_type == EmailEvent.RECORD_TYPE_BOUNCE
-				and extra.get("bounce_type") in HARD_BOUNCE_TYPES
-			):
-				record_author_opt_out(
-					recipient,
-					AuthorContactOptOut.REASON_HARD_BOUNCE,
-					note=f"Postmark Bounce Type={extra.get('bounce_type')!r}.",
-				)
-			elif record_type == EmailEvent.RECORD_TYPE_SPAM_COMPLAINT:
-				record_author_opt_out(recipient, AuthorContactOptOut.REASON_SPAM_COMPLAINT)
-		except Exception:
-			logger.exception(
-				"email_events: failed to record an author opt-out for %s event "
-				"(EmailEvent %s was still recorded).",
-				record_type,
-				event.pk,
-			)
+		# a different table (AuthorContactOptOut), and the function still
+		# returns `event` — a webhook caller still sees it as processed —
+		# whatever happens in it.
+		_record_opt_out_for_event(record_type, fields["recipient"], extra, event.pk)
 
 		return event
 	except IntegrityError:
@@ -249,3 +288,255 @@ def handle_email_event(payload):
 	except Exception:
 		logger.exception("email_events: failed to process %s event.", record_type)
 		return None
+
+
+# ---------------------------------------------------------------------------
+# Staged (bulk) path
+# ---------------------------------------------------------------------------
+
+DRAIN_BATCH_SIZE = 500
+
+# Every payload key _event_fields and _find_message read — and nothing else.
+# Staging the raw body would park exactly the Geo/IP/UserAgent/Content fields
+# EmailEvent refuses to store in a table of its own, however briefly.
+_STAGED_FIELDS = (
+	"RecordType",
+	"MessageID",
+	"Recipient",
+	"Email",
+	"DeliveredAt",
+	"BouncedAt",
+	"ReceivedAt",
+	"Tag",
+	"MessageStream",
+	"Type",
+	"TypeCode",
+	"Details",
+	"OriginalLink",
+)
+
+
+def stage_email_event_payload(payload):
+	"""The allow-listed subset of a webhook payload that PendingEmailEvent keeps."""
+	staged = {key: payload[key] for key in _STAGED_FIELDS if key in payload}
+	metadata = payload.get("Metadata")
+	if isinstance(metadata, dict) and metadata.get("msg_token"):
+		staged["Metadata"] = {"msg_token": metadata["msg_token"]}
+	return staged
+
+
+def enqueue_email_event(payload):
+	"""
+	Stage one webhook payload for drain_pending_email_events with a single
+	INSERT. Returns the PendingEmailEvent, or None for a RecordType
+	EmailEvent doesn't record.
+
+	Never raises. If the staging insert itself fails, the payload is
+	processed inline through handle_email_event instead — slower, but the
+	event is not lost and the webhook still answers 200.
+	"""
+	record_type = payload.get("RecordType")
+	if record_type not in EmailEvent.RECORD_TYPES:
+		return None
+	try:
+		return PendingEmailEvent.objects.create(
+			record_type=record_type, payload=stage_email_event_payload(payload)
+		)
+	except Exception:
+		logger.exception(
+			"email_events: failed to stage %s event; processing inline.", record_type
+		)
+		handle_email_event(payload)
+		return None
+
+
+def _msg_token(payload):
+	"""Metadata.msg_token as a UUID, or None when absent or malformed (a
+	malformed token falls through to MessageID correlation, as in
+	_find_message)."""
+	metadata = payload.get("Metadata")
+	raw = metadata.get("msg_token") if isinstance(metadata, dict) else None
+	if not raw:
+		return None
+	try:
+		return uuid.UUID(str(raw))
+	except ValueError:
+		return None
+
+
+def _resolve_messages(payloads):
+	"""
+	Bulk counterpart of _find_message: one query per correlation key for a
+	whole batch. Returns a list aligned with *payloads* (EmailMessage or None).
+	"""
+	tokens = {token for token in map(_msg_token, payloads) if token}
+	message_ids = {p.get("MessageID") for p in payloads if p.get("MessageID")}
+
+	by_token = {}
+	if tokens:
+		by_token = {
+			message.msg_token: message
+			for message in EmailMessage.objects.filter(msg_token__in=tokens)
+		}
+	by_message_id = {}
+	if message_ids:
+		# Same tie-break as _find_message's .first() under the model's
+		# -sent_at ordering: the most recently sent row wins.
+		for message in EmailMessage.objects.filter(message_id__in=message_ids):
+			by_message_id.setdefault(message.message_id, message)
+
+	resolved = []
+	for payload in payloads:
+		message = by_token.get(_msg_token(payload))
+		if message is None:
+			message = by_message_id.get(payload.get("MessageID") or "")
+		resolved.append(message)
+	return resolved
+
+
+def _apply_aggregates_in_bulk(events):
+	"""
+	Apply _update_message_aggregates' rules for a whole batch in one UPDATE.
+
+	Events are folded per message in occurred_at order, so within a batch
+	the latest Delivery/Bounce/SpamComplaint wins and the earliest Open fills
+	first_opened_at — and an already-set first_opened_at is never moved
+	(Coalesce), exactly as on the inline path.
+	"""
+	delivered, first_open, bounced, complained = {}, {}, {}, {}
+	for event in sorted(events, key=lambda e: e.occurred_at):
+		pk = event.email_message_id
+		if pk is None:
+			continue
+		if event.record_type == EmailEvent.RECORD_TYPE_DELIVERY:
+			delivered[pk] = event.occurred_at
+		elif event.record_type == EmailEvent.RECORD_TYPE_OPEN:
+			first_open.setdefault(pk, event.occurred_at)
+		elif event.record_type == EmailEvent.RECORD_TYPE_BOUNCE:
+			bounced[pk] = (event.occurred_at, event.bounce_type)
+		elif event.record_type == EmailEvent.RECORD_TYPE_SPAM_COMPLAINT:
+			complained[pk] = event.occurred_at
+
+	def case(field, values, output_field):
+		return Case(
+			*[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+			default=F(field),
+			output_field=output_field,
+		)
+
+	updates = {}
+	if delivered:
+		updates["delivered_at"] = case("delivered_at", delivered, models.DateTimeField())
+	if first_open:
+		updates["first_opened_at"] = Coalesce(
+			F("first_opened_at"),
+			case("first_opened_at", first_open, models.DateTimeField()),
+		)
+	if bounced:
+		updates["bounced_at"] = case(
+			"bounced_at", {pk: v[0] for pk, v in bounced.items()}, models.DateTimeField()
+		)
+		updates["bounce_type"] = case(
+			"bounce_type", {pk: v[1] for pk, v in bounced.items()}, models.CharField()
+		)
+	if complained:
+		updates["complained_at"] = case(
+			"complained_at", complained, models.DateTimeField()
+		)
+	if updates:
+		pks = set(delivered) | set(first_open) | set(bounced) | set(complained)
+		EmailMessage.objects.filter(pk__in=pks).update(**updates)
+
+
+_DEDUP_KEY = ("record_type", "message_id", "occurred_at", "recipient", "link_url")
+
+
+def _dedup_key(event):
+	return tuple(getattr(event, field) for field in _DEDUP_KEY)
+
+
+def _unrecorded_events(events):
+	"""
+	The events in *events* that EmailEvent doesn't hold yet, once each.
+
+	bulk_create(ignore_conflicts=True) silently drops a replay but can't say
+	which rows it dropped, and applying a replay's aggregates again would
+	move them — a re-sent older Delivery would pull delivered_at back, a
+	replayed Bounce would re-stamp bounced_at — just as the inline path
+	avoids by returning early on IntegrityError. So the batch is compared
+	against the stored rows on EmailEvent's unique key (one query, narrowed
+	by message_id) and collapsed within itself first; only what remains is
+	inserted, folded into the aggregates and turned into opt-outs.
+	"""
+	unique = {}
+	for event in events:
+		unique.setdefault(_dedup_key(event), event)
+	if not unique:
+		return []
+	recorded = set(
+		EmailEvent.objects.filter(
+			message_id__in={key[1] for key in unique}
+		).values_list(*_DEDUP_KEY)
+	)
+	return [event for key, event in unique.items() if key not in recorded]
+
+
+def drain_pending_email_events(batch_size=DRAIN_BATCH_SIZE):
+	"""
+	Turn up to *batch_size* staged PendingEmailEvent rows into EmailEvent rows.
+
+	One transaction per batch: the rows are claimed with SELECT ... FOR
+	UPDATE SKIP LOCKED (so concurrent drains never double-process), messages
+	are resolved in bulk, the events are bulk-inserted with
+	ignore_conflicts (a replay dedupes on EmailEvent's unique constraint
+	exactly as the inline IntegrityError path does), the aggregates are
+	applied with one UPDATE for the events actually inserted, and the staged rows are deleted. If anything
+	in there fails the whole batch rolls back and stays queued. A payload
+	that can't be parsed at all is logged and dropped, as handle_email_event
+	would have.
+
+	Returns the number of staged rows consumed (0 when the queue is empty).
+	"""
+	with transaction.atomic():
+		rows = list(
+			PendingEmailEvent.objects.select_for_update(skip_locked=True).order_by("pk")[
+				:batch_size
+			]
+		)
+		if not rows:
+			return 0
+
+		parsed = []
+		for row in rows:
+			try:
+				parsed.append((row.payload, _event_fields(row.record_type, row.payload)))
+			except Exception:
+				logger.exception(
+					"email_events: dropping unparseable staged %s event %s.",
+					row.record_type,
+					row.pk,
+				)
+
+		messages = _resolve_messages([payload for payload, _ in parsed])
+		events = _unrecorded_events(
+			[
+				EmailEvent(email_message=message, **fields)
+				for (_, fields), message in zip(parsed, messages)
+			]
+		)
+		# ignore_conflicts still covers a row the inline fallback or another
+		# drain inserted since the lookup above.
+		EmailEvent.objects.bulk_create(events, ignore_conflicts=True)
+		_apply_aggregates_in_bulk(events)
+		PendingEmailEvent.objects.filter(pk__in=[row.pk for row in rows]).delete()
+
+	# After commit, as on the inline path. record_author_opt_out is idempotent
+	# per address, so a replayed bounce in a batch costs a lookup, not a row.
+	for event in events:
+		_record_opt_out_for_event(
+			event.record_type,
+			event.recipient,
+			{"bounce_type": event.bounce_type},
+			"from a staged batch",
+		)
+	return len(rows)
@@ -9,6 +9,10 @@ so they cannot drift, and each call writes a `SuppressionEvent` recording
 exactly which `ListSubscription` rows it turned off. That record is what makes
 `reactivate_subscribers` possible: it restores precisely what a suppression
 changed, not a guess at what the subscriber "probably" still wants.
+
+Both also refresh the BlockedEmail projection for the addresses they touch
+(subscriptions.utils.blocked_emails): their `active` writes are queryset
+updates, which the projection's save signals never see.
 """
 
 import logging
@@ -17,6 +21,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from subscriptions.models import ListSubscription, SuppressionEvent, Subscribers
+from subscriptions.utils.blocked_emails import refresh_blocked_emails
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +95,9 @@ def deactivate_subscribers(
 			)
 			for subscriber_id, subscriber in subscribers_by_id.items()
 		]
+		refresh_blocked_emails(
+			subscriber.email for subscriber in subscribers_by_id.values()
+		)
 
 	if reason:
 		logger.warning(
@@ -125,5 +133,6 @@ def reactivate_subscribers(original_event):
 			pk__in=original_event.deactivated_list_subscription_ids or [],
 			subscriber=subscriber,
 		).update(is_active=True, unsubscribed_at=None)
+		refresh_blocked_emails([subscriber.email])
 
 	return subscribers_updated, subscriptions_updated
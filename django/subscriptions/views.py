@@ -29,7 +29,7 @@ from subscriptions.models import (
 	SubscriberSiteProfile,
 )
 from subscriptions.utils.author_optout import record_author_opt_out
-from subscriptions.utils.email_events import handle_email_event
+from subscriptions.utils.email_events import enqueue_email_event
 from subscriptions.utils.postmark_webhook import handle_subscription_change
 
 logger = logging.getLogger(__name__)
@@ -531,8 +531,9 @@ def postmark_webhook(request):
 	Only Subscription Change drives suppression/reactivation state — see
 	subscriptions.utils.postmark_webhook.handle_subscription_change and
 	docs/subscriptions.md for the policy. Every *other* recognised
-	RecordType is appended to the EmailEvent log via
-	subscriptions.utils.email_events.handle_email_event — see EmailEvent's
+	RecordType is staged in PendingEmailEvent via
+	subscriptions.utils.email_events.enqueue_email_event and appended to the
+	EmailEvent log by the drain_email_events command — see EmailEvent's
 	model docstring for exactly what is (and, deliberately, is not) kept
 	from each payload.
 
@@ -550,7 +551,7 @@ def postmark_webhook(request):
 	Every other outcome — including an unrecognised RecordType — returns 200
 	quickly. Postmark retries any non-200, and Subscription Change events are
 	only retried for ~21 minutes, so slow or wrongly-erroring responses
-	genuinely lose data. handle_email_event and handle_subscription_change
+	genuinely lose data. enqueue_email_event and handle_subscription_change
 	are both written to never raise, for the same reason: a bug in either
 	must not turn a webhook call into a non-200 response.
 	"""
@@ -574,7 +575,10 @@ def postmark_webhook(request):
 		# docstring for why: it's not an oversight.
 		handle_subscription_change(payload)
 	elif record_type in _POSTMARK_KNOWN_RECORD_TYPES:
-		handle_email_event(payload)
+		# One INSERT into the staging table; drain_email_events turns it
+		# into an EmailEvent in bulk. Keeps this response flat when Postmark
+		# replays a burst after an outage.
+		enqueue_email_event(payload)
 	else:
 		logger.warning(
 			"postmark_webhook: unrecognised RecordType %r; ignoring.", record_type
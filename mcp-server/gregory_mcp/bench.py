@@ -0,0 +1,629 @@
+"""Load and latency benchmark for the MCP server: `python -m gregory_mcp.bench`.
+
+Telemetry (telemetry.py) describes single requests in production; it can't
+say what the server does under concurrency, or whether a change made it
+faster. This drives a weighted mix of `tools/call` requests through
+`build_server()` in-process — middleware, tool dispatch, GregoryClient,
+CatalogCache, all real — at each of a set of concurrency levels, against a
+stand-in Gregory API with configurable latency instead of a live instance.
+
+Per level it reports p50/p95/p99 latency (overall and per tool), throughput,
+upstream HTTP calls per tool call and CatalogCache hit rates. The last two
+are read from the `mcp_request` telemetry records the server emits anyway,
+so the benchmark measures exactly what production logs. The report is
+JSON; `--baseline` compares it against an earlier one and exits non-zero on
+a latency regression, so two versions can be compared on the same mix.
+
+The stand-in serves fixtures: a synthetic data set by default, or a JSON
+file of recorded API responses (`--fixtures`, format in StandInAPI). List
+endpoints are paginated the way Django pages them, `<id field>__in` filters
+are honoured, responses carry ETags and answer If-None-Match with 304 —
+enough for the pagination fan-out, the catalog cache and the ETag cache to
+behave as against the real API. Other filters are ignored: this measures
+the MCP server, not search relevance.
+
+Usage:
+	python -m gregory_mcp.bench --concurrency 1,8,32 --calls 400 --output before.json
+	python -m gregory_mcp.bench --concurrency 1,8,32 --calls 400 --baseline before.json
+	python -m gregory_mcp.bench --latency-ms 40 --path-latency /categories/=1000 \\
+		--mix search_articles=5,list_categories=1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import platform
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from importlib import metadata
+from typing import Any
+
+import httpx2
+from mcp.client import Client
+
+from .cache import reset_catalog_cache
+from .client import close_client, init_client
+from .config import Settings
+from .server import build_server
+
+SCHEMA_VERSION = 1
+
+# Which field identifies a record of each collection: detail lookups and the
+# `<field>__in` filter key on it.
+ID_FIELDS = {
+	"/articles/": "article_id",
+	"/trials/": "trial_id",
+	"/authors/": "author_id",
+	"/categories/": "id",
+	"/subjects/": "id",
+	"/sponsors/": "id",
+}
+
+# Endpoints with plain DRF pagination ignore `page_size` (see
+# GregoryClient.get_all_pages); everything else honours it, up to 100.
+FIXED_PAGE_SIZES = {"/categories/": 10, "/subjects/": 10}
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+# Relative weights of each tool in a run; roughly the production mix, where
+# searches dominate and the catalogs are read mostly at the start of a
+# conversation.
+DEFAULT_MIX = {
+	"search_articles": 30,
+	"get_article": 8,
+	"get_articles": 10,
+	"search_trials": 15,
+	"get_trial": 4,
+	"get_trials": 5,
+	"search_authors": 5,
+	"list_categories": 8,
+	"list_subjects": 7,
+	"list_sponsors": 3,
+	"get_stats": 5,
+}
+
+SEARCH_TERMS = [
+	"remyelination",
+	"stem cells",
+	"encephalitis",
+	"rituximab OR ocrelizumab",
+	'"progressive multiple sclerosis"',
+	"neuroprotection NOT mice",
+]
+
+logger = logging.getLogger("gregory_mcp.bench")
+
+
+def synthetic_fixtures(
+	articles: int = 200, trials: int = 100, categories: int = 120, subjects: int = 7, authors: int = 60
+) -> dict[str, Any]:
+	"""A data set shaped like the API's responses. 120 categories at the
+	endpoint's fixed 10 per page give the 12-request cold read the catalog
+	cache was built for."""
+	summary = "Background. " + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+	return {
+		"collections": {
+			"/articles/": [
+				{
+					"article_id": i,
+					"title": f"Article {i}",
+					"summary": summary,
+					"link": f"https://example.org/articles/{i}",
+					"doi": f"10.5555/bench.{i}",
+					"published_date": "2026-01-01T00:00:00Z",
+					"container_title": "Journal of Benchmarks",
+					"access": "open",
+					"ml_score": 0.5,
+					"authors": [{"author_id": i % authors + 1, "full_name": f"Author {i % authors + 1}"}],
+				}
+				for i in range(1, articles + 1)
+			],
+			"/trials/": [
+				{
+					"trial_id": i,
+					"title": f"Trial {i}",
+					"summary": summary,
+					"link": f"https://example.org/trials/{i}",
+					"published_date": "2026-01-01T00:00:00Z",
+					"recruitment_status_normalized": "recruiting",
+					"phase_normalized": "phase_2",
+					"identifiers": {"nct": f"NCT{i:08d}"},
+				}
+				for i in range(1, trials + 1)
+			],
+			"/categories/": [
+				{
+					"id": i,
+					"category_name": f"Category {i}",
+					"category_slug": f"category-{i}",
+					"article_count_total": i * 3,
+					"trials_count_total": i,
+				}
+				for i in range(1, categories + 1)
+			],
+			"/subjects/": [
+				{"id": i, "subject_name": f"Subject {i}", "team_id": 1} for i in range(1, subjects + 1)
+			],
+			"/authors/": [
+				{"author_id": i, "full_name": f"Author {i}", "articles_count": 3} for i in range(1, authors + 1)
+			],
+			"/sponsors/": [{"id": i, "name": f"Sponsor {i}"} for i in range(1, 41)],
+		},
+		"documents": {
+			"/stats/": {"articles": articles, "trials": trials, "authors": authors, "by_subject": []},
+			"/articles/stats/": {"total": articles, "by_access": {"open": articles}, "by_subject": []},
+			"/trials/stats/": {"total": trials, "by_phase": {"phase_2": trials}, "by_subject": []},
+		},
+	}
+
+
+class StandInAPI:
+	"""An httpx2 transport handler serving *fixtures* with a delay.
+
+	Fixtures are a dict with two keys:
+
+	- ``collections``: list endpoint path -> list of records. Served
+	  paginated (``count``/``next``/``results``), and by id at
+	  ``<path><id>/`` using ID_FIELDS.
+	- ``documents``: path -> JSON body, served as is (the stats endpoints).
+
+	Each request waits ``latency`` seconds (``path_latency[path]`` when set,
+	plus up to ``jitter`` seconds drawn from a seeded generator).
+	"""
+
+	def __init__(
+		self,
+		fixtures: dict[str, Any],
+		latency: float = 0.0,
+		path_latency: dict[str, float] | None = None,
+		jitter: float = 0.0,
+		seed: int = 0,
+	):
+		self._collections = fixtures.get("collections", {})
+		self._documents = fixtures.get("documents", {})
+		self._by_id = {
+			path: {str(record.get(ID_FIELDS.get(path, "id"))): record for record in records}
+			for path, records in self._collections.items()
+		}
+		self._latency = latency
+		self._path_latency = path_latency or {}
+		self._jitter = jitter
+		self._rng = random.Random(seed)
+		self.requests: Counter[str] = Counter()
+		self.not_modified = 0
+
+	async def handle(self, request: httpx2.Request) -> httpx2.Response:
+		path = request.url.path
+		self.requests[path] += 1
+		delay = self._path_latency.get(path, self._latency)
+		if self._jitter:
+			delay += self._rng.uniform(0, self._jitter)
+		if delay:
+			await asyncio.sleep(delay)
+
+		status, body = self._resolve(path, request.url.params)
+		if status != 200:
+			return httpx2.Response(status, json=body)
+		content = json.dumps(body, sort_keys=True).encode()
+		etag = f'W/"{hashlib.sha256(content).hexdigest()[:20]}"'
+		if request.headers.get("If-None-Match") == etag:
+			self.not_modified += 1
+			return httpx2.Response(304, headers={"ETag": etag})
+		return httpx2.Response(
+			200, content=content, headers={"Content-Type": "application/json", "ETag": etag}
+		)
+
+	def _resolve(self, path: str, params: Any) -> tuple[int, Any]:
+		if path in self._documents:
+			return 200, self._documents[path]
+		if path in self._collections:
+			return self._page(path, params)
+		match = re.fullmatch(r"(/[^/]+/)([^/]+)/", path)
+		if match and match.group(1) in self._by_id:
+			record = self._by_id[match.group(1)].get(match.group(2))
+			if record is not None:
+				return 200, record
+		return 404, {"detail": "Not found."}
+
+	def _page(self, path: str, params: Any) -> tuple[int, Any]:
+		records = self._collections[path]
+		id_filter = params.get(f"{ID_FIELDS.get(path, 'id')}__in")
+		if id_filter:
+			wanted = set(id_filter.split(","))
+			records = [r for r in records if str(r.get(ID_FIELDS.get(path, "id"))) in wanted]
+		size = FIXED_PAGE_SIZES.get(path) or min(
+			int(params.get("page_size", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE
+		)
+		page = int(params.get("page", 1))
+		start = (page - 1) * size
+		if page > 1 and start >= len(records):
+			return 404, {"detail": "Invalid page."}
+		has_next = start + size < len(records)
+		return 200, {
+			"count": len(records),
+			"next": f"https://stand-in.invalid{path}?page={page + 1}" if has_next else None,
+			"previous": None,
+			"results": records[start : start + size],
+		}
+
+
+def _ids(fixtures: dict[str, Any], path: str) -> list[int]:
+	field = ID_FIELDS[path]
+	return [record[field] for record in fixtures.get("collections", {}).get(path, [])] or [1]
+
+
+def argument_factories(fixtures: dict[str, Any]) -> dict[str, Callable[[random.Random], dict[str, Any]]]:
+	"""Per tool, a function drawing realistic arguments for one call."""
+	article_ids = _ids(fixtures, "/articles/")
+	trial_ids = _ids(fixtures, "/trials/")
+	author_ids = _ids(fixtures, "/authors/")
+
+	def sample(rng: random.Random, ids: list[int]) -> list[int]:
+		return rng.sample(ids, min(len(ids), rng.randint(2, 8)))
+
+	return {
+		"search_articles": lambda rng: {"search": rng.choice(SEARCH_TERMS), "page": rng.choice((1, 1, 1, 2))},
+		"get_article": lambda rng: {"article_id": rng.choice(article_ids)},
+		"get_articles": lambda rng: {"ids": sample(rng, article_ids)},
+		"search_trials": lambda rng: {"search": rng.choice(SEARCH_TERMS)},
+		"get_trial": lambda rng: {"trial_id": rng.choice(trial_ids)},
+		"get_trials": lambda rng: {"ids": sample(rng, trial_ids)},
+		"search_authors": lambda rng: {"full_name": f"Author {rng.choice(author_ids)}"},
+		"get_author": lambda rng: {"author_id": rng.choice(author_ids)},
+		"list_categories": lambda rng: {},
+		"list_subjects": lambda rng: {},
+		"list_sponsors": lambda rng: {"page": rng.choice((1, 2))},
+		"get_stats": lambda rng: {"scope": rng.choice(("global", "articles", "trials"))},
+	}
+
+
+def build_plan(
+	mix: dict[str, int], calls: int, fixtures: dict[str, Any], seed: int
+) -> list[tuple[str, dict[str, Any]]]:
+	"""The (tool, arguments) sequence of one run, drawn from *mix* with a
+	seeded generator so every version benchmarks the same requests."""
+	factories = argument_factories(fixtures)
+	unknown = set(mix) - set(factories)
+	if unknown:
+		raise ValueError(f"no argument factory for {sorted(unknown)}")
+	rng = random.Random(seed)
+	tools = rng.choices(list(mix), weights=list(mix.values()), k=calls)
+	return [(tool, factories[tool](rng)) for tool in tools]
+
+
+def percentile(values: list[float], pct: float) -> float:
+	"""Nearest-rank percentile; 0.0 for no values."""
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	rank = max(1, -(-len(ordered) * pct // 100))
+	return ordered[int(rank) - 1]
+
+
+def _latency_summary(values: list[float]) -> dict[str, float]:
+	return {
+		"p50": round(percentile(values, 50), 2),
+		"p95": round(percentile(values, 95), 2),
+		"p99": round(percentile(values, 99), 2),
+		"mean": round(sum(values) / len(values), 2) if values else 0.0,
+		"max": round(max(values), 2) if values else 0.0,
+	}
+
+
+class _TelemetryCapture(logging.Handler):
+	"""Collects the `mcp_request` records TelemetryMiddleware emits."""
+
+	def __init__(self):
+		super().__init__(logging.INFO)
+		self.events: list[dict[str, Any]] = []
+
+	def emit(self, record: logging.LogRecord) -> None:
+		if record.getMessage() == "mcp_request" and getattr(record, "method", None) == "tools/call":
+			self.events.append(
+				{
+					"tool": getattr(record, "tool", None),
+					"outcome": getattr(record, "outcome", None),
+					"upstream_calls": getattr(record, "upstream_calls", 0),
+					"cache": getattr(record, "cache", None),
+				}
+			)
+
+
+def _cache_summary(statuses: Counter[str]) -> dict[str, Any]:
+	lookups = sum(statuses.values())
+	served = statuses["hit"] + statuses["single-flight-wait"]
+	return {
+		"hit": statuses["hit"],
+		"miss": statuses["miss"],
+		"single_flight_wait": statuses["single-flight-wait"],
+		"hit_rate": round(served / lookups, 4) if lookups else None,
+	}
+
+
+async def run_level(
+	settings: Settings,
+	fixtures: dict[str, Any],
+	plan: list[tuple[str, dict[str, Any]]],
+	concurrency: int,
+	*,
+	latency: float = 0.0,
+	path_latency: dict[str, float] | None = None,
+	jitter: float = 0.0,
+	seed: int = 0,
+) -> dict[str, Any]:
+	"""Run *plan* with *concurrency* callers against a fresh server, client
+	and catalog cache (every level starts cold), and summarise it."""
+	stand_in = StandInAPI(fixtures, latency, path_latency, jitter, seed)
+	init_client(settings, transport=httpx2.MockTransport(stand_in.handle))
+	reset_catalog_cache()
+	server = build_server()
+
+	capture = _TelemetryCapture()
+	telemetry_logger = logging.getLogger("gregory_mcp.telemetry")
+	saved = telemetry_logger.level, telemetry_logger.propagate
+	telemetry_logger.addHandler(capture)
+	telemetry_logger.setLevel(logging.INFO)
+	telemetry_logger.propagate = False
+
+	latencies: dict[str, list[float]] = defaultdict(list)
+	errors: Counter[str] = Counter()
+	pending = iter(plan)
+	try:
+		async with Client(server) as mcp_client:
+
+			async def caller() -> None:
+				for tool, arguments in pending:
+					started = time.perf_counter()
+					try:
+						result = await mcp_client.call_tool(tool, arguments)
+						failed = result.is_error
+					except Exception:
+						logger.debug("bench_call_failed", exc_info=True)
+						failed = True
+					latencies[tool].append((time.perf_counter() - started) * 1000)
+					if failed:
+						errors[tool] += 1
+
+			started = time.perf_counter()
+			await asyncio.gather(*(caller() for _ in range(max(1, concurrency))))
+			wall = time.perf_counter() - started
+	finally:
+		telemetry_logger.removeHandler(capture)
+		telemetry_logger.setLevel(saved[0])
+		telemetry_logger.propagate = saved[1]
+		await close_client()
+		reset_catalog_cache()
+
+	upstream: dict[str, list[int]] = defaultdict(list)
+	cache_statuses: dict[str, Counter[str]] = defaultdict(Counter)
+	for event in capture.events:
+		upstream[event["tool"]].append(event["upstream_calls"])
+		if event["cache"] is not None:
+			cache_statuses[event["tool"]][event["cache"]] += 1
+
+	all_latencies = [value for values in latencies.values() for value in values]
+	all_upstream = [value for values in upstream.values() for value in values]
+	return {
+		"concurrency": concurrency,
+		"calls": len(all_latencies),
+		"errors": sum(errors.values()),
+		"wall_seconds": round(wall, 3),
+		"throughput_per_second": round(len(all_latencies) / wall, 2) if wall else None,
+		"latency_ms": _latency_summary(all_latencies),
+		"upstream_calls_per_call": round(sum(all_upstream) / len(all_upstream), 3) if all_upstream else 0.0,
+		"upstream_requests": sum(stand_in.requests.values()),
+		"upstream_not_modified": stand_in.not_modified,
+		"catalog_cache": _cache_summary(sum(cache_statuses.values(), Counter())),
+		"tools": {
+			tool: {
+				"calls": len(values),
+				"errors": errors[tool],
+				"latency_ms": _latency_summary(values),
+				"upstream_calls_per_call": (
+					round(sum(upstream[tool]) / len(upstream[tool]), 3) if upstream[tool] else 0.0
+				),
+				**({"catalog_cache": _cache_summary(cache_statuses[tool])} if cache_statuses[tool] else {}),
+			}
+			for tool, values in sorted(latencies.items())
+		},
+	}
+
+
+async def run_benchmark(
+	concurrency_levels: list[int],
+	calls: int,
+	*,
+	mix: dict[str, int] | None = None,
+	fixtures: dict[str, Any] | None = None,
+	latency: float = 0.0,
+	path_latency: dict[str, float] | None = None,
+	jitter: float = 0.0,
+	seed: int = 1,
+	settings: Settings | None = None,
+) -> dict[str, Any]:
+	"""Run the same seeded plan at each concurrency level; return the report."""
+	mix = mix or DEFAULT_MIX
+	fixtures = fixtures if fixtures is not None else synthetic_fixtures()
+	settings = settings or bench_settings()
+	plan = build_plan(mix, calls, fixtures, seed)
+	levels = [
+		await run_level(
+			settings,
+			fixtures,
+			plan,
+			level,
+			latency=latency,
+			path_latency=path_latency,
+			jitter=jitter,
+			seed=seed,
+		)
+		for level in concurrency_levels
+	]
+	try:
+		version = metadata.version("gregory-mcp")
+	except metadata.PackageNotFoundError:
+		version = "unknown"
+	return {
+		"schema_version": SCHEMA_VERSION,
+		"gregory_mcp_version": version,
+		"python": platform.python_version(),
+		"created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+		"config": {
+			"calls_per_level": calls,
+			"mix": mix,
+			"latency_ms": latency * 1000,
+			"path_latency_ms": {path: value * 1000 for path, value in (path_latency or {}).items()},
+			"jitter_ms": jitter * 1000,
+			"seed": seed,
+			"page_concurrency": settings.page_concurrency,
+			"etag_cache_size": settings.etag_cache_size,
+			"max_retries": settings.max_retries,
+		},
+		"levels": levels,
+	}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+	"""Latency regressions of *current* against *baseline*: one line per
+	(concurrency level, percentile) more than *tolerance* slower. Levels
+	missing from either report are skipped."""
+	previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+	regressions = []
+	for level in current.get("levels", []):
+		old = previous.get(level["concurrency"])
+		if old is None:
+			continue
+		for key in ("p50", "p95", "p99"):
+			before, after = old["latency_ms"][key], level["latency_ms"][key]
+			if before and after > before * (1 + tolerance):
+				regressions.append(
+					f"concurrency {level['concurrency']}: {key} {before:.1f} ms -> {after:.1f} ms "
+					f"(+{(after / before - 1) * 100:.0f}%)"
+				)
+	return regressions
+
+
+def bench_settings(**overrides: Any) -> Settings:
+	"""Settings for a benchmark run: the production defaults, no network."""
+	values: dict[str, Any] = {
+		"api_url": "https://stand-in.invalid",
+		"host": "127.0.0.1",
+		"port": 0,
+		"request_timeout": 30.0,
+		"connect_timeout": 5.0,
+		"max_retries": 2,
+		"log_level": "WARNING",
+		"log_dir": None,
+	}
+	values.update({key: value for key, value in overrides.items() if value is not None})
+	return Settings(**values)
+
+
+def _parse_weights(text: str) -> dict[str, int]:
+	weights = {}
+	for item in filter(None, (part.strip() for part in text.split(","))):
+		tool, _, weight = item.partition("=")
+		weights[tool.strip()] = int(weight or 1)
+	return weights
+
+
+def _parse_path_latency(items: list[str]) -> dict[str, float]:
+	latencies = {}
+	for item in items:
+		path, _, ms = item.partition("=")
+		latencies[path] = float(ms) / 1000
+	return latencies
+
+
+def _print_summary(report: dict[str, Any], stream: Any) -> None:
+	print(
+		f"{'conc':>5} {'calls':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} "
+		f"{'p99 ms':>8} {'up/call':>8} {'cache hit':>9}",
+		file=stream,
+	)
+	for level in report["levels"]:
+		hit_rate = level["catalog_cache"]["hit_rate"]
+		print(
+			f"{level['concurrency']:>5} {level['calls']:>6} {level['errors']:>4} "
+			f"{level['throughput_per_second'] or 0:>8.1f} {level['latency_ms']['p50']:>8.1f} "
+			f"{level['latency_ms']['p95']:>8.1f} {level['latency_ms']['p99']:>8.1f} "
+			f"{level['upstream_calls_per_call']:>8.2f} "
+			f"{'-' if hit_rate is None else f'{hit_rate:.0%}':>9}",
+			file=stream,
+		)
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m gregory_mcp.bench", description=__doc__.split("\n\n")[0])
+	parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels (default: 1,8,32)")
+	parser.add_argument("--calls", type=int, default=200, help="Tool calls per level (default: 200)")
+	parser.add_argument("--mix", help="Tool weights, e.g. search_articles=5,list_categories=1 (default: DEFAULT_MIX)")
+	parser.add_argument("--fixtures", help="JSON file of recorded responses (default: synthetic data)")
+	parser.add_argument("--latency-ms", type=float, default=50.0, help="Stand-in API latency per request (default: 50)")
+	parser.add_argument(
+		"--path-latency",
+		action="append",
+		default=[],
+		metavar="PATH=MS",
+		help="Latency for one path, e.g. /categories/=1000 (repeatable)",
+	)
+	parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random latency, up to this much")
+	parser.add_argument("--seed", type=int, default=1, help="Seed for the call plan and jitter (default: 1)")
+	parser.add_argument("--page-concurrency", type=int, help="Override Settings.page_concurrency")
+	parser.add_argument("--etag-cache-size", type=int, help="Override Settings.etag_cache_size")
+	parser.add_argument("--output", default="-", help="Where to write the JSON report (default: stdout)")
+	parser.add_argument("--baseline", help="Earlier report to compare against")
+	parser.add_argument(
+		"--tolerance", type=float, default=0.2, help="Allowed slowdown against --baseline (default: 0.2 = 20%%)"
+	)
+	args = parser.parse_args(argv)
+	# One INFO line per stand-in request would drown the summary.
+	logging.getLogger("httpx2").setLevel(logging.WARNING)
+
+	fixtures = None
+	if args.fixtures:
+		with open(args.fixtures) as f:
+			fixtures = json.load(f)
+	report = asyncio.run(
+		run_benchmark(
+			[int(level) for level in args.concurrency.split(",") if level.strip()],
+			args.calls,
+			mix=_parse_weights(args.mix) if args.mix else None,
+			fixtures=fixtures,
+			latency=args.latency_ms / 1000,
+			path_latency=_parse_path_latency(args.path_latency),
+			jitter=args.jitter_ms / 1000,
+			seed=args.seed,
+			settings=bench_settings(page_concurrency=args.page_concurrency, etag_cache_size=args.etag_cache_size),
+		)
+	)
+
+	text = json.dumps(report, indent=2)
+	if args.output == "-":
+		sys.stdout.write(text + "\n")
+	else:
+		with open(args.output, "w") as f:
+			f.write(text + "\n")
+	_print_summary(report, sys.stderr)
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			regressions = compare(json.load(f), report, args.tolerance)
+		for line in regressions:
+			sys.stderr.write(f"REGRESSION {line}\n")
+		if regressions:
+			return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -9,8 +9,9 @@ catalogs do.
 Single-flight: on a cold cache, N concurrent callers for the same key await
 one upstream fetch rather than each starting their own. /categories/ costs
 about a second per request and takes 12 requests to read in full (measured
-against a live instance — see HANDOVER-MCP-FOLLOWUP-PLAN.md), so that ~6s
-window is wide enough for concurrent callers to actually collide in
+against a live instance — see HANDOVER-MCP-FOLLOWUP-PLAN.md). Even with
+get_all_pages fetching pages 2..12 concurrently that is a window of a few
+seconds, wide enough for concurrent callers to actually collide in
 practice.
 
 Per-replica, in-process — no Redis. The stateless-core model means each
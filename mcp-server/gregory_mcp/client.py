@@ -8,9 +8,11 @@ instance named by `GREGORY_API_URL`.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import random
 import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
 from typing import Any
 
@@ -71,6 +73,14 @@ class GregoryClient:
 	One instance is shared for the lifetime of the server process; it holds
 	no per-request or per-caller state, matching the stateless-core model of
 	the 2026-07-28 spec revision.
+
+	It does keep the last `etag_cache_size` response bodies that came with an
+	ETag, keyed on (path, sorted params), and revalidates them with
+	`If-None-Match`: an unchanged page comes back as an empty 304 that the
+	API answers from one aggregate, without running the page query or
+	serializing it. Every caller is anonymous (see "Auth" in
+	docs/07-mcp-server.md), so a body is never served to a caller who could
+	not have fetched it.
 	"""
 
 	def __init__(
@@ -78,17 +88,23 @@ class GregoryClient:
 		settings: Settings,
 		sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
 		jitter: Callable[[float, float], float] = random.uniform,
+		transport: httpx2.AsyncBaseTransport | None = None,
 	):
 		self._settings = settings
+		# `transport` replaces the network, e.g. with the stand-in API of
+		# gregory_mcp/bench.py.
 		self._client = httpx2.AsyncClient(
 			base_url=settings.api_base,
 			timeout=httpx2.Timeout(settings.request_timeout, connect=settings.connect_timeout),
 			headers={"Accept": "application/json", "User-Agent": "gregory-mcp/0.1.0"},
+			transport=transport,
 		)
 		# Injectable so tests can assert on backoff spacing without real
 		# sleeping and without depending on random's actual distribution.
 		self._sleep = sleep
 		self._jitter = jitter
+		# key -> (etag, raw body), least recently used first.
+		self._etag_cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
 
 	async def aclose(self) -> None:
 		await self._client.aclose()
@@ -101,13 +117,18 @@ class GregoryClient:
 		optional filter unconditionally without hand-pruning the dict.
 		"""
 		clean_params = {k: v for k, v in (params or {}).items() if v is not None}
+		cache_key = f"{path}?{tuple(sorted(clean_params.items()))!r}"
+		# Read once: a concurrent call may evict the entry while this one is
+		# in flight, and a 304 must be answered with the body it revalidated.
+		cached = self._etag_cache.get(cache_key)
+		headers = {"If-None-Match": cached[0]} if cached is not None else None
 		attempts = self._settings.max_retries + 1
 		last_exc: Exception | None = None
 
 		for attempt in range(1, attempts + 1):
 			call_start = time.monotonic()
 			try:
-				response = await self._client.get(path, params=clean_params)
+				response = await self._client.get(path, params=clean_params, headers=headers)
 			except httpx2.TransportError as exc:
 				record_upstream_call((time.monotonic() - call_start) * 1000)
 				last_exc = exc
@@ -131,12 +152,29 @@ class GregoryClient:
 				record_upstream_error(response.status_code)
 				raise GregoryAPIError(response.status_code, response.text[:500])
 
+			if response.status_code == 304 and cached is not None:
+				self._remember(cache_key, cached[0], cached[1])
+				return json.loads(cached[1])
+
+			etag = response.headers.get("ETag")
+			if etag:
+				self._remember(cache_key, etag, response.content)
 			return response.json()
 
 		# Unreachable in practice — the loop always returns or raises — but keeps
 		# the type checker honest about last_exc being used.
 		raise GregoryAPIError(0, f"exhausted retries calling {path}: {last_exc}")
 
+	def _remember(self, key: str, etag: str, body: bytes) -> None:
+		"""Store (or refresh) an entry as most recently used, evicting the
+		least recently used ones past etag_cache_size."""
+		if self._settings.etag_cache_size <= 0:
+			return
+		self._etag_cache[key] = (etag, body)
+		self._etag_cache.move_to_end(key)
+		while len(self._etag_cache) > self._settings.etag_cache_size:
+			self._etag_cache.popitem(last=False)
+
 	def _backoff_seconds(self, attempt: int, retry_after_header: str | None) -> float:
 		"""Delay before the next attempt. Honors `Retry-After` (seconds form)
 		when the upstream sends one; otherwise full-jitter exponential backoff.
@@ -166,27 +204,89 @@ class GregoryClient:
 		for catalogs that are known to be small, so hitting the cap means
 		either that assumption broke (the catalog grew) or this was called
 		on the wrong endpoint.
+
+		Page 1's `count` and page size give the number of pages; the rest are
+		fetched concurrently, at most `page_concurrency` at a time, each
+		through get() and so with its retries. A cold /categories/ read
+		(about 12 pages of ~1s each) then takes roughly one round trip per
+		`page_concurrency` pages instead of one per page. Without a `count`
+		the pages are followed one `next` at a time, as is anything past the
+		last expected page if the catalog grew in the meantime.
 		"""
 		base_params = dict(params or {})
-		results: list[dict[str, Any]] = []
+		if max_pages < 1:
+			record_truncation_error()
+			raise GregoryPaginationTruncatedError(path, max_pages, 0)
+
+		data = await self.get(path, {**base_params, "page": 1})
+		results: list[dict[str, Any]] = list(data.get("results", []))
 		page = 1
-		while page <= max_pages:
+		count = data.get("count")
+		if data.get("next") and isinstance(count, int) and results:
+			last_page = min(max_pages, -(-count // len(results)))
+			try:
+				pages = await self._fetch_pages(path, base_params, range(2, last_page + 1))
+			except GregoryAPIError as exc:
+				# The catalog shrank since page 1 and a page past its new end
+				# 404s: start over the plain way.
+				if exc.status_code != 404:
+					raise
+				return await self._follow_pages(path, base_params, max_pages)
+			for data in pages:
+				results.extend(data.get("results", []))
+			page = last_page
+
+		return await self._follow_pages(path, base_params, max_pages, data, page, results)
+
+	async def _fetch_pages(
+		self, path: str, base_params: dict[str, Any], pages: range
+	) -> list[dict[str, Any]]:
+		"""GET each of *pages* concurrently (bounded by page_concurrency) and
+		return the bodies in page order. The first failure cancels the rest."""
+		semaphore = asyncio.Semaphore(max(1, self._settings.page_concurrency))
+
+		async def fetch(page: int) -> dict[str, Any]:
+			async with semaphore:
+				return await self.get(path, {**base_params, "page": page})
+
+		tasks = [asyncio.ensure_future(fetch(page)) for page in pages]
+		try:
+			return await asyncio.gather(*tasks)
+		except BaseException:
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+			raise
+
+	async def _follow_pages(
+		self,
+		path: str,
+		base_params: dict[str, Any],
+		max_pages: int,
+		data: dict[str, Any] | None = None,
+		page: int = 0,
+		results: list[dict[str, Any]] | None = None,
+	) -> list[dict[str, Any]]:
+		"""Follow `next` one page at a time from *page* (whose body is *data*)
+		until it runs out or max_pages is reached."""
+		results = [] if results is None else results
+		while data is None or data.get("next"):
+			if page >= max_pages:
+				record_truncation_error()
+				raise GregoryPaginationTruncatedError(path, max_pages, len(results))
+			page += 1
 			data = await self.get(path, {**base_params, "page": page})
 			results.extend(data.get("results", []))
-			if not data.get("next"):
-				return results
-			page += 1
-		record_truncation_error()
-		raise GregoryPaginationTruncatedError(path, max_pages, len(results))
+		return results
 
 
 _client: GregoryClient | None = None
 
 
-def init_client(settings: Settings) -> GregoryClient:
+def init_client(settings: Settings, transport: httpx2.AsyncBaseTransport | None = None) -> GregoryClient:
 	"""Create the process-wide client. Call once, before serving requests."""
 	global _client
-	_client = GregoryClient(settings)
+	_client = GregoryClient(settings, transport=transport)
 	return _client
 
 
@@ -16,6 +16,10 @@ class Settings:
 	max_retries: int
 	log_level: str
 	log_dir: str | None
+	# Bodies GregoryClient keeps for If-None-Match revalidation; 0 disables.
+	etag_cache_size: int = 256
+	# Pages get_all_pages fetches at once after page 1.
+	page_concurrency: int = 6
 
 	@property
 	def api_base(self) -> str:
@@ -41,4 +45,6 @@ def load_settings() -> Settings:
 		max_retries=max(0, int(os.environ.get("GREGORY_MAX_RETRIES", "2"))),
 		log_level=os.environ.get("MCP_LOG_LEVEL", "INFO").upper(),
 		log_dir=os.environ.get("MCP_LOG_DIR", "").strip() or None,
+		etag_cache_size=max(0, int(os.environ.get("GREGORY_ETAG_CACHE_SIZE", "256"))),
+		page_concurrency=max(1, int(os.environ.get("GREGORY_PAGE_CONCURRENCY", "6"))),
 	)
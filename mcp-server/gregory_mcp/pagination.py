@@ -1,4 +1,5 @@
-"""Shared page/page_size clamping for tools that paginate."""
+"""Shared page/page_size clamping for tools that paginate, and the id-list
+limit of the batch detail tools."""
 
 from __future__ import annotations
 
@@ -13,3 +14,15 @@ def clamp_page_size(page_size: int, max_size: int) -> int:
 	"""Clamp to [1, max_size] — a 0 or negative page_size would otherwise be
 	forwarded upstream and produce an empty or erroring page."""
 	return max(1, min(page_size, max_size))
+
+
+def batch_ids(ids: list[int], max_ids: int) -> list[int]:
+	"""Deduplicate *ids*, keeping their order. Unlike page_size this is not
+	clamped: dropping ids past the limit would read as "not found" to the
+	caller, so too many (or none) is an error instead."""
+	unique = list(dict.fromkeys(ids))
+	if not unique:
+		raise ValueError("ids must list at least one ID")
+	if len(unique) > max_ids:
+		raise ValueError(f"at most {max_ids} IDs per call — split the list across several calls")
+	return unique
@@ -18,8 +18,8 @@ def register_prompts(server) -> None:
 			f"1. Call search_articles with search=\"{topic}\" (add relevant=true if you "
 			"want AI-flagged-relevant results only) and skim the top results.\n"
 			f"2. Call search_trials with search=\"{topic}\" to find related clinical trials.\n"
-			"3. For the most promising 2-3 articles or trials, call get_article / get_trial "
-			"for the full record before summarizing.\n"
+			"3. For the most promising 2-3 articles or trials, call get_articles / get_trials "
+			"with their IDs for the full records before summarizing.\n"
 			"4. Summarize: what's being studied, how far along it is (trial phase/recruitment "
 			"status where relevant), and any notable authors or sponsors."
 		)
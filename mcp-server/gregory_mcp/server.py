@@ -70,8 +70,10 @@ def build_server() -> MCPServer:
 	server.add_tool(catalog.list_subjects, annotations=READ_ONLY)
 	server.add_tool(articles.search_articles, annotations=READ_ONLY)
 	server.add_tool(articles.get_article, annotations=READ_ONLY)
+	server.add_tool(articles.get_articles, annotations=READ_ONLY)
 	server.add_tool(trials.search_trials, annotations=READ_ONLY)
 	server.add_tool(trials.get_trial, annotations=READ_ONLY)
+	server.add_tool(trials.get_trials, annotations=READ_ONLY)
 	server.add_tool(authors.search_authors, annotations=READ_ONLY)
 	server.add_tool(authors.get_author, annotations=READ_ONLY)
 	server.add_tool(catalog.list_categories, annotations=READ_ONLY)
@@ -6,11 +6,13 @@ from .. import intent as intent_module
 from ..client import get_client
 from ..compact import compact_article
 from ..enums import CategoryModality
-from ..pagination import clamp_page, clamp_page_size
+from ..pagination import batch_ids, clamp_page, clamp_page_size
 from ..zero_result import guidance_for
 
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 25
+# get_articles: one list page of at most this many records.
+MAX_BATCH_IDS = 25
 
 
 async def search_articles(
@@ -107,3 +109,20 @@ async def get_article(article_id: int) -> dict:
 	"""Fetch the full record for one article by ID, including authors,
 	ML predictions, linked clinical trials, and the untruncated summary."""
 	return await get_client().get(f"/articles/{article_id}/")
+
+
+async def get_articles(ids: list[int]) -> dict:
+	"""Fetch the full records for several articles by ID in one call (at most
+	25) — use this rather than repeated get_article calls, e.g. for the
+	promising hits of a search. `articles` keeps the order of `ids`; IDs that
+	don't exist or aren't publicly visible are listed under `missing`."""
+	wanted = batch_ids(ids, MAX_BATCH_IDS)
+	data = await get_client().get(
+		"/articles/",
+		{"article_id__in": ",".join(map(str, wanted)), "page_size": len(wanted)},
+	)
+	found = {record["article_id"]: record for record in data.get("results", [])}
+	return {
+		"articles": [found[pk] for pk in wanted if pk in found],
+		"missing": [pk for pk in wanted if pk not in found],
+	}
@@ -8,7 +8,7 @@ from .. import intent as intent_module
 from ..client import get_client
 from ..compact import compact_trial
 from ..enums import CategoryModality
-from ..pagination import clamp_page, clamp_page_size
+from ..pagination import batch_ids, clamp_page, clamp_page_size
 from ..zero_result import guidance_for
 
 SexEligibility = Literal["all", "female", "male"]
@@ -17,6 +17,8 @@ Region = Literal["africa", "asia", "europe", "north_america", "oceania", "south_
 
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 25
+# get_trials: one list page of at most this many records.
+MAX_BATCH_IDS = 25
 
 
 async def search_trials(
@@ -131,3 +133,22 @@ async def get_trial(trial_id: int) -> dict:
 	"""Fetch the full record for one clinical trial by ID, including
 	trial_sites (detail-only), eligibility criteria, and results detail."""
 	return await get_client().get(f"/trials/{trial_id}/")
+
+
+async def get_trials(ids: list[int]) -> dict:
+	"""Fetch the full records for several trials by ID in one call (at most
+	25) — use this rather than repeated get_trial calls, e.g. for the
+	promising hits of a search. `trials` keeps the order of `ids`; IDs that
+	don't exist or aren't publicly visible are listed under `missing`.
+	Records come from the list endpoint, so unlike get_trial they carry no
+	`trial_sites` — call get_trial for a trial whose sites you need."""
+	wanted = batch_ids(ids, MAX_BATCH_IDS)
+	data = await get_client().get(
+		"/trials/",
+		{"trial_id__in": ",".join(map(str, wanted)), "page_size": len(wanted)},
+	)
+	found = {record["trial_id"]: record for record in data.get("results", [])}
+	return {
+		"trials": [found[pk] for pk in wanted if pk in found],
+		"missing": [pk for pk in wanted if pk not in found],
+	}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import httpx2
+
+from gregory_mcp.bench import (
+	StandInAPI,
+	build_plan,
+	compare,
+	percentile,
+	run_benchmark,
+	synthetic_fixtures,
+)
+
+
+async def test_report_covers_every_level_and_tool():
+	mix = {"search_articles": 3, "get_articles": 1, "list_categories": 1, "get_stats": 1}
+
+	report = await run_benchmark([1, 4], 30, mix=mix)
+
+	assert [level["concurrency"] for level in report["levels"]] == [1, 4]
+	for level in report["levels"]:
+		assert level["calls"] == 30
+		assert level["errors"] == 0
+		assert set(level["tools"]) <= set(mix)
+		assert level["latency_ms"]["p50"] <= level["latency_ms"]["p95"] <= level["latency_ms"]["p99"]
+		assert level["upstream_calls_per_call"] > 0
+		# The first catalog read misses, every later one is served from
+		# CatalogCache — each level starts cold.
+		assert level["catalog_cache"]["miss"] == 1
+		assert level["catalog_cache"]["hit_rate"] > 0
+	assert report["config"]["mix"] == mix
+
+
+def test_plan_is_deterministic_per_seed():
+	fixtures = synthetic_fixtures()
+	mix = {"search_articles": 1, "get_trials": 1}
+	assert build_plan(mix, 20, fixtures, seed=3) == build_plan(mix, 20, fixtures, seed=3)
+	assert build_plan(mix, 20, fixtures, seed=3) != build_plan(mix, 20, fixtures, seed=4)
+
+
+async def test_stand_in_serves_pages_id_filters_and_304s():
+	stand_in = StandInAPI(synthetic_fixtures(categories=25))
+	async with httpx2.AsyncClient(
+		base_url="https://stand-in.invalid", transport=httpx2.MockTransport(stand_in.handle)
+	) as client:
+		last = await client.get("/categories/", params={"page": 3})
+		assert last.json()["count"] == 25
+		assert [c["id"] for c in last.json()["results"]] == [21, 22, 23, 24, 25]
+		assert last.json()["next"] is None
+
+		picked = await client.get("/articles/", params={"article_id__in": "5,3,999"})
+		assert sorted(a["article_id"] for a in picked.json()["results"]) == [3, 5]
+
+		again = await client.get(
+			"/categories/", params={"page": 3}, headers={"If-None-Match": last.headers["ETag"]}
+		)
+		assert again.status_code == 304
+		assert (await client.get("/trials/99999/")).status_code == 404
+	assert stand_in.not_modified == 1
+
+
+def test_percentile_is_nearest_rank():
+	values = [float(n) for n in range(1, 101)]
+	assert percentile(values, 50) == 50.0
+	assert percentile(values, 99) == 99.0
+	assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_only_slowdowns_past_tolerance():
+	def report(p50, p95, p99):
+		return {"levels": [{"concurrency": 8, "latency_ms": {"p50": p50, "p95": p95, "p99": p99}}]}
+
+	assert compare(report(10, 20, 30), report(11, 20, 30), tolerance=0.2) == []
+	regressions = compare(report(10, 20, 30), report(10, 30, 20), tolerance=0.2)
+	assert len(regressions) == 1
+	assert regressions[0].startswith("concurrency 8: p95")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import replace
 
 import httpx2
@@ -227,3 +228,108 @@ async def test_get_all_pages_raises_rather_than_silently_truncating():
 	assert exc_info.value.path == "/sponsors/"
 	assert exc_info.value.max_pages == 3
 	assert exc_info.value.fetched == 3
+
+
+async def test_revalidates_cached_body_with_if_none_match():
+	client = GregoryClient(TEST_SETTINGS)
+	seen_if_none_match = []
+
+	def handler(request):
+		seen_if_none_match.append(request.headers.get("If-None-Match"))
+		if request.headers.get("If-None-Match") == 'W/"v1"':
+			return httpx2.Response(304, headers={"ETag": 'W/"v1"'})
+		return httpx2.Response(200, json={"results": [{"id": 1}]}, headers={"ETag": 'W/"v1"'})
+
+	client._client._transport = httpx2.MockTransport(handler)
+
+	first = await client.get("/articles/", {"page": 1, "team_id": None})
+	second = await client.get("/articles/", {"page": 1})
+
+	assert first == second == {"results": [{"id": 1}]}
+	assert seen_if_none_match == [None, 'W/"v1"']
+	# Callers get their own copy, not a shared object they could mutate.
+	assert first is not second
+
+
+async def test_changed_body_replaces_cached_one():
+	client = GregoryClient(TEST_SETTINGS)
+	version = {"etag": 'W/"v1"', "id": 1}
+
+	def handler(request):
+		if request.headers.get("If-None-Match") == version["etag"]:
+			return httpx2.Response(304, headers={"ETag": version["etag"]})
+		return httpx2.Response(200, json={"id": version["id"]}, headers={"ETag": version["etag"]})
+
+	client._client._transport = httpx2.MockTransport(handler)
+
+	assert await client.get("/articles/1/") == {"id": 1}
+	version.update(etag='W/"v2"', id=2)
+	assert await client.get("/articles/1/") == {"id": 2}
+	assert await client.get("/articles/1/") == {"id": 2}
+
+
+async def test_etag_cache_evicts_least_recently_used():
+	client = GregoryClient(replace(TEST_SETTINGS, etag_cache_size=2))
+
+	def handler(request):
+		return httpx2.Response(200, json={}, headers={"ETag": f'W/"{request.url.path}"'})
+
+	client._client._transport = httpx2.MockTransport(handler)
+
+	for path in ("/a/", "/b/", "/a/", "/c/"):
+		await client.get(path)
+
+	assert [key.split("?")[0] for key in client._etag_cache] == ["/a/", "/c/"]
+
+
+async def test_get_all_pages_fans_out_after_page_one():
+	client = GregoryClient(replace(TEST_SETTINGS, page_concurrency=3))
+	in_flight = {"now": 0, "peak": 0}
+	requested = []
+
+	async def handler(request):
+		page = int(request.url.params.get("page", "1"))
+		requested.append(page)
+		in_flight["now"] += 1
+		in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+		# Later pages answer first, so order must come from page numbers.
+		await asyncio.sleep(0.001 * (10 - page))
+		in_flight["now"] -= 1
+		return httpx2.Response(
+			200,
+			json={
+				"count": 7 * 2 - 1,
+				"next": None if page == 7 else f"https://x/?page={page + 1}",
+				"results": [{"id": page * 10}, {"id": page * 10 + 1}][: 1 if page == 7 else 2],
+			},
+		)
+
+	client._client._transport = httpx2.MockTransport(handler)
+
+	results = await client.get_all_pages("/categories/", max_pages=10)
+
+	assert [r["id"] for r in results] == [
+		n for page in range(1, 8) for n in (page * 10, page * 10 + 1)
+	][:13]
+	assert requested[0] == 1
+	assert sorted(requested) == list(range(1, 8))
+	assert in_flight["peak"] == 3
+
+
+async def test_get_all_pages_fan_out_still_raises_past_max_pages():
+	client = GregoryClient(TEST_SETTINGS)
+	requested = []
+
+	def handler(request):
+		requested.append(int(request.url.params.get("page", "1")))
+		return httpx2.Response(
+			200, json={"count": 100, "next": "https://x/?page=next", "results": [{"id": 1}]}
+		)
+
+	client._client._transport = httpx2.MockTransport(handler)
+
+	with pytest.raises(GregoryPaginationTruncatedError) as exc_info:
+		await client.get_all_pages("/categories/", max_pages=4)
+
+	assert exc_info.value.fetched == 4
+	assert sorted(requested) == [1, 2, 3, 4]
@@ -45,3 +45,12 @@ def test_log_dir_passes_through(monkeypatch):
 	settings = load_settings()
 
 	assert settings.log_dir == "/var/log/gregory-mcp"
+
+
+def test_etag_cache_size_defaults_and_clamps(monkeypatch):
+	monkeypatch.setenv("GREGORY_API_URL", "https://gregory.test")
+	monkeypatch.delenv("GREGORY_ETAG_CACHE_SIZE", raising=False)
+	assert load_settings().etag_cache_size == 256
+
+	monkeypatch.setenv("GREGORY_ETAG_CACHE_SIZE", "-1")
+	assert load_settings().etag_cache_size == 0
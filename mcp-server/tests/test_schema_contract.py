@@ -48,6 +48,12 @@ TOOL_ENDPOINTS = [
 	(catalog.list_sponsors, "/sponsors/", set()),
 ]
 
+# Batch detail tools: their `ids` argument is sent as this id-list filter.
+BATCH_ENDPOINTS = [
+	(articles.get_articles, "/articles/", "article_id__in"),
+	(trials.get_trials, "/trials/", "trial_id__in"),
+]
+
 DETAIL_ENDPOINTS = [
 	(articles.get_article, "/articles/{article_id}/"),
 	(trials.get_trial, "/trials/{trial_id}/"),
@@ -69,6 +75,13 @@ def test_tool_filters_are_declared_in_schema(fn, path, non_filter_args, schema_p
 	)
 
 
+@pytest.mark.parametrize("fn,path,param", BATCH_ENDPOINTS, ids=[fn.__name__ for fn, _, _ in BATCH_ENDPOINTS])
+def test_batch_filter_is_declared_in_schema(fn, path, param, schema_params):
+	assert param in schema_params.get(path, set()), (
+		f"{fn.__name__} sends {param} to GET {path}, but schema.yml does not declare it"
+	)
+
+
 @pytest.mark.parametrize("fn,path", DETAIL_ENDPOINTS, ids=[fn.__name__ for fn, _ in DETAIL_ENDPOINTS])
 def test_detail_endpoint_exists_in_schema(fn, path, schema_params):
 	assert path in schema_params, f"{path} is missing from schema.yml entirely"
@@ -81,6 +94,7 @@ def test_detail_endpoint_exists_in_schema(fn, path, schema_params):
 # added to a FilterSet that nobody thought to add to the matching tool).
 KNOWN_UNEXPOSED_PARAMS = {
 	"/articles/": {
+		"article_id__in",  # sent by get_articles(ids), see BATCH_ENDPOINTS
 		"format",  # CSV — no export tool, see STAGE-2 plan "Risks"
 		"site_id",  # Django Site scoping; MCP client is already scoped to one instance
 		"source_id",  # niche — callers don't know source IDs
@@ -96,6 +110,7 @@ KNOWN_UNEXPOSED_PARAMS = {
 		"subjects",
 		"subjects_any",
 		"trial_id",  # redundant with get_trial(trial_id)
+		"trial_id__in",  # sent by get_trials(ids), see BATCH_ENDPOINTS
 		"source_register",  # niche — registry name (e.g. "ClinicalTrials.gov")
 		"internal_number",  # niche — WHO internal number
 		"identifiers",  # generic multi-registry filter; nct covers the common case
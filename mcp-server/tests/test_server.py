@@ -6,8 +6,10 @@ EXPECTED_TOOLS = {
 	"list_subjects",
 	"search_articles",
 	"get_article",
+	"get_articles",
 	"search_trials",
 	"get_trial",
+	"get_trials",
 	"search_authors",
 	"get_author",
 	"list_categories",
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import httpx2
+import pytest
 
 import gregory_mcp.tools.articles as articles_module
-from gregory_mcp.tools.articles import get_article, search_articles
+from gregory_mcp.tools.articles import MAX_BATCH_IDS, get_article, get_articles, search_articles
 
 
 async def test_search_articles_compacts_results(mock_gregory):
@@ -156,3 +157,29 @@ async def test_get_article_returns_full_record(mock_gregory):
 	assert result["article_id"] == 42
 	assert result["authors"] == [{"full_name": "A"}]
 	assert mock_gregory.requests[0].url.path == "/articles/42/"
+
+
+async def test_get_articles_is_one_upstream_call_in_requested_order(mock_gregory):
+	mock_gregory.set_handler(
+		lambda request: httpx2.Response(
+			200, json={"count": 2, "next": None, "results": [{"article_id": 3}, {"article_id": 1}]}
+		)
+	)
+
+	result = await get_articles([1, 2, 3, 1])
+
+	assert [a["article_id"] for a in result["articles"]] == [1, 3]
+	assert result["missing"] == [2]
+	assert len(mock_gregory.requests) == 1
+	params = mock_gregory.requests[0].url.params
+	assert mock_gregory.requests[0].url.path == "/articles/"
+	assert params["article_id__in"] == "1,2,3"
+	assert params["page_size"] == "3"
+
+
+async def test_get_articles_rejects_empty_and_oversized_lists(mock_gregory):
+	with pytest.raises(ValueError):
+		await get_articles([])
+	with pytest.raises(ValueError):
+		await get_articles(list(range(MAX_BATCH_IDS + 1)))
+	assert mock_gregory.requests == []
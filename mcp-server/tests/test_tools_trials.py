@@ -3,7 +3,7 @@ from __future__ import annotations
 import httpx2
 
 import gregory_mcp.tools.trials as trials_module
-from gregory_mcp.tools.trials import get_trial, search_trials
+from gregory_mcp.tools.trials import get_trial, get_trials, search_trials
 
 
 async def test_search_trials_compacts_results(mock_gregory):
@@ -140,3 +140,14 @@ async def test_get_trial_returns_full_record(mock_gregory):
 
 	assert result["trial_id"] == 7
 	assert mock_gregory.requests[0].url.path == "/trials/7/"
+
+
+async def test_get_trials_reports_invisible_ids(mock_gregory):
+	mock_gregory.set_handler(
+		lambda request: httpx2.Response(200, json={"count": 1, "next": None, "results": [{"trial_id": 9}]})
+	)
+
+	result = await get_trials([9, 8])
+
+	assert result == {"trials": [{"trial_id": 9}], "missing": [8]}
+	assert mock_gregory.requests[0].url.params["trial_id__in"] == "9,8"